@@ -6,6 +6,10 @@ from openai import OpenAI
 from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
 from huggingface_hub import login
 
+# backend 폴더의 공용 LLM 응답 캐시
+# (backend 폴더에서 python -m ai_issue_creator.run_news_gen 으로 실행하면 backend 모듈을 그대로 import 할 수 있음)
+from llm_cache import llm_cache
+
 # =================================================================
 # 1. API 키 설정
 # =================================================================
@@ -30,13 +34,33 @@ if GOOGLE_API_KEY:
 
 loaded_hf_pipelines = {}
 
+# 모델별 생성 설정이 바뀌면 이 값을 올려서 예전 캐시를 무효화합니다.
+ASK_PARAMS_VERSION = "reporter-v1"
+
 
 # =================================================================
 # 3. 만능 질문 함수 (모든 모델 '기자 모드' 적용)
 # =================================================================
-def ask(model_name, message):
-    answer = ""
+def ask(model_name, message, use_cache=True):
+    """
+    모델 이름에 맞는 백엔드(GPT / Gemini / 로컬 HF)로 질문합니다.
+    같은 모델 + 같은 메시지는 llm_cache에 저장된 답변을 재사용합니다. (오류 메시지는 저장하지 않음)
+    """
     model_name = model_name.strip()
+    if not use_cache:
+        return _ask_uncached(model_name, message)
+
+    return llm_cache.get_or_generate(
+        model_name,
+        {"version": ASK_PARAMS_VERSION},
+        message,
+        lambda: _ask_uncached(model_name, message),
+        should_store=lambda answer: not answer.startswith("⚠️"),
+    )
+
+
+def _ask_uncached(model_name, message):
+    answer = ""
 
     try:
         # ---------------------------------------------------------
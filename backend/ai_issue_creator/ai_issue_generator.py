@@ -1,4 +1,4 @@
-from ai_helper import ask
+from ai_issue_creator.ai_helper import ask
 
 
 def generate_balanced_article(model_name, cluster_topic, articles):
@@ -1,11 +1,13 @@
+# 실행 (backend 폴더에서):
+#     python -m ai_issue_creator.run_news_gen
 import sys
 import time
 from collections import defaultdict
 
 # 만든 파일들 불러오기
 # (만약 여기서 에러가 나면 ai_helper.py 파일 문제일 확률이 높습니다)
-from ai_news_generator import generate_balanced_article
-from test_data import fake_articles_data
+from ai_issue_creator.ai_issue_generator import generate_balanced_article
+from ai_issue_creator.test_data import fake_articles_data
 
 
 # =========================================================
@@ -0,0 +1,119 @@
+# ann_clustering.py
+"""
+근사 최근접 이웃(ANN) 기반 군집화 엔진.
+
+전체 임베딩 행렬에 HDBSCAN을 돌리는 대신,
+1) (선택) PCA / 랜덤 투영으로 차원 축소
+2) 기사마다 k개 이웃만 찾은 kNN 그래프 생성 (블록 단위 정확 계산, 아주 많으면 hnswlib HNSW 인덱스)
+3) 코사인 유사도가 threshold 이상인 간선만 남긴 희소 그래프의 연결 요소를 군집으로 사용
+합니다. 시간/메모리가 기사 수에 거의 선형으로 늘어납니다.
+
+기본 threshold 0.92는 정규화 벡터에서 유클리드 거리 0.4(HDBSCAN cluster_selection_epsilon)와 같은 값입니다.
+"""
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+try:
+    import hnswlib  # chromadb가 설치될 때 함께 들어오는 HNSW 구현 (chroma-hnswlib)
+except ImportError:
+    hnswlib = None
+
+# 정확 kNN 계산 시 한 번에 만들 유사도 블록 원소 수 (약 64MB, 행 수 = 이 값 / 전체 기사 수)
+EXACT_KNN_BLOCK_ELEMENTS = 16 * 1024 * 1024
+# backend="auto"에서 이 기사 수 이하이면 블록 정확 계산이 HNSW 인덱스 구축(1024차원)보다 빠릅니다.
+AUTO_EXACT_MAX_ROWS = 100000
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def reduce_dimensions(embeddings, method=None, dim=128, seed=0):
+    """차원 축소 후 다시 정규화합니다. method: None | "pca" | "random" """
+    if not method or method == "none" or embeddings.shape[1] <= dim:
+        return embeddings
+    if method == "pca":
+        from sklearn.decomposition import PCA
+
+        reduced = PCA(n_components=dim, svd_solver="randomized", random_state=seed).fit_transform(embeddings)
+    elif method == "random":
+        rng = np.random.default_rng(seed)
+        projection = rng.standard_normal((embeddings.shape[1], dim)).astype(np.float32) / np.sqrt(dim)
+        reduced = embeddings @ projection
+    else:
+        raise ValueError(f"지원하지 않는 차원 축소 방식입니다: {method}")
+    return _normalize_rows(reduced)
+
+
+def _exact_knn(embeddings, k):
+    n = len(embeddings)
+    indices = np.empty((n, k), dtype=np.int64)
+    sims = np.empty((n, k), dtype=np.float32)
+    chunk_rows = max(64, EXACT_KNN_BLOCK_ELEMENTS // n)
+    for start in range(0, n, chunk_rows):
+        block = embeddings[start:start + chunk_rows] @ embeddings.T
+        rows = np.arange(len(block))
+        block[rows, start + rows] = -np.inf  # 자기 자신 제외
+        top = np.argpartition(block, -k, axis=1)[:, -k:]
+        indices[start:start + len(block)] = top
+        sims[start:start + len(block)] = block[rows[:, None], top]
+    return indices, sims
+
+
+def _hnsw_knn(embeddings, k, ef_construction=200, m=16):
+    n, dim = embeddings.shape
+    index = hnswlib.Index(space="ip", dim=dim)
+    index.init_index(max_elements=n, ef_construction=ef_construction, M=m)
+    index.add_items(embeddings, np.arange(n))
+    index.set_ef(max(2 * (k + 1), 50))
+    labels, distances = index.knn_query(embeddings, k=k + 1)
+    # 'ip' 거리 = 1 - 내적. 첫 번째 이웃은 보통 자기 자신이므로 제외합니다.
+    self_mask = labels == np.arange(n)[:, None]
+    indices = np.empty((n, k), dtype=np.int64)
+    sims = np.empty((n, k), dtype=np.float32)
+    for i in range(n):
+        keep = ~self_mask[i]
+        indices[i] = labels[i][keep][:k]
+        sims[i] = 1.0 - distances[i][keep][:k]
+    return indices, sims
+
+
+def knn_graph(embeddings, k=15, backend="auto"):
+    """각 행의 k개 최근접 이웃 (indices, 코사인 유사도)을 구합니다. backend: auto | hnsw | exact"""
+    k = min(k, len(embeddings) - 1)
+    if backend == "auto":
+        backend = "hnsw" if hnswlib is not None and len(embeddings) > AUTO_EXACT_MAX_ROWS else "exact"
+    if backend == "hnsw":
+        if hnswlib is None:
+            raise ImportError("hnswlib이 설치되어 있지 않습니다. (pip install chroma-hnswlib)")
+        return _hnsw_knn(embeddings, k)
+    return _exact_knn(embeddings, k)
+
+
+def cluster_knn_graph(indices, sims, threshold=0.92, min_cluster_size=2):
+    """유사도 threshold 이상 간선의 연결 요소를 군집 번호로 반환합니다. (작은 군집은 -1 = 노이즈)"""
+    n = len(indices)
+    rows = np.repeat(np.arange(n), indices.shape[1])
+    cols = indices.ravel()
+    keep = sims.ravel() >= threshold
+    graph = coo_matrix((np.ones(keep.sum(), dtype=np.int8), (rows[keep], cols[keep])), shape=(n, n)).tocsr()
+    _, components = connected_components(graph, directed=False)
+
+    sizes = np.bincount(components)
+    big = np.flatnonzero(sizes >= min_cluster_size)
+    remap = np.full(len(sizes), -1, dtype=np.int64)
+    remap[big] = np.arange(len(big))
+    return remap[components]
+
+
+def ann_cluster(embeddings, k=15, threshold=0.92, min_cluster_size=2, reduce=None, reduce_dim=128, backend="auto"):
+    """정규화된 임베딩 행렬을 군집화해 HDBSCAN.fit_predict와 같은 형태의 라벨 배열을 돌려줍니다."""
+    embeddings = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+    if len(embeddings) < 2:
+        return np.full(len(embeddings), -1, dtype=np.int64)
+    embeddings = reduce_dimensions(embeddings, reduce, reduce_dim)
+    indices, sims = knn_graph(embeddings, k, backend)
+    return cluster_knn_graph(indices, sims, threshold, min_cluster_size)
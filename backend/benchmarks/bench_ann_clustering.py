@@ -0,0 +1,127 @@
+# benchmarks/bench_ann_clustering.py
+"""
+신규 군집화 엔진 벤치마크: HDBSCAN(정확) vs ANN kNN 그래프.
+
+bge-m3와 같은 1024차원 정규화 벡터로 '사건 군집(기사 2~10건) + 단독 기사' 데이터를 만들고,
+엔진/기사 수마다 별도 프로세스에서 실행 시간, 최대 메모리(peak RSS), 정답/HDBSCAN 대비 일치도(ARI)를 잽니다.
+hdbscan 패키지가 없으면 같은 파라미터의 sklearn.cluster.HDBSCAN을 씁니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_ann_clustering --sizes 5000 20000 50000
+    python -m benchmarks.bench_ann_clustering --sizes 20000 --reduce pca random
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.metrics import adjusted_rand_score
+
+
+def make_embeddings(count, dim=1024, noise_ratio=0.5, spread=0.2, seed=0):
+    """(임베딩 행렬, 정답 라벨) — 단독 기사는 라벨 -1"""
+    rng = np.random.default_rng(seed)
+    truth = np.full(count, -1, dtype=np.int64)
+    clustered = int(count * (1 - noise_ratio))
+    pos, cid = 0, 0
+    while pos < clustered:
+        size = min(int(rng.integers(2, 11)), clustered - pos)
+        truth[pos:pos + size] = cid
+        pos += size
+        cid += 1
+    centers = rng.standard_normal((cid, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+
+    embs = rng.standard_normal((count, dim)).astype(np.float32)
+    embs /= np.linalg.norm(embs, axis=1, keepdims=True)
+    in_cluster = truth >= 0
+    # 같은 사건 기사끼리는 유클리드 거리 약 0.28 (코사인 약 0.96)
+    embs[in_cluster] = centers[truth[in_cluster]] + embs[in_cluster] * spread
+    embs /= np.linalg.norm(embs, axis=1, keepdims=True)
+    order = rng.permutation(count)
+    return embs[order], truth[order]
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_exact(embs):
+    try:
+        import hdbscan
+
+        clusterer = hdbscan.HDBSCAN(min_cluster_size=2, min_samples=1, metric='euclidean', cluster_selection_epsilon=0.4)
+    except ImportError:
+        from sklearn.cluster import HDBSCAN
+
+        clusterer = HDBSCAN(min_cluster_size=2, min_samples=1, metric='euclidean', cluster_selection_epsilon=0.4)
+    return clusterer.fit_predict(embs)
+
+
+def run_one(config):
+    embs, _ = make_embeddings(config["count"])
+    started = time.perf_counter()
+    if config["engine"] == "hdbscan":
+        labels = run_exact(embs)
+    else:
+        from ann_clustering import ann_cluster
+
+        labels = ann_cluster(embs, k=config["k"], reduce=config["reduce"], backend=config["backend"])
+    elapsed = time.perf_counter() - started
+    np.save(config["labels_path"], labels)
+    return {"seconds": elapsed, "peak_rss_mb": peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", type=int, default=[5000, 20000, 50000])
+    parser.add_argument("--k", type=int, default=15)
+    parser.add_argument("--reduce", nargs="+", default=["none"], help="none | pca | random")
+    parser.add_argument("--backends", nargs="+", default=["auto"], help="auto | hnsw | exact")
+    parser.add_argument("--exact-max", type=int, default=50000, help="이보다 큰 크기는 HDBSCAN 생략")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(json.loads(args.child))))
+        return
+
+    print(f"{'n':>7}  {'engine':<24}{'seconds':>9}{'peak MB':>9}{'ARI/truth':>11}{'ARI/hdbscan':>13}{'clusters':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.sizes:
+            _, truth = make_embeddings(count)
+            configs = []
+            if count <= args.exact_max:
+                configs.append({"engine": "hdbscan", "name": "hdbscan"})
+            for backend in args.backends:
+                for reduce in args.reduce:
+                    configs.append({"engine": "ann", "backend": backend, "reduce": reduce, "name": f"ann[{backend},{reduce}]"})
+
+            exact_labels = None
+            for config in configs:
+                config.update(count=count, k=args.k, labels_path=os.path.join(tmp, f"{config['name']}-{count}.npy"))
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_ann_clustering", "--child", json.dumps(config)],
+                    capture_output=True, text=True,
+                )
+                if out.returncode != 0:
+                    print(f"{count:>7}  {config['name']:<24} 실패: {out.stderr.strip().splitlines()[-1:]}")
+                    continue
+                result = json.loads(out.stdout.strip().splitlines()[-1])
+                labels = np.load(config["labels_path"])
+                if config["engine"] == "hdbscan":
+                    exact_labels = labels
+                vs_exact = adjusted_rand_score(exact_labels, labels) if exact_labels is not None else float("nan")
+                print(
+                    f"{count:>7}  {config['name']:<24}{result['seconds']:>9.2f}{result['peak_rss_mb']:>9.0f}"
+                    f"{adjusted_rand_score(truth, labels):>11.3f}{vs_exact:>13.3f}{len(set(labels) - {-1}):>10}"
+                )
+
+
+if __name__ == "__main__":
+    main()
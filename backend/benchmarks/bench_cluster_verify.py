@@ -0,0 +1,89 @@
+# benchmarks/bench_cluster_verify.py
+"""
+후보 군집 LLM 검증 단계 벤치마크 (가짜 LLM 백엔드).
+
+가짜 refine 함수가 설정한 지연 시간만큼 잠들고, 일정 비율로 오류를 내거나 아주 느리게 응답합니다.
+- sequential: 변경 전처럼 군집마다 한 번씩 순서대로 호출
+- verify_clusters: 동시 호출 수를 바꿔가며 비교 (제한 시간 + 재시도 포함)
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_cluster_verify --clusters 50 --latency 2.0
+"""
+import argparse
+import contextlib
+import io
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from cluster_verifier import verify_clusters
+
+
+def make_clusters(count, seed=0):
+    rnd = random.Random(seed)
+    now = datetime.now()
+    return [
+        [SimpleNamespace(id=c * 100 + i, title=f"기사 {c}-{i}", time=now - timedelta(minutes=rnd.randint(0, 4320)))
+         for i in range(rnd.randint(2, 15))]
+        for c in range(count)
+    ]
+
+
+def make_fake_llm(latency, error_rate, hang_rate, hang_seconds, seed=0):
+    rnd = random.Random(seed)
+    lock = threading.Lock()
+
+    def refine(articles):
+        with lock:
+            roll = rnd.random()
+            delay = max(0.05, rnd.gauss(latency, latency * 0.2))
+        if roll < hang_rate:
+            time.sleep(hang_seconds)
+        else:
+            time.sleep(delay)
+        if roll > 1 - error_rate:
+            raise RuntimeError("fake 503")
+        return {"is_issue": "True", "title": articles[0].title}
+
+    return refine
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=2.0, help="LLM 호출 평균 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--hang-rate", type=float, default=0.02)
+    parser.add_argument("--timeout", type=float, default=6.0)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[4, 8, 16])
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    clusters = make_clusters(args.clusters)
+    hang_seconds = args.timeout * 3
+
+    if not args.skip_sequential:
+        refine = make_fake_llm(args.latency, args.error_rate, args.hang_rate, hang_seconds)
+        started = time.perf_counter()
+        ok = 0
+        for articles in clusters:
+            try:
+                ok += refine(articles)["is_issue"] == "True"
+            except Exception:
+                pass
+        print(f"{'sequential':<24}{time.perf_counter() - started:>8.1f}s   성공 {ok}/{len(clusters)}")
+
+    for concurrency in args.concurrency:
+        refine = make_fake_llm(args.latency, args.error_rate, args.hang_rate, hang_seconds)
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = verify_clusters(clusters, refine, max_concurrency=concurrency, timeout=args.timeout, retries=2, backoff=0.5)
+        ok = sum(1 for _, res in results if res["is_issue"] == "True")
+        sizes = [len(a) for a, _ in results[:5]]
+        print(f"{f'concurrent x{concurrency}':<24}{time.perf_counter() - started:>8.1f}s   성공 {ok}/{len(clusters)}   첫 5개 크기 {sizes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/bench_comprehensive_search.py
+"""
+/api/comprehensive-search 지연 시간(p50/p99) 벤치마크.
+
+search_agent의 네 섹션을 지연 시간이 있는 가짜 백엔드로 바꿔 끼우고
+- 기존 순차 실행 (섹션 지연의 합)
+- 병렬 실행 (가장 느린 섹션 + 섹션별 제한 시간)
+- 병렬 실행 + 키워드 TTL 캐시 (인기 검색어 반복)
+를 비교합니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_comprehensive_search --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import search_agent
+
+# 섹션별 (평균 지연, 흔들림) 초 — 위키(HTTP 2번 + LLM), 이슈 요약(LLM), DB 검색 2개
+LATENCIES = {
+    "search_wikipedia": (1.2, 0.4),
+    "search_issues_by_keyword": (0.9, 0.3),
+    "search_hot_topics_by_keyword": (0.05, 0.02),
+    "search_articles_by_keyword": (0.04, 0.02),
+}
+
+
+class FakeSession:
+    def close(self):
+        pass
+
+
+def install_fake_backends(slow_ratio, slow_seconds, seed=0):
+    rnd = random.Random(seed)
+
+    def make(name, mean, jitter):
+        def fake(*args):
+            delay = max(0.0, rnd.gauss(mean, jitter))
+            if name == "search_wikipedia" and rnd.random() < slow_ratio:
+                delay = slow_seconds  # 가끔 아주 느린 외부 API
+            time.sleep(delay)
+            return [] if name != "search_wikipedia" else {"title": args[-1]}
+        return fake
+
+    for name, (mean, jitter) in LATENCIES.items():
+        setattr(search_agent, name, make(name, mean, jitter))
+
+
+def run_sequential(keyword):
+    db = FakeSession()
+    search_agent.search_wikipedia(keyword)
+    search_agent.search_issues_by_keyword(db, keyword)
+    search_agent.search_hot_topics_by_keyword(db, keyword)
+    search_agent.search_articles_by_keyword(db, keyword)
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+async def drive(keywords, concurrency, handler):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one(keyword):
+        async with semaphore:
+            started = time.perf_counter()
+            await handler(keyword)
+            samples.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one(k) for k in keywords))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--distinct", type=int, default=30, help="서로 다른 검색어 수 (적을수록 캐시 적중↑)")
+    parser.add_argument("--slow-ratio", type=float, default=0.02)
+    parser.add_argument("--slow-seconds", type=float, default=15.0)
+    parser.add_argument("--timeout", type=float, default=3.0)
+    args = parser.parse_args()
+
+    install_fake_backends(args.slow_ratio, args.slow_seconds)
+    rnd = random.Random(1)
+    # 인기 검색어 쏠림(지프 분포 비슷하게)
+    keywords = [f"키워드{int(rnd.paretovariate(1.2)) % args.distinct}" for _ in range(args.requests)]
+
+    # 기존 sync 엔드포인트처럼 요청 하나가 스레드 하나를 끝까지 점유합니다.
+    request_pool = ThreadPoolExecutor(max_workers=args.concurrency)
+
+    async def sequential(keyword):
+        await asyncio.get_running_loop().run_in_executor(request_pool, run_sequential, keyword)
+
+    async def concurrent_nocache(keyword):
+        search_agent._comprehensive_cache.clear()
+        await search_agent.run_comprehensive_search(keyword, FakeSession, timeout=args.timeout)
+
+    async def concurrent_cached(keyword):
+        await search_agent.run_comprehensive_search(keyword, FakeSession, timeout=args.timeout)
+
+    print(f"{'mode':<28}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for label, handler in (
+        ("sequential (기존)", sequential),
+        ("concurrent", concurrent_nocache),
+        ("concurrent + TTL cache", concurrent_cached),
+    ):
+        samples = asyncio.run(drive(keywords, args.concurrency, handler))
+        print(f"{label:<28}{percentile(samples, 0.5):>10.0f}{percentile(samples, 0.99):>10.0f}{statistics.mean(samples):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
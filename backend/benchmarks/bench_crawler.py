@@ -0,0 +1,79 @@
+# benchmarks/bench_crawler.py
+"""
+크롤링 1사이클 소요 시간 비교 벤치마크.
+- 기존 방식: 섹션/기사를 순서대로 requests.get + time.sleep(0.1)
+- 신규 방식: CrawlEngine (공유 세션 + 호스트별 동시성 제한 + 적응형 간격)
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_crawler --latency 0.05 --links 20
+    python -m benchmarks.bench_crawler --pages-dir ./saved_naver_pages
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from bs4 import BeautifulSoup
+
+import scraper
+from crawl_engine import CrawlEngine
+from crawl_state import CrawlState
+from benchmarks.naver_stub import SECTIONS, NaverStubServer, load_saved_pages
+
+
+def run_sequential_baseline(list_url):
+    """변경 전 run_article_crawler와 같은 순차 수집 루프."""
+    results = []
+    seen_urls = set()
+    for sid in SECTIONS:
+        response = scraper.requests.get(list_url.format(sid=sid), headers=scraper.DEFAULT_HEADERS)
+        soup = BeautifulSoup(response.text, "html.parser")
+        atags = soup.select(".list_body a, .sa_text_title")
+        urls = [a.get("href") for a in atags if a.get("href") and "article" in a.get("href")]
+        for url in set(urls):
+            if url in seen_urls:
+                continue
+            data = scraper.get_news_data(url)
+            if data:
+                results.append(data)
+                seen_urls.add(url)
+            time.sleep(0.1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05, help="대역 서버 응답 지연(초)")
+    parser.add_argument("--links", type=int, default=20, help="섹션당 기사 링크 수")
+    parser.add_argument("--pages-dir", default=None, help="저장된 네이버 기사 HTML 폴더")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--per-host", type=int, default=8)
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+
+    saved = load_saved_pages(args.pages_dir)
+    with NaverStubServer(latency=args.latency, links_per_section=args.links, saved_pages=saved) as stub:
+        rows = []
+
+        if not args.skip_baseline:
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                baseline = run_sequential_baseline(stub.list_url)
+            rows.append(("sequential + sleep(0.1)", time.perf_counter() - started, len(baseline)))
+
+        engine = CrawlEngine(max_workers=args.workers, per_host_limit=args.per_host)
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            concurrent = scraper.run_article_crawler([], False, engine=engine, list_url=stub.list_url, state=CrawlState())
+        rows.append((f"CrawlEngine(workers={args.workers}, per_host={args.per_host})", time.perf_counter() - started, len(concurrent)))
+        engine.close()
+
+    print(f"{'mode':<45}{'seconds':>10}{'articles':>10}")
+    for name, elapsed, count in rows:
+        print(f"{name:<45}{elapsed:>10.2f}{count:>10}")
+    if len(rows) == 2 and rows[1][1] > 0:
+        print(f"speed-up: x{rows[0][1] / rows[1][1]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
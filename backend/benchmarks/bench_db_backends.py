@@ -0,0 +1,178 @@
+# benchmarks/bench_db_backends.py
+"""
+DB 백엔드별 처리량 부하 테스트 (SQLite vs PostgreSQL/MySQL).
+
+uvicorn 워커처럼 --workers개 프로세스가 각자 database.create_db_engine으로 엔진(커넥션 풀)을 만들고,
+프로세스마다 --threads개 스레드가 --seconds초 동안 API와 같은 DB 작업을 섞어서 보냅니다.
+- read : /articles 목록 1페이지 또는 다음 페이지(키셋 커서, view=summary) / /users/{login_id} 조회
+- write: /increase_user_interest를 버퍼 없이(INTEREST_FLUSH_MS=0) 처리할 때와 같은 crud.increase_user_interest
+--write-ratios마다 초당 처리량(ops/s), 작업별 p50/p99 지연, 오류 수(database is locked, 풀 대기 시간 초과 등)를 출력합니다.
+SQLite는 쓰기 잠금이 하나라 쓰기 비율이 올라갈수록 워커를 늘려도 처리량이 늘지 않습니다.
+
+--url을 여러 개 주면 차례로 측정합니다. (기본: 임시 SQLite 파일)
+각 DB의 기존 테이블은 지우고 다시 만드므로 벤치마크 전용 DB를 쓰세요.
+DB 서버가 같은 머신에서 돌면 CPU를 나눠 쓰므로 절대값보다 백엔드 간 비교로 보세요.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_db_backends --workers 4 --threads 4 --seconds 10 \\
+        --url sqlite:////tmp/bench_backends.db \\
+        --url "postgresql+psycopg2://user:pw@localhost:5432/bench" \\
+        --url "mysql+pymysql://user:pw@localhost:3306/bench"
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+import crud
+import projections
+from database import create_db_engine
+from migrations import run_migrations, schema_migrations
+from models import Article, Base, User
+from pagination import paginate
+
+CATEGORIES = ["정치", "경제", "사회", "생활/문화", "세계", "IT/과학"]
+KEYWORDS = ["반도체", "금리", "환율", "선거", "인공지능", "배터리", "물가", "태풍", "코스피", "기후"]
+SEED_CHUNK = 2000
+
+
+def prepare(url, articles, users, seed=0):
+    """테이블을 다시 만들고 기사/사용자를 채웁니다."""
+    rnd = random.Random(seed)
+    now = datetime.now()
+    engine = create_db_engine(url)
+    Base.metadata.drop_all(engine)
+    schema_migrations.drop(engine, checkfirst=True)
+    Base.metadata.create_all(engine)
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_migrations(engine)
+    body = "가나다라마바사 " * 40
+    with engine.begin() as conn:
+        for start in range(0, articles, SEED_CHUNK):
+            conn.execute(Article.__table__.insert(), [
+                {
+                    "title": f"기사 {i}", "contents": body, "category": rnd.choice(CATEGORIES),
+                    "url": f"https://n.news.naver.com/article/{i}", "company_name": "테스트일보", "img_urls": [],
+                    "time": now - timedelta(seconds=rnd.randint(0, 30 * 86400)), "author": "홍길동",
+                }
+                for i in range(start, min(articles, start + SEED_CHUNK))
+            ])
+        conn.execute(User.__table__.insert(), [
+            {"login_id": f"user{i}", "password_hash": "x", "subscribed_categories": [], "subscribed_keywords": [],
+             "read_categories": {}, "read_keywords": {}, "view_history": {}}
+            for i in range(users)
+        ])
+    engine.dispose()
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000
+
+
+def worker_process(url, threads, seconds, write_ratio, users, start_at, seed, queue):
+    """워커 프로세스 하나 (uvicorn 워커 하나에 해당). 결과: (읽기 지연 목록, 쓰기 지연 목록, 오류 수)"""
+    engine = create_db_engine(url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    reads, writes, errors = [], [], [0]
+    lock = threading.Lock()
+
+    def run(n):
+        rnd = random.Random(seed * 1000 + n)
+        my_reads, my_writes, my_errors = [], [], 0
+        cursor = None
+        while time.time() < start_at:
+            time.sleep(0.001)
+        deadline = start_at + seconds
+        while time.time() < deadline:
+            db = Session()
+            begin = time.perf_counter()
+            try:
+                if rnd.random() < write_ratio:
+                    crud.increase_user_interest(db, f"user{rnd.randrange(users)}", rnd.choice(CATEGORIES), rnd.sample(KEYWORDS, 3))
+                    my_writes.append(time.perf_counter() - begin)
+                else:
+                    if rnd.random() < 0.8:
+                        query = projections.article_list_query(db, projections.VIEW_SUMMARY)
+                        _, cursor = paginate(query, Article.time, Article.id, cursor=cursor, limit=20)
+                    else:
+                        crud.get_user(db, f"user{rnd.randrange(users)}")
+                    my_reads.append(time.perf_counter() - begin)
+            except Exception:
+                # database is locked, 풀 대기 시간 초과, 교착 상태 등
+                db.rollback()
+                my_errors += 1
+            finally:
+                db.close()
+        with lock:
+            reads.extend(my_reads)
+            writes.extend(my_writes)
+            errors[0] += my_errors
+
+    pool = [threading.Thread(target=run, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    engine.dispose()
+    queue.put((reads, writes, errors[0]))
+
+
+def measure(url, args, write_ratio):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    start_at = time.time() + 3  # 프로세스 시작(import) 시간을 빼고 동시에 출발
+    procs = [
+        ctx.Process(target=worker_process, args=(url, args.threads, args.seconds, write_ratio, args.users, start_at, seed, queue))
+        for seed in range(args.workers)
+    ]
+    for p in procs:
+        p.start()
+    results = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+    reads = [v for r, _, _ in results for v in r]
+    writes = [v for _, w, _ in results for v in w]
+    errors = sum(e for _, _, e in results)
+    return (len(reads) + len(writes)) / args.seconds, reads, writes, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", action="append", help="측정할 DB URL (여러 번 지정 가능, 기본: 임시 SQLite 파일)")
+    parser.add_argument("--workers", type=int, default=4, help="워커 프로세스 수 (uvicorn --workers)")
+    parser.add_argument("--threads", type=int, default=4, help="프로세스당 동시 요청 수")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratios", type=float, nargs="+", default=[0.1, 0.5, 1.0])
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        urls = args.url or [f"sqlite:///{os.path.join(tmp, 'bench.db')}"]
+        print(f"workers={args.workers} threads/worker={args.threads} seconds={args.seconds} articles={args.articles} users={args.users}")
+        print(f"{'backend':<12}{'writes':>8}{'ops/s':>9}{'read p50':>10}{'read p99':>10}{'write p50':>11}{'write p99':>11}{'errors':>8}")
+        for url in urls:
+            prepare(url, args.articles, args.users)
+            backend = url.split(":", 1)[0].split("+", 1)[0]
+            for ratio in args.write_ratios:
+                rate, reads, writes, errors = measure(url, args, ratio)
+                print(
+                    f"{backend:<12}{ratio:>8.0%}{rate:>9.0f}"
+                    f"{_percentile(reads, 0.5):>10.1f}{_percentile(reads, 0.99):>10.1f}"
+                    f"{_percentile(writes, 0.5):>11.1f}{_percentile(writes, 0.99):>11.1f}{errors:>8}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/bench_embedding.py
+"""
+임베딩 처리량(texts/sec)과 최대 메모리(peak RSS) 벤치마크.
+
+설정마다 별도 프로세스에서 실행해 peak RSS가 서로 섞이지 않게 합니다.
+- naive: 변경 전처럼 model.encode(전체 텍스트) 한 번 호출
+- service: EmbeddingService (배치 + 길이순 버킷), 백엔드/배치 크기/워커 수 조합
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_embedding --count 2000
+    python -m benchmarks.bench_embedding --count 2000 --backends torch onnx onnx-int8 --workers 0 2
+"""
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+
+WORDS = ["정부", "국회", "경제", "반도체", "수출", "금리", "물가", "기업", "투자", "시장", "기술", "교육", "의료", "환경", "외교"]
+
+
+def make_texts(count, seed=0):
+    # 실제 입력처럼 "제목 + 본문 앞 200자" 길이가 들쭉날쭉한 텍스트
+    rnd = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        title = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(3, 12)))
+        body = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(5, 80)))
+        texts.append(f"제목: {title} 내용: {body[:200]}")
+    return texts
+
+
+def peak_rss_mb():
+    # 리눅스 ru_maxrss 단위는 KB (자식 프로세스 포함)
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / 1024
+
+
+def run_one(config):
+    texts = make_texts(config["count"])
+    started = time.perf_counter()
+    if config["mode"] == "naive":
+        from embedding_service import load_model
+
+        model = load_model(config["model"], "torch")
+        load_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        model.encode(texts, normalize_embeddings=True)
+    else:
+        from embedding_service import EmbeddingService
+
+        service = EmbeddingService(
+            model_name=config["model"], backend=config["backend"], batch_size=config["batch_size"], workers=config["workers"]
+        )
+        service.warm_up()
+        load_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        service.encode(texts)
+        service.close()
+    elapsed = time.perf_counter() - started
+    return {"load_s": load_seconds, "texts_per_s": len(texts) / elapsed, "peak_rss_mb": peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--model", default="BAAI/bge-m3")
+    parser.add_argument("--backends", nargs="+", default=["torch"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[16, 64])
+    parser.add_argument("--workers", nargs="+", type=int, default=[0])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(json.loads(args.child))))
+        return
+
+    configs = [{"mode": "naive", "backend": "torch", "batch_size": 32, "workers": 0}]
+    for backend in args.backends:
+        for batch_size in args.batch_sizes:
+            for workers in args.workers:
+                configs.append({"mode": "service", "backend": backend, "batch_size": batch_size, "workers": workers})
+
+    print(f"{'mode':<10}{'backend':<12}{'batch':>6}{'workers':>9}{'load s':>9}{'texts/s':>10}{'peak MB':>10}")
+    for config in configs:
+        config.update(count=args.count, model=args.model)
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_embedding", "--child", json.dumps(config)],
+            capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            print(f"{config['mode']:<10}{config['backend']:<12} 실패: {out.stderr.strip().splitlines()[-1:]}")
+            continue
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        print(
+            f"{config['mode']:<10}{config['backend']:<12}{config['batch_size']:>6}{config['workers']:>9}"
+            f"{result['load_s']:>9.1f}{result['texts_per_s']:>10.1f}{result['peak_rss_mb']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
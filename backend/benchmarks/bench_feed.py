@@ -0,0 +1,129 @@
+# benchmarks/bench_feed.py
+"""
+개인화 피드(/users/{login_id}/feed) 지연 벤치마크 (기사 테이블 크기별).
+
+임시 SQLite 파일에 기사 --sizes개를 넣고(제목에 키워드 단어 포함, 그중 --recent개만 최근 --window-hours 이내),
+관심사(구독 카테고리/키워드 + 읽은 키워드 20개)가 있는 사용자의 피드를 구합니다.
+- sql scan    : 색인 없이 DB에서 바로 (카테고리 IN / 제목 LIKE 조건으로 최근 기사 중 상위 N) — 비교용
+- cold        : 첫 조회 (역색인 구축 포함)
+- miss        : 캐시 무효화 후 조회 (순위 다시 계산)
+- hit         : 캐시된 순위로 조회
+최근 기사 수를 고정하고 과거 기사만 늘리므로, miss/hit는 테이블 크기와 관계없이 비슷해야 합니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_feed --sizes 50000 200000 800000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
+from sqlalchemy.orm import sessionmaker
+
+import crud
+from database import create_db_engine  # SQLite WAL 등 연결 설정 포함
+from benchmarks.bench_pagination import fill
+from feed_service import FeedIndex, FeedService
+from migrations import run_migrations
+from models import Article, Base, User
+from projections import article_columns
+
+WORDS = [
+    "반도체", "수출", "금리", "환율", "부동산", "선거", "국회", "북한", "우크라이나", "인공지능",
+    "삼성전자", "현대차", "배터리", "전기차", "물가", "날씨", "태풍", "축구", "야구", "올림픽",
+    "대통령", "검찰", "법원", "교육", "의료", "주식", "코스피", "비트코인", "기후", "에너지",
+]
+
+
+def prepare(path, recent, window_hours, seed=0):
+    """제목을 키워드 문장으로 바꾸고, 마지막 recent개만 최근 window_hours 이내로 (나머지는 그 이전)"""
+    rnd = random.Random(seed)
+    now = datetime.now()
+    window = window_hours * 3600
+    conn = sqlite3.connect(path)
+    ids = [row[0] for row in conn.execute("SELECT id FROM articles")]
+    first_recent = len(ids) - recent
+
+    def published(n):
+        seconds = rnd.uniform(0, window) if n >= first_recent else rnd.uniform(window + 3600, 365 * 86400)
+        return (now - timedelta(seconds=seconds)).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+    conn.executemany(
+        "UPDATE articles SET title = ?, time = ? WHERE id = ?",
+        ((f"{rnd.choice(WORDS)}가 {rnd.choice(WORDS)} 관련 기사 {i}", published(n), i) for n, i in enumerate(ids)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def run(size, args, tmp):
+    path = os.path.join(tmp, f"feed_{size}.db")
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    fill(path, size, 300)
+    prepare(path, min(args.recent, size), args.window_hours)
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    db.add(User(login_id="reader", password_hash="x", subscribed_categories=["경제", "IT/과학"],
+                subscribed_keywords=["반도체", "인공지능", "코스피"]))
+    db.commit()
+    rnd = random.Random(1)
+    for _ in range(200):
+        crud.increase_user_interest(db, "reader", rnd.choice(["정치", "경제", "세계"]), rnd.sample(WORDS, 3))
+    user = db.query(User).filter(User.login_id == "reader").first()
+
+    service = FeedService(FeedIndex(window_hours=args.window_hours, refresh_seconds=3600), top_k=100)
+
+    def sql_scan():
+        cutoff = datetime.now() - timedelta(hours=args.window_hours)
+        keywords = list(user.subscribed_keywords) + list(crud.get_user_interests(db, "reader")[crud.INTEREST_KEYWORD])
+        conditions = [Article.category.in_(user.subscribed_categories)] + [Article.title.like(f"%{k}%") for k in keywords]
+        return db.query(*article_columns()).filter(Article.time >= cutoff, or_(*conditions))\
+            .order_by(Article.time.desc()).limit(args.limit).all()
+
+    def miss():
+        service.invalidate("reader")
+        return service.feed(db, user, limit=args.limit)
+
+    scan_ms = timed(sql_scan, args.repeat)
+    cold_ms = timed(lambda: service.feed(db, user, limit=args.limit), 1)
+    miss_ms = timed(miss, args.repeat)
+    hit_ms = timed(lambda: service.feed(db, user, limit=args.limit), args.repeat)
+    print(f"{size:>10}{len(service.index):>10}{scan_ms:>12.2f}{cold_ms:>10.1f}{miss_ms:>10.2f}{hit_ms:>10.2f}")
+    db.close()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50000, 200000, 800000])
+    parser.add_argument("--window-hours", type=float, default=72)
+    parser.add_argument("--recent", type=int, default=5000, help="최근 기사 수 (피드 후보)")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'articles':>10}{'indexed':>10}{'sql scan ms':>12}{'cold ms':>10}{'miss ms':>10}{'hit ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            run(size, args, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_ingest.py
+"""
+기사 저장 처리량 비교 벤치마크.
+- 기존 방식: 기사마다 crud.create_article (SELECT 2번 + INSERT + commit + refresh)
+- 신규 방식: crud.create_articles_bulk (집합 쿼리 + 여러 행 INSERT + 배치당 commit 1번)
+
+임시 SQLite 파일(WAL 모드)에 합성 기사를 넣어 비교합니다.
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_ingest --count 3000
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from database import create_db_engine  # SQLite WAL 등 연결 설정 포함
+from models import Base
+from crud import create_article, create_articles_bulk
+
+
+def make_news(count, seed=0):
+    rnd = random.Random(seed)
+    now = datetime.now()
+    companies = ["연합뉴스", "KBS", "조선일보", "한겨레", "중앙일보", "경향신문"]
+    news = []
+    for i in range(count):
+        news.append({
+            "title": f"합성 기사 제목 {i} {rnd.randint(0, 10**6)}",
+            "time": (now - timedelta(minutes=rnd.randint(0, 60 * 48))).strftime("%Y-%m-%d %H:%M:%S"),
+            "company_name": rnd.choice(companies),
+            "author": "홍길동",
+            "contents": "본문 " * rnd.randint(100, 400),
+            "img_urls": [f"https://img.example/{i}.jpg"],
+            "url": f"https://n.news.naver.com/article/001/{i:010d}",
+            "category": rnd.choice(["정치", "경제", "사회", "세계"]),
+        })
+    return news
+
+
+def new_session(path):
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(bind=engine)()
+
+
+def bench(label, path, fn, news):
+    engine, db = new_session(path)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(db, news)
+    elapsed = time.perf_counter() - started
+    db.close()
+    engine.dispose()
+    print(f"{label:<40}{elapsed:>10.2f}s{len(news) / elapsed:>12.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=3000)
+    args = parser.parse_args()
+
+    news = make_news(args.count)
+    # 두 번째 사이클: 절반은 이미 저장된 기사, 절반은 신규
+    second = news[: args.count // 2] + make_news(args.count // 2, seed=1)
+    for item in second[args.count // 2:]:
+        item["url"] += "-b"
+
+    def per_row(db, batch):
+        for item in batch:
+            create_article(db, item)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, fn in (("create_article (per row)", per_row), ("create_articles_bulk", create_articles_bulk)):
+            path = os.path.join(tmp, f"{fn.__name__}.db")
+            bench(f"{label} / cold", path, fn, news)
+            bench(f"{label} / 50% dup", path, fn, second)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# benchmarks/bench_interest.py
+"""
+/increase_user_interest 동시 클릭 벤치마크 (JSON 읽고-고쳐-쓰기 vs user_interests 원자적 +1).
+
+임시 SQLite 파일에 사용자 --users명을 만들고, --threads개 스레드가 각자 세션으로 --clicks번씩
+(카테고리 1개 + 키워드 --keywords개) 클릭을 동시에 보냅니다.
+- json (before): 변경 전 crud.increase_user_interest (User 행 로드 -> dict 복사 -> flag_modified -> 전체 JSON 다시 쓰기)
+- atomic       : crud.increase_user_interest (INSERT ... ON CONFLICT DO UPDATE count = count + 1)
+- buffered     : interest_buffer.InterestBuffer.add (--flush-ms마다 합쳐서 한 트랜잭션, 마지막 shutdown flush까지 시간에 포함)
+보낸 클릭으로 계산한 기대 횟수와 DB에 남은 횟수를 비교해 사라진 증가(lost)를 셉니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_interest --threads 8 --clicks 300 --users 1
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import flag_modified
+
+import crud
+from database import create_db_engine  # SQLite WAL 등 연결 설정 포함
+from interest_buffer import InterestBuffer
+from models import Base, User
+
+CATEGORIES = ["정치", "경제", "사회", "생활/문화", "세계", "IT/과학"]
+KEYWORDS = [f"키워드{i}" for i in range(500)]
+
+
+def legacy_increase(db, login_id, category, keywords=None):
+    """변경 전 crud.increase_user_interest"""
+    user = db.query(User).filter(User.login_id == login_id).first()
+    if not user:
+        return None
+    current_cats = user.read_categories or {}
+    current_cats[category] = current_cats.get(category, 0) + 1
+    user.read_categories = dict(current_cats)
+    flag_modified(user, "read_categories")
+    if keywords:
+        current_kwds = user.read_keywords or {}
+        for keyword in keywords:
+            current_kwds[keyword] = current_kwds.get(keyword, 0) + 1
+            user.read_keywords = dict(current_kwds)
+        flag_modified(user, "read_keywords")
+    db.commit()
+    return user
+
+
+def make_clicks(args, seed):
+    rnd = random.Random(seed)
+    return [
+        (f"user{rnd.randrange(args.users)}", rnd.choice(CATEGORIES), rnd.sample(KEYWORDS, args.keywords))
+        for _ in range(args.clicks)
+    ]
+
+
+def expected_counts(clicks):
+    expected = Counter()
+    for login_id, category, keywords in clicks:
+        expected[(login_id, "category", category)] += 1
+        expected.update((login_id, "keyword", keyword) for keyword in keywords)
+    return expected
+
+
+def stored_counts(Session, users, legacy):
+    stored = Counter()
+    db = Session()
+    try:
+        for i in range(users):
+            login_id = f"user{i}"
+            if legacy:
+                user = db.query(User).filter(User.login_id == login_id).first()
+                categories, keywords = user.read_categories or {}, user.read_keywords or {}
+            else:
+                user = crud.get_user(db, login_id)
+                categories, keywords = user.read_categories, user.read_keywords
+            stored.update({(login_id, "category", term): count for term, count in categories.items()})
+            stored.update({(login_id, "keyword", term): count for term, count in keywords.items()})
+    finally:
+        db.close()
+    return stored
+
+
+def run(mode, args, tmp):
+    path = os.path.join(tmp, f"{mode}.db")
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    db.add_all(User(login_id=f"user{i}", password_hash="x", read_categories={}, read_keywords={}) for i in range(args.users))
+    db.commit()
+    db.close()
+
+    buffer = None
+    if mode == "buffered":
+        buffer = InterestBuffer(Session, flush_ms=args.flush_ms, flush_events=args.flush_events)
+        buffer.start()
+        increase = lambda session, *click: buffer.add(*click)  # noqa: E731
+    else:
+        increase = legacy_increase if mode == "json" else crud.increase_user_interest
+    work = [make_clicks(args, seed) for seed in range(args.threads)]
+    done = [[] for _ in range(args.threads)]
+    errors = Counter()
+    barrier = threading.Barrier(args.threads)
+
+    def worker(n):
+        session = Session()
+        barrier.wait()
+        for click in work[n]:
+            login_id, category, keywords = click
+            try:
+                increase(session, login_id, category, keywords)
+                done[n].append(click)
+            except OperationalError:
+                # database is locked 등 (실패한 클릭은 기대값에서 제외)
+                session.rollback()
+                errors[n] += 1
+        session.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if buffer is not None:
+        buffer.shutdown()
+    elapsed = time.perf_counter() - start
+
+    succeeded = [click for clicks in done for click in clicks]
+    expected = expected_counts(succeeded)
+    stored = stored_counts(Session, args.users, legacy=mode == "json")
+    lost = sum((expected - stored).values())
+    engine.dispose()
+    if buffer is not None:
+        metrics = buffer.metrics()
+        print(f"   [buffered] flush {metrics['flushes']}회, 평균 {metrics['avg_flush_ms']}ms / 최대 {metrics['max_flush_ms']}ms")
+    return len(succeeded) / elapsed, len(succeeded), sum(errors.values()), sum(expected.values()), lost
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--clicks", type=int, default=300, help="스레드당 클릭 수")
+    parser.add_argument("--users", type=int, default=1, help="클릭이 나뉘는 사용자 수 (1이면 한 사용자에 몰림)")
+    parser.add_argument("--keywords", type=int, default=3, help="클릭당 키워드 수")
+    parser.add_argument("--flush-ms", type=int, default=200)
+    parser.add_argument("--flush-events", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"threads={args.threads} clicks/thread={args.clicks} users={args.users} keywords/click={args.keywords}")
+    print(f"{'mode':<16}{'clicks/s':>10}{'ok':>8}{'errors':>8}{'increments':>12}{'lost':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("json", "atomic", "buffered"):
+            rate, ok, errors, increments, lost = run(mode, args, tmp)
+            label = "json (before)" if mode == "json" else mode
+            print(f"{label:<16}{rate:>10.0f}{ok:>8}{errors:>8}{increments:>12}{lost:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_issue_matching.py
+"""
+기존 이슈 매칭 단계 벤치마크 (이슈 1,000개 x 신규 기사 10,000건, 1024차원).
+- 기존 방식: 이슈마다 샘플 기사 1건과, 기사 1건씩 sklearn cosine_similarity 비교
+  (전체를 돌리면 수십 분이 걸려 일부 이슈만 돌리고 전체 시간을 추정합니다)
+- 신규 방식: IssueCentroidIndex (정규화 행렬 곱 1번 + argmax)
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_issue_matching --issues 1000 --articles 10000
+"""
+import argparse
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from issue_matcher import IssueCentroidIndex
+
+
+def make_data(n_issues, n_articles, dim, members_per_issue, seed=0):
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_issues, dim)).astype(np.float32)
+    members = topics.repeat(members_per_issue, axis=0) + 0.3 * rng.normal(size=(n_issues * members_per_issue, dim)).astype(np.float32)
+    member_issue = np.arange(n_issues).repeat(members_per_issue)
+    # 신규 기사의 절반은 기존 이슈 주제, 절반은 무관한 기사
+    related = rng.integers(0, n_issues, size=n_articles // 2)
+    articles = np.vstack([
+        topics[related] + 0.3 * rng.normal(size=(len(related), dim)).astype(np.float32),
+        rng.normal(size=(n_articles - len(related), dim)).astype(np.float32),
+    ])
+    return members, member_issue, articles
+
+
+def legacy_match(sample_vecs, articles, threshold=0.85):
+    assigned = [None] * len(articles)
+    for issue_id, sample in enumerate(sample_vecs):
+        issue_vec = sample.reshape(1, -1)
+        for i in range(len(articles)):
+            if assigned[i] is not None:
+                continue
+            if cosine_similarity(articles[i].reshape(1, -1), issue_vec)[0][0] > threshold:
+                assigned[i] = issue_id
+    return assigned
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--issues", type=int, default=1000)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--members", type=int, default=5, help="이슈당 소속 기사 수")
+    parser.add_argument("--legacy-issues", type=int, default=3, help="기존 방식을 실제로 돌려볼 이슈 수")
+    args = parser.parse_args()
+
+    members, member_issue, articles = make_data(args.issues, args.articles, args.dim, args.members)
+
+    started = time.perf_counter()
+    legacy_match(members[::args.members][: args.legacy_issues], articles)
+    per_issue = (time.perf_counter() - started) / args.legacy_issues
+    print(f"기존 방식: 이슈 1개당 {per_issue:.2f}s -> 이슈 {args.issues}개 추정 {per_issue * args.issues:,.0f}s")
+
+    index = IssueCentroidIndex()
+    started = time.perf_counter()
+    index.add_many(member_issue.tolist(), members)
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matched, _ = index.match(articles, threshold=0.85)
+    match = time.perf_counter() - started
+    hits = sum(1 for m in matched if m is not None)
+    print(f"centroid 인덱스: 구축 {build:.2f}s, 매칭 {match:.2f}s (배정 {hits}/{len(articles)}건)")
+
+    started = time.perf_counter()
+    index.add_many(matched[matched != None].tolist(), articles[matched != None])  # noqa: E711
+    print(f"증분 갱신 (배정된 기사 반영): {time.perf_counter() - started:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# benchmarks/bench_keyword_matcher.py
+"""
+구독 키워드 매칭 벤치마크 (사용자별 키워드 순회 vs Aho-Corasick 오토마톤 하나).
+
+--users명(기본 10만)이 --keywords개(기본 50)씩 키워드를 구독하고(어휘 --vocab개, 인기 키워드에 치우친 분포),
+본문 --chars자 정도의 기사 --articles개를 매칭해 사용자별 알림 묶음을 만듭니다.
+- naive        : 사용자마다 키워드를 돌며 `키워드 in 본문` (--naive-users명만 재고 전체 사용자 수로 환산)
+- python / pyahocorasick : keyword_matcher.KeywordMatcher.match_articles (오토마톤 백엔드별)
+- 구독 변경: --changes명이 새 키워드로 바꾼 뒤 오토마톤 준비(delta만 다시 만듦) vs 전체 재구성
+- sync s: 구독이 그대로인 전체 사용자를 다시 적용하는 시간 (notify 단계의 sync 비용)
+표본 사용자에 대해 naive 결과와 매처 결과가 같은지도 확인합니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_keyword_matcher --users 100000 --keywords 50 --articles 200
+"""
+import argparse
+import itertools
+import random
+import time
+from collections import defaultdict
+
+import keyword_matcher
+from keyword_matcher import KeywordMatcher
+
+SYLLABLES = [chr(c) for c in range(0xAC00, 0xD7A4, 37)]  # 한글 음절 일부 (약 300자)
+
+
+class FakeArticle:
+    def __init__(self, article_id, title, contents):
+        self.id, self.title, self.contents = article_id, title, contents
+
+
+def make_vocab(size, rnd):
+    vocab = set()
+    while len(vocab) < size:
+        vocab.add("".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4))))
+    return sorted(vocab)
+
+
+def make_users(users, keywords, vocab, rnd):
+    # 인기 키워드에 치우친 분포 (순위^-0.8)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(vocab))))
+    result = {}
+    for i in range(users):
+        chosen = set()
+        while len(chosen) < keywords:
+            chosen.update(rnd.choices(vocab, cum_weights=cum_weights, k=keywords - len(chosen)))
+        result[f"user{i}"] = list(chosen)
+    return result
+
+
+def make_articles(count, chars, vocab, rnd):
+    articles = []
+    for i in range(count):
+        words = []
+        length = 0
+        while length < chars:
+            word = rnd.choice(vocab) if rnd.random() < 0.05 else "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(1, 3)))
+            words.append(word + rnd.choice(["", "가", "는", "을", "의"]))
+            length += len(words[-1]) + 1
+        articles.append(FakeArticle(i + 1, " ".join(words[:8]), " ".join(words[8:])))
+    return articles
+
+
+def naive_match(subscriptions, articles):
+    batches = defaultdict(list)
+    for article in articles:
+        text = f"{article.title}\n{article.contents}".lower()
+        for login_id, keywords in subscriptions.items():
+            found = [k for k in keywords if k in text]
+            if found:
+                batches[login_id].append((article.id, sorted(found)))
+    return batches
+
+
+def build_matcher(subscriptions):
+    matcher = KeywordMatcher(merge_threshold=1000)
+    start = time.perf_counter()
+    for login_id, keywords in subscriptions.items():
+        matcher.set_user_keywords(login_id, keywords)
+    load = time.perf_counter() - start
+    matcher.rebuild()
+    # 구독이 그대로인 사용자 다시 적용 (notify 단계의 sync와 같은 비용)
+    start = time.perf_counter()
+    for login_id, keywords in subscriptions.items():
+        matcher.set_user_keywords(login_id, keywords)
+    resync = time.perf_counter() - start
+    return matcher, load, resync, matcher.stats["last_rebuild_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--keywords", type=int, default=50)
+    parser.add_argument("--vocab", type=int, default=30000)
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--chars", type=int, default=2000)
+    parser.add_argument("--naive-users", type=int, default=1000)
+    parser.add_argument("--changes", type=int, default=500)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    vocab = make_vocab(args.vocab, rnd)
+    subscriptions = make_users(args.users, args.keywords, vocab, rnd)
+    articles = make_articles(args.articles, args.chars, vocab, rnd)
+    print(f"users={args.users} keywords/user={args.keywords} vocab={args.vocab} articles={args.articles} chars~{args.chars}")
+
+    sample = dict(list(subscriptions.items())[:args.naive_users])
+    start = time.perf_counter()
+    expected = naive_match(sample, articles)
+    naive_rate = args.articles / ((time.perf_counter() - start) * args.users / len(sample))
+    print(f"{'mode':<16}{'load s':>8}{'sync s':>9}{'build ms':>10}{'articles/s':>12}{'user matches':>14}")
+    print(f"{'naive (est.)':<16}{'-':>8}{'-':>9}{'-':>10}{naive_rate:>12.2f}{'-':>14}")
+
+    backends = [("python", None)]
+    if keyword_matcher.ahocorasick is not None:
+        backends.append(("pyahocorasick", keyword_matcher.ahocorasick))
+    matcher = None
+    for name, module in backends:
+        keyword_matcher.ahocorasick = module
+        matcher, load, resync, build_ms = build_matcher(subscriptions)
+        start = time.perf_counter()
+        batches = matcher.match_articles(articles)
+        rate = args.articles / (time.perf_counter() - start)
+        matches = sum(len(items) for items in batches.values())
+        print(f"{name:<16}{load:>8.1f}{resync:>9.1f}{build_ms:>10.0f}{rate:>12.1f}{matches:>14}")
+
+        got = {login_id: batches.get(login_id, []) for login_id in sample}
+        mismatched = sum(1 for login_id in sample if got[login_id] != expected.get(login_id, []))
+        print(f"   [{name}] 표본 사용자 {len(sample)}명 naive 결과와 다른 사용자: {mismatched}명")
+
+    # 구독 변경: changes명이 키워드 하나를 어휘에 없던 새 키워드로 바꿈
+    for i in range(args.changes):
+        login_id = f"user{i}"
+        matcher.set_user_keywords(login_id, subscriptions[login_id][1:] + [f"신규키워드{i}"])
+    start = time.perf_counter()
+    matcher.match_text("")  # 오토마톤 준비만
+    compile_ms = (time.perf_counter() - start) * 1000
+    metrics = matcher.metrics()
+    print(f"[구독 변경] {args.changes}명 변경 후 오토마톤 준비 {compile_ms:.1f}ms "
+          f"(delta 키워드 {metrics['delta_keywords']}개, delta 재구성 {metrics['delta_rebuilds']}회) "
+          f"vs 전체 재구성 {metrics['last_rebuild_ms']:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
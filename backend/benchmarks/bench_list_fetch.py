@@ -0,0 +1,93 @@
+# benchmarks/bench_list_fetch.py
+"""
+섹션 목록 수집량 벤치마크: 조건부 요청 + 변경 감지 + 적응형 페이지 깊이.
+
+대역 서버에서 사이클마다 섹션별 새 기사 --new건을 올리고(중간에 한 번 다운타임 동안 --downtime-new건),
+- baseline: 변경 전처럼 매 사이클 첫 페이지 전체를 받아 파싱 (상태 없음)
+- state: CrawlState 사용 (ETag 304 / 목록 해시 / 이미 본 URL에서 페이지 중단 / 다운타임 후 깊게 따라잡기)
+의 목록 요청 수, 수신 바이트, 파싱 페이지 수, 놓친 기사 수를 비교합니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_list_fetch --cycles 12 --new 3
+    python -m benchmarks.bench_list_fetch --no-etag     # ETag 없는 서버 (해시 비교만)
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import scraper
+from benchmarks.naver_stub import SECTIONS, NaverStubServer
+from crawl_engine import CrawlEngine
+from crawl_state import CrawlState
+
+
+KEYS = ("list_requests", "list_not_modified", "list_unchanged", "list_parsed", "list_bytes")
+
+
+def run(mode, args):
+    """반환값: (평상시 사이클 합계, 다운타임 직후 사이클 합계, 첫 사이클 이후 올라온 기사 중 놓친 수)"""
+    steady = dict.fromkeys(KEYS, 0)
+    catchup = dict.fromkeys(KEYS, 0)
+    state = CrawlState()
+    seen = set()
+    with NaverStubServer(latency=0.0, links_per_section=args.links, etag=not args.no_etag) as stub, \
+            CrawlEngine(max_workers=16, per_host_limit=16, min_delay=0.0) as engine:
+        stub.publish(args.links)
+        start_heads = dict(stub.heads)
+        for cycle in range(args.cycles):
+            downtime = cycle == args.cycles // 2
+            if downtime:
+                stub.publish(args.downtime_new)
+                # 다운타임: 마지막 수집 시각을 CATCHUP_AFTER보다 오래전으로 돌려놓음
+                for sid in SECTIONS:
+                    section = state._sections.get(sid)
+                    if section:
+                        section["last_crawled"] = time.time() - scraper.LIST_CATCHUP_AFTER - 1
+            elif cycle > 0 and cycle % 2 == 0:
+                stub.publish(args.new)  # 홀수 사이클은 새 기사 없음
+            with contextlib.redirect_stdout(io.StringIO()):
+                news = scraper.run_article_crawler(
+                    [], False, engine=engine, list_url=stub.list_url,
+                    state=CrawlState() if mode == "baseline" else state,
+                )
+            seen.update(n["url"] for n in news)
+            target = catchup if downtime else steady
+            for key in KEYS:
+                target[key] += scraper.last_crawl_stats.get(key, 0)
+
+        missed = 0
+        for sid in SECTIONS:
+            for number in range(start_heads[sid] + 1, stub.heads[sid] + 1):
+                missed += f"{stub.base_url}/article/{sid}/{number}" not in seen
+    return steady, catchup, missed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=12)
+    parser.add_argument("--links", type=int, default=20, help="목록 페이지당 기사 수")
+    parser.add_argument("--new", type=int, default=3, help="사이클당 섹션별 새 기사 수")
+    parser.add_argument("--downtime-new", type=int, default=90, help="다운타임 동안 섹션별 새 기사 수")
+    parser.add_argument("--no-etag", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'phase':<9}{'requests':>10}{'304':>6}{'same':>6}{'parsed':>8}{'KB':>10}")
+    results = {}
+    for mode in ("baseline", "state"):
+        steady, catchup, missed = run(mode, args)
+        results[mode] = steady
+        for phase, totals in (("steady", steady), ("catch-up", catchup)):
+            print(
+                f"{mode:<10}{phase:<9}{totals['list_requests']:>10}{totals['list_not_modified']:>6}"
+                f"{totals['list_unchanged']:>6}{totals['list_parsed']:>8}{totals['list_bytes'] / 1024:>10.1f}"
+            )
+        print(f"{mode:<10}놓친 기사 {missed}건")
+    base, new = results["baseline"], results["state"]
+    print(
+        f"평상시 목록 수신 바이트 {100 * (1 - new['list_bytes'] / base['list_bytes']):.0f}% 감소, "
+        f"파싱 페이지 {100 * (1 - new['list_parsed'] / base['list_parsed']):.0f}% 감소"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# benchmarks/bench_online_clustering.py
+"""
+온라인 군집화 vs 배치 재군집화 사이클 비용 벤치마크 (가짜 임베딩/LLM).
+
+매 사이클 새 기사 --batch건을 임시 SQLite DB에 넣고,
+- batch: 변경 전처럼 기간 내 미배정 기사 전체를 읽어 임베딩 조회 + 군집화 (ann 엔진 기준, 하한값)
+- online: OnlineClusterer.ingest (새 기사만 처리)
+의 사이클당 시간을 비교합니다. 중간에 한 번 OnlineClusterer를 새로 만들어 재시작(상태 복원)도 확인합니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_online_clustering --cycles 20 --batch 500
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sklearn.metrics import adjusted_rand_score
+
+from ann_clustering import ann_cluster
+from benchmarks.bench_ann_clustering import make_embeddings
+from issue_matcher import IssueCentroidIndex
+from models import Base, Article, Issue
+from online_clustering import OnlineClusterer
+
+
+class FakeEmbeddings:
+    """EmbeddingCache와 같은 get_matrix / lookup 인터페이스 (기사 id -> 미리 만든 벡터)"""
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    def get_matrix(self, articles):
+        return self.matrix[[a.id - 1 for a in articles]]
+
+    def lookup(self, ids):
+        ids = [str(i) for i in ids]
+        return ids, self.matrix[[int(i) - 1 for i in ids]]
+
+
+def fake_refine(articles):
+    return {"is_issue": "True", "title": articles[0].title}
+
+
+def make_sync(embeddings, issue_index):
+    def sync(db, time_threshold):
+        rows = db.query(Article.id, Article.issue_id).filter(Article.issue_id.isnot(None)).all()
+        if rows:
+            ids, matrix = embeddings.lookup([r[0] for r in rows])
+            issue_index.add_many([r[1] for r in rows], matrix)
+    return sync
+
+
+def make_clusterer(embeddings, state_dir):
+    issue_index = IssueCentroidIndex()
+    return OnlineClusterer(
+        issue_index, embeddings, fake_refine, state_dir,
+        sync_fn=make_sync(embeddings, issue_index), maintain_interval=0,
+        verify_options={"max_concurrency": 8, "timeout": 5, "retries": 0},
+    )
+
+
+def batch_cycle(db, embeddings):
+    articles = db.query(Article).filter(Article.issue_id.is_(None)).all()
+    matrix = embeddings.get_matrix(articles)
+    return ann_cluster(matrix, backend="exact") if len(articles) > 1 else []
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=500, help="사이클당 새 기사 수")
+    args = parser.parse_args()
+
+    total = args.cycles * args.batch
+    matrix, truth = make_embeddings(total)
+    embeddings = FakeEmbeddings(matrix)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        state_dir = os.path.join(tmp, "state")
+        clusterer = make_clusterer(embeddings, state_dir)
+
+        print(f"{'cycle':>6}{'articles':>10}{'batch s':>10}{'online s':>10}{'issues':>8}{'pending':>9}")
+        for cycle in range(args.cycles):
+            db = Session()
+            now = datetime.now()
+            start = cycle * args.batch
+            db.add_all([
+                Article(id=i + 1, title=f"기사 {i}", contents="", url=f"https://example.com/{i}", time=now)
+                for i in range(start, start + args.batch)
+            ])
+            db.commit()
+
+            started = time.perf_counter()
+            batch_cycle(db, embeddings)
+            batch_s = time.perf_counter() - started
+
+            if cycle == args.cycles // 2:
+                clusterer.save_state()
+                clusterer = make_clusterer(embeddings, state_dir)  # 재시작: 파일에서 상태 복원
+
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                clusterer.ingest(db)
+            online_s = time.perf_counter() - started
+            issues = db.query(Issue).count()
+            print(f"{cycle + 1:>6}{start + args.batch:>10}{batch_s:>10.2f}{online_s:>10.2f}{issues:>8}{len(clusterer.members):>9}")
+            db.close()
+
+        db = Session()
+        labels = np.full(total, -1, dtype=np.int64)
+        for article_id, issue_id in db.query(Article.id, Article.issue_id).filter(Article.issue_id.isnot(None)):
+            labels[article_id - 1] = issue_id
+        db.close()
+        print(f"\n이슈 배정 기사 {int((labels >= 0).sum())} / 정답 군집 기사 {int((truth >= 0).sum())}, "
+              f"ARI(정답 대비) {adjusted_rand_score(truth, labels):.3f}")
+
+
+if __name__ == "__main__":
+    main()
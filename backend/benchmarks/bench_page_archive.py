@@ -0,0 +1,98 @@
+# benchmarks/bench_page_archive.py
+"""
+상세 페이지 원본 보관소 벤치마크.
+
+1. 보관: 합성 기사 페이지(일부는 같은 내용이 다른 URL로 다시 나오게)를 여러 스레드에서 넣고
+   초당 보관 페이지 수 / 압축률 / 중복 제거 수를 측정
+2. 재파싱: 임시 DB에 "기자명 추출이 틀린" 기사 행을 만든 뒤 보관소를 다시 파싱해 보정하고
+   워커 수별 소요 시간과 고쳐진 행 수를 확인 (네트워크 요청 없음)
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_page_archive --pages 3000 --workers 1 2 4
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import sessionmaker
+
+from database import create_db_engine  # SQLite WAL 등 연결 설정 포함
+import page_archive
+from crud import create_articles_bulk
+from models import Article, Base
+from news_parser import parse_article
+from page_archive import PageArchive, reparse
+from benchmarks.naver_stub import make_article_html
+
+
+def make_pages(count, duplicate_rate=0.1, seed=0):
+    rnd = random.Random(seed)
+    pages = []
+    for i in range(count):
+        # 같은 기사가 모바일/PC 주소 등 다른 URL로 다시 수집되는 경우를 흉내
+        source = rnd.randrange(i) if i and rnd.random() < duplicate_rate else i
+        pages.append((f"https://n.news.naver.com/mnews/article/001/{i:010d}", make_article_html(source).encode("utf-8")))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=8, help="보관 단계에서 동시에 넣는 크롤러 스레드 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--segment-mb", type=int, default=4)
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages)
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(os.path.join(tmp, "archive"), segment_bytes=args.segment_mb * 1024 * 1024)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(lambda page: archive.put(page[0], page[1], "utf-8"), pages))
+        elapsed = time.perf_counter() - start
+        s = archive.summary()
+        codec = "zstd" if page_archive.zstandard is not None else "zlib"
+        print(
+            f"[보관] {len(pages)}페이지 {elapsed:.2f}초 ({len(pages) / elapsed:.0f} pages/s, {codec}) | "
+            f"고유 {s['blobs']}개 (중복 {archive.stats['deduplicated']}개) | 세그먼트 {s['segments']}개 | "
+            f"원본 {s['raw_bytes'] / 1e6:.1f}MB -> {s['stored_bytes'] / 1e6:.2f}MB (x{s['raw_bytes'] / s['stored_bytes']:.1f})"
+        )
+        sample_url, sample_body = pages[len(pages) // 2]
+        assert archive.get(sample_url) == (sample_body, "utf-8")
+
+        # 예전 추출기로 저장된 것처럼 기자명이 비어 있는 기사 행 준비
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        news_list = []
+        for url, body in pages:
+            data = parse_article(body.decode("utf-8"), url)
+            data.update(author="기자 미상", title=f"{data['title']} {url[-10:]}", category="정치")
+            news_list.append(data)
+        db = Session()
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_articles_bulk(db, news_list)
+        db.close()
+
+        print(f"{'workers':<9}{'seconds':>9}{'pages/s':>10}{'changed':>9}")
+        for workers in args.workers:
+            db = Session()
+            db.query(Article).update({Article.author: "기자 미상"})
+            db.commit()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = reparse(archive, db, workers=workers, fields=("author",))
+            elapsed = time.perf_counter() - start
+            fixed = db.query(Article).filter(Article.author == "홍길동 기자").count()
+            db.close()
+            print(f"{workers:<9}{elapsed:>9.2f}{result['pages'] / elapsed:>10.1f}{result['changed']:>9}   (기자명 보정 {fixed}행)")
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# benchmarks/bench_pagination.py
+"""
+/articles, /issues 목록 페이지네이션 벤치마크 (offset vs 키셋, 인덱스 전/후).
+
+임시 SQLite 파일에 기사 --rows개(기본 50만)와 이슈 --rows/10개를 넣고,
+1페이지와 --page번째 페이지(기본 1000)를 가져오는 시간을 비교합니다.
+- offset / 인덱스 없음: 변경 전 (create_all만 한 DB)
+- offset / 인덱스 있음: migrations.run_migrations 적용 후
+- keyset / 인덱스 있음: pagination.paginate(cursor=...)
+카테고리 필터(/articles?category=...)도 같은 방식으로 측정합니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_pagination --rows 500000 --page 1000
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from database import create_db_engine  # SQLite WAL 등 연결 설정 포함
+from migrations import run_migrations
+from models import Article, Base, Issue
+from pagination import paginate
+
+CATEGORIES = ["정치", "경제", "사회", "생활/문화", "세계", "IT/과학"]
+
+
+def fill(path, rows, contents_chars, seed=0):
+    """sqlite3 executemany로 빠르게 채웁니다. (기사 발행 시각은 최근 1년에 무작위로 분포)"""
+    rnd = random.Random(seed)
+    now = datetime.now()
+    body = ("가나다라마바사 " * (contents_chars // 8 + 1))[:contents_chars]
+    conn = sqlite3.connect(path)
+    n_issues = max(1, rows // 10)
+    conn.executemany(
+        "INSERT INTO issues (id, title, contents, created_at) VALUES (?, ?, ?, ?)",
+        (
+            (i, f"이슈 {i}", body, (now - timedelta(seconds=rnd.randint(0, 365 * 86400))).strftime("%Y-%m-%d %H:%M:%S.%f"))
+            for i in range(1, n_issues + 1)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO articles (id, title, contents, category, url, company_name, img_urls, time, author, issue_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                i, f"기사 {i}", body, rnd.choice(CATEGORIES), f"https://n.news.naver.com/article/{i}", "테스트일보", "[]",
+                (now - timedelta(seconds=rnd.randint(0, 365 * 86400))).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                "홍길동", rnd.randint(1, n_issues) if rnd.random() < 0.3 else None,
+            )
+            for i in range(1, rows + 1)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def measure(Session, label, page, limit, repeat, keyset):
+    targets = [
+        ("articles", lambda db: db.query(Article), Article.time, Article.id),
+        ("articles?category=경제", lambda db: db.query(Article).filter(Article.category == "경제"), Article.time, Article.id),
+        ("issues", lambda db: db.query(Issue), Issue.created_at, Issue.id),
+    ]
+    db = Session()
+    try:
+        for name, make_query, sort_column, id_column in targets:
+            skip = (page - 1) * limit
+            if keyset:
+                # page번째 페이지 직전 행의 커서 (측정 밖에서 한 번 계산)
+                _, cursor = paginate(make_query(db), sort_column, id_column, skip=skip - limit, limit=limit) if skip else (None, None)
+                first = timed(lambda: paginate(make_query(db), sort_column, id_column, limit=limit), repeat)
+                deep = timed(lambda: paginate(make_query(db), sort_column, id_column, cursor=cursor, limit=limit), repeat)
+            else:
+                first = timed(lambda: paginate(make_query(db), sort_column, id_column, skip=0, limit=limit), repeat)
+                deep = timed(lambda: paginate(make_query(db), sort_column, id_column, skip=skip, limit=limit), repeat)
+            print(f"{label:<22}{name:<24}{first:>12.1f}{deep:>16.1f}")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--contents-chars", type=int, default=600, help="기사 본문 길이 (행 크기)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        engine = create_db_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        start = time.perf_counter()
+        fill(path, args.rows, args.contents_chars)
+        print(f"[준비] 기사 {args.rows}건 / 이슈 {max(1, args.rows // 10)}건 ({time.perf_counter() - start:.1f}초, "
+              f"{os.path.getsize(path) / 1e6:.0f}MB)")
+        Session = sessionmaker(bind=engine)
+
+        print(f"{'mode':<22}{'query':<24}{'page 1 ms':>12}{f'page {args.page} ms':>16}")
+        measure(Session, "offset / no index", args.page, args.limit, args.repeat, keyset=False)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_migrations(engine)
+        print(f"[마이그레이션] 인덱스 생성 {time.perf_counter() - start:.1f}초")
+        measure(Session, "offset / indexed", args.page, args.limit, args.repeat, keyset=False)
+        measure(Session, "keyset / indexed", args.page, args.limit, args.repeat, keyset=True)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_parse_workers.py
+"""
+상세 페이지 받기/파싱 분리 벤치마크 (따라잡기 수집 흉내).
+
+- threads: 변경 전처럼 엔진 스레드가 받고 같은 스레드에서 파싱 (GIL에 묶임)
+- processes N: parse_pool.fetch_and_parse (받기는 엔진 스레드, 파싱은 N개 프로세스)
+같은 기사 URL 목록을 받아 걸린 시간/초당 페이지 수를 비교하고, 결과가 threads와 같은지 확인합니다.
+대역 서버는 별도 프로세스에서 돌려 서버 쪽 CPU가 크롤러의 GIL과 섞이지 않게 합니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_parse_workers --pages 2000 --workers 1 2 4 8
+    python -m benchmarks.bench_parse_workers --backend selectolax --latency 0.05
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import time
+
+from crawl_engine import CrawlEngine
+from parse_pool import fetch_and_parse, fetch_page, parse_page
+from benchmarks.naver_stub import NaverStubServer, load_saved_pages
+
+
+def _serve(queue, latency, pages_dir):
+    with NaverStubServer(latency=latency, saved_pages=load_saved_pages(pages_dir)) as stub:
+        queue.put(stub.base_url)
+        while True:
+            time.sleep(3600)
+
+
+def run_threads(urls, engine, backend):
+    return engine.map(lambda url: parse_page(url, *fetch_page(url, engine), backend=backend), urls)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02, help="대역 서버 응답 지연(초)")
+    parser.add_argument("--fetch-threads", type=int, default=16)
+    parser.add_argument("--backend", default="bs4", help="파서 백엔드 (bs4 | lxml | selectolax)")
+    parser.add_argument("--pages-dir", default=None)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    server = context.Process(target=_serve, args=(queue, args.latency, args.pages_dir), daemon=True)
+    server.start()
+    base_url = queue.get(timeout=30)
+    urls = [f"{base_url}/article/100/{n}" for n in range(args.pages)]
+    print(f"[설정] 페이지 {args.pages}개, 백엔드 {args.backend}, 받기 스레드 {args.fetch_threads}, CPU {os.cpu_count()}개")
+
+    def engine():
+        return CrawlEngine(max_workers=args.fetch_threads, per_host_limit=args.fetch_threads, min_delay=0.0)
+
+    try:
+        print(f"{'mode':<16}{'seconds':>9}{'pages/s':>10}{'parsed':>8}{'same':>6}")
+        with engine() as e, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            expected = run_threads(urls, e, args.backend)
+            base = time.perf_counter() - start
+        parsed = sum(1 for r in expected if r)
+        print(f"{'threads':<16}{base:>9.2f}{args.pages / base:>10.1f}{parsed:>8}{'-':>6}")
+
+        for workers in args.workers:
+            with engine() as e, contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                results = fetch_and_parse(urls, e, parse_workers=workers, batch_size=args.batch_size, backend=args.backend)
+                elapsed = time.perf_counter() - start
+            parsed = sum(1 for r in results if r)
+            same = "yes" if results == expected else "NO"
+            print(
+                f"{f'processes {workers}':<16}{elapsed:>9.2f}{args.pages / elapsed:>10.1f}{parsed:>8}{same:>6}"
+                f"   x{base / elapsed:.2f}"
+            )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# benchmarks/bench_parser.py
+"""
+기사 상세 페이지 파서 백엔드 벤치마크 (bs4 vs lxml vs selectolax).
+
+1. 동등성: 모든 페이지에서 각 백엔드 결과 dict가 bs4(기준 구현)와 필드 단위로 같은지 확인
+   (bs4가 예외를 던지는 페이지는 같은 종류의 예외를 던져야 통과)
+2. 속도: 백엔드별 초당 파싱 페이지 수
+
+--pages-dir 로 save_naver_pages.py가 저장한 실제 네이버 기사 HTML 폴더를 넘기면 그 페이지를 쓰고,
+없으면 합성 페이지에 변형(주석, 엔티티, ruby, 캡션, 기자명 누락, 영문 기사 등)을 섞은 말뭉치를 씁니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_parser --pages 500 --rounds 3
+    python -m benchmarks.bench_parser --pages-dir ./naver_pages
+"""
+import argparse
+import random
+import time
+
+import news_parser
+from benchmarks.naver_stub import load_saved_pages, make_article_html
+
+# 합성 페이지에 섞는 변형 (실제 페이지에서 볼 수 있는 구조 차이)
+_MUTATIONS = {
+    "comment": lambda h, r: h.replace("<br>", "<br><!-- ad slot -->", 2),
+    "entities": lambda h, r: h.replace("</span></h2>", " &amp; &lt;속보&gt;&nbsp;</span></h2>").replace(
+        "<br>", " &quot;인용&quot;&nbsp; <br>", 1
+    ),
+    "title_script": lambda h, r: h.replace("</span></h2>", "<script>x()</script> 후속</span></h2>"),
+    "ruby": lambda h, r: h.replace("<br>", "<ruby>漢<rp>(</rp><rt>한</rt><rp>)</rp></ruby>자<br>", 1),
+    "caption": lambda h, r: h.replace(
+        "<br>", '<br><table><tr><td class="article_caption">그래픽 설명</td></tr></table>꼬리 문장', 1
+    ),
+    "nested_em": lambda h, r: h.replace("<br>", "<b>강조 <em>기울임 <em>중첩</em> 끝</em> 뒤</b><br>", 1),
+    "style_in_body": lambda h, r: h.replace("<br>", "<style>.x{}</style>스타일 뒤<br>", 1),
+    "template": lambda h, r: h.replace("<br>", "<template>숨김</template><br>", 1),
+    "no_author_el": lambda h, r: h.replace('<em class="media_end_head_journalist_name">홍길동 기자</em>', ""),
+    "unknown_author": lambda h, r: h.replace(">홍길동 기자</em>", ">기자 미상</em>"),
+    "empty_author": lambda h, r: h.replace(">홍길동 기자</em>", ">  </em>"),
+    "name_only": lambda h, r: h.replace('<em class="media_end_head_journalist_name">홍길동 기자</em>', "").replace(
+        "홍길동 기자 hong", "김철수 기자\n hong"
+    ).replace("@example.co.kr", " 제공"),
+    "no_logo": lambda h, r: h.replace('<a class="media_end_head_top_logo">', '<a class="media_end_head_top">'),
+    "logo_no_title": lambda h, r: h.replace('" title="테스트일보', '" alt="테스트일보'),
+    "no_time_attr": lambda h, r: h.replace("data-date-time=", "data-time="),
+    "empty_time": lambda h, r: h.replace('data-date-time="', 'data-date-time="" data-old="'),
+    "no_title": lambda h, r: h.replace('id="title_area"', 'id="title"'),
+    "no_body": lambda h, r: h.replace('id="newsct_article"', 'id="newsct"'),
+    "english": lambda h, r: h.replace("<br>", "<br>" + "Breaking news in English only. " * 60, 1),
+    "img_variants": lambda h, r: h.replace(
+        "<br>", '<br><img src=""><img data-src="" src="/a.png"><img><img data-src="/lazy.jpg">', 1
+    ),
+    "unclosed": lambda h, r: h.replace("<br>", "<p>닫히지 않은 문단<br>", 2),
+    "whitespace": lambda h, r: h.replace("<br>", "<br>\n\t  \n", 3),
+    "class_spacing": lambda h, r: h.replace(
+        'class="media_end_head_info_datestamp_time _ARTICLE_DATE_TIME"',
+        'class="  _ARTICLE_DATE_TIME\tmedia_end_head_info_datestamp_time extra "',
+    ),
+}
+
+
+def make_corpus(count, mutation_rate=0.5, seed=0):
+    """합성 기사 페이지 count개. 각 페이지에 변형을 0~3개 무작위로 적용합니다."""
+    rnd = random.Random(seed)
+    names = sorted(_MUTATIONS)
+    pages = []
+    for i in range(count):
+        html = make_article_html(i, n_paragraphs=rnd.randint(4, 16))
+        if rnd.random() < mutation_rate:
+            for name in rnd.sample(names, rnd.randint(1, 3)):
+                html = _MUTATIONS[name](html, rnd)
+        pages.append(html)
+    # 변형마다 최소 한 번은 단독으로 검사
+    for i, name in enumerate(names):
+        pages.append(_MUTATIONS[name](make_article_html(count + i), rnd))
+    return pages
+
+
+def _outcome(backend, html, url):
+    try:
+        return news_parser.parse_article(html, url, backend=backend)
+    except Exception as e:
+        return ("error", type(e).__name__)
+
+
+def check_equivalence(pages, backends):
+    """기준(bs4)과 다른 결과 목록: [(backend, 페이지 번호, 필드, bs4 값, 백엔드 값)]"""
+    mismatches = []
+    for i, html in enumerate(pages):
+        url = f"https://n.news.naver.com/article/bench/{i}"
+        expected = _outcome("bs4", html, url)
+        for backend in backends:
+            got = _outcome(backend, html, url)
+            if got == expected:
+                continue
+            if isinstance(expected, dict) and isinstance(got, dict):
+                for field in expected:
+                    if expected[field] != got.get(field):
+                        mismatches.append((backend, i, field, expected[field], got.get(field)))
+            else:
+                mismatches.append((backend, i, "*", expected, got))
+    return mismatches
+
+
+def measure(backend, pages, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for i, html in enumerate(pages):
+            _outcome(backend, html, f"https://n.news.naver.com/article/bench/{i}")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(pages) / best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=500, help="합성 페이지 수")
+    parser.add_argument("--pages-dir", default=None, help="저장된 실제 기사 HTML(*.html) 폴더")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--mutation-rate", type=float, default=0.5)
+    args = parser.parse_args()
+
+    saved = load_saved_pages(args.pages_dir)
+    if saved:
+        # requests의 response.text처럼 문자열로 넘깁니다. (네이버 기사 페이지는 UTF-8)
+        pages = [body.decode("utf-8", errors="replace") for body in saved]
+        print(f"[말뭉치] 저장된 기사 페이지 {len(pages)}개 ({args.pages_dir})")
+    else:
+        pages = make_corpus(args.pages, args.mutation_rate)
+        print(f"[말뭉치] 합성 기사 페이지 {len(pages)}개 (변형 비율 {args.mutation_rate})")
+
+    backends = news_parser.available_backends()
+    others = [b for b in backends if b != "bs4"]
+    missing = [b for b in news_parser.BACKENDS if b not in backends]
+    if missing:
+        print(f"[참고] 설치되지 않은 백엔드: {', '.join(missing)}")
+
+    mismatches = check_equivalence(pages, others)
+    if mismatches:
+        print(f"❌ [동등성] bs4와 다른 결과 {len(mismatches)}건")
+        for backend, i, field, expected, got in mismatches[:20]:
+            print(f"   {backend} 페이지 {i} {field}: bs4={expected!r:.120} / {backend}={got!r:.120}")
+    else:
+        print(f"✅ [동등성] {', '.join(others) or '(비교 대상 없음)'} 결과가 bs4와 모든 필드에서 같습니다.")
+
+    base = None
+    print(f"{'backend':<12}{'pages/s':>10}{'배속':>8}")
+    for backend in backends:
+        rate = measure(backend, pages, args.rounds)
+        base = base or rate
+        print(f"{backend:<12}{rate:>10.1f}{rate / base:>7.1f}x")
+    print(f"(auto 선택: {news_parser.resolve_backend('auto')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/bench_pipeline.py
+"""
+파이프라인 스케줄러 벤치마크 (가짜 단계 처리 함수).
+
+- sequential: 변경 전 워커처럼 수집 -> 분석을 한 스레드에서 순서대로 반복
+- pipeline: 같은 단계들을 큐로 잇고 embed/generate 워커 수를 늘린 PipelineScheduler
+  (같은 큐 DB를 쓰는 스케줄러 --processes개를 띄워 리더 하나만 작업하는지도 확인)
+같은 시간 동안 끝낸 수집 사이클 수, 단계별 처리량/지연을 비교합니다.
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_pipeline --seconds 20 --crawl-interval 2
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import threading
+import time
+
+from pipeline import PipelineScheduler
+from pipeline_queue import JobQueue, LeaderLock
+
+
+def make_handlers(crawl_s, embed_s, cluster_s, generate_s, fail_rate, calls):
+    lock = threading.Lock()
+    rnd = random.Random(0)
+
+    def count(stage):
+        with lock:
+            calls[stage] = calls.get(stage, 0) + 1
+
+    def crawl(payload):
+        time.sleep(crawl_s)
+        count("crawl")
+        # 수집 결과를 embed 작업 3개로 나눠 넘김 (기사 id 구간)
+        return 30, [("embed", {"part": i}, False) for i in range(3)]
+
+    def embed(payload):
+        time.sleep(embed_s)
+        with lock:
+            failed = rnd.random() < fail_rate
+        if failed:
+            raise RuntimeError("fake embedding error")
+        count("embed")
+        return 10, [("cluster", {}, True)]
+
+    def cluster(payload):
+        time.sleep(cluster_s)
+        count("cluster")
+        return 30, [("generate", {}, True)]
+
+    def generate(payload):
+        time.sleep(generate_s)
+        count("generate")
+        return 1, []
+
+    return {"crawl": crawl, "embed": embed, "cluster": cluster, "generate": generate}
+
+
+def run_sequential(handlers, seconds):
+    # 변경 전: 수집 -> (임베딩/군집화/생성) -> 대기 를 한 스레드에서 반복
+    deadline = time.time() + seconds
+    cycles = 0
+    while time.time() < deadline:
+        _, next_jobs = handlers["crawl"]({})
+        for stage, payload, _ in next_jobs:
+            try:
+                handlers[stage](payload)
+            except Exception:
+                pass
+        handlers["cluster"]({})
+        handlers["generate"]({})
+        cycles += 1
+    return cycles
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--crawl-interval", type=float, default=2.0)
+    parser.add_argument("--crawl", type=float, default=1.0, help="수집 단계 시간(초)")
+    parser.add_argument("--embed", type=float, default=1.0, help="embed 작업 하나 시간(초)")
+    parser.add_argument("--cluster", type=float, default=0.5)
+    parser.add_argument("--generate", type=float, default=1.5)
+    parser.add_argument("--fail-rate", type=float, default=0.1)
+    parser.add_argument("--embed-workers", type=int, default=3)
+    parser.add_argument("--processes", type=int, default=2, help="같은 큐 DB를 쓰는 스케줄러 수 (uvicorn 워커 흉내)")
+    args = parser.parse_args()
+
+    seq_calls = {}
+    seq_handlers = make_handlers(args.crawl, args.embed, args.cluster, args.generate, args.fail_rate, seq_calls)
+    cycles = run_sequential(seq_handlers, args.seconds)
+    print(f"[sequential] {args.seconds:.0f}초 동안 수집 {cycles}회, 단계 호출 {seq_calls}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pipeline.db")
+        calls = {}
+        handlers = make_handlers(args.crawl, args.embed, args.cluster, args.generate, args.fail_rate, calls)
+        schedulers = [
+            PipelineScheduler(
+                JobQueue(path), LeaderLock(path, ttl=3.0), handlers=handlers,
+                concurrency={"embed": args.embed_workers, "generate": 2},
+                crawl_interval=args.crawl_interval, poll_interval=0.1, retry_delay=0.5,
+            )
+            for _ in range(args.processes)
+        ]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for scheduler in schedulers:
+                scheduler.start()
+            time.sleep(args.seconds)
+        metrics = schedulers[0].metrics()
+        leaders = [s.lock.owner for s in schedulers if s.is_leader]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for scheduler in schedulers:
+                scheduler.shutdown()
+
+        print(f"[pipeline]   {args.seconds:.0f}초 동안 수집 {calls.get('crawl', 0)}회, 단계 호출 {calls}")
+        print(f"             리더 {len(leaders)}개 (스케줄러 {args.processes}개)")
+        print(f"{'stage':<10}{'queued':>8}{'done':>6}{'failed':>8}{'items/min':>11}{'lag s':>8}{'avg wait':>10}{'avg run':>9}")
+        for stage, s in sorted(metrics["stages"].items()):
+            print(
+                f"{stage:<10}{s['queued']:>8}{s['done']:>6}{s['failed']:>8}{s['per_minute']:>11.1f}"
+                f"{s['lag_seconds']:>8.1f}{s['avg_wait_seconds']:>10.2f}{s['avg_run_seconds']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/bench_projections.py
+"""
+목록 응답 projection 벤치마크 (전체 행 vs 요약 컬럼).
+
+임시 SQLite 파일에 본문이 긴 기사(--contents-chars)를 채우고, 다음을 비교합니다. (조회 + 직렬화, 응답 크기)
+- /articles?limit=N          : 변경 전 (ORM 전체 행 -> response_model 검증 -> json.dumps)
+                               vs view=summary (필요 컬럼만 SELECT -> 바로 JSON 바이트), snippet 포함 버전
+- /issues/{id}               : 변경 전 (joinedload로 관련 기사 본문까지 -> jsonable_encoder)
+                               vs view=summary
+- search_articles_by_keyword : ORM 전체 행 vs 필요한 4개 컬럼
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_projections --rows 20000 --limit 100
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from database import create_db_engine  # SQLite WAL 등 연결 설정 포함
+import projections
+import search_service
+from benchmarks.bench_pagination import fill
+from migrations import run_migrations
+from models import Article, Base, Issue
+from schemas import ArticleResponse
+
+RELATED_COLUMNS = (Article.id, Article.title, Article.url, Article.company_name)
+
+
+def timed(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def old_json(data):
+    # FastAPI JSONResponse.render와 같은 설정
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--issue-articles", type=int, default=200, help="상세 조회할 이슈에 묶을 기사 수")
+    parser.add_argument("--contents-chars", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        engine = create_db_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        fill(path, args.rows, args.contents_chars)
+        search_service.ensure_search_index(engine)
+        run_migrations(engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+        db.query(Article).update({Article.img_urls: [f"https://imgnews.example/{i}.jpg" for i in range(5)]})
+        db.query(Article).filter(Article.id <= args.issue_articles).update({Article.issue_id: 1})
+        # 검색어가 일부 기사(2%)에만 걸리도록
+        db.query(Article).filter(Article.id % 50 == 0).update({Article.title: "반도체 수출 " + Article.title})
+        db.commit()
+
+        article_adapter = TypeAdapter(List[ArticleResponse])
+
+        def articles_full():
+            rows = db.query(Article).order_by(Article.time.desc(), Article.id.desc()).limit(args.limit).all()
+            return old_json(article_adapter.dump_python(article_adapter.validate_python(rows), mode="json"))
+
+        def articles_summary(snippet=0):
+            rows = projections.article_list_query(db, "summary", snippet)\
+                .order_by(Article.time.desc(), Article.id.desc()).limit(args.limit).all()
+            return projections.dump_json("article", "summary", rows)
+
+        def issue_full():
+            issue = db.query(Issue).options(joinedload(Issue.articles)).filter(Issue.id == 1).first()
+            return old_json(jsonable_encoder(issue))
+
+        def issue_summary():
+            issue = db.query(Issue).filter(Issue.id == 1).first()
+            return projections.dump_issue_summary(issue, projections.issue_article_summaries(db, 1))
+
+        def search_full():
+            return [
+                {"id": a.id, "title": a.title, "url": a.url, "company_name": a.company_name}
+                for a in search_service.search_articles(db, "반도체 수출", limit=20)
+            ]
+
+        def search_columns():
+            return [
+                {"id": a.id, "title": a.title, "url": a.url, "company_name": a.company_name}
+                for a in search_service.search_articles(db, "반도체 수출", limit=20, columns=RELATED_COLUMNS)
+            ]
+
+        cases = [
+            (f"/articles?limit={args.limit}", "full (before)", articles_full),
+            (f"/articles?limit={args.limit}", "view=summary", articles_summary),
+            (f"/articles?limit={args.limit}", "summary+snippet=120", lambda: articles_summary(120)),
+            (f"/issues/1 ({args.issue_articles} articles)", "full (before)", issue_full),
+            (f"/issues/1 ({args.issue_articles} articles)", "view=summary", issue_summary),
+            ("search_articles_by_keyword", "ORM rows (before)", search_full),
+            ("search_articles_by_keyword", "4 columns", search_columns),
+        ]
+        print(f"{'endpoint':<30}{'mode':<22}{'ms':>8}{'KB':>10}")
+        for endpoint, mode, fn in cases:
+            db.expire_all()
+            ms, result = timed(fn, args.repeat)
+            size = len(result) / 1024 if isinstance(result, bytes) else len(old_json(result)) / 1024
+            print(f"{endpoint:<30}{mode:<22}{ms:>8.2f}{size:>10.1f}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
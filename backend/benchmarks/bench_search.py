@@ -0,0 +1,101 @@
+# benchmarks/bench_search.py
+"""
+키워드 검색 지연 시간 비교 벤치마크 (ilike 전체 스캔 vs FTS5 trigram 색인).
+
+임시 SQLite 파일에 합성 기사 N건(기본 100,000건)을 넣고,
+/articles/search와 같은 조건(최신순, limit 20)으로 검색 시간을 잽니다.
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_search --count 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, or_
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Article
+import search_service
+
+WORDS = ["정부", "국회", "경제", "반도체", "수출", "금리", "물가", "기업", "투자", "시장", "기술", "교육", "의료",
+         "환경", "외교", "삼성전자", "카카오", "네이버", "현대자동차", "우크라이나", "인공지능", "부동산", "청년", "일자리"]
+KEYWORDS = ["삼성전자", "우크라이나", "인공지능", "현대자동차 수출", "존재하지않는검색어"]
+
+
+def populate(engine, count, seed=0):
+    rnd = random.Random(seed)
+    now = datetime.now()
+    categories = ["정치", "경제", "사회", "세계", "IT/과학", "생활/문화"]
+    rows = []
+    for i in range(count):
+        rows.append((
+            " ".join(rnd.choice(WORDS) for _ in range(6)),
+            " ".join(rnd.choice(WORDS) for _ in range(120)),
+            rnd.choice(categories),
+            f"https://n.news.naver.com/article/001/{i:010d}",
+            "연합뉴스",
+            (now - timedelta(seconds=rnd.randint(0, 86400 * 30))).isoformat(sep=" "),
+            "홍길동",
+        ))
+    raw = engine.raw_connection()
+    raw.executemany(
+        "INSERT INTO articles (title, contents, category, url, company_name, time, author) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    raw.commit()
+    raw.close()
+
+
+def ilike_search(db, keyword, category=None):
+    pattern = f"%{keyword}%"
+    query = db.query(Article).filter(or_(Article.title.ilike(pattern), Article.contents.ilike(pattern)))
+    if category:
+        query = query.filter(Article.category == category)
+    return query.order_by(Article.time.desc()).limit(20).all()
+
+
+def measure(fn, reps):
+    samples = []
+    for _ in range(reps):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--reps", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+
+        started = time.perf_counter()
+        populate(engine, args.count)
+        print(f"합성 기사 {args.count:,}건 생성: {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        search_service.ensure_search_index(engine)
+        print(f"FTS5 색인 생성(rebuild): {time.perf_counter() - started:.1f}s\n")
+
+        db = sessionmaker(bind=engine)()
+        print(f"{'keyword':<20}{'ilike ms':>12}{'fts time ms':>14}{'fts rank ms':>14}{'+category ms':>14}")
+        for keyword in KEYWORDS:
+            base = measure(lambda: ilike_search(db, keyword), args.reps)
+            fts = measure(lambda: search_service.search_articles(db, keyword), args.reps)
+            rank = measure(lambda: search_service.search_articles(db, keyword, order="rank"), args.reps)
+            cat = measure(lambda: search_service.search_articles(db, keyword, category="경제"), args.reps)
+            print(f"{keyword:<20}{base:>12.1f}{fts:>14.1f}{rank:>14.1f}{cat:>14.1f}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
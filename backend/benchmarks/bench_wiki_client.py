@@ -0,0 +1,95 @@
+# benchmarks/bench_wiki_client.py
+"""
+WikipediaClient를 로컬 위키피디아 대역 서버에 붙여 캐시 동작과 지연 시간을 확인합니다.
+- cold: 캐시가 비어 있을 때 (opensearch + summary 2번 요청)
+- warm: 유효기간 내 재조회 (요청 없음)
+- stale: 유효기간이 지난 뒤 재조회 (기존 값 즉시 반환 + 백그라운드 갱신)
+- negative: 없는 문서도 캐시되어 두 번째부터는 요청하지 않음
+
+실행 (backend 폴더에서):
+    python -m benchmarks.bench_wiki_client --latency 0.2
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from wiki_client import WikipediaClient
+
+PAGES = {"삼성전자": "삼성전자는 대한민국의 전자 제품 제조 기업이다.", "인공지능": "인공지능은 인간의 학습 능력을 구현한 기술이다."}
+
+
+class WikiStub:
+    def __init__(self, latency):
+        self.latency = latency
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(stub.latency)
+                stub.requests += 1
+                status, payload = stub.handle(self.path)
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def handle(self, path):
+        parsed = urlparse(path)
+        if parsed.path == "/w/api.php":
+            keyword = parse_qs(parsed.query)["search"][0]
+            matches = [t for t in PAGES if keyword in t]
+            return 200, [keyword, matches[:1], [""], [""]]
+        if parsed.path.startswith("/api/rest_v1/page/summary/"):
+            title = unquote(parsed.path.rsplit("/", 1)[-1])
+            if title not in PAGES:
+                return 404, {"title": "Not found."}
+            return 200, {"title": title, "extract": PAGES[title], "content_urls": {"desktop": {"page": f"{self.base_url}/wiki/{title}"}}}
+        return 404, {}
+
+
+def timed(label, stub, fn):
+    before = stub.requests
+    started = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{label:<28}{elapsed:>10.1f} ms{stub.requests - before:>8} req   -> {result and result.get('title')}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    stub = WikiStub(args.latency)
+    client = WikipediaClient(base_url=stub.base_url, ttl=1.0, negative_ttl=1.0, stale_grace=60)
+
+    timed("cold (삼성)", stub, lambda: client.lookup("삼성"))
+    timed("warm (삼성)", stub, lambda: client.lookup("삼성"))
+    timed("negative cold (없는문서)", stub, lambda: client.lookup("없는문서"))
+    timed("negative warm (없는문서)", stub, lambda: client.lookup("없는문서"))
+    time.sleep(1.1)
+    timed("stale (삼성)", stub, lambda: client.lookup("삼성"))
+    time.sleep(args.latency * 3)
+    timed("after revalidate (삼성)", stub, lambda: client.lookup("삼성"))
+    print(client.metrics())
+    client.close()
+    stub.httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
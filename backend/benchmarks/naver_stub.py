@@ -0,0 +1,150 @@
+# benchmarks/naver_stub.py
+"""
+네이버 뉴스 대역(stand-in) 서버와 합성 기사 페이지 생성기.
+벤치마크 스크립트들이 실제 네이버에 요청하지 않고도 크롤러를 돌려볼 수 있게 합니다.
+
+--pages-dir 로 저장해 둔 실제 네이버 기사 HTML(*.html) 폴더를 넘기면 그 페이지들을 돌려가며 응답하고,
+없으면 네이버 레이아웃을 흉내 낸 합성 페이지를 사용합니다.
+"""
+import glob
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SECTIONS = ["100", "101", "102", "103", "104", "105"]
+
+_WORDS = ["정부", "국회", "경제", "반도체", "수출", "금리", "물가", "기업", "투자", "시장", "기술", "교육", "의료", "환경", "외교"]
+
+
+def make_article_html(seed, n_paragraphs=8):
+    """네이버 상세 페이지 구조(제목/언론사/날짜/본문/이미지)를 흉내 낸 HTML을 만듭니다."""
+    rnd = random.Random(seed)
+    title = " ".join(rnd.choice(_WORDS) for _ in range(6))
+    paragraphs = "<br>".join(
+        " ".join(rnd.choice(_WORDS) for _ in range(40)) + "." for _ in range(n_paragraphs)
+    )
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{title}</title>
+<script>var nv = {{"page": "article", "seed": {seed}}};</script>
+<style>.media_end_head {{ margin: 0; }}</style></head>
+<body>
+<div class="media_end_head">
+  <div class="media_end_head_top"><a class="media_end_head_top_logo"><img src="/logo{seed % 7}.png" title="테스트일보{seed % 7}"></a>
+  <div class="media_end_head_top_channel_layer_text"><strong>{_WORDS[seed % len(_WORDS)]}</strong></div></div>
+  <h2 id="title_area" class="media_end_head_headline"><span>{title}</span></h2>
+  <div class="media_end_head_info_datestamp"><span class="media_end_head_info_datestamp_time _ARTICLE_DATE_TIME" data-date-time="2026-01-0{1 + seed % 9} 1{seed % 10}:00:00">2026.01.0{1 + seed % 9}.</span></div>
+  <div class="media_end_head_journalist"><em class="media_end_head_journalist_name">홍길동 기자</em></div>
+</div>
+<article id="dic_area">
+<div id="newsct_article" class="newsct_article _article_body">
+  <span class="end_photo_org"><img data-src="https://imgnews.example/{seed}.jpg" src="/blank.gif"><em class="img_desc">사진 설명 {seed}</em></span>
+  {paragraphs}
+  <script>trackArticle({seed});</script>
+  홍길동 기자 hong{seed}@example.co.kr
+</div>
+</article>
+<footer>{"<div class='footer_link'>링크</div>" * 50}</footer>
+</body></html>"""
+
+
+def make_list_html(base_url, sid, page=1, n_links=20, top=None):
+    """top을 주면 기사 번호 top부터 내림차순(최신순)으로 page만큼 내려간 목록을 만듭니다."""
+    if top is None:
+        numbers = [page * 1000 + i for i in range(n_links)]
+    else:
+        first = top - (page - 1) * n_links
+        numbers = [n for n in range(first, first - n_links, -1) if n > 0]
+    links = "\n".join(
+        f'<li><a class="sa_text_title" href="{base_url}/article/{sid}/{n}">기사 {n}</a></li>'
+        for n in numbers
+    )
+    # 실제 목록 페이지처럼 머리말/광고/꼬리말이 붙은 크기로 만듭니다.
+    chrome = "<div class='nav_item'>메뉴</div>" * 200
+    return f"<html><body>{chrome}<div class='list_body'><ul>{links}</ul></div>{chrome}</body></html>"
+
+
+def load_saved_pages(pages_dir):
+    if not pages_dir:
+        return []
+    pages = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+        with open(path, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+class NaverStubServer:
+    """
+    ThreadingHTTPServer 기반 로컬 대역 서버.
+    latency 초만큼 응답을 지연시켜 실제 네트워크 대기 시간을 흉내 냅니다.
+    """
+
+    def __init__(self, latency=0.05, links_per_section=20, saved_pages=None, port=0, etag=False):
+        self.latency = latency
+        self.links_per_section = links_per_section
+        self.saved_pages = saved_pages or []
+        self.etag = etag  # True면 목록 페이지에 ETag를 붙이고 If-None-Match에 304로 응답
+        self.heads = {}  # sid -> 가장 최신 기사 번호 (publish()로 증가, 없으면 고정 목록)
+        self.request_count = 0
+        self.bytes_sent = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(stub.latency)
+                status, body, etag = stub.handle(self.path)
+                if etag and self.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+                stub.request_count += 1
+                stub.bytes_sent += len(body)
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.list_url = self.base_url + "/main/list.naver?mode=LSD&mid=sec&sid1={sid}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def publish(self, count, sections=SECTIONS):
+        """섹션마다 새 기사 count건이 목록 맨 위에 올라온 것처럼 만듭니다."""
+        for sid in sections:
+            self.heads[sid] = self.heads.get(sid, 0) + count
+
+    def handle(self, path):
+        """(상태 코드, 본문, ETag 또는 None)"""
+        parsed = urlparse(path)
+        if parsed.path == "/main/list.naver":
+            query = parse_qs(parsed.query)
+            sid = query.get("sid1", ["100"])[0]
+            page = int(query.get("page", ["1"])[0])
+            top = self.heads.get(sid)
+            body = make_list_html(self.base_url, sid, page, self.links_per_section, top).encode("utf-8")
+            return 200, body, (f'"{sid}-{page}-{top}"' if self.etag else None)
+        if parsed.path.startswith("/article/"):
+            seed = int(parsed.path.rsplit("/", 1)[-1])
+            if self.saved_pages:
+                return 200, self.saved_pages[seed % len(self.saved_pages)], None
+            return 200, make_article_html(seed).encode("utf-8"), None
+        return 404, b"not found", None
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,60 @@
+# benchmarks/save_naver_pages.py
+"""
+파서/크롤러 벤치마크용 실제 네이버 기사 HTML 말뭉치 저장 스크립트.
+
+DB(articles)에 이미 수집된 기사 URL을 최신순으로 골라 상세 페이지를 다시 받아
+out 폴더에 00000.html, 00001.html ... 로 원본 바이트 그대로 저장합니다.
+저장한 폴더는 bench_parser / bench_crawler의 --pages-dir 로 넘기면 됩니다.
+(네이버 원문이므로 저장소에는 올리지 않습니다)
+
+실행 (backend 폴더에서):
+    python -m benchmarks.save_naver_pages --out ./naver_pages --limit 300
+"""
+import argparse
+import os
+
+from crawl_engine import CrawlEngine
+from database import SessionLocal
+from models import Article
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", default="./naver_pages")
+    parser.add_argument("--limit", type=int, default=300)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        urls = [row[0] for row in db.query(Article.url).order_by(Article.id.desc()).limit(args.limit)]
+    finally:
+        db.close()
+    if not urls:
+        print("[말뭉치] DB에 저장된 기사 URL이 없습니다. 먼저 크롤러를 한 번 돌려주세요.")
+        return
+
+    os.makedirs(args.out, exist_ok=True)
+
+    def fetch(url):
+        try:
+            response = engine.get(url)
+            return response.content if response.status_code == 200 else None
+        except Exception as e:
+            print(f"[말뭉치] 받기 실패: {url} | 사유: {e}")
+            return None
+
+    with CrawlEngine(max_workers=4, per_host_limit=2) as engine:
+        bodies = engine.map(fetch, urls)
+
+    saved = 0
+    for body in bodies:
+        if not body:
+            continue
+        with open(os.path.join(args.out, f"{saved:05d}.html"), "wb") as f:
+            f.write(body)
+        saved += 1
+    print(f"✅ [말뭉치] 기사 페이지 {saved}/{len(urls)}개 저장 -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# cluster_verifier.py
+"""
+후보 군집 LLM 검증 단계 (동시 실행).
+
+HDBSCAN 등으로 만든 후보 군집을 LLM으로 '같은 사건인지' 검증할 때,
+- asyncio 세마포어로 동시 호출 수 제한
+- 호출별 제한 시간 + 지수 백오프 재시도
+- 중요한 군집(기사 수가 많고 최신인 군집)부터 먼저 요청
+을 적용합니다. DB 저장은 호출한 쪽에서 결과를 받은 뒤 한 트랜잭션으로 처리합니다.
+"""
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+FAILED_RESULT = {"is_issue": "False", "reason": "Error"}
+
+
+def cluster_priority(articles):
+    """정렬 키: 기사 수가 많을수록, 가장 최근 기사가 최신일수록 먼저."""
+    newest = max((a.time.timestamp() for a in articles if getattr(a, "time", None)), default=0.0)
+    return (-len(articles), -newest)
+
+
+async def _verify_one(articles, refine_fn, semaphore, executor, timeout, retries, backoff):
+    loop = asyncio.get_running_loop()
+    async with semaphore:
+        for attempt in range(retries + 1):
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(executor, refine_fn, articles), timeout)
+            except Exception as e:
+                reason = "시간 초과" if isinstance(e, asyncio.TimeoutError) else str(e)
+                if attempt == retries:
+                    print(f"      ⚠️ [LLM Error] 검증 실패 ({attempt + 1}회 시도): {reason}")
+                    return dict(FAILED_RESULT)
+                delay = backoff * (2 ** attempt) * (1 + random.random() * 0.2)
+                print(f"      [LLM Retry] {reason} -> {delay:.1f}s 후 재시도")
+                await asyncio.sleep(delay)
+
+
+async def _verify_all(clusters, refine_fn, max_concurrency, timeout, retries, backoff):
+    semaphore = asyncio.Semaphore(max_concurrency)
+    # 시간 초과로 버려진 호출이 스레드를 잡고 있어도 재시도가 막히지 않도록 여유를 둡니다.
+    executor = ThreadPoolExecutor(max_workers=max_concurrency * (retries + 1), thread_name_prefix="llm-verify")
+    try:
+        # 세마포어는 먼저 기다린 순서대로 풀리므로, 우선순위 순서로 태스크를 만들면 그 순서로 요청됩니다.
+        tasks = [
+            asyncio.create_task(_verify_one(articles, refine_fn, semaphore, executor, timeout, retries, backoff))
+            for articles in clusters
+        ]
+        return await asyncio.gather(*tasks)
+    finally:
+        executor.shutdown(wait=False)
+
+
+def verify_clusters(clusters, refine_fn, max_concurrency=8, timeout=60.0, retries=2, backoff=1.0, priority=cluster_priority):
+    """
+    clusters(기사 리스트들의 리스트)를 우선순위 순으로 정렬해 동시에 검증합니다.
+    refine_fn(articles) -> 결과 dict (실패 시 예외를 던져야 재시도됩니다)
+    반환값: [(articles, 결과 dict), ...] — 우선순위 순서
+    """
+    if not clusters:
+        return []
+    ordered = sorted(clusters, key=priority)
+    started = time.perf_counter()
+    results = asyncio.run(_verify_all(ordered, refine_fn, max_concurrency, timeout, retries, backoff))
+    print(f"      [Verify] 후보 {len(ordered)}개 검증 완료 ({time.perf_counter() - started:.1f}s, 동시 {max_concurrency})")
+    return list(zip(ordered, results))
@@ -1,21 +1,28 @@
 import numpy as np
+import os
 import re
 import chromadb
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sentence_transformers import SentenceTransformer
 import hdbscan
-from sklearn.metrics.pairwise import cosine_similarity
 from ibm_watsonx_ai.foundation_models import ModelInference
 from sklearn.preprocessing import normalize 
 from database import SessionLocal, engine
 from models import Base, Article, Issue
+from llm_cache import llm_cache
+from issue_matcher import IssueCentroidIndex
+from embedding_cache import EmbeddingCache
+from embedding_service import EmbeddingService
+from cluster_verifier import verify_clusters
+from ann_clustering import ann_cluster
+from online_clustering import OnlineClusterer
 
 # -------------------------------------------------
 # 1. 모델 및 벡터 DB 초기화
 # -------------------------------------------------
-print("--- [AI] 모델 및 ChromaDB 로딩 중... ---")
-embed_model = SentenceTransformer("BAAI/bge-m3")
+print("--- [AI] ChromaDB 로딩 중... ---")
+# 임베딩 모델은 처음 인코딩할 때 로드됩니다. (배치/백엔드/워커 수는 EMBED_* 환경변수)
+embedding_service = EmbeddingService.from_env()
 chroma_client = chromadb.PersistentClient(path="./chroma_db")
 collection = chroma_client.get_or_create_collection(name="news_articles")
 
@@ -24,34 +31,65 @@ credentials = {
     "url": "https://us-south.ml.cloud.ibm.com/"
 }
 
+LLM_MODEL_ID = "meta-llama/llama-3-3-70b-instruct"
+
 llm_model = ModelInference(
-    model_id="meta-llama/llama-3-3-70b-instruct",
+    model_id=LLM_MODEL_ID,
     credentials=credentials,
     project_id=""
 )
 
+# 기존 이슈 centroid 인덱스 (워커 사이클 간 유지, 새 이슈/합류 기사는 증분 반영)
+issue_index = IssueCentroidIndex()
+ISSUE_MATCH_THRESHOLD = 0.85
+
+# 후보 군집 LLM 검증 설정 (동시 호출 수, 호출당 제한 시간(초), 재시도 횟수)
+VERIFY_CONCURRENCY = int(os.getenv("CLUSTER_VERIFY_CONCURRENCY", "8"))
+VERIFY_TIMEOUT = float(os.getenv("CLUSTER_VERIFY_TIMEOUT", "60"))
+VERIFY_RETRIES = int(os.getenv("CLUSTER_VERIFY_RETRIES", "2"))
+
+# 신규 군집화 엔진: hdbscan(정확, 기본) | ann(kNN 그래프, 기사 수가 많을 때)
+CLUSTER_ENGINE = os.getenv("CLUSTER_ENGINE", "hdbscan")
+ANN_NEIGHBORS = int(os.getenv("CLUSTER_ANN_NEIGHBORS", "15"))
+ANN_THRESHOLD = float(os.getenv("CLUSTER_ANN_THRESHOLD", "0.92"))  # 유클리드 0.4 = 코사인 0.92
+ANN_REDUCE = os.getenv("CLUSTER_ANN_REDUCE", "none")  # none | pca | random
+ANN_REDUCE_DIM = int(os.getenv("CLUSTER_ANN_REDUCE_DIM", "128"))
+
 # -------------------------------------------------
 # 2. 보조 함수 정의
 # -------------------------------------------------
-def get_embeddings_with_cache(articles):
-    article_ids = [str(a.id) for a in articles]
-    existing_data = collection.get(ids=article_ids, include=['embeddings'])
-    existing_ids = set(existing_data['ids'])
-    
-    needed_articles = [a for a in articles if str(a.id) not in existing_ids]
-    if needed_articles:
-        print(f"      [Cache] 본문 포함 {len(needed_articles)}건 임베딩 생성 중...")
-        texts = [f"제목: {a.title} 내용: {(a.contents or '')[:200]}" for a in needed_articles]
-        new_embeddings = embed_model.encode(texts, normalize_embeddings=True).tolist()
-        collection.add(
-            ids=[str(a.id) for a in needed_articles],
-            embeddings=new_embeddings,
-            metadatas=[{"title": a.title} for a in needed_articles]
+def embedding_text(article):
+    return f"제목: {article.title} 내용: {(article.contents or '')[:200]}"
+
+def cluster_embeddings(norm_embs):
+    """정규화된 임베딩 행렬의 군집 번호 배열을 반환합니다. (-1 = 노이즈)"""
+    if CLUSTER_ENGINE == "ann":
+        return ann_cluster(
+            norm_embs,
+            k=ANN_NEIGHBORS,
+            threshold=ANN_THRESHOLD,
+            min_cluster_size=2,
+            reduce=ANN_REDUCE,
+            reduce_dim=ANN_REDUCE_DIM,
         )
-    
-    final_data = collection.get(ids=article_ids, include=['embeddings'])
-    id_to_embedding = {idx: emb for idx, emb in zip(final_data['ids'], final_data['embeddings'])}
-    return np.array([id_to_embedding[str(a.id)] for a in articles])
+    clusterer = hdbscan.HDBSCAN(
+        min_cluster_size=2,
+        min_samples=1,
+        metric='euclidean',
+        cluster_selection_epsilon=0.4
+    )
+    return clusterer.fit_predict(norm_embs)
+
+# ChromaDB 앞단의 프로세스 내 임베딩 캐시 (워커 사이클 간 유지)
+embedding_cache = EmbeddingCache(
+    collection,
+    encode_fn=embedding_service.encode,
+    text_fn=embedding_text,
+)
+
+def get_embeddings_with_cache(articles):
+    # 메모리에 없는 기사만 ChromaDB 조회, 그래도 없는 기사만 새로 임베딩 (float32 연속 행렬 반환)
+    return embedding_cache.get_matrix(articles)
 
 def simple_kg_check(articles):
     if len(articles) < 2: return True
@@ -70,7 +108,8 @@ def simple_kg_check(articles):
         return False
     return True
 
-def run_stage2_issue_refine(cluster_articles):
+def refine_cluster(cluster_articles):
+    """LLM으로 군집이 같은 사건인지 판정합니다. (호출 실패 시 예외를 그대로 던짐 -> 재시도용)"""
     article_summaries = []
     for a in cluster_articles[:10]:
         clean_content = re.sub(r'\s+', ' ', (a.contents or ''))[:150]
@@ -95,24 +134,68 @@ is_issue: (True/False)
 reason: (판단 이유)
 title: (대표 제목)
 """
+    params = {"max_new_tokens": 400, "temperature": 0.1}
+    # 같은 기사 묶음을 다시 검증할 때는 캐시된 판정을 재사용합니다.
+    response = llm_cache.get_or_generate(
+        LLM_MODEL_ID, params, prompt, lambda: llm_model.generate_text(prompt=prompt, params=params)
+    )
+    res_dict = {}
+    for line in response.strip().split('\n'):
+        if ':' in line:
+            key, val = line.split(':', 1)
+            res_dict[key.strip().lower().replace('*', '')] = val.strip().replace('*', '')
+    
+    is_issue_val = res_dict.get('is_issue', 'FALSE').upper()
+    res_dict['is_issue'] = 'True' if 'TRUE' in is_issue_val else 'False'
+    return res_dict
+
+def run_stage2_issue_refine(cluster_articles):
     try:
-        response = llm_model.generate_text(
-            prompt=prompt,
-            params={"max_new_tokens": 400, "temperature": 0.1}
-        )
-        res_dict = {}
-        for line in response.strip().split('\n'):
-            if ':' in line:
-                key, val = line.split(':', 1)
-                res_dict[key.strip().lower().replace('*', '')] = val.strip().replace('*', '')
-        
-        is_issue_val = res_dict.get('is_issue', 'FALSE').upper()
-        res_dict['is_issue'] = 'True' if 'TRUE' in is_issue_val else 'False'
-        return res_dict
+        return refine_cluster(cluster_articles)
     except Exception as e:
         print(f"      ⚠️ [LLM Error] {e}")
         return {"is_issue": "False", "reason": "Error"}
 
+def sync_issue_index(db: Session, time_threshold: datetime):
+    """
+    centroid 인덱스를 최근 이슈 목록에 맞춥니다.
+    기간이 지난 이슈는 빼고, 인덱스에 없는 이슈만 소속 기사 임베딩을 한 번에 읽어 채웁니다.
+    (이슈마다 샘플 기사 조회 + ChromaDB get을 하던 N+1 조회 제거)
+    """
+    issue_index.drop_older_than(time_threshold)
+    recent = db.query(Issue.id, Issue.created_at).filter(Issue.created_at >= time_threshold).all()
+    missing = {issue_id: created_at for issue_id, created_at in recent if issue_id not in issue_index}
+    if not missing:
+        return
+
+    members = db.query(Article.id, Article.issue_id).filter(Article.issue_id.in_(list(missing))).all()
+    if not members:
+        return
+    article_to_issue = {str(article_id): issue_id for article_id, issue_id in members}
+    found_ids, embeddings = embedding_cache.lookup(list(article_to_issue))
+    if not found_ids:
+        return
+    issue_index.add_many([article_to_issue[i] for i in found_ids], embeddings, missing)
+
+# 온라인 군집화 (CLUSTER_MODE=online일 때 워커가 기사 저장 직후 호출, 상태는 CLUSTER_STATE_DIR에 저장)
+online_clusterer = OnlineClusterer(
+    issue_index,
+    embedding_cache,
+    refine_cluster,
+    state_dir=os.getenv("CLUSTER_STATE_DIR", "./cluster_state"),
+    check_fn=simple_kg_check,
+    sync_fn=sync_issue_index,
+    match_threshold=ISSUE_MATCH_THRESHOLD,
+    join_threshold=ANN_THRESHOLD,
+    min_size=int(os.getenv("CLUSTER_ONLINE_MIN_SIZE", "3")),
+    maintain_interval=int(os.getenv("CLUSTER_ONLINE_MAINTAIN_INTERVAL", "3600")),
+    verify_options={"max_concurrency": VERIFY_CONCURRENCY, "timeout": VERIFY_TIMEOUT, "retries": VERIFY_RETRIES},
+)
+
+def run_online_clustering(db: Session):
+    # 마지막 처리 이후 저장된 기사만 배정/군집화합니다.
+    return online_clusterer.ingest(db)
+
 def save_issue_to_db(db: Session, res: dict, cluster_articles: list):
     new_issue = Issue(
         title=res.get('title', cluster_articles[0].title),
@@ -123,6 +206,16 @@ def save_issue_to_db(db: Session, res: dict, cluster_articles: list):
     for article in cluster_articles:
         article.issue_id = new_issue.id
     print(f"      ✨ 이슈 생성: {new_issue.title} ({len(cluster_articles)}건)")
+    return new_issue
+
+def _commit_with_index(db: Session, index_updates: list):
+    """
+    커밋이 성공한 뒤에만 issue_index에 반영합니다. (index_updates: [(이슈 id 리스트, 임베딩 행렬, 생성 시각 dict 또는 None)])
+    커밋 전에 넣으면 롤백된 이슈 id나 늘어난 기사 수가 인덱스에 남고, sync_issue_index는 없는 이슈만 채우므로 고쳐지지 않습니다.
+    """
+    db.commit()
+    for issue_ids, embeddings, created_at in index_updates:
+        issue_index.add_many(issue_ids, embeddings, created_at)
 
 # -------------------------------------------------
 # 3. 메인 클러스터링 로직
@@ -135,57 +228,57 @@ def run_issue_clustering(db: Session, days: int = 3):
     if len(articles) < 2:
         return
 
-    all_embeddings = np.array(get_embeddings_with_cache(articles)).astype('float32')
-
-    # 1. 기존 이슈 매칭
-    recent_issues = db.query(Issue).filter(Issue.created_at >= time_threshold).all()
-    for issue in recent_issues:
-        sample = db.query(Article).filter(Article.issue_id == issue.id).first()
-        if not sample: continue
-        
-        res = collection.get(ids=[str(sample.id)], include=['embeddings'])
-        
-        # [ValueError 해결] NumPy 배열의 비어있음을 확인하는 더 정확한 방법
-        target_embs = res.get('embeddings')
-        if target_embs is None or len(target_embs) == 0:
-            continue
-        
-        issue_vec = np.array(target_embs[0]).reshape(1, -1)
-        for i, article in enumerate(articles):
-            if article.issue_id is not None: continue
-            sim = cosine_similarity(all_embeddings[i].reshape(1, -1), issue_vec)[0][0]
-            if sim > 0.85:
-                article.issue_id = issue.id
+    all_embeddings = get_embeddings_with_cache(articles)
+
+    # 1. 기존 이슈 매칭 (이슈 centroid 행렬과 한 번에 비교 -> 가장 가까운 이슈에 배정)
+    sync_issue_index(db, time_threshold)
+    matched, _ = issue_index.match(all_embeddings, ISSUE_MATCH_THRESHOLD)
+    joined = [i for i, issue_id in enumerate(matched) if issue_id is not None]
+    for i in joined:
+        articles[i].issue_id = matched[i]
+    index_updates = []
+    if joined:
+        index_updates.append(([matched[i] for i in joined], all_embeddings[joined], None))
+        print(f"      [Match] 기존 이슈에 {len(joined)}건 배정")
 
     # 2. 신규 군집화
     rem_idx = [i for i, a in enumerate(articles) if a.issue_id is None]
     rem_arts = [articles[i] for i in rem_idx]
     if len(rem_arts) < 2:
-        db.commit()
+        _commit_with_index(db, index_updates)
         return
 
     rem_embs = all_embeddings[rem_idx]
     norm_embs = normalize(rem_embs)
 
-    clusterer = hdbscan.HDBSCAN(
-        min_cluster_size=2,
-        min_samples=1,
-        metric='euclidean',
-        cluster_selection_epsilon=0.4
-    )
-    labels = clusterer.fit_predict(norm_embs)
+    labels = cluster_embeddings(norm_embs)
 
-    # 3. 검증 및 저장
+    # 3. 검증 (후보 군집을 우선순위 순으로 동시에 LLM 검증)
+    candidates = []
     for cid in set(labels):
         if cid == -1: continue
         c_articles = [rem_arts[i] for i in np.where(labels == cid)[0]]
         if not simple_kg_check(c_articles): continue
-        
-        res = run_stage2_issue_refine(c_articles)
+        candidates.append(c_articles)
+
+    verified = verify_clusters(
+        candidates,
+        refine_cluster,
+        max_concurrency=VERIFY_CONCURRENCY,
+        timeout=VERIFY_TIMEOUT,
+        retries=VERIFY_RETRIES,
+    )
+
+    # 4. 저장 (우선순위 순서대로, 한 트랜잭션)
+    row_of = {a.id: i for i, a in enumerate(rem_arts)}
+    for c_articles, res in verified:
         if res and res.get('is_issue') == 'True':
-            save_issue_to_db(db, res, c_articles)
+            issue = save_issue_to_db(db, res, c_articles)
+            # 다음 사이클부터 새 이슈에도 바로 매칭되도록 (커밋 후) 인덱스에 추가
+            embeddings = rem_embs[[row_of[a.id] for a in c_articles]]
+            index_updates.append(([issue.id] * len(c_articles), embeddings, {issue.id: issue.created_at}))
 
-    db.commit()
+    _commit_with_index(db, index_updates)
     print("--- [Success] 클러스터링 완료 ---")
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+# crawl_state.py
+"""
+섹션 목록 페이지 수집 상태 (조건부 요청 + 변경 감지).
+
+섹션마다 다음 값을 기억합니다.
+- etag / last_modified: 다음 요청에 If-None-Match / If-Modified-Since로 보내 304(변경 없음)를 받기 위함
+- content_hash / size: 서버가 검증 헤더를 주지 않아도 같은 목록이면 파싱을 건너뛰기 위함
+- known_urls: 최근에 목록에서 본 기사 URL (최신순). 다음 페이지를 계속 받을지 판단
+- last_crawled: 마지막 수집 시각. 오래 쉬었으면(다운타임) 더 깊은 페이지까지 따라잡기
+상태는 JSON 파일로 저장해 재시작 후에도 유지합니다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+# 섹션별로 기억할 최근 기사 URL 수
+MAX_KNOWN_URLS = 1000
+
+
+class CrawlState:
+    def __init__(self, path=None, max_known=MAX_KNOWN_URLS):
+        self.path = path
+        self.max_known = max_known
+        self._lock = threading.Lock()
+        self._sections = {}
+        self._known_sets = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self._sections = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[수집 상태] 상태 파일을 읽지 못해 새로 시작합니다: {e}")
+                self._sections = {}
+
+    def section(self, sid):
+        with self._lock:
+            return dict(self._sections.get(sid, {}))
+
+    def conditional_headers(self, sid):
+        state = self.section(sid)
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    def is_known(self, sid, url):
+        with self._lock:
+            known = self._known_sets.get(sid)
+            if known is None:
+                known = self._known_sets[sid] = set(self._sections.get(sid, {}).get("known_urls", []))
+            return url in known
+
+    def seconds_since_crawl(self, sid):
+        last = self.section(sid).get("last_crawled")
+        return None if last is None else time.time() - last
+
+    def record_page(self, sid, response=None, body=None, touched=True):
+        """첫 페이지 응답의 검증 헤더/해시/크기를 기록합니다. (304이면 response만, 시각만 갱신)"""
+        with self._lock:
+            state = self._sections.setdefault(sid, {})
+            if body is not None:
+                state["content_hash"] = content_hash(body)
+                state["size"] = len(body)
+            if response is not None and response.status_code == 200:
+                state["etag"] = response.headers.get("ETag")
+                state["last_modified"] = response.headers.get("Last-Modified")
+            if touched:
+                state["last_crawled"] = time.time()
+
+    def remember_urls(self, sid, urls):
+        """새로 본 기사 URL을 최신순 목록 앞에 넣습니다."""
+        if not urls:
+            return
+        with self._lock:
+            state = self._sections.setdefault(sid, {})
+            previous = state.get("known_urls", [])
+            seen = set(previous)
+            state["known_urls"] = ([u for u in dict.fromkeys(urls) if u not in seen] + previous)[: self.max_known]
+            self._known_sets[sid] = set(state["known_urls"])
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._sections, ensure_ascii=False)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+
+def content_hash(body):
+    return hashlib.sha1(body).hexdigest()
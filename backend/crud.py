@@ -1,11 +1,62 @@
 # crud.py
+from collections import Counter
 from typing import List
 from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm.attributes import set_committed_value
 from database import SessionLocal
-from models import Article, Issue, User
+from models import Article, Issue, User, UserInterest
 from datetime import datetime, timedelta
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import sqlite, postgresql, mysql
+
+# user_interests.kind 값
+INTEREST_CATEGORY = "category"
+INTEREST_KEYWORD = "keyword"
+# user_interests.term 최대 길이 (MySQL STRICT 모드에서는 더 긴 값을 넣으면 저장 전체가 실패함)
+MAX_INTEREST_TERM_LENGTH = UserInterest.__table__.c.term.type.length
+
+def _parse_published_at(news_data: dict) -> datetime:
+    # 네이버 뉴스 날짜 형식: "2024-05-20 14:00:01"
+    # 크롤러는 "time" 키로, 예전 데이터는 "published_at" 키로 넘겨줍니다.
+    raw = news_data.get("published_at") or news_data.get("time")
+    try:
+        if raw:
+            return datetime.strptime(raw, "%Y-%m-%d %H:%M:%S")
+    except Exception:
+        pass
+    return datetime.now() # 날짜가 없거나 변환 에러나면 현재 시간으로
+
+def _insert_ignore(db: Session, model, conflict_columns: List[str]):
+    """
+    DB 종류에 맞는 'INSERT ... 충돌 시 무시' 문장을 만듭니다.
+    (SQLite/PostgreSQL: ON CONFLICT DO NOTHING, MySQL: INSERT IGNORE, 그 밖의 DB: None)
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing(index_elements=conflict_columns)
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing(index_elements=conflict_columns)
+    if dialect in ("mysql", "mariadb"):
+        return mysql.insert(model).prefix_with("IGNORE")
+    return None
+
+def _insert_ignore_rows(db: Session, model, conflict_columns: List[str], rows: List[dict]) -> int:
+    """
+    rows를 넣되 conflict_columns 값이 이미 있는 행은 건너뜁니다. 반환값: 실제로 넣은 행 수
+    전용 문장이 없는 DB는 행마다 SAVEPOINT 안에서 INSERT 하고 중복(IntegrityError)이면 건너뜁니다. (느리지만 어느 DB에서나 동작)
+    """
+    stmt = _insert_ignore(db, model, conflict_columns)
+    if stmt is not None:
+        return db.execute(stmt.values(rows)).rowcount
+    inserted = 0
+    for row in rows:
+        try:
+            with db.begin_nested():
+                db.execute(model.__table__.insert().values(row))
+            inserted += 1
+        except IntegrityError:
+            pass
+    return inserted
 
 def create_article(db: Session, news_data: dict):
     """
@@ -29,14 +80,7 @@ def create_article(db: Session, news_data: dict):
         return None
 
     # 2. 날짜 변환 (문자열 -> datetime 객체)
-    # 네이버 뉴스 날짜 형식: "2024-05-20 14:00:01"
-    try:
-        if news_data["published_at"]:
-            pub_date = datetime.strptime(news_data["published_at"], "%Y-%m-%d %H:%M:%S")
-        else:
-            pub_date = datetime.now() # 날짜 없으면 현재 시간
-    except Exception:
-        pub_date = datetime.now() # 변환 에러나도 일단 현재 시간으로
+    pub_date = _parse_published_at(news_data)
 
     # 3. 데이터 객체 생성
     new_article = Article(
@@ -63,6 +107,141 @@ def is_url_exists(db: Session, url: str) -> bool:
     # 데이터 전체를 가져오지 않고, 존재하는지만 체크 (속도 최적화)
     return db.query(Article.id).filter(Article.url == url).first() is not None
 
+# SQLite 바인드 변수 개수 제한(구버전 999개)을 넘지 않도록 IN 절을 나눠서 조회합니다.
+IN_CHUNK_SIZE = 500
+
+def get_existing_urls(db: Session, urls: List[str]) -> set:
+    """
+    주어진 URL 중 이미 articles 테이블에 저장된 URL 집합을 반환합니다.
+    URL마다 쿼리를 날리지 않고 IN 절로 한 번에(청크 단위) 확인합니다.
+    """
+    unique_urls = list(dict.fromkeys(u for u in urls if u))
+    existing = set()
+    for i in range(0, len(unique_urls), IN_CHUNK_SIZE):
+        chunk = unique_urls[i:i + IN_CHUNK_SIZE]
+        existing.update(row[0] for row in db.query(Article.url).filter(Article.url.in_(chunk)))
+    return existing
+
+def filter_new_urls(db: Session, urls: List[str]) -> List[str]:
+    """아직 저장되지 않은 URL만 (입력 순서를 유지한 채) 돌려줍니다."""
+    existing = get_existing_urls(db, urls)
+    return [u for u in urls if u not in existing]
+
+# 한 번의 INSERT 문에 넣을 최대 행 수 (행당 컬럼 8개 -> 바인드 변수 800개)
+BULK_INSERT_ROWS = 100
+
+def create_articles_bulk(db: Session, news_list: List[dict]) -> dict:
+    """
+    크롤링한 기사 리스트를 한 번에 저장합니다. (create_article의 일괄 처리 버전)
+    - URL 중복 / 최근 24시간 제목+언론사 중복 검사를 배치 전체에 대해 집합 쿼리로 처리
+    - 여러 행을 한 번에 INSERT ... ON CONFLICT(url) DO NOTHING
+    - 커밋은 배치당 한 번
+    반환값: {"inserted": 저장 수, "skipped_url": URL 중복 수, "skipped_title": 제목 중복 수}
+    """
+    result = {"inserted": 0, "skipped_url": 0, "skipped_title": 0}
+    if not news_list:
+        return result
+
+    time_limit = datetime.now() - timedelta(hours=24)
+
+    # 1. URL 중복 검사 (DB + 배치 내부)
+    existing_urls = get_existing_urls(db, [n["url"] for n in news_list])
+
+    # 2. 제목+언론사 중복 검사 (최근 24시간, DB + 배치 내부)
+    titles = list(dict.fromkeys(n["title"] for n in news_list))
+    recent_pairs = set()
+    for i in range(0, len(titles), IN_CHUNK_SIZE):
+        chunk = titles[i:i + IN_CHUNK_SIZE]
+        rows = db.query(Article.title, Article.company_name).filter(
+            Article.title.in_(chunk),
+            Article.time >= time_limit
+        )
+        recent_pairs.update((title, company) for title, company in rows)
+
+    rows = []
+    for news in news_list:
+        if news["url"] in existing_urls:
+            result["skipped_url"] += 1
+            continue
+        pair = (news["title"], news["company_name"])
+        if pair in recent_pairs:
+            result["skipped_title"] += 1
+            continue
+
+        pub_date = _parse_published_at(news)
+        rows.append({
+            "title": news["title"],
+            "contents": news["contents"],
+            "category": news["category"],
+            "url": news["url"],
+            "company_name": news["company_name"],
+            "img_urls": news["img_urls"],
+            "time": pub_date,
+            "author": news["author"],
+        })
+        existing_urls.add(news["url"])
+        if pub_date >= time_limit:
+            recent_pairs.add(pair)
+
+    # 3. 여러 행 INSERT (검사 이후 다른 프로세스가 먼저 넣은 URL은 ON CONFLICT로 무시)
+    try:
+        for i in range(0, len(rows), BULK_INSERT_ROWS):
+            chunk = rows[i:i + BULK_INSERT_ROWS]
+            inserted = _insert_ignore_rows(db, Article, ["url"], chunk)
+            result["inserted"] += inserted
+            result["skipped_url"] += len(chunk) - inserted
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    print(
+        f"[일괄 저장] 신규 {result['inserted']}건 | URL 중복 {result['skipped_url']}건 | "
+        f"제목 중복 {result['skipped_title']}건"
+    )
+    return result
+
+def update_articles_from_pages(db: Session, news_list: List[dict], fields: List[str], dry_run: bool = False) -> dict:
+    """
+    다시 파싱한 기사 dict로 기존 articles 행의 fields 값을 고칩니다. (page_archive reparse용)
+    값이 실제로 바뀐 행만 UPDATE하며, category/issue_id는 건드리지 않습니다.
+    반환값: {"changed": 바뀐 행 수, "updated": 저장한 행 수, "missing": articles에 없는 기사 dict 리스트}
+    """
+    result = {"changed": 0, "updated": 0, "missing": []}
+    by_url = {n["url"]: n for n in news_list}
+    existing = {}
+    urls = list(by_url)
+    for i in range(0, len(urls), IN_CHUNK_SIZE):
+        for article in db.query(Article).filter(Article.url.in_(urls[i:i + IN_CHUNK_SIZE])):
+            existing[article.url] = article
+
+    for url, news in by_url.items():
+        article = existing.get(url)
+        if article is None:
+            result["missing"].append(news)
+            continue
+        values = {field: _parse_published_at(news) if field == "time" else news[field] for field in fields}
+        # 날짜를 못 읽으면 _parse_published_at이 현재 시각을 주므로, 그 경우 기존 값을 유지합니다.
+        if "time" in values and not news.get("time", "")[:4].isdigit():
+            del values["time"]
+        changes = {k: v for k, v in values.items() if getattr(article, k) != v}
+        if not changes:
+            continue
+        result["changed"] += 1
+        if dry_run:
+            continue
+        for key, value in changes.items():
+            setattr(article, key, value)
+        result["updated"] += 1
+
+    if not dry_run:
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return result
+
 def create_sample_issue():
     # 1. DB 세션 열기
     db = SessionLocal()
@@ -148,39 +327,123 @@ def get_user(db: Session, login_id: str):
     """
     login_id를 기준으로 사용자 정보를 가져옵니다.
     Primary Key로 검색하므로 속도가 매우 빠릅니다.
+    read_categories / read_keywords는 user_interests 테이블의 카운트로 채워집니다. (UserResponse 형태 그대로)
     """
-    return db.query(User).filter(User.login_id == login_id).first()
-
-# 기사를 봤을 때 카운트가 증가하는 함수
-def increase_user_interest(db: Session, login_id: str, category: str, keywords: List[str] = None):
     user = db.query(User).filter(User.login_id == login_id).first()
-    if not user:
+    if user:
+        interests = get_user_interests(db, login_id)
+        # 변경으로 표시하지 않고 값만 채움 (commit 해도 예전 JSON 컬럼은 그대로)
+        set_committed_value(user, "read_categories", interests[INTEREST_CATEGORY])
+        set_committed_value(user, "read_keywords", interests[INTEREST_KEYWORD])
+    return user
+
+def get_user_interests(db: Session, login_id: str) -> dict:
+    """{"category": {카테고리: 횟수}, "keyword": {키워드: 횟수}}"""
+    result = {INTEREST_CATEGORY: {}, INTEREST_KEYWORD: {}}
+    rows = db.query(UserInterest.kind, UserInterest.term, UserInterest.count)\
+        .filter(UserInterest.login_id == login_id)
+    for kind, term, count in rows:
+        if kind in result:
+            result[kind][term] = count
+    return result
+
+_UPSERT_INCREMENT = {}
+
+def _upsert_increment(db: Session):
+    """
+    DB 종류에 맞는 'INSERT ... 충돌 시 count += 새 값' 문장을 만듭니다. (행 값은 실행 시 파라미터로 전달)
+    (SQLite/PostgreSQL: ON CONFLICT DO UPDATE, MySQL: ON DUPLICATE KEY UPDATE, 그 밖의 DB: None)
+    클릭마다 호출되므로 DB 종류별로 한 번만 만들어 두고 재사용합니다. (컴파일 캐시 적중)
+    """
+    dialect = db.get_bind().dialect.name
+    stmt = _UPSERT_INCREMENT.get(dialect)
+    if stmt is not None:
+        return stmt
+    table = UserInterest.__table__
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert(table) if dialect == "sqlite" else postgresql.insert(table)
+        stmt = insert.on_conflict_do_update(
+            index_elements=["login_id", "kind", "term"],
+            set_={"count": table.c.count + insert.excluded["count"]},
+        )
+    elif dialect in ("mysql", "mariadb"):
+        insert = mysql.insert(table)
+        stmt = insert.on_duplicate_key_update(count=table.c.count + insert.inserted["count"])
+    else:
         return None
-    
-    # 1. 카테고리 카운트 증가
-    current_cats = user.read_categories or {} # 기존 값 가져오기
-    # 가져온 값이 딕셔너리가 아니라면(혹시 모를 에러 방지) 딕셔너리로 변환
-    if isinstance(current_cats, list): 
-        current_cats = {c: 1 for c in current_cats}
-        
-    current_count = current_cats.get(category, 0) # 기존 점수 확인
-    current_cats[category] = current_count + 1    # 점수 +1
-    user.read_categories = dict(current_cats) # [중요] 재할당해야 DB가 인식함
-    
-    flag_modified(user, "read_categories")
-
-    # 2. 키워드 카운트 증가 (키워드가 있을 경우에만)
-    if keywords:
-        current_kwds = user.read_keywords or {}
-        if isinstance(current_kwds, list):
-            current_kwds = {k: 1 for k in current_kwds}
-            
-        for keyword in keywords:
-            kwd_count = current_kwds.get(keyword, 0)
-            current_kwds[keyword] = kwd_count + 1
-            user.read_keywords = dict(current_kwds)
-    
-        flag_modified(user, "read_keywords")
+    _UPSERT_INCREMENT[dialect] = stmt
+    return stmt
 
-    db.commit()
-    return user
\ No newline at end of file
+def _increment_rows(db: Session, rows: List[dict]):
+    """
+    UPSERT 문장이 없는 DB용: 행마다 count + 증가량으로 UPDATE 하고, 행이 없으면 SAVEPOINT 안에서 INSERT 합니다.
+    (그사이 다른 요청이 먼저 INSERT 해서 충돌하면 다시 UPDATE)
+    """
+    table = UserInterest.__table__
+    for row in rows:
+        key = (table.c.login_id == row["login_id"]) & (table.c.kind == row["kind"]) & (table.c.term == row["term"])
+        update = table.update().where(key).values(count=table.c.count + row["count"])
+        if db.execute(update).rowcount:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(table.insert().values(row))
+        except IntegrityError:
+            db.execute(update)
+
+def interest_counts(login_id: str, category: str, keywords: List[str] = None) -> Counter:
+    """
+    클릭 한 번 -> {(login_id, kind, term): 증가량} (같은 요청 안의 중복 키워드는 합침)
+    빈 값이나 MAX_INTEREST_TERM_LENGTH보다 긴 카테고리/키워드는 저장할 수 없으므로 뺍니다.
+    """
+    terms = [(INTEREST_CATEGORY, category)] + [(INTEREST_KEYWORD, keyword) for keyword in keywords or []]
+    return Counter(
+        (login_id, kind, term) for kind, term in terms
+        if term and len(term) <= MAX_INTEREST_TERM_LENGTH
+    )
+
+def add_user_interest_counts(db: Session, counts: dict) -> dict:
+    """
+    {(login_id, kind, term): 증가량}을 한 트랜잭션으로 user_interests에 더합니다.
+    users에 없는 login_id의 항목은 버립니다.
+    (PostgreSQL은 한 문장에서 같은 행을 두 번 갱신할 수 없으므로 키는 미리 합쳐서 넘겨야 함)
+    반환값: {"rows": 갱신한 행 수, "unknown_users": 없는 login_id 리스트}
+    """
+    login_ids = list({login_id for login_id, _, _ in counts})
+    known = set()
+    for i in range(0, len(login_ids), IN_CHUNK_SIZE):
+        chunk = login_ids[i:i + IN_CHUNK_SIZE]
+        known.update(row[0] for row in db.query(User.login_id).filter(User.login_id.in_(chunk)))
+
+    rows = [
+        {"login_id": login_id, "kind": kind, "term": term, "count": count}
+        for (login_id, kind, term), count in counts.items()
+        if login_id in known and count
+    ]
+    try:
+        if rows:
+            stmt = _upsert_increment(db)
+            if stmt is not None:
+                db.connection().execute(stmt, rows)
+            else:
+                _increment_rows(db, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"rows": len(rows), "unknown_users": [login_id for login_id in login_ids if login_id not in known]}
+
+# 기사를 봤을 때 카운트가 증가하는 함수
+def increase_user_interest(db: Session, login_id: str, category: str, keywords: List[str] = None):
+    """
+    읽은 카테고리/키워드 횟수를 1씩 올립니다.
+    User 행을 읽어 JSON을 고쳐 쓰지 않고 (login_id, kind, term) 행마다 DB에서 count + 1 하므로
+    같은 사용자의 클릭이 동시에 들어와도 횟수가 사라지지 않습니다.
+    (API는 보통 interest_buffer로 모아서 add_user_interest_counts를 한 번에 호출합니다)
+    반환값: login_id (사용자가 없으면 None)
+    """
+    counts = interest_counts(login_id, category, keywords)
+    if not counts:
+        return login_id if db.query(User.login_id).filter(User.login_id == login_id).first() else None
+    result = add_user_interest_counts(db, counts)
+    return None if result["unknown_users"] else login_id
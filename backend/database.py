@@ -1,23 +1,143 @@
 # database.py
+"""
+DB 엔진/세션 설정 (환경변수).
+
+- DATABASE_URL: 기본은 프로젝트 폴더의 SQLite 파일(sqlite:///./sql.db)
+    MySQL     : mysql+pymysql://user:pw@host:3306/dbname
+    PostgreSQL: postgresql+psycopg2://user:pw@host:5432/dbname  (psycopg2 설치 필요)
+- DATABASE_READ_URL: (선택) 읽기 전용 복제본. 있으면 조회 전용 GET API가 ReadSessionLocal로 여기서 읽습니다.
+  없으면 read_engine/ReadSessionLocal은 기본 엔진과 같습니다.
+- 커넥션 풀: DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT(초), DB_POOL_RECYCLE(초, -1이면 끔), DB_POOL_PRE_PING(1/0)
+  워커 프로세스마다 풀이 따로 생기므로 (uvicorn 워커 수 x (POOL_SIZE + MAX_OVERFLOW))가 DB의 최대 연결 수보다 작아야 합니다.
+- 연결마다 DB 종류별 설정 (configure_engine):
+    SQLite    : WAL 저널, synchronous=NORMAL, busy_timeout(DB_LOCK_TIMEOUT_MS)
+    MySQL     : utf8mb4, sql_mode(DB_MYSQL_SQL_MODE), innodb_lock_wait_timeout, max_execution_time
+    PostgreSQL: application_name(DB_APPLICATION_NAME), lock_timeout, statement_timeout
+  DB_STATEMENT_TIMEOUT_MS는 쿼리 하나의 최대 실행 시간입니다. (0이면 제한 없음, SQLite는 해당 없음)
+"""
+import os
+
 from sqlalchemy import create_engine, event
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 
-# SQLite 데이터베이스 파일 이름 (프로젝트 폴더에 db 파일이 생깁니다)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql.db"
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql.db")
+SQLALCHEMY_READ_DATABASE_URL = os.getenv("DATABASE_READ_URL", "")
 
-# 데이터베이스 엔진 생성
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# MySQL은 wait_timeout(기본 8시간)이 지난 연결을 끊으므로 그 전에 새 연결로 바꿉니다.
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+LOCK_TIMEOUT_MS = int(os.getenv("DB_LOCK_TIMEOUT_MS", "5000"))
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "vaccine-daily-report")
+MYSQL_SQL_MODE = os.getenv("DB_MYSQL_SQL_MODE", "STRICT_TRANS_TABLES,NO_ENGINE_SUBSTITUTION")
 
 
-# WAL 모드 활성화
-@event.listens_for(Engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    cursor = dbapi_connection.cursor()
+def _is_memory_sqlite(url):
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _sqlite_setup(cursor):
     cursor.execute("PRAGMA journal_mode=WAL")  # 읽기/쓰기 동시성 향상
     cursor.execute("PRAGMA synchronous=NORMAL")  # 쓰기 속도 향상 (안전성 약간 타협)
-    cursor.close()
+    cursor.execute(f"PRAGMA busy_timeout={LOCK_TIMEOUT_MS}")  # 쓰기 잠금을 기다리는 시간
+
+
+def _mysql_setup(cursor):
+    cursor.execute("SET SESSION sql_mode = %s", (MYSQL_SQL_MODE,))
+    cursor.execute(f"SET SESSION innodb_lock_wait_timeout = {max(1, LOCK_TIMEOUT_MS // 1000)}")
+    if STATEMENT_TIMEOUT_MS:
+        cursor.execute(f"SET SESSION max_execution_time = {STATEMENT_TIMEOUT_MS}")  # SELECT에만 적용
+
+
+def _postgresql_setup(cursor):
+    cursor.execute(f"SET lock_timeout = {LOCK_TIMEOUT_MS}")
+    cursor.execute(f"SET statement_timeout = {STATEMENT_TIMEOUT_MS}")
+
+
+_SESSION_SETUP = {
+    "sqlite": _sqlite_setup,
+    "mysql": _mysql_setup,
+    "mariadb": _mysql_setup,
+    "postgresql": _postgresql_setup,
+}
+
 
+def configure_engine(engine):
+    """engine의 새 연결마다 DB 종류별 설정(pragma/세션 변수)을 적용합니다. 반환값: engine"""
+    setup = _SESSION_SETUP.get(engine.dialect.name)
+    if setup is None:
+        return engine
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            setup(cursor)
+        finally:
+            cursor.close()
+        # PostgreSQL/MySQL 드라이버는 SET도 트랜잭션 안에서 실행하므로 바로 확정
+        if engine.dialect.name != "sqlite":
+            dbapi_connection.commit()
+
+    return engine
+
+
+def engine_options(url):
+    """URL에 맞는 create_engine 인자 (풀 설정 + 드라이버 연결 인자)"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    options = {"pool_pre_ping": POOL_PRE_PING}
+    connect_args = {}
+    if backend == "sqlite":
+        connect_args["check_same_thread"] = False  # 풀의 연결을 여러 스레드(요청)가 돌려 씀
+        connect_args["timeout"] = LOCK_TIMEOUT_MS / 1000
+    elif backend in ("mysql", "mariadb"):
+        if "charset" not in url.query:
+            connect_args["charset"] = "utf8mb4"  # 한글/이모지
+    elif backend == "postgresql":
+        connect_args["application_name"] = APPLICATION_NAME
+    options["connect_args"] = connect_args
+
+    # 메모리 SQLite는 연결 하나를 같이 쓰는 전용 풀이라 풀 크기 설정이 없습니다.
+    if not _is_memory_sqlite(url):
+        options.update(
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+            pool_recycle=POOL_RECYCLE,
+        )
+    return options
+
+
+def create_db_engine(url, **overrides):
+    """환경변수 풀 설정과 DB 종류별 연결 설정을 적용한 엔진 (overrides는 create_engine 인자를 덮어씀)"""
+    options = engine_options(url)
+    options.update(overrides)
+    return configure_engine(create_engine(url, **options))
+
+
+def pool_status(engine):
+    """커넥션 풀 상태 (메트릭용)"""
+    pool = engine.pool
+    status = {"url": engine.url.render_as_string(hide_password=True), "dialect": engine.dialect.name, "pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        value = getattr(pool, name, None)
+        if callable(value):  # QueuePool만 지원 (SingletonThreadPool의 size는 정수 속성)
+            status[name] = value()
+    return status
+
+
+# 데이터베이스 엔진 생성
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
+# 읽기 전용 복제본 (없으면 기본 엔진)
+read_engine = create_db_engine(SQLALCHEMY_READ_DATABASE_URL) if SQLALCHEMY_READ_DATABASE_URL else engine
 
 # DB 세션(접속창구) 생성기
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 조회 전용 세션 생성기 (복제본이 없으면 SessionLocal과 같은 엔진)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
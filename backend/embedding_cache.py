@@ -0,0 +1,114 @@
+# embedding_cache.py
+"""
+기사 임베딩 캐시 계층.
+
+ChromaDB(영구 저장소) 앞에 프로세스 내 'id -> 행 번호' 인덱스와 연속된 float32 행렬을 둡니다.
+- 메모리에 있는 기사: ChromaDB를 전혀 조회하지 않음
+- 메모리에 없는 기사: 없는 id만 ChromaDB에서 한 번 조회
+- ChromaDB에도 없는 기사: 새로 임베딩해서 저장하고, 계산한 값을 그대로 메모리에 올림 (다시 읽지 않음)
+그래서 워커 사이클이 반복될수록 비용은 '새로 들어온 기사 수'에만 비례합니다.
+"""
+import threading
+
+import numpy as np
+
+# 메모리 인덱스가 이 행 수를 넘고, 최근 요청 크기의 2배보다 커지면 최근 요청분만 남기고 정리합니다.
+COMPACT_MIN_ROWS = 20000
+
+
+class EmbeddingCache:
+    def __init__(self, collection, encode_fn, text_fn, compact_min_rows=COMPACT_MIN_ROWS):
+        """
+        collection: ChromaDB 컬렉션
+        encode_fn(texts) -> (n, dim) 정규화된 임베딩
+        text_fn(article) -> 임베딩할 문자열
+        """
+        self.collection = collection
+        self.encode_fn = encode_fn
+        self.text_fn = text_fn
+        self.compact_min_rows = compact_min_rows
+        self._rows = {}  # 기사 id(str) -> 행 번호
+        self._matrix = None  # (capacity, dim) float32, 앞쪽 len(_rows)행만 사용
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "store_hits": 0, "encoded": 0}
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _append(self, ids, embeddings):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(ids) == 0:
+            return
+        n = len(self._rows)
+        if self._matrix is None:
+            self._matrix = np.zeros((max(1024, len(ids)), embeddings.shape[1]), dtype=np.float32)
+        if n + len(ids) > len(self._matrix):
+            grown = np.zeros((max(len(self._matrix) * 2, n + len(ids)), self._matrix.shape[1]), dtype=np.float32)
+            grown[:n] = self._matrix[:n]
+            self._matrix = grown
+        self._matrix[n:n + len(ids)] = embeddings
+        for offset, article_id in enumerate(ids):
+            self._rows[article_id] = n + offset
+
+    def _load_from_store(self, ids):
+        """ChromaDB에서 ids를 한 번에 읽어 메모리에 올리고, 찾은 id 집합을 반환합니다."""
+        res = self.collection.get(ids=ids, include=['embeddings'])
+        found = list(res['ids'])
+        embeddings = res.get('embeddings')
+        if found and embeddings is not None and len(embeddings) > 0:
+            self._append(found, embeddings)
+            self.stats["store_hits"] += len(found)
+        return set(found)
+
+    def _compact(self, keep_ids):
+        rows = np.fromiter((self._rows[i] for i in keep_ids), dtype=np.int64, count=len(keep_ids))
+        matrix = self._matrix[rows]
+        self._rows = {article_id: row for row, article_id in enumerate(keep_ids)}
+        self._matrix = matrix
+
+    def get_matrix(self, articles):
+        """articles 순서대로 (n, dim) float32 연속 행렬을 반환합니다. (없는 임베딩은 계산해서 저장)"""
+        ids = [str(a.id) for a in articles]
+        with self._lock:
+            missing = [i for i in dict.fromkeys(ids) if i not in self._rows]
+            self.stats["memory_hits"] += len(ids) - len(missing)
+            if missing:
+                found = self._load_from_store(missing)
+                needed_ids = set(i for i in missing if i not in found)
+                if needed_ids:
+                    needed_articles = list({str(a.id): a for a in articles if str(a.id) in needed_ids}.values())
+                    print(f"      [Cache] 본문 포함 {len(needed_articles)}건 임베딩 생성 중...")
+                    new_ids = [str(a.id) for a in needed_articles]
+                    new_embeddings = np.asarray(self.encode_fn([self.text_fn(a) for a in needed_articles]), dtype=np.float32)
+                    self.collection.add(
+                        ids=new_ids,
+                        embeddings=new_embeddings.tolist(),
+                        metadatas=[{"title": a.title} for a in needed_articles]
+                    )
+                    self._append(new_ids, new_embeddings)
+                    self.stats["encoded"] += len(new_ids)
+
+            if not ids:
+                return np.zeros((0, 0 if self._matrix is None else self._matrix.shape[1]), dtype=np.float32)
+            rows = np.fromiter((self._rows[i] for i in ids), dtype=np.int64, count=len(ids))
+            result = self._matrix[rows]
+
+            if len(self._rows) > max(self.compact_min_rows, 2 * len(ids)):
+                self._compact(list(dict.fromkeys(ids)))
+            return result
+
+    def lookup(self, ids):
+        """
+        이미 저장된 임베딩만 찾습니다. (새로 계산하지 않음)
+        반환값: (찾은 id 리스트, (n, dim) float32 행렬)
+        """
+        ids = [str(i) for i in ids]
+        with self._lock:
+            missing = [i for i in dict.fromkeys(ids) if i not in self._rows]
+            if missing:
+                self._load_from_store(missing)
+            found = [i for i in ids if i in self._rows]
+            if not found:
+                return [], np.zeros((0, 0 if self._matrix is None else self._matrix.shape[1]), dtype=np.float32)
+            rows = np.fromiter((self._rows[i] for i in found), dtype=np.int64, count=len(found))
+            return found, self._matrix[rows]
@@ -0,0 +1,160 @@
+# embedding_service.py
+"""
+문장 임베딩 서비스.
+
+- 모델 지연 로딩: import 시점이 아니라 처음 encode()를 부를 때 (또는 warm_up()) 로드
+- 배치 크기 지정 + 길이순 정렬 버킷: 비슷한 길이끼리 묶어 패딩 낭비와 메모리 급증을 줄임
+- 선택적 ONNX / int8 양자화 CPU 추론 (sentence-transformers의 backend="onnx")
+- 선택적 워커 프로세스 풀: 인코딩을 별도 프로세스에서 돌려 API 프로세스가 멈추지 않게 함
+
+환경변수
+    EMBED_MODEL            모델 이름 (기본 BAAI/bge-m3)
+    EMBED_BACKEND          torch | onnx | onnx-int8 (기본 torch)
+    EMBED_ONNX_FILE        onnx-int8에서 쓸 양자화 모델 파일 (기본 onnx/model_qint8_avx512_vnni.onnx)
+    EMBED_BATCH_SIZE       배치 크기 (기본 32)
+    EMBED_MAX_SEQ_LENGTH   최대 토큰 길이 (기본 512)
+    EMBED_WORKERS          워커 프로세스 수 (기본 0 = 현재 프로세스에서 인코딩)
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+DEFAULT_ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def load_model(model_name, backend="torch", max_seq_length=512, onnx_file=DEFAULT_ONNX_INT8_FILE):
+    # sentence-transformers / torch는 무거우므로 실제로 모델이 필요할 때 import 합니다.
+    from sentence_transformers import SentenceTransformer
+
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {backend} (가능: {', '.join(BACKENDS)})")
+
+    print(f"--- [AI] 임베딩 모델 로딩 중... ({model_name}, backend={backend}) ---")
+    if backend == "torch":
+        model = SentenceTransformer(model_name)
+    elif backend == "onnx":
+        model = SentenceTransformer(model_name, backend="onnx")
+    else:
+        model = SentenceTransformer(model_name, backend="onnx", model_kwargs={"file_name": onnx_file})
+    model.max_seq_length = max_seq_length
+    return model
+
+
+def length_sorted_batches(texts, batch_size):
+    """길이가 비슷한 텍스트끼리 묶은 (원래 위치 배열) 배치 목록을 만듭니다."""
+    order = np.argsort([len(t) for t in texts], kind="stable")
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+# --- 워커 프로세스 쪽 ---
+_worker_model = None
+
+
+def _init_worker(config):
+    global _worker_model
+    _worker_model = load_model(**config)
+
+
+def _encode_in_worker(texts, batch_size):
+    return np.asarray(
+        _worker_model.encode(texts, batch_size=batch_size, normalize_embeddings=True, show_progress_bar=False),
+        dtype=np.float32,
+    )
+
+
+class EmbeddingService:
+    def __init__(
+        self,
+        model_name="BAAI/bge-m3",
+        backend="torch",
+        batch_size=32,
+        max_seq_length=512,
+        workers=0,
+        onnx_file=DEFAULT_ONNX_INT8_FILE,
+    ):
+        self.config = {
+            "model_name": model_name,
+            "backend": backend,
+            "max_seq_length": max_seq_length,
+            "onnx_file": onnx_file,
+        }
+        self.batch_size = batch_size
+        self.workers = workers
+        self._model = None
+        self._pool = None
+        self._lock = threading.Lock()
+        self.stats = {"texts": 0, "batches": 0}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            model_name=os.getenv("EMBED_MODEL", "BAAI/bge-m3"),
+            backend=os.getenv("EMBED_BACKEND", "torch"),
+            batch_size=int(os.getenv("EMBED_BATCH_SIZE", "32")),
+            max_seq_length=int(os.getenv("EMBED_MAX_SEQ_LENGTH", "512")),
+            workers=int(os.getenv("EMBED_WORKERS", "0")),
+            onnx_file=os.getenv("EMBED_ONNX_FILE", DEFAULT_ONNX_INT8_FILE),
+        )
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                self._model = load_model(**self.config)
+            return self._model
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # torch는 fork 이후 동작이 불안정할 수 있어 spawn으로 워커를 띄웁니다.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.config,),
+                )
+            return self._pool
+
+    def warm_up(self):
+        """모델(또는 워커 프로세스)을 미리 로드합니다. 서버 시작 직후 한가할 때 호출하면 됩니다."""
+        self.encode(["warm up"])
+
+    def encode(self, texts):
+        """texts를 (n, dim) float32 정규화 임베딩 행렬로 만듭니다. (입력 순서 유지)"""
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        batches = length_sorted_batches(texts, self.batch_size)
+        result = None
+
+        if self.workers > 0:
+            pool = self._get_pool()
+            futures = [pool.submit(_encode_in_worker, [texts[i] for i in idx], self.batch_size) for idx in batches]
+            outputs = (f.result() for f in futures)
+        else:
+            model = self._get_model()
+            outputs = (
+                np.asarray(
+                    model.encode([texts[i] for i in idx], batch_size=self.batch_size, normalize_embeddings=True, show_progress_bar=False),
+                    dtype=np.float32,
+                )
+                for idx in batches
+            )
+
+        for idx, embeddings in zip(batches, outputs):
+            if result is None:
+                result = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+            result[idx] = embeddings
+            self.stats["batches"] += 1
+
+        self.stats["texts"] += len(texts)
+        return result
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -0,0 +1,400 @@
+# feed_service.py
+"""
+사용자별 개인화 피드 (/users/{login_id}/feed).
+
+구독(subscribed_*) + 읽은 횟수(user_interests)로 사용자 관심사 가중치를 만들고,
+최근 기사(window_hours 이내)에 점수를 매겨 상위 기사와 이슈를 돌려줍니다.
+
+- FeedIndex: 최근 기사의 카테고리 -> 기사 id, 제목 토큰 -> 기사 id 역색인 (메모리)
+  새로 저장된 기사(id > 마지막으로 본 id)만 refresh_seconds마다 읽어 붙이고, 기간이 지난 기사는 빼므로
+  articles 테이블이 커져도 색인 크기/조회 비용은 최근 기사 수에만 비례합니다.
+  (파이프라인 리더 프로세스가 저장한 기사도 API 워커마다 이 방식으로 따라잡습니다)
+- 사용자별 상위 top_k 결과 캐시 (TTL). 읽은 횟수가 저장되거나(interest_buffer flush)
+  구독 정보를 고치면 invalidate()로 지웁니다. 색인에 새 기사가 붙어도 그 사용자의 관심사에 걸리는
+  기사가 있을 때만 다시 계산하고, 기간이 지나 색인에서 빠진 기사는 캐시를 읽을 때 걸러냅니다.
+
+점수 = (카테고리 가중치 + 제목에 들어간 키워드 가중치 합) x 0.5 ^ (경과 시간 / half_life_hours)
+- 구독한 카테고리/키워드: subscribed_weight
+- 읽은 카테고리/키워드: 횟수 / 가장 많이 읽은 횟수 (0~1), 키워드는 상위 profile_keywords개만
+관심사가 하나도 없는 사용자는 최신순(감쇠만)으로 채웁니다.
+"""
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from cachetools import TTLCache
+from sqlalchemy.orm import Session
+
+import crud
+from models import Article, Issue
+from projections import article_columns, issue_columns
+
+# 한글은 조사가 붙으므로("삼성전자가") 앞부분 일치, 영문/숫자는 전체 일치로 찾습니다.
+_TOKEN_RE = re.compile(r"[가-힣]+|[0-9a-z]+")
+_HANGUL_RE = re.compile(r"[가-힣]")
+MIN_TOKEN_LENGTH = 2
+
+# 한 번에 읽어 올 신규 기사 수
+REFRESH_BATCH = 5000
+
+
+def tokenize(text):
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if len(t) >= MIN_TOKEN_LENGTH]
+
+
+class FeedIndex:
+    def __init__(self, window_hours=72, refresh_seconds=10):
+        self.window = timedelta(hours=window_hours)
+        self.refresh_seconds = refresh_seconds
+        self.version = 0  # 기사가 붙을 때마다 +1 (캐시를 만든 뒤 새로 붙은 기사를 찾는 용도)
+
+        self._times = {}  # 기사 id -> 발행 시각
+        self._titles = {}  # 기사 id -> 제목 토큰 (삭제용)
+        self._categories = {}  # 기사 id -> 카테고리
+        self._by_category = defaultdict(set)
+        self._by_token = defaultdict(set)
+        self._tokens = []  # 앞부분 일치 검색용 정렬된 토큰 목록
+        self._expiry = []  # (발행 시각, 기사 id) 힙
+        self._added = []  # 붙은 순서대로의 기사 id (version - _added_offset 위치부터가 그 뒤에 붙은 기사)
+        self._added_offset = 0
+        self._max_id = 0
+        self._last_refresh = 0.0
+        self.lock = threading.RLock()  # 갱신 중 조회(rank)가 색인을 읽지 않도록
+
+    def __len__(self):
+        return len(self._times)
+
+    def add(self, article_id, title, category, published_at):
+        with self.lock:
+            if article_id in self._times or published_at is None:
+                return
+            tokens = set(tokenize(title))
+            self._times[article_id] = published_at
+            self._titles[article_id] = tokens
+            self._categories[article_id] = category
+            if category:
+                self._by_category[category].add(article_id)
+            for token in tokens:
+                ids = self._by_token[token]
+                if not ids:
+                    insort(self._tokens, token)
+                ids.add(article_id)
+            heapq.heappush(self._expiry, (published_at, article_id))
+            self._max_id = max(self._max_id, article_id)
+            self._added.append(article_id)
+            self.version += 1
+
+    def _remove(self, article_id):
+        self._times.pop(article_id, None)
+        category = self._categories.pop(article_id, None)
+        if category in self._by_category:
+            self._by_category[category].discard(article_id)
+            if not self._by_category[category]:
+                del self._by_category[category]
+        for token in self._titles.pop(article_id, ()):
+            ids = self._by_token.get(token)
+            if ids is None:
+                continue
+            ids.discard(article_id)
+            if not ids:
+                del self._by_token[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def evict(self, now=None):
+        """window보다 오래된 기사를 뺍니다. 반환값: 뺀 기사 수"""
+        cutoff = (now or datetime.now()) - self.window
+        removed = 0
+        with self.lock:
+            while self._expiry and self._expiry[0][0] < cutoff:
+                _, article_id = heapq.heappop(self._expiry)
+                self._remove(article_id)
+                removed += 1
+        return removed
+
+    def refresh(self, db: Session, force=False):
+        """마지막으로 본 id 이후 저장된 최근 기사를 색인에 붙입니다. (refresh_seconds 간격)"""
+        with self.lock:
+            if not force and time.monotonic() - self._last_refresh < self.refresh_seconds:
+                return 0
+            self._last_refresh = time.monotonic()
+            cutoff = datetime.now() - self.window
+            added = 0
+            if not self._max_id:
+                # 처음: 최근 기사 전체를 (time, id) 인덱스 범위로 한 번에
+                rows = db.query(Article.id, Article.title, Article.category, Article.time)\
+                    .filter(Article.time >= cutoff)\
+                    .all()
+                for article_id, title, category, published_at in rows:
+                    self.add(article_id, title, category, published_at)
+                added += len(rows)
+            while self._max_id:
+                # 이후: 마지막으로 본 id 다음부터 (PK 범위)
+                rows = db.query(Article.id, Article.title, Article.category, Article.time)\
+                    .filter(Article.id > self._max_id, Article.time >= cutoff)\
+                    .order_by(Article.id)\
+                    .limit(REFRESH_BATCH)\
+                    .all()
+                for article_id, title, category, published_at in rows:
+                    self.add(article_id, title, category, published_at)
+                added += len(rows)
+                if len(rows) < REFRESH_BATCH:
+                    break
+            self.evict()
+            # 붙은 순서 기록은 색인 크기 정도만 남깁니다. (그보다 오래된 캐시는 added_since가 None -> 다시 계산)
+            if len(self._added) > max(REFRESH_BATCH, 2 * len(self._times)):
+                drop = len(self._added) // 2
+                del self._added[:drop]
+                self._added_offset += drop
+            return added
+
+    def added_since(self, version):
+        """version 이후 붙은 기사 id 목록 (기록이 지워져 알 수 없으면 None)"""
+        with self.lock:
+            if version < self._added_offset:
+                return None
+            return self._added[version - self._added_offset:]
+
+    def category_ids(self, category):
+        return self._by_category.get(category, ())
+
+    def keyword_ids(self, keyword):
+        """제목에 keyword가 들어간 기사 id 집합 (여러 단어면 모든 단어가 들어간 기사)"""
+        result = None
+        for token in tokenize(keyword):
+            if _HANGUL_RE.match(token):
+                ids = set()
+                i = bisect_left(self._tokens, token)
+                while i < len(self._tokens) and self._tokens[i].startswith(token):
+                    ids |= self._by_token[self._tokens[i]]
+                    i += 1
+            else:
+                ids = set(self._by_token.get(token, ()))
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result or set()
+
+    def title_matches(self, article_id, keyword):
+        """기사 제목이 keyword에 걸리는지 (keyword_ids와 같은 규칙을 기사 하나에)"""
+        tokens = self._titles.get(article_id)
+        if not tokens:
+            return False
+        for token in tokenize(keyword):
+            if _HANGUL_RE.match(token):
+                if not any(t.startswith(token) for t in tokens):
+                    return False
+            elif token not in tokens:
+                return False
+        return bool(tokenize(keyword))
+
+    def category(self, article_id):
+        return self._categories.get(article_id)
+
+    def published_at(self, article_id):
+        return self._times.get(article_id)
+
+    def all_ids(self):
+        return self._times.keys()
+
+
+class FeedService:
+    def __init__(
+        self,
+        index: FeedIndex,
+        top_k=100,
+        cache_size=10000,
+        cache_ttl=300,
+        half_life_hours=24.0,
+        subscribed_weight=2.0,
+        profile_keywords=30,
+    ):
+        self.index = index
+        self.top_k = top_k
+        self.half_life_hours = half_life_hours
+        self.subscribed_weight = subscribed_weight
+        self.profile_keywords = profile_keywords
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            FeedIndex(
+                window_hours=float(os.getenv("FEED_WINDOW_HOURS", "72")),
+                refresh_seconds=float(os.getenv("FEED_REFRESH_SECONDS", "10")),
+            ),
+            top_k=int(os.getenv("FEED_TOP_K", "100")),
+            cache_size=int(os.getenv("FEED_CACHE_SIZE", "10000")),
+            cache_ttl=float(os.getenv("FEED_CACHE_TTL", "300")),
+            half_life_hours=float(os.getenv("FEED_HALF_LIFE_HOURS", "24")),
+        )
+
+    # --- 캐시 무효화 ---
+    def invalidate(self, login_id):
+        with self._lock:
+            if self._cache.pop(login_id, None) is not None:
+                self.stats["invalidations"] += 1
+
+    def invalidate_many(self, login_ids):
+        for login_id in login_ids:
+            self.invalidate(login_id)
+
+    # --- 점수 계산 ---
+    def profile(self, user, interests):
+        """(카테고리 가중치, 키워드 가중치) 딕셔너리"""
+        def weights(subscribed, counts, limit=None):
+            result = defaultdict(float)
+            top = max(counts.values(), default=0)
+            items = heapq.nlargest(limit, counts.items(), key=lambda kv: kv[1]) if limit else counts.items()
+            for term, count in items:
+                if top:
+                    result[term] += count / top
+            for term in subscribed or []:
+                result[term] += self.subscribed_weight
+            return result
+
+        categories = weights(user.subscribed_categories, interests[crud.INTEREST_CATEGORY])
+        keywords = weights(user.subscribed_keywords, interests[crud.INTEREST_KEYWORD], self.profile_keywords)
+        return categories, keywords
+
+    def _interest_scores(self, category_weights, keyword_weights):
+        """관심사에 걸리는 기사 id -> 가중치 합 (비어 있으면 최신순으로 채움)"""
+        scores = defaultdict(float)
+        for category, weight in category_weights.items():
+            for article_id in self.index.category_ids(category):
+                scores[article_id] += weight
+        for keyword, weight in keyword_weights.items():
+            for article_id in self.index.keyword_ids(keyword):
+                scores[article_id] += weight
+        return scores
+
+    def rank(self, category_weights, keyword_weights, now=None, scores=None):
+        """[(점수, 기사 id)] 상위 top_k"""
+        now = now or datetime.now()
+        if scores is None:
+            scores = self._interest_scores(category_weights, keyword_weights)
+        if not scores:
+            # 관심사가 없는 사용자: 최신순
+            scores = dict.fromkeys(self.index.all_ids(), 1.0)
+
+        decay = math.log(2) / (self.half_life_hours * 3600)
+
+        def score(item):
+            article_id, weight = item
+            age = max(0.0, (now - self.index.published_at(article_id)).total_seconds())
+            return weight * math.exp(-decay * age)
+
+        return heapq.nlargest(self.top_k, ((score(item), item[0]) for item in scores.items()))
+
+    @staticmethod
+    def _issue_ranking(articles, issue_of):
+        issue_scores = defaultdict(float)
+        for article_id, s in articles:
+            issue_id = issue_of.get(article_id)
+            if issue_id is not None:
+                issue_scores[issue_id] += s
+        return sorted(((issue_id, round(s, 6)) for issue_id, s in issue_scores.items()), key=lambda x: -x[1])
+
+    def _compute(self, db: Session, user):
+        categories, keywords = self.profile(user, crud.get_user_interests(db, user.login_id))
+        with self.index.lock:
+            version = self.index.version
+            scores = self._interest_scores(categories, keywords)
+            ranked = self.rank(categories, keywords, scores=scores)
+        # 이슈 연결(issue_id)은 군집화 단계가 나중에 채우므로 색인에 두지 않고 여기서 읽습니다.
+        issue_of = {}
+        ids = [article_id for _, article_id in ranked]
+        for i in range(0, len(ids), crud.IN_CHUNK_SIZE):
+            chunk = ids[i:i + crud.IN_CHUNK_SIZE]
+            for article_id, issue_id in db.query(Article.id, Article.issue_id).filter(Article.id.in_(chunk)):
+                if issue_id is not None:
+                    issue_of[article_id] = issue_id
+        articles = [(article_id, round(s, 6)) for s, article_id in ranked]
+        return {
+            "version": version,
+            "generated_at": datetime.now(),
+            "articles": articles,
+            "issues": self._issue_ranking(articles, issue_of),
+            # 캐시를 계속 써도 되는지 판단용 (새 기사가 관심사에 걸리는지)
+            "categories": categories,
+            "keywords": keywords,
+            "recent_only": not scores,
+            "issue_of": issue_of,
+        }
+
+    def _relevant(self, cached, article_id):
+        """새로 붙은 기사가 이 캐시의 순위를 바꿀 수 있는지"""
+        if cached["recent_only"]:
+            return True
+        if self.index.category(article_id) in cached["categories"]:
+            return True
+        return any(self.index.title_matches(article_id, keyword) for keyword in cached["keywords"])
+
+    def _still_valid(self, cached):
+        """캐시를 만든 뒤 붙은 기사 중 관심사에 걸리는 것이 없으면 True (확인한 version까지 앞으로 당김)"""
+        with self.index.lock:
+            added = self.index.added_since(cached["version"])
+            if added is None or any(self._relevant(cached, article_id) for article_id in added):
+                return False
+            cached["version"] = self.index.version
+            return True
+
+    def _live(self, cached):
+        """색인에서 빠진(기간이 지난) 기사를 걸러낸 캐시 결과"""
+        with self.index.lock:
+            articles = [(a, s) for a, s in cached["articles"] if self.index.published_at(a) is not None]
+        if len(articles) == len(cached["articles"]):
+            return cached
+        return dict(cached, articles=articles, issues=self._issue_ranking(articles, cached["issue_of"]))
+
+    def ranking(self, db: Session, user):
+        """사용자 상위 top_k (캐시). {"articles": [(id, 점수)], "issues": [(id, 점수)], "generated_at": ...}"""
+        self.index.refresh(db)
+        with self._lock:
+            cached = self._cache.get(user.login_id)
+            if cached is not None and self._still_valid(cached):
+                self.stats["hits"] += 1
+                return self._live(cached)
+            self.stats["misses"] += 1
+        result = self._compute(db, user)
+        with self._lock:
+            self._cache[user.login_id] = result
+        return result
+
+    def feed(self, db: Session, user, limit=20, issues=5, snippet=0):
+        """FeedResponse 형태의 dict (상위 limit개 기사 / issues개 이슈의 요약 필드 + 점수)"""
+        ranking = self.ranking(db, user)
+        top_articles = ranking["articles"][:limit]
+        top_issues = ranking["issues"][:issues]
+
+        articles = []
+        if top_articles:
+            rows = {row.id: row for row in db.query(*article_columns(snippet)).filter(Article.id.in_([a for a, _ in top_articles]))}
+            articles = [dict(rows[a]._mapping, score=s) for a, s in top_articles if a in rows]
+        issue_list = []
+        if top_issues:
+            rows = {row.id: row for row in db.query(*issue_columns(snippet)).filter(Issue.id.in_([i for i, _ in top_issues]))}
+            issue_list = [dict(rows[i]._mapping, score=s) for i, s in top_issues if i in rows]
+        return {
+            "login_id": user.login_id,
+            "articles": articles,
+            "issues": issue_list,
+            "generated_at": ranking["generated_at"],
+        }
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats, cached_users=len(self._cache))
+        stats.update(indexed_articles=len(self.index), index_version=self.index.version)
+        return stats
+
+
+# 프로세스 공용 피드 서비스 (환경변수로 설정)
+feed_service = FeedService.from_env()
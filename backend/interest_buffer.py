@@ -0,0 +1,189 @@
+# interest_buffer.py
+"""
+/increase_user_interest 쓰기 지연(write-behind) 버퍼.
+
+클릭마다 SQLite에 커밋하면 모든 API 워커가 WAL 쓰기 잠금 하나를 두고 줄을 서게 됩니다.
+여기서는 클릭 이벤트를 메모리에 모아 (login_id, kind, term)별로 합친 뒤,
+flush_ms마다 또는 flush_events개가 쌓이면 백그라운드 스레드가 한 트랜잭션으로 더합니다. (crud.add_user_interest_counts)
+
+내구성 한계: 프로세스가 비정상 종료되면 최대 flush_ms 동안(또는 flush_events개)의 클릭이 사라질 수 있습니다.
+정상 종료 시에는 main.lifespan에서 shutdown()이 남은 이벤트를 모두 저장합니다.
+flush_ms=0(INTEREST_FLUSH_MS=0)이면 버퍼를 쓰지 않고 요청마다 바로 저장합니다.
+
+저장이 실패하면 합친 값을 버퍼에 되돌려 다음 flush에서 다시 시도합니다.
+단, 값 자체 때문에 실패하면(DataError/IntegrityError: 너무 긴 값 등) 항목별로 나눠 저장하고,
+혼자서도 실패하는 항목만 버립니다. (dropped_rows) 이런 항목 하나 때문에 전체가 계속 재시도되지 않도록 하기 위함입니다.
+쌓인 항목이 max_keys를 넘으면 add()가 False를 돌려주고, 호출한 쪽이 바로 저장합니다. (overflow_events)
+"""
+import os
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+import crud
+
+
+class InterestBuffer:
+    def __init__(self, session_factory, flush_ms=500, flush_events=1000, max_keys=200000, on_flush=None):
+        self.session_factory = session_factory
+        # 저장 후 호출 (횟수가 바뀐 login_id 리스트). 예: 피드 캐시 무효화
+        self.on_flush = on_flush
+        self.flush_ms = flush_ms
+        self.flush_events = flush_events
+        self.max_keys = max_keys
+
+        self._pending = Counter()  # {(login_id, kind, term): 증가량}
+        self._pending_events = 0
+        self._oldest = None  # 버퍼에서 가장 오래 기다린 이벤트 시각 (monotonic)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # flush는 한 번에 하나만
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {
+            "events": 0, "flushes": 0, "flushed_events": 0, "flushed_rows": 0,
+            "unknown_users": 0, "overflow_events": 0, "errors": 0, "dropped_rows": 0,
+            "last_flush_ms": 0.0, "max_flush_ms": 0.0, "total_flush_ms": 0.0,
+        }
+
+    @classmethod
+    def from_env(cls, session_factory, on_flush=None):
+        return cls(
+            session_factory,
+            on_flush=on_flush,
+            flush_ms=int(os.getenv("INTEREST_FLUSH_MS", "500")),
+            flush_events=int(os.getenv("INTEREST_FLUSH_EVENTS", "1000")),
+            max_keys=int(os.getenv("INTEREST_BUFFER_MAX_KEYS", "200000")),
+        )
+
+    @property
+    def enabled(self):
+        return self.flush_ms > 0
+
+    def add(self, login_id, category, keywords=None):
+        """클릭 이벤트를 버퍼에 넣고 바로 돌아옵니다. 반환값: 버퍼가 가득 차서 넣지 못했으면 False"""
+        counts = crud.interest_counts(login_id, category, keywords)
+        with self._lock:
+            self.stats["events"] += 1
+            if len(self._pending) + len(counts) > self.max_keys:
+                self.stats["overflow_events"] += 1
+                return False
+            self._pending.update(counts)
+            self._pending_events += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = self._pending_events >= self.flush_events
+        if full:
+            self._wakeup.set()
+        return True
+
+    def flush(self):
+        """모인 증가량을 한 트랜잭션으로 저장합니다. 반환값: 저장한 이벤트 수"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                pending, events = self._pending, self._pending_events
+                self._pending, self._pending_events, self._oldest = Counter(), 0, None
+
+            start = time.perf_counter()
+            login_ids = {key[0] for key in pending}
+            try:
+                result = self._save(pending)
+            except Exception as e:
+                # 저장하지 못한 항목(pending에 남은 것)만 되돌림
+                print(f"⚠️ [Interest Buffer] 저장 실패, 다음 flush에서 다시 시도합니다: {e}")
+                with self._lock:
+                    self.stats["errors"] += 1
+                    pending.update(self._pending)
+                    self._pending = pending
+                    self._pending_events += events
+                    self._oldest = self._oldest or time.monotonic()
+                return 0
+
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.stats["flushes"] += 1
+                self.stats["flushed_events"] += events
+                self.stats["flushed_rows"] += result["rows"]
+                self.stats["unknown_users"] += len(result["unknown_users"])
+                self.stats["last_flush_ms"] = round(elapsed, 2)
+                self.stats["max_flush_ms"] = round(max(self.stats["max_flush_ms"], elapsed), 2)
+                self.stats["total_flush_ms"] += elapsed
+            if self.on_flush is not None:
+                unknown = set(result["unknown_users"])
+                self.on_flush([login_id for login_id in login_ids if login_id not in unknown])
+            return events
+
+    def _save(self, pending):
+        """
+        pending을 한 트랜잭션으로 저장하고 비웁니다. 값 때문에 실패하면 항목별로 나눠 저장합니다.
+        그 밖의 오류(DB 연결, 잠금 등)는 그대로 올려 보내며, 아직 저장하지 못한 항목은 pending에 남습니다.
+        """
+        db = self.session_factory()
+        try:
+            try:
+                result = crud.add_user_interest_counts(db, pending)
+                pending.clear()
+                return result
+            except (DataError, IntegrityError) as e:
+                print(f"⚠️ [Interest Buffer] 저장할 수 없는 값이 있어 항목별로 나눠 저장합니다: {e.orig}")
+
+            result = {"rows": 0, "unknown_users": set()}
+            for key in list(pending):
+                try:
+                    one = crud.add_user_interest_counts(db, {key: pending[key]})
+                except (DataError, IntegrityError) as e:
+                    print(f"🗑️ [Interest Buffer] 저장할 수 없는 항목을 버립니다: {key} ({e.orig})")
+                    with self._lock:
+                        self.stats["dropped_rows"] += 1
+                else:
+                    result["rows"] += one["rows"]
+                    result["unknown_users"].update(one["unknown_users"])
+                del pending[key]
+            result["unknown_users"] = list(result["unknown_users"])
+            return result
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_ms / 1000)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # on_flush 등에서 난 예외로 스레드가 죽으면 이후 클릭이 계속 쌓이기만 함
+                print(f"⚠️ [Interest Buffer] flush 중 오류: {e}")
+                with self._lock:
+                    self.stats["errors"] += 1
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="interest-buffer", daemon=True)
+        self._thread.start()
+
+    def shutdown(self, timeout=5.0):
+        """백그라운드 스레드를 멈추고 남은 이벤트를 저장합니다."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        flushed = self.flush()
+        if flushed:
+            print(f"💾 [Interest Buffer] 종료 전 클릭 {flushed}건 저장")
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["depth_events"] = self._pending_events
+            stats["depth_keys"] = len(self._pending)
+            stats["oldest_pending_ms"] = round((time.monotonic() - self._oldest) * 1000, 1) if self._oldest else 0.0
+        total = stats.pop("total_flush_ms")
+        stats["avg_flush_ms"] = round(total / stats["flushes"], 2) if stats["flushes"] else 0.0
+        stats.update(enabled=self.enabled, flush_ms=self.flush_ms, flush_events=self.flush_events, max_keys=self.max_keys)
+        return stats
@@ -0,0 +1,186 @@
+# issue_matcher.py
+"""
+기존 이슈 매칭용 centroid 인덱스.
+
+이슈마다 소속 기사 임베딩(정규화된 벡터)의 합과 개수를 들고 있다가,
+새 기사들을 '정규화된 행렬 곱 한 번 + argmax'로 가장 가까운 이슈에 배정합니다.
+기사가 이슈에 합류할 때마다 합/개수만 갱신하므로(증분 업데이트) 매 사이클 전체를 다시 읽지 않습니다.
+"""
+import numpy as np
+
+# 유사도 행렬을 한 번에 만들 기사 수 (메모리 상한: chunk x 이슈 수 x 4바이트)
+MATCH_CHUNK_ROWS = 4096
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class IssueCentroidIndex:
+    def __init__(self, dim=None):
+        self.dim = dim
+        self.issue_ids = []  # 행 번호 -> issue_id
+        self._rows = {}  # issue_id -> 행 번호
+        self._created_at = []  # 행 번호 -> 이슈 생성 시각
+        self._sums = np.zeros((0, dim or 0), dtype=np.float32)  # 앞쪽 len(issue_ids)행만 사용 (용량은 2배씩 증가)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._normed = np.zeros((0, dim or 0), dtype=np.float32)  # 정규화된 centroid (_sums와 같은 용량)
+        self._stale = True  # True면 다음 centroids() 호출 때 전체를 다시 계산
+
+    def __len__(self):
+        return len(self.issue_ids)
+
+    def __contains__(self, issue_id):
+        return issue_id in self._rows
+
+    def _row_for(self, issue_id, created_at=None):
+        row = self._rows.get(issue_id)
+        if row is not None:
+            return row
+        row = len(self.issue_ids)
+        if row >= len(self._sums):
+            capacity = max(16, len(self._sums) * 2)
+            sums = np.zeros((capacity, self.dim), dtype=np.float32)
+            sums[:row] = self._sums[:row]
+            counts = np.zeros(capacity, dtype=np.int64)
+            counts[:row] = self._counts[:row]
+            normed = np.zeros((capacity, self.dim), dtype=np.float32)
+            normed[:row] = self._normed[:row]
+            self._sums, self._counts, self._normed = sums, counts, normed
+        self._rows[issue_id] = row
+        self.issue_ids.append(issue_id)
+        self._created_at.append(created_at)
+        return row
+
+    def add_many(self, issue_ids, embeddings, created_at=None):
+        """
+        기사 임베딩들을 각자의 이슈에 한꺼번에 더합니다.
+        issue_ids[i]는 embeddings[i] 기사가 속한 이슈, created_at은 {issue_id: 생성 시각} (옵션)
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        if len(embeddings) == 0:
+            return
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+            self._sums = np.zeros((0, self.dim), dtype=np.float32)
+            self._normed = np.zeros((0, self.dim), dtype=np.float32)
+
+        created_at = created_at or {}
+        rows = np.array([self._row_for(i, created_at.get(i)) for i in issue_ids], dtype=np.int64)
+        np.add.at(self._sums, rows, _normalize_rows(embeddings))
+        np.add.at(self._counts, rows, 1)
+        self._refresh_rows(np.unique(rows))
+
+    def _refresh_rows(self, rows):
+        # 바뀐 행의 centroid만 다시 계산합니다. (기사 하나씩 들어오는 온라인 군집화에서 전체 재계산을 피함)
+        if not self._stale:
+            self._normed[rows] = _normalize_rows(self._sums[rows])
+
+    def subtract(self, issue_id, embeddings):
+        """issue_id 이슈에서 기사 임베딩들을 뺍니다. (이슈에서 떨어져 나간 기사)"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        row = self._rows[issue_id]
+        self._sums[row] -= _normalize_rows(embeddings).sum(axis=0)
+        self._counts[row] -= len(embeddings)
+        self._refresh_rows(np.array([row]))
+
+    def merge(self, src_id, dst_id):
+        """src_id 이슈의 합/개수를 dst_id 이슈로 옮기고 src_id는 인덱스에서 뺍니다."""
+        src, dst = self._rows[src_id], self._rows[dst_id]
+        self._sums[dst] += self._sums[src]
+        self._counts[dst] += self._counts[src]
+        self._refresh_rows(np.array([dst]))
+        self.remove([src_id])
+
+    def count(self, issue_id):
+        return int(self._counts[self._rows[issue_id]])
+
+    def centroid(self, issue_id):
+        return self.centroids()[self._rows[issue_id]]
+
+    def add(self, issue_id, embeddings, created_at=None):
+        """issue_id 이슈에 기사 임베딩(행렬 또는 벡터 하나)을 더합니다. 없는 이슈면 새로 만듭니다."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        self.add_many([issue_id] * len(embeddings), embeddings, {issue_id: created_at})
+
+    def drop_older_than(self, time_threshold):
+        """생성 시각이 time_threshold 이전인 이슈를 인덱스에서 뺍니다."""
+        keep = [i for i, created in enumerate(self._created_at) if created is None or created >= time_threshold]
+        self._keep_rows(keep)
+
+    def remove(self, issue_ids):
+        """issue_ids 이슈들을 인덱스에서 뺍니다."""
+        drop = set(issue_ids)
+        self._keep_rows([row for row, issue_id in enumerate(self.issue_ids) if issue_id not in drop])
+
+    def _keep_rows(self, keep):
+        if len(keep) == len(self.issue_ids):
+            return
+        self.issue_ids = [self.issue_ids[i] for i in keep]
+        self._created_at = [self._created_at[i] for i in keep]
+        self._sums = self._sums[keep]
+        self._counts = self._counts[keep]
+        self._normed = np.zeros_like(self._sums)
+        self._rows = {issue_id: row for row, issue_id in enumerate(self.issue_ids)}
+        self._stale = True
+
+    def state(self):
+        """저장용 상태 (issue_ids, 생성 시각, 합/개수 배열)"""
+        n = len(self.issue_ids)
+        return {
+            "issue_ids": list(self.issue_ids),
+            "created_at": list(self._created_at),
+            "sums": self._sums[:n].copy(),
+            "counts": self._counts[:n].copy(),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        sums = np.asarray(state["sums"], dtype=np.float32)
+        index = cls(dim=sums.shape[1] if sums.ndim == 2 and sums.shape[1] else None)
+        index.issue_ids = list(state["issue_ids"])
+        index._created_at = list(state["created_at"])
+        index._rows = {issue_id: row for row, issue_id in enumerate(index.issue_ids)}
+        index._sums = sums
+        index._counts = np.asarray(state["counts"], dtype=np.int64)
+        index._normed = np.zeros_like(sums)
+        return index
+
+    def centroids(self):
+        n = len(self.issue_ids)
+        if self._stale:
+            self._normed[:n] = _normalize_rows(self._sums[:n])
+            self._stale = False
+        return self._normed[:n]
+
+    def match(self, embeddings, threshold=0.85):
+        """
+        각 기사에 대해 가장 비슷한 이슈를 찾습니다.
+        반환값: (issue_ids 배열, 유사도 배열) — 유사도가 threshold 이하이면 issue_id는 None
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        n = len(embeddings)
+        matched = np.full(n, None, dtype=object)
+        best_sims = np.zeros(n, dtype=np.float32)
+        if n == 0 or len(self.issue_ids) == 0:
+            return matched, best_sims
+
+        centroids_t = self.centroids().T
+        ids = np.asarray(self.issue_ids, dtype=object)
+        for start in range(0, n, MATCH_CHUNK_ROWS):
+            chunk = _normalize_rows(embeddings[start:start + MATCH_CHUNK_ROWS])
+            sims = chunk @ centroids_t
+            best = sims.argmax(axis=1)
+            best_sims[start:start + len(chunk)] = sims[np.arange(len(chunk)), best]
+            matched[start:start + len(chunk)] = ids[best]
+
+        matched[best_sims <= threshold] = None
+        return matched, best_sims
@@ -0,0 +1,385 @@
+# keyword_matcher.py
+"""
+구독 키워드 매칭 (새 기사 -> 그 키워드를 구독한 사용자별 알림 묶음).
+
+사용자마다 키워드 목록을 돌며 기사에 들어 있는지 보면 (사용자 x 키워드 x 기사)만큼 비교해야 합니다.
+여기서는 모든 사용자의 구독 키워드(중복 제거)를 Aho-Corasick 오토마톤 하나로 만들고,
+기사 제목+본문을 한 번 훑어 나온 키워드를 키워드 -> 구독자 역색인으로 사용자별로 모읍니다.
+
+- pyahocorasick이 설치되어 있으면 C 구현을, 없으면 같은 알고리즘의 파이썬 구현을 씁니다.
+- 구독 변경(PATCH /users)은 set_user_keywords로 바로 반영합니다. 전체 오토마톤을 다시 만들지 않고
+  새 키워드는 작은 보조 오토마톤(delta)에 넣고, 구독자가 없어진 키워드는 매칭 결과에서만 빼 둡니다.
+  delta가 merge_threshold개를 넘거나 안 쓰는 키워드가 stale_ratio를 넘으면 그때 한 번 합쳐서 다시 만듭니다.
+- 영문/숫자 키워드는 단어 경계에서만 일치로 봅니다. ("AI"가 "said"에 걸리지 않도록)
+  한글은 조사가 붙으므로 부분 일치입니다.
+- 다른 프로세스에서 바뀐 구독은 sync로 가져옵니다. users.keywords_updated_at이 지난번에 본 값 이후인
+  사용자만 읽고, full_sync_interval마다 한 번은 전체를 읽어 지워진 사용자를 정리합니다.
+- 파이프라인의 notify 단계가 새 기사 id 범위를 match_range로 매칭하고 notify_matches로 보냅니다.
+  보낸 사용자는 (기사 id 범위, login_id)로 sent_notifications에 남기므로, 같은 범위의 작업이 재시도돼도 다시 보내지 않습니다.
+  알림 전송은 LogNotifier(로그 + JSONL 파일) 스텁입니다.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from models import Article, SentNotification, User
+
+try:
+    import ahocorasick
+except ImportError:  # 파이썬 구현 사용
+    ahocorasick = None
+
+# match_range에서 한 번에 읽을 기사 수
+MATCH_BATCH = 500
+# 증분 sync는 지난번에 본 keywords_updated_at보다 이만큼(초) 앞에서부터 다시 읽습니다.
+# (시각을 정한 뒤 늦게 커밋된 변경을 놓치지 않도록. 같은 키워드를 다시 반영해도 결과는 같음)
+SYNC_OVERLAP_SECONDS = 60
+
+
+def normalize_keyword(keyword):
+    return " ".join(str(keyword or "").lower().split())
+
+
+def _is_word_char(ch):
+    return ch.isascii() and ch.isalnum()
+
+
+class _PyAutomaton:
+    """pyahocorasick이 없을 때 쓰는 Aho-Corasick (iter 결과 형식은 pyahocorasick과 같음: (끝 위치, 키워드))"""
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] = self._out[state] + (keyword,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter(self, text):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword in out[state]:
+                yield i, keyword
+
+
+def build_automaton(keywords):
+    """키워드 집합 -> iter(text)가 (끝 위치, 키워드)를 내는 오토마톤 (키워드가 없으면 None)"""
+    if not keywords:
+        return None
+    if ahocorasick is None:
+        return _PyAutomaton(keywords)
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+class KeywordMatcher:
+    def __init__(self, merge_threshold=1000, stale_ratio=0.2, full_sync_interval=3600):
+        self.merge_threshold = merge_threshold
+        self.stale_ratio = stale_ratio
+        self.full_sync_interval = full_sync_interval
+
+        self._subscribers = defaultdict(set)  # 키워드 -> login_id 집합
+        self._user_keywords = {}  # login_id -> 키워드 집합
+        self._main, self._main_keywords = None, set()
+        self._delta, self._delta_keywords, self._delta_dirty = None, set(), False
+        self._stale = 0  # main에 있지만 구독자가 없는 키워드 수
+        self._lock = threading.RLock()
+        self._synced_until = None  # sync가 반영한 가장 늦은 keywords_updated_at (None이면 다음 sync는 전체)
+        self._last_full_sync = 0.0  # monotonic
+        self.stats = {
+            "rebuilds": 0, "delta_rebuilds": 0, "articles": 0, "matched_users": 0, "last_rebuild_ms": 0.0,
+            "full_syncs": 0, "incremental_syncs": 0, "synced_rows": 0,
+        }
+
+    # --- 구독 변경 ---
+    def set_user_keywords(self, login_id, keywords):
+        """사용자의 구독 키워드를 바꿉니다. 반환값: 바뀌었으면 True"""
+        new = {k for k in map(normalize_keyword, keywords or []) if k}
+        with self._lock:
+            old = self._user_keywords.get(login_id, set())
+            if new == old:
+                return False
+            for keyword in old - new:
+                subscribers = self._subscribers.get(keyword)
+                if subscribers is None:
+                    continue
+                subscribers.discard(login_id)
+                if not subscribers:
+                    del self._subscribers[keyword]
+                    if keyword in self._main_keywords:
+                        self._stale += 1
+                    elif keyword in self._delta_keywords:
+                        self._delta_keywords.discard(keyword)
+                        self._delta_dirty = True
+            for keyword in new - old:
+                if keyword not in self._subscribers:
+                    if keyword in self._main_keywords:
+                        self._stale -= 1
+                    elif keyword not in self._delta_keywords:
+                        self._delta_keywords.add(keyword)
+                        self._delta_dirty = True
+                self._subscribers[keyword].add(login_id)
+            if new:
+                self._user_keywords[login_id] = new
+            else:
+                self._user_keywords.pop(login_id, None)
+            return True
+
+    def sync(self, db: Session, full=False):
+        """
+        users 테이블의 구독 키워드와 맞춥니다. (다른 프로세스에서 바뀐 구독 반영) 반환값: 바뀐 사용자 수
+        처음과 full_sync_interval초마다는 전체를 읽고, 그 사이에는 keywords_updated_at이 바뀐 사용자만 읽습니다.
+        """
+        if full or self._synced_until is None or time.monotonic() - self._last_full_sync >= self.full_sync_interval:
+            return self._full_sync(db)
+
+        since = self._synced_until - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        query = db.query(User.login_id, User.subscribed_keywords, User.keywords_updated_at).filter(
+            User.keywords_updated_at >= since
+        )
+        changed, latest, rows = 0, self._synced_until, 0
+        for login_id, keywords, updated_at in query.yield_per(5000):
+            rows += 1
+            changed += self.set_user_keywords(login_id, keywords)
+            latest = max(latest, updated_at)
+        with self._lock:
+            self._synced_until = latest
+            self.stats["incremental_syncs"] += 1
+            self.stats["synced_rows"] += rows
+        return changed
+
+    def _full_sync(self, db: Session):
+        # 전체를 읽어 맞추고, users에 없는 사용자(직접 지운 행 등)는 구독을 비웁니다.
+        # 다음 증분 sync는 이 시각(- SYNC_OVERLAP_SECONDS) 이후에 바뀐 사용자부터 읽음
+        started = datetime.now()
+        changed = 0
+        seen = set()
+        for login_id, keywords in db.query(User.login_id, User.subscribed_keywords).yield_per(5000):
+            seen.add(login_id)
+            changed += self.set_user_keywords(login_id, keywords)
+        with self._lock:
+            gone = [login_id for login_id in self._user_keywords if login_id not in seen]
+        for login_id in gone:
+            changed += self.set_user_keywords(login_id, [])
+        with self._lock:
+            self._synced_until = started
+            self._last_full_sync = time.monotonic()
+            self.stats["full_syncs"] += 1
+            self.stats["synced_rows"] += len(seen)
+        return changed
+
+    # --- 오토마톤 ---
+    def rebuild(self):
+        """모든 키워드로 main 오토마톤을 다시 만들고 delta를 비웁니다."""
+        with self._lock:
+            start = time.perf_counter()
+            self._main_keywords = set(self._subscribers)
+            self._main = build_automaton(self._main_keywords)
+            self._delta, self._delta_keywords, self._delta_dirty = None, set(), False
+            self._stale = 0
+            self.stats["rebuilds"] += 1
+            self.stats["last_rebuild_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    def _ensure_compiled(self):
+        if (
+            len(self._delta_keywords) > self.merge_threshold
+            or self._stale > self.stale_ratio * max(1, len(self._main_keywords))
+            or (self._main is None and self._subscribers)
+        ):
+            self.rebuild()
+        elif self._delta_dirty:
+            self._delta = build_automaton(self._delta_keywords)
+            self._delta_dirty = False
+            self.stats["delta_rebuilds"] += 1
+
+    # --- 매칭 ---
+    def match_text(self, text):
+        """text에 들어 있는 (구독자가 있는) 키워드 집합"""
+        text = (text or "").lower()
+        found = set()
+        with self._lock:
+            self._ensure_compiled()
+            for automaton in (self._main, self._delta):
+                if automaton is None:
+                    continue
+                for end, keyword in automaton.iter(text):
+                    if keyword in found or keyword not in self._subscribers:
+                        continue
+                    start = end - len(keyword) + 1
+                    if _is_word_char(keyword[0]) and start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if _is_word_char(keyword[-1]) and end + 1 < len(text) and _is_word_char(text[end + 1]):
+                        continue
+                    found.add(keyword)
+        return found
+
+    def match_article(self, title, contents=None):
+        """{login_id: [키워드(정렬)]} (제목과 본문을 한 번에 훑음)"""
+        keywords = self.match_text(f"{title or ''}\n{contents or ''}")
+        result = defaultdict(list)
+        with self._lock:
+            for keyword in sorted(keywords):
+                for login_id in self._subscribers.get(keyword, ()):
+                    result[login_id].append(keyword)
+        return result
+
+    def match_articles(self, articles):
+        """
+        articles: id, title, contents 속성을 가진 객체(ORM/Row) 목록
+        반환값: 사용자별 묶음 {login_id: [(기사 id, [키워드])]}
+        (기사 하나가 수천 명에게 걸리므로 사용자마다 기사 정보를 복사하지 않고 id만 담습니다)
+        """
+        batches = defaultdict(list)
+        for article in articles:
+            matches = self.match_article(article.title, article.contents)
+            for login_id, keywords in matches.items():
+                batches[login_id].append((article.id, keywords))
+            self.stats["articles"] += 1
+            self.stats["matched_users"] += len(matches)
+        return batches
+
+    def match_range(self, db: Session, min_id, max_id):
+        """
+        id가 min_id ~ max_id인 기사를 매칭합니다. (파이프라인 notify 단계용)
+        반환값: (사용자별 묶음, {기사 id: (제목, URL)})
+        """
+        batches = defaultdict(list)
+        articles = {}
+        query = db.query(Article.id, Article.title, Article.contents, Article.url)
+        for start in range(min_id, max_id + 1, MATCH_BATCH):
+            end = min(max_id, start + MATCH_BATCH - 1)
+            rows = query.filter(Article.id.between(start, end)).order_by(Article.id).all()
+            articles.update((row.id, (row.title, row.url)) for row in rows)
+            for login_id, items in self.match_articles(rows).items():
+                batches[login_id].extend(items)
+        return batches, articles
+
+    def metrics(self):
+        with self._lock:
+            return dict(
+                self.stats,
+                users=len(self._user_keywords),
+                keywords=len(self._subscribers),
+                main_keywords=len(self._main_keywords),
+                delta_keywords=len(self._delta_keywords),
+                stale_keywords=self._stale,
+                backend="pyahocorasick" if ahocorasick is not None else "python",
+            )
+
+
+class LogNotifier:
+    """알림 전송 스텁: 실제 푸시(FCM) 대신 로그를 남기고, outbox_path가 있으면 JSONL로 한 줄씩 기록합니다."""
+
+    def __init__(self, outbox_path=None):
+        self.outbox_path = outbox_path
+        self._lock = threading.Lock()
+        self.stats = {"sent": 0, "items": 0}
+
+    def send(self, login_id, fcm_token, items):
+        with self._lock:
+            self.stats["sent"] += 1
+            self.stats["items"] += len(items)
+            if self.outbox_path:
+                with open(self.outbox_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"login_id": login_id, "fcm_token": fcm_token, "items": items}, ensure_ascii=False) + "\n")
+
+
+def sent_login_ids(db: Session, min_id, max_id):
+    """기사 id 범위 min_id ~ max_id의 알림을 이미 받은 login_id 집합"""
+    rows = db.query(SentNotification.login_id).filter(SentNotification.min_id == min_id, SentNotification.max_id == max_id)
+    return {row[0] for row in rows}
+
+
+def _record_sent(db: Session, id_range, login_ids):
+    if not login_ids:
+        return
+    now = datetime.now()
+    db.execute(SentNotification.__table__.insert(), [
+        {"min_id": id_range[0], "max_id": id_range[1], "login_id": login_id, "sent_at": now} for login_id in login_ids
+    ])
+    db.commit()
+
+
+def prune_sent_notifications(db: Session, days=7):
+    """days일보다 오래된 전송 기록을 지웁니다. (그보다 늦게 재시도되는 작업은 없다고 봄) 반환값: 지운 행 수"""
+    deleted = db.query(SentNotification).filter(SentNotification.sent_at < datetime.now() - timedelta(days=days)).delete(
+        synchronize_session=False
+    )
+    db.commit()
+    return deleted
+
+
+def notify_matches(db: Session, batches, articles, notifier, chunk_size=500, id_range=None):
+    """
+    사용자별 매칭 묶음을 알림으로 보냅니다. fcm_token이 없는 사용자는 건너뜁니다.
+    articles: {기사 id: (제목, URL)} (match_range 반환값)
+    id_range: (min_id, max_id)를 주면 그 범위로 이미 보낸 사용자는 건너뛰고, 보낸 사용자를 sent_notifications에 남깁니다.
+    (전송 도중 실패해도 그때까지 보낸 사용자는 기록하므로, 작업을 재시도하면 나머지에게만 보냄)
+    반환값: 알림을 보낸 사용자 수
+    """
+    already = sent_login_ids(db, *id_range) if id_range else set()
+    login_ids = [login_id for login_id in batches if login_id not in already]
+    sent = 0
+    recorded = []
+    try:
+        for i in range(0, len(login_ids), chunk_size):
+            chunk = login_ids[i:i + chunk_size]
+            for login_id, token in db.query(User.login_id, User.fcm_token).filter(User.login_id.in_(chunk)):
+                if token:
+                    items = [
+                        {"article_id": article_id, "title": articles[article_id][0], "url": articles[article_id][1], "keywords": keywords}
+                        for article_id, keywords in batches[login_id]
+                    ]
+                    notifier.send(login_id, token, items)
+                    recorded.append(login_id)
+                    sent += 1
+            if id_range:
+                _record_sent(db, id_range, recorded)
+            recorded = []
+    finally:
+        if id_range and recorded:
+            _record_sent(db, id_range, recorded)
+    skipped = f" (이미 보낸 {len(already)}명 제외)" if already else ""
+    print(f"🔔 [Notify] 키워드 매칭 사용자 {len(login_ids)}명 중 {sent}명에게 알림 전송{skipped}")
+    return sent
+
+
+# 프로세스 공용 매처 / 알림 스텁 (환경변수로 설정)
+keyword_matcher = KeywordMatcher(
+    merge_threshold=int(os.getenv("KEYWORD_MATCHER_MERGE_THRESHOLD", "1000")),
+    stale_ratio=float(os.getenv("KEYWORD_MATCHER_STALE_RATIO", "0.2")),
+    full_sync_interval=float(os.getenv("KEYWORD_MATCHER_FULL_SYNC_INTERVAL", "3600")),
+)
+notifier = LogNotifier(os.getenv("NOTIFY_OUTBOX_PATH") or None)
@@ -0,0 +1,145 @@
+# llm_cache.py
+"""
+LLM 응답 캐시.
+
+(모델 ID, 생성 파라미터, 프롬프트 해시)로 만든 키에 응답 문자열을 저장합니다.
+- 1차: 프로세스 내 LRU + TTL (cachetools.TTLCache)
+- 2차: 디스크 (diskcache, 크기 제한 + 만료) — 서버 재시작 / 여러 워커 프로세스 간 공유
+같은 프롬프트로 다시 요청하면 LLM을 호출하지 않고 저장된 응답을 돌려줍니다.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from cachetools import TTLCache
+
+try:
+    import diskcache
+except ImportError:  # 디스크 캐시 없이 메모리 캐시만 사용
+    diskcache = None
+
+
+class LLMCache:
+    def __init__(
+        self,
+        directory="./llm_cache",
+        memory_size=1024,
+        ttl=60 * 60 * 24,
+        disk_size_limit=256 * 1024 * 1024,
+        enabled=True,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.disk_size_limit = disk_size_limit
+        self.enabled = enabled
+        self._memory = TTLCache(maxsize=memory_size, ttl=ttl)
+        self._lock = threading.Lock()
+        self._disk = None
+        self._disk_failed = False
+        self._disk_lock = threading.Lock()  # 디스크 캐시를 두 번 열지 않도록
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    @staticmethod
+    def make_key(model_id, params, prompt):
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        raw = json.dumps({"model": model_id, "params": params or {}, "prompt": prompt_hash}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _disk_cache(self):
+        # 디스크 캐시는 처음 쓸 때 엽니다. (열기 실패 시 메모리 캐시만 사용)
+        if self._disk is not None or self._disk_failed or diskcache is None:
+            return self._disk
+        with self._disk_lock:
+            if self._disk is None and not self._disk_failed:
+                try:
+                    self._disk = diskcache.Cache(
+                        self.directory, size_limit=self.disk_size_limit, eviction_policy="least-recently-used"
+                    )
+                except Exception as e:
+                    print(f"⚠️ [LLM Cache] 디스크 캐시를 열 수 없습니다: {e}")
+                    self._disk_failed = True
+        return self._disk
+
+    def get(self, key):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self.stats["memory_hits"] += 1
+                return value
+
+        disk = self._disk_cache()
+        if disk is not None:
+            try:
+                value = disk.get(key)
+            except Exception:
+                value = None
+                with self._lock:
+                    self.stats["errors"] += 1
+            if value is not None:
+                with self._lock:
+                    self._memory[key] = value
+                    self.stats["disk_hits"] += 1
+                return value
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self.stats["stores"] += 1
+        disk = self._disk_cache()
+        if disk is not None:
+            try:
+                disk.set(key, value, expire=self.ttl)
+            except Exception:
+                with self._lock:
+                    self.stats["errors"] += 1
+
+    def get_or_generate(self, model_id, params, prompt, generate, should_store=None):
+        """
+        캐시에 있으면 저장된 응답을, 없으면 generate()를 호출한 결과를 저장하고 반환합니다.
+        generate()에서 난 예외는 그대로 전파되며 저장하지 않습니다.
+        should_store(응답)가 False를 돌려주는 응답(오류 메시지 등)도 저장하지 않습니다.
+        """
+        if not self.enabled:
+            return generate()
+
+        key = self.make_key(model_id, params, prompt)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        value = generate()
+        if value and (should_store is None or should_store(value)):
+            self.set(key, value)
+        return value
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        if self._disk is not None:
+            stats["disk_bytes"] = self._disk.volume()
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        disk = self._disk_cache()
+        if disk is not None:
+            disk.clear()
+
+
+# 프로세스 공용 캐시 (환경변수로 설정)
+llm_cache = LLMCache(
+    directory=os.getenv("LLM_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache")),
+    memory_size=int(os.getenv("LLM_CACHE_MEMORY_SIZE", "1024")),
+    ttl=float(os.getenv("LLM_CACHE_TTL", str(60 * 60 * 24))),
+    disk_size_limit=int(os.getenv("LLM_CACHE_DISK_BYTES", str(256 * 1024 * 1024))),
+    enabled=os.getenv("LLM_CACHE_ENABLED", "1") != "0",
+)
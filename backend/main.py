@@ -1,59 +1,50 @@
-import threading
-import time
 from contextlib import asynccontextmanager
-from typing import Dict, List, Optional, Any
-from fastapi import FastAPI, Depends, HTTPException, Query, status
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Union
+from fastapi import FastAPI, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
 
-from database import engine, SessionLocal
+import database
+from database import engine, read_engine, SessionLocal, ReadSessionLocal
 from models import Base, Article, Issue, User
-from schemas import ArticleResponse, IssueResponse, UserCreateRequest, UserLoginRequest, UserResponse, LogViewRequest, UserUpdate
-from scraper import run_article_crawler
-from crud import create_article, create_user, get_user, increase_user_interest
-from ai_processor import process_news_pipeline 
-from search_agent import search_wikipedia, search_issues_by_keyword, search_hot_topics_by_keyword, search_articles_by_keyword
-
-# --- [백그라운드 워커] 주기적으로 뉴스 수집 & AI 분석 ---
-def run_background_worker():
-    print("🚀 [System] 백그라운드 워커 가동 시작")
-    while True:
-        print("\n⏰ [Auto] 뉴스 수집 및 분석 사이클 시작...")
-            
-        # 1. 뉴스 수집 (DB 연결)
-        db = SessionLocal()
-        try:
-            # 스마트 수집 (중복 만나면 중단)
-            # news_list = crawl_breaking_news(limit=20, db_check_session=db)
-            news_list = run_article_crawler([], False)
-            count = 0
-            for news in news_list:
-                # 기사 db에 저장
-                if create_article(db, news):
-                    count += 1
-                pass
-            print(f"   -> {count}개의 신규 기사 저장 완료")
-        finally:
-            db.close()
-
-        # 2. AI 파이프라인 가동 (신규 기사가 있든 없든, 분석 대기 중인 게 있을 수 있으므로 실행)
-        process_news_pipeline()
-        
-        # 10분(600초) 대기
-        print("💤 [Sleep] 10분 대기 중...")
-        time.sleep(600)
+from schemas import ArticleResponse, ArticleSummary, IssueResponse, IssueSummary, IssueDetailSummary, FeedResponse, UserCreateRequest, UserLoginRequest, UserResponse, LogViewRequest, UserUpdate
+from crud import create_user, get_user, increase_user_interest
+from search_agent import run_comprehensive_search
+import search_service
+from search_service import ensure_search_index
+from llm_cache import llm_cache
+from wiki_client import wiki_client
+from pipeline import PipelineScheduler
+from migrations import run_migrations
+from pagination import NEXT_CURSOR_HEADER, paginate
+import projections
+from projections import MAX_SNIPPET_CHARS, VIEW_PATTERN
+from interest_buffer import InterestBuffer
+from feed_service import feed_service
+from keyword_matcher import keyword_matcher
 
 # --- [FastAPI 앱 설정] ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 앱 시작 시 DB 테이블 생성
     Base.metadata.create_all(bind=engine)
-    
-    # 백그라운드 스레드 시작
-    worker_thread = threading.Thread(target=run_background_worker, daemon=True)
-    worker_thread.start()
+    # 기존 DB에 필요한 스키마 변경(인덱스 등) 적용
+    run_migrations(engine)
+    # 키워드 검색용 전문 검색(FTS5) 색인 준비
+    ensure_search_index(engine)
+    
+    # 수집 -> 임베딩 -> 군집화 -> 기사 생성 파이프라인 시작 (리더 프로세스 하나만 실제 작업 수행)
+    app.state.pipeline = PipelineScheduler.from_env()
+    app.state.pipeline.start()
+    # 기사 클릭(관심사 카운트)을 모아서 저장하는 쓰기 지연 버퍼
+    # (저장되면 그 사용자들의 피드 캐시를 지웁니다)
+    app.state.interest_buffer = InterestBuffer.from_env(SessionLocal, on_flush=feed_service.invalidate_many)
+    app.state.interest_buffer.start()
     
     yield
+    app.state.pipeline.shutdown()
+    # 버퍼에 남은 클릭 저장
+    app.state.interest_buffer.shutdown()
     print("👋 서버 종료")
 
 app = FastAPI(lifespan=lifespan)
@@ -72,6 +63,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # 브라우저에서 다음 페이지 커서를 읽을 수 있게
 )
 #--------------------------------------------------
 
@@ -84,16 +76,24 @@ def get_db():
     finally:
         db.close()
 
+# 조회 전용 GET API용 세션 의존성 (DATABASE_READ_URL 복제본이 있으면 거기서 읽음)
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 # --- [API 엔드포인트] ---
 
 # 통합 검색 엔드포인트
 @app.get("/api/comprehensive-search")
-def comprehensive_search(
+async def comprehensive_search(
     keyword: str = Query(..., min_length=1, description="검색어"),
-    db: Session = Depends(get_db)
 ):
     """
     통합 검색 API: 위키피디아, AI 요약, 핫토픽, 관련 기사를 한 번에 반환합니다.
+    네 섹션은 동시에 실행되며, 제한 시간을 넘긴 섹션은 비운 채로(부분 결과) 응답합니다.
     
     Returns:
         keyword (str): 검색 키워드
@@ -101,57 +101,124 @@ def comprehensive_search(
         ai_summaries (list): AI가 요약한 관련 이슈 목록
         hot_topics (list): 이미지가 포함된 실시간 핫토픽 기사 목록
         articles (list): 이미지 여부와 무관한 최신 관련 기사 목록 (Related News용)
+        failed_sections (list): 시간 초과/오류로 비어 있거나 AI 요약을 만들지 못한 섹션 이름 목록 (이런 응답은 캐시하지 않음)
     """
     
-    # 1. 위키피디아 검색 (외부 API)
-    wiki_info = search_wikipedia(keyword)
-    
-    # 2. AI 이슈 요약 검색 (DB: Issue)
-    ai_summaries = search_issues_by_keyword(db, keyword)
-    
-    # 3. 핫토픽 검색 (DB: Article, 이미지 포함 & 조회수/최신순)
-    hot_topics = search_hot_topics_by_keyword(db, keyword)
-    
-    # 4. 관련 기사 검색 (DB: Article, 최신순)
-    articles = search_articles_by_keyword(db, keyword)
-    
-    return {
-        "keyword": keyword,
-        "definition": wiki_info,
-        "ai_summaries": ai_summaries,
-        "hot_topics": hot_topics,
-        "articles": articles
-    }
+    # DB 세션은 섹션마다 따로 열어야 하므로 get_read_db 대신 (조회 전용) 세션 생성기를 넘깁니다.
+    return await run_comprehensive_search(keyword, ReadSessionLocal)
 
 
 
+# LLM 응답 캐시 상태 (적중률, 항목 수 등)
+@app.get("/metrics/llm-cache")
+def get_llm_cache_metrics():
+    """
+    LLM 응답 캐시의 메모리/디스크 적중 수, 미스 수, 적중률을 반환합니다.
+    """
+    return llm_cache.metrics()
+
+# 파이프라인 단계별 지연/처리량
+@app.get("/metrics/pipeline")
+def get_pipeline_metrics():
+    """
+    파이프라인 리더 프로세스, 단계별 대기/실행 중 작업 수, 지연(가장 오래 기다린 작업), 최근 1시간 처리량을 반환합니다.
+    """
+    return app.state.pipeline.metrics()
+
+# 위키피디아 조회 캐시 상태
+@app.get("/metrics/wikipedia")
+def get_wikipedia_metrics():
+    """
+    위키피디아 클라이언트의 캐시 적중(fresh/stale), 미스, 실제 요청 수를 반환합니다.
+    """
+    return wiki_client.metrics()
+
+# 기사 클릭(관심사 카운트) 쓰기 지연 버퍼 상태
+@app.get("/metrics/interest-buffer")
+def get_interest_buffer_metrics():
+    """
+    저장 대기 중인 클릭 수(depth_events), 가장 오래 기다린 시간, flush 횟수와 지연(최근/평균/최대 ms)을 반환합니다.
+    """
+    return app.state.interest_buffer.metrics()
+
+# 개인화 피드 색인/캐시 상태
+@app.get("/metrics/feed")
+def get_feed_metrics():
+    """
+    피드 색인에 들어 있는 최근 기사 수, 사용자별 순위 캐시 적중/미스/무효화 수를 반환합니다.
+    """
+    return feed_service.metrics()
+
+# DB 커넥션 풀 상태
+@app.get("/metrics/database")
+def get_database_metrics():
+    """
+    DB 커넥션 풀 상태 (이 워커 프로세스 기준): 기본 엔진과 읽기 복제본(설정된 경우)
+    """
+    status = {"primary": database.pool_status(engine)}
+    if read_engine is not engine:
+        status["replica"] = database.pool_status(read_engine)
+    return status
+
+# 구독 키워드 매칭 상태
+@app.get("/metrics/keyword-matcher")
+def get_keyword_matcher_metrics():
+    """
+    구독 키워드 수, 오토마톤 재구성 횟수/시간, 매칭한 기사 수와 매칭된 사용자 수를 반환합니다.
+    """
+    return keyword_matcher.metrics()
+
+
+def _paginate_or_400(query, sort_column, id_column, cursor, skip, limit):
+    try:
+        return paginate(query, sort_column, id_column, cursor=cursor, skip=skip, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _list_response(kind, view, rows, next_cursor=None):
+    # 목록은 스키마 직렬화기로 바로 JSON 바이트를 만듭니다. (view에 따라 스키마가 달라서 response_model 대신)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return Response(projections.dump_json(kind, view, rows), media_type="application/json", headers=headers)
+
+
+VIEW_DESCRIPTION = "응답 형태 (full: 전체 필드, summary: 본문 없이 목록용 필드만)"
+SNIPPET_DESCRIPTION = "view=summary일 때 본문 앞부분을 몇 글자 포함할지 (0이면 생략)"
+
+
 # 이슈 목록 가져오기 (히스토리)
-@app.get("/issues", response_model=List[IssueResponse])
+@app.get("/issues", response_model=Union[List[IssueResponse], List[IssueSummary]])
 def get_issues(
     skip: int = 0,    # [추가] 앞에서부터 몇 개를 건너뛸지
     limit: int = 10,  # 몇 개를 가져올지
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,  # 이전 응답의 X-Next-Cursor 값
+    view: str = Query("full", pattern=VIEW_PATTERN, description=VIEW_DESCRIPTION),
+    snippet: int = Query(0, ge=0, le=MAX_SNIPPET_CHARS, description=SNIPPET_DESCRIPTION),
+    db: Session = Depends(get_read_db)
 ):
     """
     AI가 생성한 기사들을 가져옵니다.
     
     **skip**: 앞에서부터 건너뛸 데이터의 개수 (페이지 번호 구현 시 사용)<br/>
     **limit**: 한 번에 가져올 최대 데이터 개수 (페이지 당 목록 수)<br/>
+    **cursor**: 이전 응답 헤더 X-Next-Cursor 값. 주면 skip 대신 그 다음부터 가져옵니다. (뒤쪽 페이지도 빠름)<br/>
+    **view**: full(기본, 전체 필드) / summary(id, 제목, 생성 시각 + 선택적으로 snippet)<br/>
+    **snippet**: summary일 때 내용 앞부분 글자 수<br/>
     
     """
-    
-    return db.query(Issue)\
-        .order_by(Issue.created_at.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    query = projections.issue_list_query(db, view, snippet)
+    issues, next_cursor = _paginate_or_400(query, Issue.created_at, Issue.id, cursor, skip, limit)
+    return _list_response("issue", view, issues, next_cursor)
         
 @app.get("/issues/search")
 def search_issues(
     keyword: str = Query(..., min_length=1, description="검색어"),
     skip: int = 0,   # 앞에서부터 몇 개를 건너뛸지 (0이면 처음부터)
     limit: int = 20, # 최대 몇 개를 가져올지 (기본값 20개)
-    db: Session = Depends(get_db)
+    order: str = Query("time", pattern="^(time|rank)$", description="정렬 (time: 최신순, rank: 관련도순)"),
+    view: str = Query("full", pattern=VIEW_PATTERN, description=VIEW_DESCRIPTION),
+    snippet: int = Query(0, ge=0, le=MAX_SNIPPET_CHARS, description=SNIPPET_DESCRIPTION),
+    db: Session = Depends(get_read_db)
 ):
     """
     AI가 생성한 기사에서 '내용(contents)' 또는 '제목(title)'에 키워드가 포함된 이슈를 찾습니다.
@@ -159,40 +226,40 @@ def search_issues(
     **keyword**: 검색할 키워드.<br/>
     **skip**: 앞에서부터 건너뛸 데이터의 개수 (페이지 번호 구현 시 사용)<br/>
     **limit**: 한 번에 가져올 최대 데이터 개수 (페이지 당 목록 수)<br/>
+    **order**: 정렬 방식 (time: 최신순, rank: 관련도순)<br/>
+    **view**: full(기본) / summary(id, 제목, 생성 시각 + 선택적으로 snippet)<br/>
     """
     
-    search_pattern = f"%{keyword}%"
-
-    # 1. DB에서 이슈 검색
-    results = db.query(Issue).filter(
-        or_(
-            Issue.title.ilike(search_pattern),
-            Issue.contents.ilike(search_pattern)
+    # 전문 검색 색인(FTS5)으로 이슈 검색 (결과가 없으면 빈 리스트)
+    if view == projections.VIEW_SUMMARY:
+        issues = search_service.search_issues(
+            db, keyword, skip=skip, limit=limit, order=order, columns=projections.issue_columns(snippet)
         )
-    )\
-    .offset(skip)\
-    .limit(limit)\
-    .all()
-    
-    # 2. 결과가 있으면 반환 (Cache Hit)
-    if results:
-        return results
-
-    # 3. 결과가 없으면 빈 리스트 반환
-    return []
+        return _list_response("issue", view, issues)
+    return search_service.search_issues(db, keyword, skip=skip, limit=limit, order=order)
 
 @app.get("/issues/{issue_id}")
 def get_issue_detail(
     issue_id: int, 
-    db: Session = Depends(get_db)
+    view: str = Query("full", pattern=VIEW_PATTERN, description=VIEW_DESCRIPTION),
+    snippet: int = Query(0, ge=0, le=MAX_SNIPPET_CHARS, description=SNIPPET_DESCRIPTION),
+    db: Session = Depends(get_read_db)
 ):
     """
     AI가 생성한 기사 중 특정 ID에 해당하는 기사를 가져옵니다.
     
-    **issue_id**: AI가 생성한 기사의 ID.
+    **issue_id**: AI가 생성한 기사의 ID.<br/>
+    **view**: full(기본, 관련 기사 본문까지 전체) / summary(관련 기사는 요약 필드만)<br/>
+    **snippet**: summary일 때 관련 기사 본문 앞부분 글자 수
     
     """
-    
+    if view == projections.VIEW_SUMMARY:
+        issue = db.query(Issue).filter(Issue.id == issue_id).first()
+        if not issue:
+            raise HTTPException(status_code=404, detail="해당 이슈를 찾을 수 없습니다.")
+        articles = projections.issue_article_summaries(db, issue_id, snippet)
+        return Response(projections.dump_issue_summary(issue, articles), media_type="application/json")
+
     # 1. 이슈를 찾으면서 + 연관된 articles도 같이 로딩(joinedload)
     issue = db.query(Issue)\
         .options(joinedload(Issue.articles))\
@@ -206,30 +273,34 @@ def get_issue_detail(
     return issue
 
 # 개별 기사 목록 (디버깅용)
-@app.get("/articles", response_model=List[ArticleResponse])
+@app.get("/articles", response_model=Union[List[ArticleResponse], List[ArticleSummary]])
 def get_articles(
     skip: int = 0,    # [추가]
     limit: int = 20, 
     category: Optional[str] = None, 
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,  # 이전 응답의 X-Next-Cursor 값
+    view: str = Query("full", pattern=VIEW_PATTERN, description=VIEW_DESCRIPTION),
+    snippet: int = Query(0, ge=0, le=MAX_SNIPPET_CHARS, description=SNIPPET_DESCRIPTION),
+    db: Session = Depends(get_read_db)
 ):
     """
     크롤링한 기사들을 가져옵니다.
     
     **skip**: 앞에서부터 건너뛸 데이터의 개수 (페이지 번호 구현 시 사용)<br/>
     **limit**: 한 번에 가져올 최대 데이터 개수 (페이지 당 목록 수)<br/>
-    **category**: 한정할 카테고리 이름 (옵션)
+    **category**: 한정할 카테고리 이름 (옵션)<br/>
+    **cursor**: 이전 응답 헤더 X-Next-Cursor 값. 주면 skip 대신 그 다음부터 가져옵니다. (뒤쪽 페이지도 빠름)<br/>
+    **view**: full(기본, 본문/이미지 포함) / summary(목록용 필드만, 본문 제외)<br/>
+    **snippet**: summary일 때 본문 앞부분 글자 수
     """
-    query = db.query(Article)
+    query = projections.article_list_query(db, view, snippet)
     
     if category:
         query = query.filter(Article.category == category)
         
-    # 정렬 -> 건너뛰기(skip) -> 자르기(limit) 순서로 실행
-    return query.order_by(Article.time.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    # 정렬(time, id) -> 건너뛰기(skip 또는 커서) -> 자르기(limit) 순서로 실행
+    articles, next_cursor = _paginate_or_400(query, Article.time, Article.id, cursor, skip, limit)
+    return _list_response("article", view, articles, next_cursor)
 
 @app.get("/articles/search")
 def search_articles(
@@ -237,7 +308,10 @@ def search_articles(
     category: Optional[str] = None,  # [옵션] 특정 카테고리 내에서 검색
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    order: str = Query("time", pattern="^(time|rank)$", description="정렬 (time: 최신순, rank: 관련도순)"),
+    view: str = Query("full", pattern=VIEW_PATTERN, description=VIEW_DESCRIPTION),
+    snippet: int = Query(0, ge=0, le=MAX_SNIPPET_CHARS, description=SNIPPET_DESCRIPTION),
+    db: Session = Depends(get_read_db)
 ):
     """
     크롤링한 기사들에서 '내용(contents)' 또는 '제목(title)'에 키워드가 포함된 이슈를 찾습니다.
@@ -246,37 +320,26 @@ def search_articles(
     **category**: (선택) 특정 카테고리 필터링<br/>
     **skip**: 앞에서부터 건너뛸 데이터의 개수 (페이지 번호 구현 시 사용)<br/>
     **limit**: 한 번에 가져올 최대 데이터 개수 (페이지 당 목록 수)<br/>
+    **order**: 정렬 방식 (time: 최신순, rank: 관련도순)<br/>
+    **view**: full(기본) / summary(목록용 필드만, 본문 제외)<br/>
     """
     
-    # 1. 쿼리 객체 생성
-    query = db.query(Article)
-    
-    # 2. 카테고리 필터가 있다면 먼저 적용 (범위를 좁혀주므로 성능에 유리)
-    if category:
-        query = query.filter(Article.category == category)
-        
-    # 3. 키워드 검색 적용 (제목 OR 본문)
-    search_pattern = f"%{keyword}%"
-    query = query.filter(
-        or_(
-            Article.title.ilike(search_pattern),
-            Article.contents.ilike(search_pattern)
+    # 전문 검색 색인(FTS5) + 카테고리 필터 + 정렬 + 페이징
+    if view == projections.VIEW_SUMMARY:
+        articles = search_service.search_articles(
+            db, keyword, category=category, skip=skip, limit=limit, order=order,
+            columns=projections.article_columns(snippet),
         )
+        return _list_response("article", view, articles)
+    return search_service.search_articles(
+        db, keyword, category=category, skip=skip, limit=limit, order=order
     )
-    
-    # 4. 최신순 정렬 + 페이징 적용 후 실행
-    results = query.order_by(Article.time.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
-        
-    return results
 
 
 @app.get("/articles/{article_id}")
 def get_article(
     article_id: int,           # URL의 {article_id}가 여기로 들어옵니다.
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     크롤링한 기사들 중 특정 ID에 해당하는 기사를 가져옵니다.
@@ -310,22 +373,52 @@ def signup(user: UserCreateRequest, db: Session = Depends(get_db)):
         )
 
     # 3. 중복이 아니면 가입 진행
-    return create_user(db, user.model_dump())
+    new_user = create_user(db, user.model_dump())
+    keyword_matcher.set_user_keywords(new_user.login_id, new_user.subscribed_keywords)
+    return new_user
 
 # 사용자 조회 엔드포인트
 @app.get("/users/{login_id}", response_model=UserResponse)
-def read_user(login_id: str, db: Session = Depends(get_db)):
+def read_user(login_id: str, db: Session = Depends(get_read_db)):
     """
     특정 사용자 ID의 정보를 가져옵니다.
     """
     return get_user(db, login_id)
 
+# 개인화 피드
+@app.get("/users/{login_id}/feed", response_model=FeedResponse)
+def read_user_feed(
+    login_id: str,
+    limit: int = Query(20, ge=1, le=feed_service.top_k, description="기사 수"),
+    issues: int = Query(5, ge=0, le=50, description="이슈 수"),
+    snippet: int = Query(0, ge=0, le=MAX_SNIPPET_CHARS, description="본문/내용 앞부분 글자 수 (0이면 생략)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    사용자의 구독 카테고리/키워드와 읽은 횟수로 최근 기사와 이슈에 점수를 매겨 높은 순으로 돌려줍니다.
+    
+    **limit**: 가져올 기사 수<br/>
+    **issues**: 가져올 이슈 수<br/>
+    **snippet**: 본문 앞부분 글자 수<br/>
+    
+    관심사가 없는 사용자는 최신순입니다. 순위는 사용자별로 캐시되며, 읽은 횟수/구독 정보가 바뀌거나 새 기사가 들어오면 다시 계산합니다.
+    """
+    user = db.query(User).filter(User.login_id == login_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="해당 아이디의 유저를 찾을 수 없습니다.")
+    return feed_service.feed(db, user, limit=limit, issues=issues, snippet=snippet)
+
 # 사용자가 기사를 클릭했을때 호출. 카테고리, 키워드 횟수 증가
 @app.post("/increase_user_interest")
 def log_article_view(request: LogViewRequest, db: Session = Depends(get_db)):
     """
     사용자가 읽은 카테고리와 키워드를 업데이트합니다.
+    클릭은 버퍼에 모았다가 잠시 후(INTEREST_FLUSH_MS) 한꺼번에 저장하므로 바로 응답합니다. (queued: true)
+    이때 없는 사용자의 클릭은 저장 시점에 버려집니다.
     """
+    buffer = app.state.interest_buffer
+    if buffer.enabled and buffer.add(request.login_id, request.category, request.keywords):
+        return {"message": "Interest queued", "success": True, "queued": True}
     
     updated_user = increase_user_interest(
         db=db,
@@ -336,6 +429,7 @@ def log_article_view(request: LogViewRequest, db: Session = Depends(get_db)):
     
     if not updated_user:
         return {"message": "User not found", "success": False}
+    feed_service.invalidate(request.login_id)
         
     return {"message": "Interest updated", "success": True}
 
@@ -397,6 +491,9 @@ def update_user_simple(
             user.password_hash = value  
         else:
             setattr(user, key, value)
+    if "subscribed_keywords" in update_data:
+        # 다른 워커 프로세스의 keyword_matcher.sync가 바뀐 사용자만 읽어 가도록 표시
+        user.keywords_updated_at = datetime.now()
 
     # 3. 저장
     try:
@@ -405,5 +502,10 @@ def update_user_simple(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail="DB 업데이트 실패")
+    # 구독 정보가 바뀌었을 수 있으므로 피드 다시 계산
+    feed_service.invalidate(login_id)
+    if "subscribed_keywords" in update_data:
+        # 새 기사 알림용 키워드 오토마톤에 바로 반영
+        keyword_matcher.set_user_keywords(login_id, user.subscribed_keywords)
 
     return {"message": f"'{login_id}'님의 정보가 수정되었습니다."}
@@ -0,0 +1,153 @@
+# migrations.py
+"""
+스키마 변경(마이그레이션) 단계.
+
+Base.metadata.create_all은 없는 테이블만 만들고 기존 테이블에는 인덱스/컬럼을 추가하지 않으므로,
+이미 운영 중인 DB에 필요한 변경은 여기서 번호 순서대로 한 번씩 적용합니다.
+적용한 번호는 schema_migrations 테이블에 남습니다. (여러 번 실행해도 안전)
+
+실행:
+    앱 시작 시 자동 (main.lifespan)
+    python -m migrations            # 수동 적용
+    python -m migrations --status   # 적용 현황
+"""
+import argparse
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _create_indexes(conn, indexes):
+    """[(인덱스 이름, 테이블, [컬럼])] 중 없는 것만 만듭니다. (models의 Table에 Index를 붙이면 create_all이 만들어 버리므로 DDL로 직접)"""
+    existing = {}
+    for name, table, columns in indexes:
+        if table not in existing:
+            existing[table] = {ix["name"] for ix in inspect(conn).get_indexes(table)}
+        if name not in existing[table]:
+            print(f"   [Migration] 인덱스 생성: {name}")
+            # 여러 워커가 동시에 시작해도 겹치지 않도록 지원하는 DB에서는 IF NOT EXISTS (MySQL은 미지원)
+            if_not_exists = "" if conn.dialect.name in ("mysql", "mariadb") else "IF NOT EXISTS "
+            conn.execute(text(f"CREATE INDEX {if_not_exists}{name} ON {table} ({', '.join(columns)})"))
+
+
+def _listing_indexes(conn):
+    # 목록 API의 정렬/키셋 페이지네이션 (time, id) / (created_at, id) 와 카테고리 필터, 이슈별 기사 조회용
+    _create_indexes(conn, [
+        ("ix_articles_time_id", "articles", ["time", "id"]),
+        ("ix_articles_category_time_id", "articles", ["category", "time", "id"]),
+        ("ix_articles_issue_id", "articles", ["issue_id"]),
+        ("ix_issues_created_at_id", "issues", ["created_at", "id"]),
+    ])
+
+
+def _interest_counts(value):
+    """예전 read_categories / read_keywords JSON 값 -> {항목: 횟수} (리스트로 저장된 값은 항목마다 1)"""
+    if isinstance(value, list):
+        return {term: 1 for term in value if term}
+    if isinstance(value, dict):
+        return {term: int(count) for term, count in value.items() if term and count}
+    return {}
+
+
+def _backfill_user_interests(conn):
+    # users.read_categories / read_keywords JSON -> user_interests 행 (이미 옮겨진 사용자는 건너뜀)
+    from models import User, UserInterest
+
+    users = User.__table__
+    interests = UserInterest.__table__
+    interests.create(conn, checkfirst=True)
+    moved = {row[0] for row in conn.execute(select(interests.c.login_id).distinct())}
+
+    rows = []
+    result = conn.execute(select(users.c.login_id, users.c.read_categories, users.c.read_keywords))
+    for login_id, read_categories, read_keywords in result:
+        if login_id in moved:
+            continue
+        for kind, value in (("category", read_categories), ("keyword", read_keywords)):
+            rows.extend(
+                {"login_id": login_id, "kind": kind, "term": term, "count": count}
+                for term, count in _interest_counts(value).items()
+            )
+    if rows:
+        conn.execute(interests.insert(), rows)
+    print(f"   [Migration] user_interests 행 {len(rows)}개 옮김")
+
+
+def _users_keywords_updated_at(conn):
+    # 구독 키워드가 바뀐 사용자만 읽는 증분 동기화(keyword_matcher.sync)용 컬럼과 인덱스
+    # (기존 행은 NULL로 두며, 시작할 때의 전체 동기화에서 읽힘)
+    columns = {column["name"] for column in inspect(conn).get_columns("users")}
+    if "keywords_updated_at" not in columns:
+        print("   [Migration] 컬럼 추가: users.keywords_updated_at")
+        conn.execute(text(f"ALTER TABLE users ADD COLUMN keywords_updated_at {DateTime().compile(dialect=conn.dialect)}"))
+    _create_indexes(conn, [("ix_users_keywords_updated_at", "users", ["keywords_updated_at"])])
+
+
+# (번호, 이름, 적용 함수(conn)). 번호는 늘리기만 하고, 이미 배포된 단계는 고치지 않습니다.
+MIGRATIONS = [
+    (1, "listing_indexes", _listing_indexes),
+    (2, "user_interests_backfill", _backfill_user_interests),
+    (3, "users_keywords_updated_at", _users_keywords_updated_at),
+]
+
+
+def applied_versions(conn):
+    return {row[0] for row in conn.execute(schema_migrations.select().with_only_columns(schema_migrations.c.version))}
+
+
+def run_migrations(engine):
+    """아직 적용하지 않은 단계를 순서대로 적용합니다. 단계마다 한 트랜잭션. 반환값: 적용한 번호 리스트"""
+    _meta.create_all(engine)
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+
+    applied = []
+    for version, name, step in MIGRATIONS:
+        if version in done:
+            continue
+        print(f"🛠️ [Migration] {version:03d}_{name} 적용 중...")
+        try:
+            with engine.begin() as conn:
+                step(conn)
+                conn.execute(schema_migrations.insert().values(version=version, name=name, applied_at=datetime.now()))
+        except IntegrityError:
+            # 다른 워커 프로세스가 같은 단계를 먼저 적용함
+            print(f"   [Migration] {version:03d}_{name}은(는) 다른 프로세스가 이미 적용했습니다.")
+            continue
+        applied.append(version)
+    return applied
+
+
+def main():
+    from database import engine
+    from models import Base
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--status", action="store_true", help="적용 현황만 출력")
+    args = parser.parse_args()
+
+    if args.status:
+        _meta.create_all(engine)
+        with engine.connect() as conn:
+            done = applied_versions(conn)
+        for version, name, _ in MIGRATIONS:
+            print(f"{'✅' if version in done else '⏳'} {version:03d}_{name}")
+        return
+
+    Base.metadata.create_all(bind=engine)
+    applied = run_migrations(engine)
+    print(f"✅ [Migration] {len(applied)}개 단계 적용" if applied else "✅ [Migration] 최신 상태입니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from sqlalchemy import (
     ForeignKey,
     DateTime,
     JSON,
+    PrimaryKeyConstraint,
 )  # <--- JSON 임포트 필수!
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
@@ -17,12 +18,17 @@ from datetime import datetime
 Base = declarative_base()
 
 
+def _varchar(length):
+    # 길이 없는 String은 SQLite/PostgreSQL에서는 그대로 쓰고, 길이가 필요한 MySQL에서만 VARCHAR(length)
+    return String().with_variant(String(length), "mysql", "mariadb")
+
+
 # 이슈(Cluster) 테이블: AI가 분석한 주제 그룹
 class Issue(Base):
     __tablename__ = "issues"
 
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String)
+    title = Column(_varchar(500))
     contents = Column(Text)
     analysis_result = Column(JSON, nullable=True)
 
@@ -35,14 +41,14 @@ class Article(Base):
     __tablename__ = "articles"
 
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String)  # 기사 제목
+    title = Column(_varchar(500))  # 기사 제목
     contents = Column(Text)  # 기사 본문
-    category = Column(String)  # 카테고리
-    url = Column(String, unique=True)  # 기사 링크 (중복 수집 방지)
-    company_name = Column(String)  # 언론사 (예: 조선일보, 한겨레)
+    category = Column(_varchar(100))  # 카테고리
+    url = Column(_varchar(768), unique=True)  # 기사 링크 (중복 수집 방지)
+    company_name = Column(_varchar(100))  # 언론사 (예: 조선일보, 한겨레)
     img_urls = Column(JSON, nullable=True)  # 기사 이미지 리스트
     time = Column(DateTime)  # 기사 발행 시간
-    author = Column(String)  # 기자
+    author = Column(_varchar(255))  # 기자
 
     # 외래키: 이 기사가 어떤 이슈(Issue)에 속하는지 연결
     issue_id = Column(Integer, ForeignKey("issues.id"))
@@ -80,9 +86,11 @@ class User(Base):
     subscribed_keywords = Column(JSON, default=[])
 
     # read_categories JSON ({'정치': 37, '경제': 26})
+    # 읽은 횟수는 user_interests 테이블에 쌓습니다. 이 컬럼은 예전 데이터(마이그레이션 002에서 옮김)로만 남아 있고,
+    # 조회 시 crud.get_user가 user_interests 값으로 채워서 돌려줍니다.
     read_categories = Column(JSON, default={})
 
-    # read_keywords JSON ({'삼성전자': 37, 'AI': 26})
+    # read_keywords JSON ({'삼성전자': 37, 'AI': 26}) (read_categories와 동일)
     read_keywords = Column(JSON, default={})
 
     # fcm_token VARCHAR(255)
@@ -100,3 +108,33 @@ class User(Base):
     # user_status TINYINT DEFAULT 1 (1:정상, 0:휴면, -1:탈퇴)
     # SQLAlchemy에서는 보통 Integer로 처리하거나 SmallInteger를 사용합니다.
     user_status = Column(Integer, default=1)
+
+    # subscribed_keywords를 마지막으로 바꾼 시각 (keyword_matcher.sync가 바뀐 사용자만 읽는 기준, 마이그레이션 003)
+    keywords_updated_at = Column(DateTime, default=datetime.now)
+
+
+# 사용자 관심사(읽은 카테고리/키워드) 카운트 테이블
+# 기사 클릭마다 (login_id, kind, term) 한 행의 count만 원자적으로 +1 합니다. (crud.increase_user_interest)
+class UserInterest(Base):
+    __tablename__ = "user_interests"
+
+    login_id = Column(String(50), ForeignKey("users.login_id"), nullable=False)
+    # "category" 또는 "keyword"
+    kind = Column(String(20), nullable=False)
+    term = Column(String(255), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (PrimaryKeyConstraint("login_id", "kind", "term"),)
+
+
+# 키워드 알림 전송 기록 (기사 id 범위, 사용자)
+# 같은 범위의 notify 작업이 재시도돼도 이미 보낸 사용자에게 다시 보내지 않습니다. (keyword_matcher.notify_matches)
+class SentNotification(Base):
+    __tablename__ = "sent_notifications"
+
+    min_id = Column(Integer, nullable=False)
+    max_id = Column(Integer, nullable=False)
+    login_id = Column(String(50), nullable=False)
+    sent_at = Column(DateTime, default=datetime.now, nullable=False, index=True)
+
+    __table_args__ = (PrimaryKeyConstraint("min_id", "max_id", "login_id"),)
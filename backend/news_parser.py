@@ -0,0 +1,288 @@
+# news_parser.py
+"""
+네이버 기사 상세 페이지 추출기 (교체 가능한 파싱 백엔드).
+
+- bs4: 기존 BeautifulSoup(html.parser) 구현 (기준 구현)
+- lxml: libxml2 파서 + 미리 컴파일한 XPath, 필요한 노드만 찾아 직접 텍스트를 모음
+- selectolax: lexbor 파서 + CSS 선택자, 본문 영역만 정리해서 텍스트를 모음
+
+세 백엔드 모두 get_text 규칙을 똑같이 따라 같은 dict를 만듭니다.
+(script/style/template/rt/rp 안의 문자열과 주석은 제외, 문자열마다 strip 후 빈 문자열은 버리고 구분자로 연결)
+lxml / selectolax는 선택 설치 패키지이며, 없으면 NEWS_PARSER_BACKEND=auto가 bs4로 대체합니다.
+"""
+import os
+import re
+import threading
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+BACKENDS = ("bs4", "lxml", "selectolax")
+# auto 선택 우선순위 (빠른 순)
+AUTO_ORDER = ("selectolax", "lxml", "bs4")
+
+# get_text가 건너뛰는 태그 (bs4의 Script/Stylesheet/TemplateString/RubyText 문자열)
+SKIP_TEXT_TAGS = frozenset(["script", "style", "template", "rt", "rp"])
+# 정제된 본문(contents)에서 추가로 빼는 요소
+CONTENT_NOISE_SELECTOR = ".img_desc, .article_caption, em, script, style"
+
+
+# 기사에 한글 비중이 25%이하면 무시합니다.
+def is_korean_article(text, threshold=0.25):
+    if not text:
+        return False
+    korean_chars = re.findall(r"[가-힣]", text)
+    total_chars = len(text.replace(" ", ""))
+    if total_chars == 0:
+        return False
+    return (len(korean_chars) / total_chars) >= threshold
+
+
+def _find_author(author, raw_content_text):
+    # 2순위: 레이아웃에 없을 경우 본문 텍스트 내에서 패턴 매칭 (KBS, 연합뉴스 등 대응)
+    if (author == "기자 미상" or not author) and raw_content_text:
+        # 패턴 A: 이메일 앞의 이름 추출 (예: 홍길동 기자 abc@kbs.co.kr)
+        email_match = re.search(r"([가-힣]{2,4})\s?(?:기자)?\s?[\w\.-]+@[\w\.-]+", raw_content_text)
+        # 패턴 B: 본문 하단 'OOO 기자' 문구 추출
+        name_match = re.search(r"([가-힣]{2,4})\s?기자", raw_content_text)
+
+        if email_match:
+            author = email_match.group(1).strip()
+        elif name_match:
+            author = name_match.group(1).strip()
+    return author
+
+
+def _result(url, title, company_name, time_val, author, contents, img_urls):
+    return {
+        "title": title,
+        "time": time_val,  # 날짜
+        "company_name": company_name,  # 언론사
+        "author": author,  # 기자
+        "contents": contents,  # 본문
+        "img_urls": img_urls,  # 이미지
+        "url": url,  # 링크
+        # 상단 섹션 표기(.media_end_head_top_channel_layer_text)는 쓰지 않고 run_article_crawler에서 sid로 채웁니다.
+        "category": "미분류" # 카테고리는 run_article_crawler에서 줄 예정.
+    }
+
+
+# --- bs4 (기준 구현) ---
+def parse_bs4(html, url):
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 1. 기사 제목 및 언론사 추출
+    title_el = soup.select_one("h2#title_area span")
+    title = title_el.get_text(strip=True) if title_el else "제목 없음"
+    logo_el = soup.select_one(".media_end_head_top_logo img")
+    company_name = logo_el["title"] if logo_el else "언론사 미상"
+
+    # 2. 기사 시간 추출
+    time_el = soup.select_one(".media_end_head_info_datestamp_time._ARTICLE_DATE_TIME")
+    time_val = time_el["data-date-time"] if time_el and time_el.has_attr("data-date-time") else "시간 정보 없음"
+
+    # 3. 본문 영역 확보 (기자명 추출을 위해 정제 전 원본 텍스트 보관 필요)
+    content_area = soup.select_one("#newsct_article")
+    if not content_area:
+        return None
+    raw_content_text = content_area.get_text(separator=" ", strip=True)
+
+    # 3-2 한글 필터링 적용
+    if not is_korean_article(raw_content_text):
+        return None
+
+    # 4. 기자명: 1순위 네이버 표준 레이아웃(상단 기자명 영역), 2순위 본문 패턴
+    author_el = soup.select_one(".media_end_head_journalist_name")
+    author = _find_author(author_el.get_text(strip=True) if author_el else "기자 미상", raw_content_text)
+
+    # 5. 이미지 URL 리스트 수집
+    img_urls = [
+        img.get("data-src") or img.get("src")
+        for img in soup.select("#newsct_article img")
+        if img.get("data-src") or img.get("src")
+    ]
+
+    # 6. 본문 텍스트 정제 (태그 제거)
+    for extra in content_area.select(CONTENT_NOISE_SELECTOR):
+        extra.decompose()
+    contents = content_area.get_text(separator=" ", strip=True)
+
+    return _result(url, title, company_name, time_val, author, contents, img_urls)
+
+
+# --- lxml ---
+if etree is not None:
+    def _cls(name):
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+    _X_TITLE = etree.XPath("//h2[@id='title_area']//span")
+    _X_LOGO = etree.XPath(f"//*[{_cls('media_end_head_top_logo')}]//img")
+    _X_TIME = etree.XPath(f"//*[{_cls('media_end_head_info_datestamp_time')} and {_cls('_ARTICLE_DATE_TIME')}]")
+    _X_CONTENT = etree.XPath("//*[@id='newsct_article']")
+    _X_AUTHOR = etree.XPath(f"//*[{_cls('media_end_head_journalist_name')}]")
+    _X_IMAGES = etree.XPath("//*[@id='newsct_article']//img")
+    _lxml_local = threading.local()
+
+    def _lxml_parser():
+        # lxml 파서 객체는 스레드 간에 공유하지 않습니다.
+        parser = getattr(_lxml_local, "parser", None)
+        if parser is None:
+            parser = _lxml_local.parser = lxml_html.HTMLParser(encoding="utf-8")
+        return parser
+
+    def _is_noise(el):
+        if el.tag in ("em", "script", "style"):
+            return True
+        classes = (el.get("class") or "").split()
+        return "img_desc" in classes or "article_caption" in classes
+
+
+def _lxml_texts(el, out, noise=False):
+    """el 아래 문자열을 문서 순서대로 out에 모읍니다. (건너뛰는 태그의 내용은 빼고 꼬리 텍스트는 유지)"""
+    if el.text:
+        out.append(el.text)
+    for child in el:
+        if not isinstance(child.tag, str):
+            pass  # 주석 등 (주석을 파서에서 지우면 앞뒤 문자열이 합쳐져 bs4와 달라짐)
+        elif child.tag in SKIP_TEXT_TAGS or (noise and _is_noise(child)):
+            pass
+        else:
+            _lxml_texts(child, out, noise)
+        if child.tail:
+            out.append(child.tail)
+    return out
+
+
+def _join(parts, separator):
+    return separator.join(p for p in (s.strip() for s in parts) if p)
+
+
+def parse_lxml(html, url):
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    root = etree.fromstring(html, _lxml_parser())
+    if root is None:
+        return None
+
+    title_el = _X_TITLE(root)
+    title = _join(_lxml_texts(title_el[0], []), "") if title_el else "제목 없음"
+    logo_el = _X_LOGO(root)
+    company_name = logo_el[0].attrib["title"] if logo_el else "언론사 미상"
+
+    time_el = _X_TIME(root)
+    time_val = time_el[0].get("data-date-time") if time_el and "data-date-time" in time_el[0].attrib else "시간 정보 없음"
+
+    content_el = _X_CONTENT(root)
+    if not content_el:
+        return None
+    content_area = content_el[0]
+    raw_content_text = _join(_lxml_texts(content_area, []), " ")
+    if not is_korean_article(raw_content_text):
+        return None
+
+    author_el = _X_AUTHOR(root)
+    author = _find_author(_join(_lxml_texts(author_el[0], []), "") if author_el else "기자 미상", raw_content_text)
+
+    img_urls = [img.get("data-src") or img.get("src") for img in _X_IMAGES(root) if img.get("data-src") or img.get("src")]
+    contents = _join(_lxml_texts(content_area, [], noise=True), " ")
+
+    return _result(url, title, company_name, time_val, author, contents, img_urls)
+
+
+# --- selectolax ---
+def _lexbor_text(node, separator):
+    return _join((n.text_content for n in node.traverse(include_text=True) if n.tag == "-text"), separator)
+
+
+def _lexbor_strip(node, selector):
+    for el in node.css(selector):
+        el.decompose()
+
+
+def parse_selectolax(html, url):
+    tree = LexborHTMLParser(html)
+    skip = ", ".join(sorted(SKIP_TEXT_TAGS))
+
+    def text_of(node):
+        # 제목/기자명 등 작은 요소는 사본에서 건너뛸 태그를 지운 뒤 텍스트를 모읍니다.
+        if node.css_first(skip) is None:
+            return _lexbor_text(node, "")
+        copy = node.clone()
+        _lexbor_strip(copy, skip)
+        return _lexbor_text(copy, "")
+
+    title_el = tree.css_first("h2#title_area span")
+    title = text_of(title_el) if title_el else "제목 없음"
+    logo_el = tree.css_first(".media_end_head_top_logo img")
+    company_name = logo_el.attributes["title"] if logo_el else "언론사 미상"
+
+    time_el = tree.css_first(".media_end_head_info_datestamp_time._ARTICLE_DATE_TIME")
+    time_val = time_el.attributes["data-date-time"] if time_el and "data-date-time" in time_el.attributes else "시간 정보 없음"
+
+    content_area = tree.css_first("#newsct_article")
+    if content_area is None:
+        return None
+
+    author_el = tree.css_first(".media_end_head_journalist_name")
+    author_text = text_of(author_el) if author_el else "기자 미상"
+    img_urls = [
+        img.attributes.get("data-src") or img.attributes.get("src")
+        for img in tree.css("#newsct_article img")
+        if img.attributes.get("data-src") or img.attributes.get("src")
+    ]
+
+    _lexbor_strip(content_area, skip)
+    raw_content_text = _lexbor_text(content_area, " ")
+    if not is_korean_article(raw_content_text):
+        return None
+    author = _find_author(author_text, raw_content_text)
+
+    _lexbor_strip(content_area, CONTENT_NOISE_SELECTOR)
+    contents = _lexbor_text(content_area, " ")
+
+    return _result(url, title, company_name, time_val, author, contents, img_urls)
+
+
+_PARSERS = {"bs4": parse_bs4, "lxml": parse_lxml, "selectolax": parse_selectolax}
+
+
+def available_backends():
+    available = ["bs4"]
+    if etree is not None:
+        available.append("lxml")
+    if LexborHTMLParser is not None:
+        available.append("selectolax")
+    return available
+
+
+def resolve_backend(name="auto"):
+    available = available_backends()
+    if name == "auto":
+        return next(b for b in AUTO_ORDER if b in available)
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 파서 백엔드입니다: {name} (가능: auto, {', '.join(BACKENDS)})")
+    if name not in available:
+        print(f"[파서] {name} 패키지가 없어 bs4로 대신합니다.")
+        return "bs4"
+    return name
+
+
+DEFAULT_BACKEND = resolve_backend(os.getenv("NEWS_PARSER_BACKEND", "auto"))
+
+
+def parse_article(html, url, backend=None):
+    """
+    상세 페이지 HTML(str)에서 기사 dict를 추출합니다. (본문이 없거나 한글 기사가 아니면 None)
+    페이지 구조가 예상과 다르면 예외를 그대로 던집니다. (호출한 쪽에서 처리)
+    """
+    return _PARSERS[backend or DEFAULT_BACKEND](html, url)
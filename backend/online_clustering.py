@@ -0,0 +1,415 @@
+# online_clustering.py
+"""
+온라인(스트리밍) 이슈 군집화.
+
+배치 군집화(run_issue_clustering)는 매 사이클 3일치 미배정 기사 전체를 다시 읽고 다시 군집화합니다.
+온라인 모드에서는 새로 저장된 기사만 처리합니다.
+1) 새 기사 임베딩 -> 기존 이슈 centroid와 비교해 가까우면 바로 배정
+2) 아니면 '대기 중 소군집(micro-cluster)' 중 가장 가까운 곳에 붙이거나 새 소군집을 만듦
+3) 기사 수가 min_size 이상이 된 소군집만 LLM 검증 -> 통과하면 이슈로 저장
+4) 주기적 정리(maintain): 가까워진 이슈/소군집 병합, 이슈에서 멀어진 기사 분리, 오래된 소군집 만료
+대기 소군집과 처리 위치(마지막 기사 id)는 파일로 저장해 재시작 후에도 이어서 처리합니다.
+처리 위치와 상태 파일은 DB 커밋이 성공한 뒤에만 바뀝니다. 중간에 실패하면(임베딩/ChromaDB/LLM 오류 등)
+DB를 롤백하고, 이슈 인덱스에서 바뀐 이슈를 빼고(다음 sync_fn이 DB 기준으로 다시 채움) 소군집은 마지막 저장 상태로 되돌립니다.
+"""
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from sqlalchemy.orm import Session
+
+from cluster_verifier import verify_clusters
+from issue_matcher import IssueCentroidIndex, _normalize_rows
+from models import Article, Issue
+
+INGEST_CHUNK_ROWS = 1000
+
+
+class OnlineClusterer:
+    def __init__(
+        self,
+        issue_index,
+        embeddings,
+        refine_fn,
+        state_dir,
+        check_fn=None,
+        sync_fn=None,
+        days=3,
+        match_threshold=0.85,
+        join_threshold=0.92,
+        min_size=3,
+        merge_threshold=0.92,
+        split_threshold=0.75,
+        maintain_interval=3600,
+        verify_options=None,
+    ):
+        """
+        issue_index: 기존 이슈 centroid 인덱스 (IssueCentroidIndex, 배치 모드와 공유)
+        embeddings: get_matrix(articles) / lookup(ids)를 제공하는 임베딩 캐시 (EmbeddingCache)
+        refine_fn(articles) -> LLM 검증 결과 dict
+        check_fn(articles) -> bool, LLM 검증 전에 거르는 가벼운 검사 (옵션)
+        sync_fn(db, time_threshold): DB 기준으로 issue_index를 채우는 함수 (옵션)
+        """
+        self.issue_index = issue_index
+        self.embeddings = embeddings
+        self.refine_fn = refine_fn
+        self.check_fn = check_fn
+        self.sync_fn = sync_fn
+        self.state_dir = state_dir
+        self.days = days
+        self.match_threshold = match_threshold
+        self.join_threshold = join_threshold
+        self.min_size = min_size
+        self.merge_threshold = merge_threshold
+        self.split_threshold = split_threshold
+        self.maintain_interval = maintain_interval
+        self.verify_options = verify_options or {}
+
+        self.pending = IssueCentroidIndex()  # 소군집 id("p12") -> 기사 임베딩 합/개수
+        self.members = {}  # 소군집 id -> [article_id, ...]
+        self.meta = {}  # 소군집 id -> {"updated": 마지막 기사 추가 시각(ts), "verified_size": 검증 당시 크기}
+        self.article_pending = {}  # article_id -> 소군집 id
+        self.last_article_id = 0  # 여기까지의 기사는 처리 완료
+        self.next_pending_seq = 0
+        self.last_maintained = time.time()
+        self._touched_issues = set()  # 마지막 정리 이후 기사가 붙은 이슈
+        self._touched_pending = set()  # 마지막 정리 이후 기사가 붙은 소군집
+        self._dirty_issues = set()  # 마지막 커밋 이후 issue_index에서 합/개수가 바뀐 이슈 (롤백 시 인덱스에서 뺌)
+        self._index_synced = False
+        self.stats = {"ingested": 0, "matched": 0, "pending_joined": 0, "pending_created": 0, "verified": 0, "issues": 0}
+        self.load_state()
+
+    # --- 상태 저장/복원 ---
+    def _paths(self):
+        return os.path.join(self.state_dir, "pending.npz"), os.path.join(self.state_dir, "state.json")
+
+    def _reset_state(self):
+        self.pending = IssueCentroidIndex()
+        self.members, self.meta, self.article_pending = {}, {}, {}
+        self.last_article_id = 0
+        self.next_pending_seq = 0
+
+    def load_state(self):
+        npz_path, json_path = self._paths()
+        if not (os.path.exists(npz_path) and os.path.exists(json_path)):
+            return
+        with open(json_path, encoding="utf-8") as f:
+            saved = json.load(f)
+        arrays = np.load(npz_path)
+        self.pending = IssueCentroidIndex.from_state({
+            "issue_ids": saved["pending_ids"],
+            "created_at": [None] * len(saved["pending_ids"]),
+            "sums": arrays["sums"],
+            "counts": arrays["counts"],
+        })
+        self.members = {pid: list(ids) for pid, ids in saved["members"].items()}
+        self.meta = saved["meta"]
+        self.article_pending = {aid: pid for pid, ids in self.members.items() for aid in ids}
+        self.last_article_id = saved["last_article_id"]
+        self.next_pending_seq = saved["next_pending_seq"]
+        print(f"      [Online] 상태 복원: 대기 소군집 {len(self.members)}개, 마지막 기사 id {self.last_article_id}")
+
+    def save_state(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        npz_path, json_path = self._paths()
+        state = self.pending.state()
+        # 중간에 죽어도 이전 상태 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        with open(npz_path + ".tmp", "wb") as f:
+            np.savez(f, sums=state["sums"], counts=state["counts"])
+        with open(json_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "pending_ids": state["issue_ids"],
+                "members": self.members,
+                "meta": self.meta,
+                "last_article_id": self.last_article_id,
+                "next_pending_seq": self.next_pending_seq,
+            }))
+        os.replace(npz_path + ".tmp", npz_path)
+        os.replace(json_path + ".tmp", json_path)
+
+    def _commit(self, db: Session):
+        db.commit()
+        self._dirty_issues.clear()
+
+    def _rollback(self, db: Session):
+        """커밋하지 못한 변경을 버리고 마지막으로 저장한 상태로 돌아갑니다."""
+        db.rollback()
+        self.issue_index.remove(self._dirty_issues)
+        self._dirty_issues.clear()
+        self._index_synced = False
+        self._reset_state()
+        self.load_state()
+
+    # --- 소군집 ---
+    def _add_pending(self, pid, article_id, embedding):
+        if pid is None:
+            pid = f"p{self.next_pending_seq}"
+            self.next_pending_seq += 1
+            self.members[pid] = []
+            self.meta[pid] = {"updated": time.time(), "verified_size": 0}
+            self.stats["pending_created"] += 1
+        else:
+            self.stats["pending_joined"] += 1
+        self.pending.add(pid, embedding)
+        self.members[pid].append(article_id)
+        self.meta[pid]["updated"] = time.time()
+        self.article_pending[article_id] = pid
+
+    def _drop_pending(self, pids):
+        for pid in pids:
+            for article_id in self.members.pop(pid, []):
+                self.article_pending.pop(article_id, None)
+            self.meta.pop(pid, None)
+        self.pending.remove(pids)
+
+    def _place(self, articles, embeddings):
+        """기존 이슈에 붙이거나, 소군집에 넣습니다. 기사가 붙은 이슈/소군집 id 집합을 반환합니다."""
+        matched, _ = self.issue_index.match(embeddings, self.match_threshold)
+        joined = [i for i, issue_id in enumerate(matched) if issue_id is not None]
+        for i in joined:
+            articles[i].issue_id = matched[i]
+        if joined:
+            self.issue_index.add_many([matched[i] for i in joined], embeddings[joined])
+            self._touched_issues.update(matched[i] for i in joined)
+            self._dirty_issues.update(matched[i] for i in joined)
+            self.stats["matched"] += len(joined)
+
+        rest = [i for i, a in enumerate(articles) if a.issue_id is None and a.id not in self.article_pending]
+        if not rest:
+            return set()
+        rest_embs = _normalize_rows(embeddings[rest])
+
+        # 1) 기존 소군집과는 행렬 곱 한 번으로 비교
+        touched = set()
+        pids, _ = self.pending.match(rest_embs, self.join_threshold)
+        for row, pid in enumerate(pids):
+            if pid is not None:
+                self._add_pending(pid, articles[rest[row]].id, rest_embs[row])
+                touched.add(pid)
+
+        # 2) 남은 기사끼리는 유사도 그래프의 연결 요소마다 새 소군집 하나 (배치 안의 같은 사건끼리 모임)
+        new_rows = [row for row, pid in enumerate(pids) if pid is None]
+        if new_rows:
+            new_embs = rest_embs[new_rows]
+            graph = csr_matrix(new_embs @ new_embs.T >= self.join_threshold)
+            _, components = connected_components(graph, directed=False)
+            first_pid = {}
+            for row, component in zip(new_rows, components):
+                article_id = articles[rest[row]].id
+                self._add_pending(first_pid.get(component), article_id, rest_embs[row])
+                first_pid.setdefault(component, self.article_pending[article_id])
+            touched.update(first_pid.values())
+        self._touched_pending.update(touched)
+        return touched
+
+    def _create_issue(self, db: Session, res, articles):
+        issue = Issue(title=res.get('title', articles[0].title), created_at=datetime.now())
+        db.add(issue)
+        db.flush()
+        for article in articles:
+            article.issue_id = issue.id
+        print(f"      ✨ 이슈 생성: {issue.title} ({len(articles)}건)")
+        return issue
+
+    def _verify_dense(self, db: Session, pids):
+        """기사 수가 min_size 이상이고 지난 검증 이후 자란 소군집만 LLM으로 검증합니다."""
+        dense = [
+            pid for pid in pids
+            if pid in self.members
+            and len(self.members[pid]) >= self.min_size
+            and len(self.members[pid]) >= self.meta[pid]["verified_size"] + self.min_size - 1
+        ]
+        if not dense:
+            return
+
+        ids = [aid for pid in dense for aid in self.members[pid]]
+        by_id = {a.id: a for a in db.query(Article).filter(Article.id.in_(ids))}
+        candidates, pid_of = [], {}
+        for pid in dense:
+            c_articles = [by_id[aid] for aid in self.members[pid] if aid in by_id and by_id[aid].issue_id is None]
+            self.meta[pid]["verified_size"] = len(self.members[pid])
+            if len(c_articles) < 2 or (self.check_fn and not self.check_fn(c_articles)):
+                continue
+            pid_of[id(c_articles)] = pid
+            candidates.append(c_articles)
+
+        verified = verify_clusters(candidates, self.refine_fn, **self.verify_options)
+        self.stats["verified"] += len(verified)
+        promoted = []
+        for c_articles, res in verified:
+            if not (res and res.get('is_issue') == 'True'):
+                continue
+            pid = pid_of[id(c_articles)]
+            issue = self._create_issue(db, res, c_articles)
+            found_ids, embeddings = self.embeddings.lookup([a.id for a in c_articles])
+            if found_ids:
+                self.issue_index.add(issue.id, embeddings, issue.created_at)
+                self._touched_issues.add(issue.id)
+                self._dirty_issues.add(issue.id)
+            promoted.append(pid)
+            self.stats["issues"] += 1
+        self._drop_pending(promoted)
+
+    # --- 처리 ---
+    def ingest(self, db: Session):
+        """마지막으로 처리한 기사 이후 저장된 기사들을 배정합니다. (새 기사 수에 비례하는 비용)"""
+        time_threshold = datetime.now() - timedelta(days=self.days)
+        if not self._index_synced and self.sync_fn is not None:
+            self.sync_fn(db, time_threshold)
+            self._index_synced = True
+
+        touched = set()
+        count = 0
+        last_id = self.last_article_id  # 커밋이 성공해야 self.last_article_id로 옮깁니다.
+        try:
+            while True:
+                rows = (
+                    db.query(Article)
+                    .filter(Article.id > last_id)
+                    .order_by(Article.id)
+                    .limit(INGEST_CHUNK_ROWS)
+                    .all()
+                )
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                articles = [a for a in rows if a.issue_id is None and a.time is not None and a.time >= time_threshold]
+                if not articles:
+                    continue
+                embeddings = self.embeddings.get_matrix(articles)
+                touched |= self._place(articles, embeddings)
+                count += len(articles)
+
+            self._verify_dense(db, touched)
+            self._commit(db)
+        except Exception:
+            print(f"      ⚠️ [Online] 기사 id {self.last_article_id} 이후 처리 실패, 마지막 저장 상태로 되돌립니다.")
+            self._rollback(db)
+            raise
+        self.last_article_id = last_id
+        self.save_state()
+        self.stats["ingested"] += count
+        if count:
+            print(f"      [Online] 신규 {count}건 처리 | 대기 소군집 {len(self.members)}개")
+
+        if time.time() - self.last_maintained >= self.maintain_interval:
+            self.maintain(db)
+        return count
+
+    # --- 정리 ---
+    def _merge_issues(self, db: Session):
+        """최근 기사가 붙은 이슈 중 다른 이슈와 centroid가 아주 가까운 것을 큰 쪽으로 합칩니다."""
+        touched = [i for i in self._touched_issues if i in self.issue_index]
+        if len(self.issue_index) < 2 or not touched:
+            return 0
+        ids = list(self.issue_index.issue_ids)
+        row_of = {issue_id: row for row, issue_id in enumerate(ids)}
+        centroids = self.issue_index.centroids()
+        sims = centroids[[row_of[i] for i in touched]] @ centroids.T
+        merged = 0
+        gone = set()
+        for row, issue_id in enumerate(touched):
+            sims[row, row_of[issue_id]] = -1.0
+            best = int(sims[row].argmax())
+            other = ids[best]
+            if sims[row, best] < self.merge_threshold or issue_id in gone or other in gone:
+                continue
+            src, dst = sorted([issue_id, other], key=self.issue_index.count)
+            self._dirty_issues.update((src, dst))
+            db.query(Article).filter(Article.issue_id == src).update({Article.issue_id: dst})
+            db.query(Issue).filter(Issue.id == src).delete()
+            self.issue_index.merge(src, dst)
+            gone.add(src)
+            merged += 1
+        return merged
+
+    def _split_issues(self, db: Session):
+        """최근 바뀐 이슈에서 centroid와 멀어진 기사를 떼어 다시 소군집 단계로 돌려보냅니다."""
+        touched = [i for i in self._touched_issues if i in self.issue_index]
+        if not touched:
+            return 0
+        articles = db.query(Article).filter(Article.issue_id.in_(touched)).all()
+        found_ids, embeddings = self.embeddings.lookup([a.id for a in articles])
+        if not found_ids:
+            return 0
+        by_id = {str(a.id): a for a in articles}
+        detached, detached_embs = [], []
+        for article_id, embedding in zip(found_ids, embeddings):
+            article = by_id[article_id]
+            if self.issue_index.count(article.issue_id) <= 2:
+                continue
+            sim = float(self.issue_index.centroid(article.issue_id) @ (embedding / (np.linalg.norm(embedding) or 1.0)))
+            if sim < self.split_threshold:
+                self._dirty_issues.add(article.issue_id)
+                self.issue_index.subtract(article.issue_id, embedding)
+                article.issue_id = None
+                detached.append(article)
+                detached_embs.append(embedding)
+        if detached:
+            self._place(detached, np.asarray(detached_embs, dtype=np.float32))
+        return len(detached)
+
+    def _merge_pending(self):
+        """최근 기사가 붙은 소군집 중 다른 소군집과 가까워진 것을 큰 쪽으로 합칩니다."""
+        touched = [pid for pid in self._touched_pending if pid in self.members]
+        if len(self.pending) < 2 or not touched:
+            return 0
+        ids = list(self.pending.issue_ids)
+        row_of = {pid: row for row, pid in enumerate(ids)}
+        centroids = self.pending.centroids().copy()
+        pairs = []
+        for start in range(0, len(touched), INGEST_CHUNK_ROWS):
+            chunk = touched[start:start + INGEST_CHUNK_ROWS]
+            sims = centroids[[row_of[pid] for pid in chunk]] @ centroids.T
+            for pid, row in zip(chunk, sims):
+                row[row_of[pid]] = -1.0
+                best = int(row.argmax())
+                if row[best] >= self.join_threshold:
+                    pairs.append((pid, ids[best]))
+        merged = 0
+        gone = set()
+        for a, b in pairs:
+            if a in gone or b in gone:
+                continue
+            src, dst = sorted([a, b], key=self.pending.count)
+            for article_id in self.members.pop(src):
+                self.members[dst].append(article_id)
+                self.article_pending[article_id] = dst
+            self.meta[dst]["updated"] = max(self.meta[dst]["updated"], self.meta.pop(src)["updated"])
+            self.pending.merge(src, dst)
+            gone.add(src)
+            merged += 1
+        return merged
+
+    def maintain(self, db: Session):
+        started = time.perf_counter()
+        time_threshold = datetime.now() - timedelta(days=self.days)
+        self.issue_index.drop_older_than(time_threshold)
+        expired = [pid for pid, meta in self.meta.items() if meta["updated"] < time_threshold.timestamp()]
+        self._drop_pending(expired)
+
+        try:
+            merged_issues = self._merge_issues(db)
+            split = self._split_issues(db)
+            merged_pending = self._merge_pending()
+            self._commit(db)
+            self.save_state()
+            self._verify_dense(db, [pid for pid in self._touched_pending if pid in self.members])
+            self._commit(db)
+        except Exception:
+            print("      ⚠️ [Online] 정리 실패, 마지막 저장 상태로 되돌립니다.")
+            self._rollback(db)
+            raise
+        self.save_state()
+
+        self._touched_issues.clear()
+        self._touched_pending.clear()
+        self.last_maintained = time.time()
+        print(
+            f"      [Online] 정리 완료 ({time.perf_counter() - started:.1f}s): 이슈 병합 {merged_issues}, 기사 분리 {split}, "
+            f"소군집 병합 {merged_pending}, 만료 {len(expired)}"
+        )
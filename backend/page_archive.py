@@ -0,0 +1,333 @@
+# page_archive.py
+"""
+수집한 상세 페이지 원본 HTML 보관소 (선택 기능, PAGE_ARCHIVE_DIR을 설정하면 켜짐).
+
+추출 로직(기자명 정규식, 캡션 제거 등)을 고쳤을 때 네이버를 다시 긁지 않고
+보관된 원본을 다시 파싱해서 articles를 보정하기 위한 용도입니다. (파서 벤치마크 말뭉치로도 사용)
+
+저장 구조 (root 폴더)
+- segments/seg-000001.bin ...: 압축된 페이지를 이어 붙이기만 하는(append-only) 세그먼트 파일.
+  세그먼트가 SEGMENT_BYTES를 넘으면 다음 파일로 넘어갑니다.
+- index.db (SQLite)
+  - blobs: 내용 해시(sha1) -> 세그먼트 번호/오프셋/길이/코덱. 같은 내용은 한 번만 저장 (중복 제거)
+  - pages: URL -> 마지막으로 받은 내용 해시, 인코딩, 받은 시각, 카테고리(수집한 섹션, 크롤러가 set_categories로 기록)
+압축은 zstandard 패키지가 있으면 zstd, 없으면 zlib을 씁니다. (blob마다 코덱을 기록하므로 섞여 있어도 읽기 가능)
+
+다시 파싱 (backend 폴더에서):
+    python -m page_archive reparse --workers 4
+    python -m page_archive reparse --fields author,img_urls --dry-run
+    python -m page_archive export --out ./naver_pages --limit 500
+    python -m page_archive stats
+제목/본문을 바꿔도 이미 만들어진 임베딩/군집은 다시 계산하지 않습니다. (--fields로 범위를 좁힐 수 있음)
+--insert-missing은 카테고리가 기록된 페이지만 추가합니다. 카테고리는 상세 페이지가 아니라 수집한 섹션에서 정해지므로,
+카테고리 기록 전에 보관된 페이지는 추가하지 않고 건너뜁니다. (결과의 skipped_no_category)
+"""
+import argparse
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 세그먼트 파일 하나의 최대 크기
+SEGMENT_BYTES = int(os.getenv("PAGE_ARCHIVE_SEGMENT_MB", "256")) * 1024 * 1024
+ZSTD_LEVEL = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    raw_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    encoding TEXT,
+    fetched_at REAL NOT NULL,
+    category TEXT
+);
+"""
+
+# 다시 파싱할 때 articles에서 덮어쓸 수 있는 필드 (category는 섹션 기준으로 정해지므로 제외)
+REPARSE_FIELDS = ("title", "contents", "company_name", "author", "img_urls", "time")
+
+
+def compress(body):
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return "zlib", zlib.compress(body, 6)
+
+
+def decompress(codec, data):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd로 압축된 페이지를 읽으려면 zstandard 패키지가 필요합니다.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"알 수 없는 코덱입니다: {codec}")
+
+
+def segment_path(root, segment):
+    return os.path.join(root, "segments", f"seg-{segment:06d}.bin")
+
+
+def read_blob(root, segment, offset, length, codec):
+    with open(segment_path(root, segment), "rb") as f:
+        f.seek(offset)
+        return decompress(codec, f.read(length))
+
+
+class PageArchive:
+    def __init__(self, root, segment_bytes=SEGMENT_BYTES):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        os.makedirs(os.path.join(root, "segments"), exist_ok=True)
+        # 크롤러 스레드 여러 개가 동시에 넣으므로 세그먼트 추가/색인 갱신은 잠금 하나로 직렬화합니다.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "index.db"), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # category 컬럼이 생기기 전에 만든 색인
+        if "category" not in {row[1] for row in self._conn.execute("PRAGMA table_info(pages)")}:
+            self._conn.execute("ALTER TABLE pages ADD COLUMN category TEXT")
+            self._conn.commit()
+        row = self._conn.execute("SELECT MAX(segment) FROM blobs").fetchone()
+        self._segment = row[0] or 1
+        self.stats = {"pages": 0, "stored": 0, "deduplicated": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+    def put(self, url, body, encoding=None):
+        """페이지 원본을 보관합니다. 같은 내용이 이미 있으면 URL 색인만 갱신합니다. 반환값: 내용 해시"""
+        digest = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            known = self._conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        # 압축은 잠금 밖에서 (CPU 작업이라 다른 스레드의 추가를 막지 않도록)
+        codec, data = (None, None) if known else compress(body)
+
+        with self._lock:
+            self.stats["pages"] += 1
+            self.stats["raw_bytes"] += len(body)
+            if data is not None and not self._conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone():
+                path = segment_path(self.root, self._segment)
+                if os.path.exists(path) and os.path.getsize(path) + len(data) > self.segment_bytes:
+                    self._segment += 1
+                    path = segment_path(self.root, self._segment)
+                with open(path, "ab") as f:
+                    offset = f.tell()
+                    f.write(data)
+                self._conn.execute(
+                    "INSERT INTO blobs (hash, segment, offset, length, codec, raw_size) VALUES (?, ?, ?, ?, ?, ?)",
+                    (digest, self._segment, offset, len(data), codec, len(body)),
+                )
+                self.stats["stored"] += 1
+                self.stats["stored_bytes"] += len(data)
+            else:
+                self.stats["deduplicated"] += 1
+            self._conn.execute(
+                "INSERT INTO pages (url, hash, encoding, fetched_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET hash = excluded.hash, encoding = excluded.encoding, "
+                "fetched_at = excluded.fetched_at",
+                (url, digest, encoding, time.time()),
+            )
+            self._conn.commit()
+        return digest
+
+    def put_response(self, url, response):
+        """크롤러용: 보관에 실패해도 수집은 계속되도록 예외를 삼킵니다."""
+        if response.status_code != 200:
+            return None
+        try:
+            return self.put(url, response.content, response.encoding)
+        except Exception as e:
+            print(f"[보관소] 페이지 보관 실패: {url} | 사유: {e}")
+            return None
+
+    def set_categories(self, categories):
+        """크롤러용: {url: 카테고리}를 기록합니다. (reparse --insert-missing이 사용) 실패해도 수집은 계속되도록 예외를 삼킵니다."""
+        try:
+            with self._lock:
+                self._conn.executemany("UPDATE pages SET category = ? WHERE url = ?", [(c, u) for u, c in categories.items()])
+                self._conn.commit()
+        except Exception as e:
+            print(f"[보관소] 카테고리 기록 실패 ({len(categories)}건) | 사유: {e}")
+
+    def categories(self, urls):
+        """{url: 카테고리} (기록된 것만)"""
+        result = {}
+        urls = list(urls)
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                result.update(self._conn.execute(
+                    f"SELECT url, category FROM pages WHERE category IS NOT NULL AND url IN ({placeholders})", chunk
+                ).fetchall())
+        return result
+
+    def get(self, url):
+        """(원본 바이트, 인코딩) 또는 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.segment, b.offset, b.length, b.codec, p.encoding FROM pages p JOIN blobs b ON b.hash = p.hash "
+                "WHERE p.url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return read_blob(self.root, *row[:4]), row[4]
+
+    def entries(self, limit=None):
+        """(url, segment, offset, length, codec, encoding) 목록. 세그먼트 순서대로 정렬해 디스크를 순차로 읽게 합니다."""
+        sql = (
+            "SELECT p.url, b.segment, b.offset, b.length, b.codec, p.encoding FROM pages p JOIN blobs b ON b.hash = p.hash "
+            "ORDER BY b.segment, b.offset"
+        )
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            return self._conn.execute(sql).fetchall()
+
+    def summary(self):
+        with self._lock:
+            pages, = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+            blobs, stored, raw = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0), COALESCE(SUM(raw_size), 0) FROM blobs"
+            ).fetchone()
+        return {"pages": pages, "blobs": blobs, "stored_bytes": stored, "raw_bytes": raw, "segments": self._segment}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_default_archive():
+    """PAGE_ARCHIVE_DIR이 설정되어 있으면 보관소를 열고, 아니면 None"""
+    root = os.getenv("PAGE_ARCHIVE_DIR")
+    return PageArchive(root) if root else None
+
+
+# --- 다시 파싱 ---
+def _reparse_batch(root, rows, backend=None):
+    """파싱 프로세스에서 실행: 세그먼트에서 직접 읽고 압축을 풀어 파싱합니다. (부모가 원본을 넘기지 않음)"""
+    from parse_pool import parse_page
+
+    results = []
+    for url, segment, offset, length, codec, encoding in rows:
+        try:
+            body = read_blob(root, segment, offset, length, codec)
+        except Exception as e:
+            print(f"[오류] 보관 페이지 읽기 실패: {url} | 사유: {e}")
+            results.append((url, None))
+            continue
+        results.append((url, parse_page(url, body, encoding, backend)))
+    return results
+
+
+def reparse(archive, db, workers=4, batch_size=64, fields=REPARSE_FIELDS, insert_missing=False, dry_run=False,
+            limit=None, backend=None):
+    """
+    보관된 페이지를 workers개 프로세스로 다시 파싱해 articles를 보정합니다.
+    - 이미 있는 기사: fields에 해당하는 값만 덮어씀 (바뀐 행만)
+    - 없는 기사: insert_missing=True일 때만 create_articles_bulk로 추가.
+      카테고리는 보관할 때 기록한 값(수집한 섹션)을 쓰며, 기록이 없는 페이지는 추가하지 않습니다. (skipped_no_category)
+    반환값: {"pages", "parsed", "changed", "updated", "inserted", "skipped_no_category"}
+    """
+    import crud
+
+    rows = archive.entries(limit)
+    result = {"pages": len(rows), "parsed": 0, "changed": 0, "updated": 0, "inserted": 0, "skipped_no_category": 0}
+    batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(_reparse_batch, archive.root, batch, backend) for batch in batches]
+        for done, future in enumerate(futures, 1):
+            news_list = [data for _, data in future.result() if data]
+            result["parsed"] += len(news_list)
+            changed = crud.update_articles_from_pages(db, news_list, fields, dry_run=dry_run)
+            result["changed"] += changed["changed"]
+            result["updated"] += changed["updated"]
+            if insert_missing and not dry_run and changed["missing"]:
+                categories = archive.categories(news["url"] for news in changed["missing"])
+                missing = [dict(news, category=categories[news["url"]]) for news in changed["missing"] if news["url"] in categories]
+                result["skipped_no_category"] += len(changed["missing"]) - len(missing)
+                if missing:
+                    result["inserted"] += crud.create_articles_bulk(db, missing)["inserted"]
+            if done % 10 == 0 or done == len(futures):
+                print(f"   [재파싱] {done}/{len(futures)} 묶음 | 파싱 {result['parsed']} | 변경 {result['changed']}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상세 페이지 원본 보관소")
+    parser.add_argument("--root", default=os.getenv("PAGE_ARCHIVE_DIR", "./page_archive"))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p_reparse = commands.add_parser("reparse", help="보관된 페이지를 다시 파싱해 articles 보정")
+    p_reparse.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p_reparse.add_argument("--batch-size", type=int, default=64)
+    p_reparse.add_argument("--fields", default=",".join(REPARSE_FIELDS), help="덮어쓸 필드 (쉼표 구분)")
+    p_reparse.add_argument(
+        "--insert-missing", action="store_true", help="articles에 없는 페이지는 새로 추가 (카테고리가 기록된 페이지만)"
+    )
+    p_reparse.add_argument("--dry-run", action="store_true", help="바뀔 행 수만 세고 저장하지 않음")
+    p_reparse.add_argument("--limit", type=int, default=None)
+    p_reparse.add_argument("--backend", default=None, help="파서 백엔드 (기본 NEWS_PARSER_BACKEND)")
+
+    p_export = commands.add_parser("export", help="파서 벤치마크용 *.html 폴더로 내보내기")
+    p_export.add_argument("--out", default="./naver_pages")
+    p_export.add_argument("--limit", type=int, default=500)
+
+    commands.add_parser("stats", help="보관 현황")
+    args = parser.parse_args()
+
+    archive = PageArchive(args.root)
+    try:
+        if args.command == "reparse":
+            from database import SessionLocal
+
+            fields = tuple(f.strip() for f in args.fields.split(",") if f.strip())
+            unknown = [f for f in fields if f not in REPARSE_FIELDS]
+            if unknown:
+                parser.error(f"알 수 없는 필드: {', '.join(unknown)} (가능: {', '.join(REPARSE_FIELDS)})")
+            db = SessionLocal()
+            try:
+                started = time.time()
+                result = reparse(
+                    archive, db, workers=args.workers, batch_size=args.batch_size, fields=fields,
+                    insert_missing=args.insert_missing, dry_run=args.dry_run, limit=args.limit, backend=args.backend,
+                )
+            finally:
+                db.close()
+            print(f"✅ [재파싱] {result} ({time.time() - started:.1f}초{', dry-run' if args.dry_run else ''})")
+        elif args.command == "export":
+            os.makedirs(args.out, exist_ok=True)
+            rows = archive.entries(args.limit)
+            for i, (url, segment, offset, length, codec, _) in enumerate(rows):
+                with open(os.path.join(args.out, f"{i:05d}.html"), "wb") as f:
+                    f.write(read_blob(archive.root, segment, offset, length, codec))
+            print(f"✅ [보관소] 페이지 {len(rows)}개 내보냄 -> {args.out}")
+        else:
+            s = archive.summary()
+            ratio = s["raw_bytes"] / s["stored_bytes"] if s["stored_bytes"] else 0.0
+            print(
+                f"[보관소] URL {s['pages']}개 | 고유 페이지 {s['blobs']}개 | 세그먼트 {s['segments']}개 | "
+                f"원본 {s['raw_bytes'] / 1e6:.1f}MB -> {s['stored_bytes'] / 1e6:.1f}MB (x{ratio:.1f})"
+            )
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
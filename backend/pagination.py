@@ -0,0 +1,59 @@
+# pagination.py
+"""
+목록 API용 키셋(커서) 페이지네이션.
+
+offset(skip)은 앞의 skip개 행을 모두 읽고 버리므로 뒤쪽 페이지일수록 느려집니다.
+키셋 방식은 직전 페이지 마지막 행의 (정렬 값, id)를 커서로 넘겨받아
+"그보다 뒤" 조건으로 인덱스((time, id) 등)에서 바로 이어 읽습니다.
+
+커서는 (정렬 값, id)를 JSON으로 만들어 URL-safe base64로 감싼 문자열입니다. (클라이언트는 그대로 돌려주기만 하면 됨)
+정렬 컬럼은 NULL이 없다고 가정합니다. (articles.time / issues.created_at은 저장 시 항상 채워짐)
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(value, row_id):
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    raw = json.dumps([value, row_id], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """(정렬 값, id). 형식이 잘못되면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+        if not isinstance(row_id, int):
+            raise ValueError("id가 정수가 아닙니다.")
+        return value, row_id
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+
+def paginate(query, sort_column, id_column, cursor=None, skip=0, limit=20):
+    """
+    sort_column 내림차순(같으면 id 내림차순)으로 한 페이지를 가져옵니다.
+    cursor가 있으면 키셋 방식(skip 무시), 없으면 기존 offset 방식.
+    반환값: (행 리스트, 다음 페이지 커서 또는 None)
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor)
+        # (정렬 값, id) < 커서. 앞의 <= 조건이 있어야 DB가 인덱스 범위 검색으로 바로 이어 읽습니다.
+        query = query.filter(and_(sort_column <= value, or_(sort_column < value, id_column < row_id)))
+        skip = 0
+    rows = query.order_by(sort_column.desc(), id_column.desc()).offset(skip).limit(limit).all()
+
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
@@ -0,0 +1,106 @@
+# parse_pool.py
+"""
+상세 페이지 수집을 받기(fetch)와 파싱(parse) 두 단계로 나눠 돌리는 실행기.
+
+- fetch: CrawlEngine 스레드 풀에서 원본 HTML 바이트만 받아옵니다. (I/O 대기라 스레드로 충분)
+- parse: 받은 페이지를 batch_size개씩 묶어 ProcessPoolExecutor로 보냅니다.
+  HTML 파싱 / 기자명 정규식 / 한글 비율 검사는 GIL에 묶이므로 프로세스를 나눠야 여러 코어를 씁니다.
+- 역압(back-pressure): 파싱 중인 묶음이 max_batches개를 넘으면 가장 오래된 묶음이 끝날 때까지
+  새 요청을 보내지 않아, 파싱이 밀릴 때 받은 HTML이 메모리에 쌓이지 않습니다.
+  (동시에 들고 있는 원본 페이지는 최대 약 batch_size * (max_batches * 2 + 1)개)
+
+파싱 프로세스는 spawn으로 띄웁니다. (uvicorn/스케줄러 스레드가 도는 프로세스를 fork하지 않기 위함)
+"""
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from news_parser import parse_article
+
+
+def fetch_page(url, engine, archive=None):
+    """(원본 바이트, 인코딩). 받기에 실패하면 (None, None). archive(PageArchive)를 넘기면 원본을 보관합니다."""
+    try:
+        response = engine.get(url)
+        if archive is not None:
+            archive.put_response(url, response)
+        return response.content, response.encoding
+    except Exception as e:
+        print(f"[오류] 상세 페이지 요청 실패: {url} | 사유: {e}")
+        return None, None
+
+
+def parse_page(url, body, encoding=None, backend=None):
+    """get_news_data의 파싱 부분. response.text와 같은 방식(인코딩 + replace)으로 디코딩합니다."""
+    try:
+        return parse_article(body.decode(encoding or "utf-8", errors="replace"), url, backend=backend)
+    except Exception as e:
+        print(f"[오류] 상세 페이지 파싱 실패: {url} | 사유: {e}")
+        return None
+
+
+def parse_batch(batch, backend=None):
+    """파싱 프로세스에서 실행: [(index, url, body, encoding)] -> [(index, 결과 dict 또는 None)]"""
+    return [(index, parse_page(url, body, encoding, backend)) for index, url, body, encoding in batch]
+
+
+def fetch_and_parse(urls, engine, parse_workers=4, batch_size=16, max_batches=None, backend=None, archive=None):
+    """
+    urls의 상세 페이지를 받아 파싱한 결과를 입력 순서대로 반환합니다. (실패한 페이지는 None)
+    max_batches: 동시에 파싱 중일 수 있는 묶음 수 (기본 parse_workers * 2)
+    """
+    results = [None] * len(urls)
+    if not urls:
+        return results
+    max_batches = max_batches or parse_workers * 2
+    # 받는 중인 요청 수 상한: 파싱 대기열이 가득 차면 여기서 더 늘지 않습니다.
+    fetch_window = max(engine.max_workers, batch_size * max_batches)
+
+    pending_urls = iter(enumerate(urls))
+    fetching = {}  # future -> (index, url)
+    parsing = deque()
+    batch = []
+    exhausted = False
+
+    def collect(future):
+        for index, data in future.result():
+            results[index] = data
+
+    def submit_fetch():
+        nonlocal exhausted
+        while not exhausted and len(fetching) < fetch_window:
+            item = next(pending_urls, None)
+            if item is None:
+                exhausted = True
+                break
+            index, url = item
+            fetching[engine.submit(fetch_page, url, engine, archive)] = (index, url)
+
+    def submit_parse(size):
+        # 역압: 파싱 중인 묶음이 가득 차면 가장 오래된 묶음을 기다립니다.
+        while len(parsing) >= max_batches:
+            collect(parsing.popleft())
+        parsing.append(pool.submit(parse_batch, batch[:size], backend))
+        del batch[:size]
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=parse_workers, mp_context=context) as pool:
+        submit_fetch()
+        while fetching:
+            done, _ = wait(fetching, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, url = fetching.pop(future)
+                body, encoding = future.result()
+                if body is not None:
+                    batch.append((index, url, body, encoding))
+            while len(batch) >= batch_size:
+                submit_parse(batch_size)
+            # 완료된 파싱 묶음은 바로 거둬 결과 메모리를 풀어줍니다.
+            while parsing and parsing[0].done():
+                collect(parsing.popleft())
+            submit_fetch()
+        if batch:
+            submit_parse(len(batch))
+        while parsing:
+            collect(parsing.popleft())
+    return results
@@ -0,0 +1,286 @@
+# pipeline.py
+"""
+뉴스 처리 파이프라인 스케줄러.
+
+수집(crawl) -> 임베딩(embed) -> 군집화(cluster) -> 기사 생성(generate) 단계와
+수집 -> 구독 키워드 알림(notify) 단계를
+영구 작업 큐(pipeline_queue.JobQueue)로 잇고, 단계마다 정해진 수의 워커 스레드가 작업을 처리합니다.
+- APScheduler: 주기적 수집 작업 등록, 리더 잠금 연장, 임대 만료 작업 회수, 오래된 기록 정리
+- 리더 잠금: uvicorn 워커가 여러 개여도 리더 프로세스 하나만 단계 워커를 돌림 (나머지는 대기하다 리더가 죽으면 승계)
+- 단계 실패는 해당 작업만 재시도/실패 처리되고 워커 스레드는 계속 동작
+
+환경변수
+    PIPELINE_DB_PATH               큐 DB 파일 (기본 ./pipeline.db)
+    PIPELINE_CRAWL_INTERVAL        수집 주기(초, 기본 600)
+    PIPELINE_CONCURRENCY_<STAGE>   단계별 워커 수 (기본 crawl 1, embed 1, cluster 1, generate 1, notify 1)
+    CLUSTER_MODE                   batch | online (군집화 단계 방식)
+"""
+import os
+import threading
+import time
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import func
+
+from database import SessionLocal
+from models import Article
+from pipeline_queue import JobQueue, LeaderLock
+
+# 이슈 군집화 방식: batch(기간 내 미배정 기사 재군집화) | online(새 기사만 배정)
+CLUSTER_MODE = os.getenv("CLUSTER_MODE", "batch")
+
+STAGES = ("crawl", "embed", "cluster", "generate", "notify")
+# 군집화 단계는 프로세스 내 상태(이슈 인덱스, 대기 소군집)를 쓰므로 항상 1개만 돌립니다. (알림 단계의 키워드 오토마톤도 동일)
+SINGLE_WORKER_STAGES = ("crawl", "cluster", "notify")
+
+
+# --- 단계 처리 함수: payload를 받아 (처리 항목 수, [(다음 단계, payload, unique)])를 반환 ---
+def crawl_stage(payload):
+    from crud import create_articles_bulk
+    from scraper import run_article_crawler
+
+    db = SessionLocal()
+    try:
+        before = db.query(func.max(Article.id)).scalar() or 0
+        # 이미 저장된 URL은 상세 페이지를 받기 전에 걸러내고, 저장이 끝난 뒤에 수집 상태(본 URL)를 기록합니다.
+        saved = {"inserted": 0}
+        run_article_crawler([], False, db_check_session=db, save=lambda news_list: saved.update(create_articles_bulk(db, news_list)))
+        after = db.query(func.max(Article.id)).scalar() or 0
+    finally:
+        db.close()
+    print(f"   -> {saved['inserted']}개의 신규 기사 저장 완료")
+
+    if after > before:
+        new_range = {"min_id": before + 1, "max_id": after}
+        return saved["inserted"], [("embed", new_range, False), ("notify", new_range, False)]
+    # 신규 기사가 없어도 분석 대기 중인 게 있을 수 있으므로 기사 생성 단계는 실행
+    return 0, [("generate", {}, True)]
+
+
+def embed_stage(payload):
+    # 임베딩 모델/ChromaDB 의존성이 무거우므로 단계가 처음 실행될 때 불러옵니다.
+    from clustering import embedding_cache
+
+    db = SessionLocal()
+    try:
+        articles = db.query(Article).filter(Article.id.between(payload["min_id"], payload["max_id"])).all()
+        if articles:
+            embedding_cache.get_matrix(articles)
+    finally:
+        db.close()
+    return len(articles), [("cluster", payload, True)]
+
+
+def cluster_stage(payload):
+    from clustering import run_issue_clustering, run_online_clustering
+
+    db = SessionLocal()
+    try:
+        if CLUSTER_MODE == "online":
+            count = run_online_clustering(db)
+        else:
+            run_issue_clustering(db, days=3)
+            count = 0
+    finally:
+        db.close()
+    return count or 0, [("generate", {}, True)]
+
+
+def generate_stage(payload):
+    from ai_processor import process_news_pipeline
+
+    process_news_pipeline()
+    return 1, []
+
+
+def notify_stage(payload):
+    from keyword_matcher import keyword_matcher, notifier, notify_matches, prune_sent_notifications
+
+    db = SessionLocal()
+    try:
+        # 다른 워커 프로세스에서 바뀐 구독도 반영 (keywords_updated_at이 바뀐 사용자만 읽음)
+        keyword_matcher.sync(db)
+        id_range = (payload["min_id"], payload["max_id"])
+        batches, articles = keyword_matcher.match_range(db, *id_range)
+        # 같은 범위로 재시도된 작업이면 이미 받은 사용자는 건너뜀
+        sent = notify_matches(db, batches, articles, notifier, id_range=id_range)
+        prune_sent_notifications(db)
+    finally:
+        db.close()
+    return sent, []
+
+
+STAGE_HANDLERS = {
+    "crawl": crawl_stage,
+    "embed": embed_stage,
+    "cluster": cluster_stage,
+    "generate": generate_stage,
+    "notify": notify_stage,
+}
+
+
+class PipelineScheduler:
+    def __init__(
+        self,
+        queue,
+        lock,
+        handlers=None,
+        concurrency=None,
+        crawl_interval=600,
+        poll_interval=1.0,
+        lease_seconds=900,
+        max_attempts=3,
+        retry_delay=30.0,
+    ):
+        self.queue = queue
+        self.lock = lock
+        self.handlers = handlers or STAGE_HANDLERS
+        self.concurrency = {stage: 1 for stage in self.handlers}
+        self.concurrency.update(concurrency or {})
+        for stage in SINGLE_WORKER_STAGES:
+            if stage in self.concurrency:
+                self.concurrency[stage] = 1
+        self.crawl_interval = crawl_interval
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+        self.is_leader = False
+        self._leader_event = threading.Event()  # 리더일 때만 set (단계 워커가 기다림)
+        self._stop = threading.Event()
+        self._threads = []
+        self._scheduler = BackgroundScheduler(daemon=True)
+        self._stats_lock = threading.Lock()
+        self.worker_stats = {stage: {"processed": 0, "failed": 0, "busy": 0} for stage in self.handlers}
+
+    @classmethod
+    def from_env(cls, handlers=None):
+        path = os.getenv("PIPELINE_DB_PATH", "./pipeline.db")
+        concurrency = {
+            stage: int(os.getenv(f"PIPELINE_CONCURRENCY_{stage.upper()}", "1"))
+            for stage in (handlers or STAGE_HANDLERS)
+        }
+        return cls(
+            JobQueue(path),
+            LeaderLock(path),
+            handlers=handlers,
+            concurrency=concurrency,
+            crawl_interval=int(os.getenv("PIPELINE_CRAWL_INTERVAL", "600")),
+        )
+
+    # --- 리더 잠금 / 주기 작업 ---
+    def _heartbeat(self):
+        leader = self.lock.try_acquire()
+        if leader and not self.is_leader:
+            print(f"👑 [Pipeline] 리더가 되었습니다 ({self.lock.owner})")
+            # 이전 리더가 처리 중이던 작업을 바로 회수합니다.
+            self.queue.requeue_expired()
+            self._leader_event.set()
+            self.enqueue_crawl()
+        elif not leader and self.is_leader:
+            print("⚠️ [Pipeline] 리더 잠금을 잃었습니다. 대기 모드로 전환")
+            self._leader_event.clear()
+        self.is_leader = leader
+
+    def enqueue_crawl(self):
+        if self.is_leader or self._leader_event.is_set():
+            self.queue.enqueue("crawl", {}, unique=True)
+
+    def _housekeeping(self):
+        if self.is_leader:
+            recovered = self.queue.requeue_expired()
+            if recovered:
+                print(f"      [Pipeline] 임대 만료 작업 {recovered}건 재대기")
+            self.queue.purge()
+
+    # --- 단계 워커 ---
+    def _keep_lease(self, job_id, owner, done):
+        """핸들러가 도는 동안 임대 시간의 1/3마다 임대를 연장합니다. (오래 걸리는 따라잡기 수집/군집화가 회수되지 않도록)"""
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                if not self.queue.renew(job_id, owner, self.lease_seconds):
+                    print(f"⚠️ [Pipeline] 작업 {job_id}의 임대를 잃었습니다. (다른 워커가 다시 가져갔을 수 있음)")
+                    return
+            except Exception as e:
+                print(f"⚠️ [Pipeline] 작업 {job_id} 임대 연장 실패: {e}")
+
+    def _run_job(self, stage, owner, job_id, payload, attempts):
+        with self._stats_lock:
+            self.worker_stats[stage]["busy"] += 1
+        done = threading.Event()
+        keeper = threading.Thread(target=self._keep_lease, args=(job_id, owner, done), name=f"lease-{job_id}", daemon=True)
+        keeper.start()
+        try:
+            items, next_jobs = self.handlers[stage](payload)
+            done.set()
+            for next_stage, next_payload, unique in next_jobs:
+                if next_stage in self.handlers:
+                    self.queue.enqueue(next_stage, next_payload, unique=unique)
+            if not self.queue.complete(job_id, owner, items):
+                print(f"⚠️ [Pipeline] {stage} 작업 {job_id}: 임대를 잃어 완료를 기록하지 않았습니다.")
+            with self._stats_lock:
+                self.worker_stats[stage]["processed"] += 1
+        except Exception as e:
+            done.set()
+            print(f"⚠️ [Pipeline] {stage} 작업 {job_id} 실패 ({attempts}회째): {e}")
+            self.queue.fail(job_id, owner, e, attempts, self.max_attempts, self.retry_delay)
+            with self._stats_lock:
+                self.worker_stats[stage]["failed"] += 1
+        finally:
+            done.set()
+            with self._stats_lock:
+                self.worker_stats[stage]["busy"] -= 1
+
+    def _worker_loop(self, stage):
+        # 작업 임대는 워커 스레드 단위 (같은 프로세스의 다른 워커가 회수된 작업을 다시 가져가도 구분됨)
+        owner = f"{self.lock.owner}/{threading.current_thread().name}"
+        while not self._stop.is_set():
+            if not self._leader_event.wait(timeout=self.poll_interval):
+                continue
+            try:
+                job = self.queue.claim(stage, owner, self.lease_seconds)
+            except Exception as e:
+                print(f"⚠️ [Pipeline] 큐 조회 실패 ({stage}): {e}")
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            self._run_job(stage, owner, *job)
+
+    # --- 시작/종료 ---
+    def start(self):
+        print("🚀 [System] 파이프라인 스케줄러 가동 시작")
+        self._heartbeat()
+        ttl = self.lock.ttl
+        self._scheduler.add_job(self._heartbeat, "interval", seconds=max(1.0, ttl / 3), max_instances=1, coalesce=True)
+        self._scheduler.add_job(self.enqueue_crawl, "interval", seconds=self.crawl_interval, max_instances=1, coalesce=True)
+        self._scheduler.add_job(self._housekeeping, "interval", seconds=60, max_instances=1, coalesce=True)
+        self._scheduler.start()
+
+        for stage, count in self.concurrency.items():
+            for n in range(count):
+                thread = threading.Thread(target=self._worker_loop, args=(stage,), name=f"pipeline-{stage}-{n}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def shutdown(self, timeout=5.0):
+        self._stop.set()
+        self._leader_event.set()  # 대기 중인 워커를 깨워 종료시키기
+        self._scheduler.shutdown(wait=False)
+        deadline = time.time() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.time()))
+        if self.is_leader:
+            self.lock.release()
+            self.is_leader = False
+
+    def metrics(self):
+        with self._stats_lock:
+            workers = {stage: dict(stats, concurrency=self.concurrency[stage]) for stage, stats in self.worker_stats.items()}
+        return {
+            "leader": self.lock.holder(),
+            "is_leader": self.is_leader,
+            "stages": self.queue.stats(),
+            "workers": workers,
+        }
@@ -0,0 +1,240 @@
+# pipeline_queue.py
+"""
+파이프라인 단계 사이를 잇는 SQLite 기반 영구 작업 큐 + 단일 리더 잠금.
+
+- JobQueue: 단계(stage)별 작업을 넣고(enqueue), 여러 스레드/프로세스가 겹치지 않게 하나씩 가져갑니다(claim).
+  가져간 작업은 임대 시간(lease) 안에 완료/실패를 기록해야 하며, 프로세스가 죽어 임대가 끝난 작업은 다시 대기열로 돌아갑니다.
+  오래 걸리는 작업은 실행 중에 renew로 임대를 연장합니다. 완료/실패 기록은 지금 임대를 가진 owner만 할 수 있습니다.
+- LeaderLock: 같은 DB 파일을 쓰는 여러 uvicorn 워커 중 한 프로세스만 리더가 되도록 하는 임대 방식 잠금.
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stage TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    items INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    owner TEXT,
+    enqueued_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    started_at REAL,
+    lease_until REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_claim ON jobs (stage, status, available_at, id);
+CREATE INDEX IF NOT EXISTS ix_jobs_finished ON jobs (status, finished_at);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def make_owner_id():
+    """프로세스를 구분하는 id (호스트명:pid:난수)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class _SQLiteStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: 트랜잭션을 BEGIN IMMEDIATE로 직접 엽니다. (쓰기 잠금을 먼저 잡아 경쟁 방지)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, fn):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class JobQueue(_SQLiteStore):
+    def enqueue(self, stage, payload=None, unique=False, delay=0.0):
+        """
+        작업을 넣고 job id를 반환합니다.
+        unique=True이면 같은 단계에 대기 중인 작업이 이미 있을 때 넣지 않고 None을 반환합니다.
+        """
+        now = time.time()
+
+        def insert(conn):
+            if unique:
+                exists = conn.execute(
+                    "SELECT 1 FROM jobs WHERE stage = ? AND status = 'queued' LIMIT 1", (stage,)
+                ).fetchone()
+                if exists:
+                    return None
+            cur = conn.execute(
+                "INSERT INTO jobs (stage, payload, enqueued_at, available_at) VALUES (?, ?, ?, ?)",
+                (stage, json.dumps(payload or {}, ensure_ascii=False), now, now + delay),
+            )
+            return cur.lastrowid
+
+        return self._write(insert)
+
+    def claim(self, stage, owner, lease_seconds=600):
+        """대기 중인 작업 하나를 가져갑니다. 반환값: (job_id, payload, attempts) 또는 None"""
+        now = time.time()
+
+        def take(conn):
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM jobs "
+                "WHERE stage = ? AND status = 'queued' AND available_at <= ? ORDER BY id LIMIT 1",
+                (stage, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, started_at = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (owner, now, now + lease_seconds, row[0]),
+            )
+            return row[0], json.loads(row[1]), row[2] + 1
+
+        return self._write(take)
+
+    def renew(self, job_id, owner, lease_seconds=600):
+        """실행 중인 작업의 임대를 연장합니다. 반환값: 아직 내 작업이면 True (임대가 만료되어 회수됐으면 False)"""
+        return self._write(lambda conn: conn.execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND status = 'running'",
+            (time.time() + lease_seconds, job_id, owner),
+        ).rowcount) > 0
+
+    def complete(self, job_id, owner, items=0):
+        """완료 기록. 반환값: 기록했으면 True (임대를 잃어 다른 워커가 가져간 작업이면 False)"""
+        return self._write(lambda conn: conn.execute(
+            "UPDATE jobs SET status = 'done', items = ?, finished_at = ?, error = NULL "
+            "WHERE id = ? AND owner = ? AND status = 'running'",
+            (items, time.time(), job_id, owner),
+        ).rowcount) > 0
+
+    def fail(self, job_id, owner, error, attempts, max_attempts=3, retry_delay=30.0):
+        """실패 기록. 재시도 횟수가 남아 있으면 지수 백오프 후 다시 대기열로 보냅니다. 반환값: complete와 같음"""
+        now = time.time()
+        if attempts < max_attempts:
+            delay = retry_delay * (2 ** (attempts - 1))
+            return self._write(lambda conn: conn.execute(
+                "UPDATE jobs SET status = 'queued', error = ?, owner = NULL, available_at = ? "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                (str(error)[:500], now + delay, job_id, owner),
+            ).rowcount) > 0
+        return self._write(lambda conn: conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND owner = ? AND status = 'running'",
+            (str(error)[:500], now, job_id, owner),
+        ).rowcount) > 0
+
+    def requeue_expired(self):
+        """임대 시간이 지난 실행 중 작업(프로세스가 죽은 경우)을 다시 대기열로 돌립니다."""
+        return self._write(lambda conn: conn.execute(
+            "UPDATE jobs SET status = 'queued', owner = NULL, available_at = ? WHERE status = 'running' AND lease_until < ?",
+            (time.time(), time.time()),
+        ).rowcount)
+
+    def purge(self, older_than_seconds=86400):
+        """오래된 완료/실패 작업 기록을 지웁니다."""
+        cutoff = time.time() - older_than_seconds
+        return self._write(lambda conn: conn.execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (cutoff,)
+        ).rowcount)
+
+    def stats(self, window_seconds=3600):
+        """
+        단계별 지표
+        - queued / running / failed: 현재 작업 수
+        - lag_seconds: 가장 오래 기다린 대기 작업의 대기 시간
+        - done / items / per_minute: 최근 window 동안 완료한 작업 수, 처리 항목 수, 분당 처리 항목 수
+        - avg_wait_seconds / avg_run_seconds: 최근 완료 작업의 평균 대기/실행 시간
+        """
+        now = time.time()
+        conn = self._conn()
+        stages = {}
+
+        def entry(stage):
+            return stages.setdefault(stage, {
+                "queued": 0, "running": 0, "failed": 0, "lag_seconds": 0.0,
+                "done": 0, "items": 0, "per_minute": 0.0, "avg_wait_seconds": 0.0, "avg_run_seconds": 0.0,
+            })
+
+        for stage, status, count, oldest in conn.execute(
+            "SELECT stage, status, COUNT(*), MIN(enqueued_at) FROM jobs "
+            "WHERE status IN ('queued', 'running', 'failed') GROUP BY stage, status"
+        ):
+            entry(stage)[status] = count
+            if status == "queued":
+                entry(stage)["lag_seconds"] = round(now - oldest, 1)
+
+        for stage, done, items, wait, run in conn.execute(
+            "SELECT stage, COUNT(*), SUM(items), AVG(started_at - enqueued_at), AVG(finished_at - started_at) "
+            "FROM jobs WHERE status = 'done' AND finished_at >= ? GROUP BY stage",
+            (now - window_seconds,),
+        ):
+            e = entry(stage)
+            e.update(
+                done=done,
+                items=items or 0,
+                per_minute=round((items or 0) / (window_seconds / 60), 2),
+                avg_wait_seconds=round(wait or 0.0, 2),
+                avg_run_seconds=round(run or 0.0, 2),
+            )
+        return stages
+
+
+class LeaderLock(_SQLiteStore):
+    def __init__(self, path, name="pipeline-leader", ttl=60.0, owner=None):
+        super().__init__(path)
+        self.name = name
+        self.ttl = ttl
+        self.owner = owner or make_owner_id()
+
+    def try_acquire(self):
+        """잠금을 잡거나(만료된 잠금 포함) 이미 내 것이면 연장합니다. 리더이면 True"""
+        now = time.time()
+
+        def acquire(conn):
+            conn.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (self.name, self.owner, now + self.ttl, now),
+            )
+            row = conn.execute("SELECT owner FROM leases WHERE name = ?", (self.name,)).fetchone()
+            return row is not None and row[0] == self.owner
+
+        return self._write(acquire)
+
+    def release(self):
+        self._write(lambda conn: conn.execute(
+            "DELETE FROM leases WHERE name = ? AND owner = ?", (self.name, self.owner)
+        ))
+
+    def holder(self):
+        row = self._conn().execute("SELECT owner, expires_at FROM leases WHERE name = ?", (self.name,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
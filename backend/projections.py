@@ -0,0 +1,86 @@
+# projections.py
+"""
+목록 응답용 가벼운 조회(projection).
+
+목록 화면에는 제목/언론사/링크 정도만 필요한데, ORM 객체 전체를 읽으면
+기사 본문(contents, 수 KB)과 img_urls JSON까지 DB에서 꺼내 파싱하고 직렬화하게 됩니다.
+여기서는 필요한 컬럼만 SELECT하고, 본문이 필요하면 DB에서 앞부분만 잘라(substr) snippet으로 가져옵니다.
+
+view
+- full: 기존과 같은 전체 행 (기본값, 하위 호환)
+- summary: ArticleSummary / IssueSummary 필드만 (+ snippet 글자 수를 주면 본문 앞부분)
+"""
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Article, Issue
+from schemas import ArticleResponse, ArticleSummary, IssueDetailSummary, IssueResponse, IssueSummary
+
+VIEW_FULL = "full"
+VIEW_SUMMARY = "summary"
+VIEW_PATTERN = f"^({VIEW_SUMMARY}|{VIEW_FULL})$"
+# snippet 최대 글자 수
+MAX_SNIPPET_CHARS = 1000
+
+ARTICLE_SUMMARY_COLUMNS = (
+    Article.id, Article.title, Article.category, Article.url, Article.company_name, Article.time, Article.author,
+)
+ISSUE_SUMMARY_COLUMNS = (Issue.id, Issue.title, Issue.created_at)
+
+# 응답 직렬화기 (FastAPI response_model 검증을 거치지 않고 바로 JSON 바이트로)
+_ADAPTERS = {
+    ("article", VIEW_FULL): TypeAdapter(List[ArticleResponse]),
+    ("article", VIEW_SUMMARY): TypeAdapter(List[ArticleSummary]),
+    ("issue", VIEW_FULL): TypeAdapter(List[IssueResponse]),
+    ("issue", VIEW_SUMMARY): TypeAdapter(List[IssueSummary]),
+}
+
+
+def _snippet(column, snippet):
+    return func.substr(column, 1, min(snippet, MAX_SNIPPET_CHARS)).label("snippet")
+
+
+def article_columns(snippet: int = 0):
+    """요약 목록용 SELECT 컬럼 (snippet > 0이면 본문 앞 snippet글자 포함)"""
+    return ARTICLE_SUMMARY_COLUMNS + ((_snippet(Article.contents, snippet),) if snippet else ())
+
+
+def issue_columns(snippet: int = 0):
+    return ISSUE_SUMMARY_COLUMNS + ((_snippet(Issue.contents, snippet),) if snippet else ())
+
+
+def article_list_query(db: Session, view: str = VIEW_FULL, snippet: int = 0):
+    if view == VIEW_SUMMARY:
+        return db.query(*article_columns(snippet))
+    return db.query(Article)
+
+
+def issue_list_query(db: Session, view: str = VIEW_FULL, snippet: int = 0):
+    if view == VIEW_SUMMARY:
+        return db.query(*issue_columns(snippet))
+    return db.query(Issue)
+
+
+def issue_article_summaries(db: Session, issue_id: int, snippet: int = 0):
+    """이슈에 속한 기사 요약 목록 (최신순). 본문 전체 대신 필요한 컬럼만 읽습니다."""
+    return db.query(*article_columns(snippet))\
+        .filter(Article.issue_id == issue_id)\
+        .order_by(Article.time.desc(), Article.id.desc())\
+        .all()
+
+
+def dump_json(kind: str, view: str, rows) -> bytes:
+    """kind(article | issue) / view에 맞는 스키마로 rows(ORM 객체 또는 Row)를 JSON 바이트로 직렬화합니다."""
+    adapter = _ADAPTERS[(kind, view)]
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def dump_issue_summary(issue, articles) -> bytes:
+    """/issues/{id}?view=summary 응답: 이슈 전체 필드 + 기사 요약 목록"""
+    return IssueDetailSummary(
+        **IssueResponse.model_validate(issue).model_dump(),
+        articles=TypeAdapter(List[ArticleSummary]).validate_python(articles, from_attributes=True),
+    ).model_dump_json()
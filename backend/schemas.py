@@ -36,13 +36,13 @@ class IssueResponse(BaseModel):
     
     id: 기사 ID<br/>
     title: 기사 제목<br/>
-    content: 기사 내용<br/>
+    contents: 기사 내용 (클러스터링 직후 아직 생성 전이면 null)<br/>
     created_at: 기사 생성 시각
     analysis_result: AI 비교분석 (옵션)
     """
     id: int
     title: str
-    contents: str
+    contents: Optional[str] = None
     created_at: datetime
     # 통째로 구조화된 JSON 데이터를 보냅니다. (프론트엔드가 받아서 알아서 뿌림)
     analysis_result: Optional[Any] 
@@ -50,6 +50,75 @@ class IssueResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ArticleSummary(BaseModel):
+    """
+    뉴스 기사 요약 응답 스키마 (목록용, view=summary)<br/><br/>
+    
+    본문(contents)과 이미지 목록 없이 목록 화면에 필요한 필드만 보냅니다.<br/>
+    snippet: 본문 앞부분 (snippet 글자 수를 요청했을 때만)
+    """
+    id: int
+    title: str
+    category: Optional[str] = None
+    url: str
+    company_name: Optional[str] = None
+    time: Optional[datetime] = None
+    author: Optional[str] = None
+    snippet: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class IssueSummary(BaseModel):
+    """
+    AI 생성 기사 요약 응답 스키마 (목록용, view=summary)<br/><br/>
+    
+    snippet: 내용 앞부분 (snippet 글자 수를 요청했을 때만)
+    """
+    id: int
+    title: str
+    created_at: datetime
+    snippet: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class IssueDetailSummary(IssueResponse):
+    """
+    이슈 상세 응답 (view=summary): 이슈 전체 필드 + 관련 기사 요약 목록
+    """
+    articles: List[ArticleSummary] = []
+
+class FeedArticle(ArticleSummary):
+    """
+    개인화 피드 기사 (ArticleSummary + 점수)<br/><br/>
+    
+    score: 관심사 가중치 합 x 최신성 감쇠 (클수록 먼저)
+    """
+    score: float
+
+class FeedIssue(IssueSummary):
+    """
+    개인화 피드 이슈 (IssueSummary + 점수)<br/><br/>
+    
+    score: 피드 상위 기사 중 이 이슈에 속한 기사들의 점수 합
+    """
+    score: float
+
+class FeedResponse(BaseModel):
+    """
+    개인화 피드 응답 스키마<br/><br/>
+    
+    login_id: 사용자 ID<br/>
+    articles: 점수순 기사 목록<br/>
+    issues: 점수순 이슈 목록<br/>
+    generated_at: 순위를 계산한 시각 (캐시된 결과면 이전 시각)
+    """
+    login_id: str
+    articles: List[FeedArticle] = []
+    issues: List[FeedIssue] = []
+    generated_at: datetime
+
 # 회원가입 요청 시 받을 데이터
 class UserCreateRequest(BaseModel):
     """
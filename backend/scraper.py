@@ -1,169 +1,247 @@
 import requests
 from bs4 import BeautifulSoup
 import json
-import time
-import re
+import os
 
+import crud
+from crawl_engine import CrawlEngine, DEFAULT_HEADERS
+from crawl_state import CrawlState, content_hash
+from page_archive import open_default_archive
+from parse_pool import fetch_and_parse
+from news_parser import is_korean_article, parse_article  # noqa: F401 (is_korean_article: 기존 import 경로 유지)
 
-# 기사에 한글 비중이 25%이하면 무시합니다.
-def is_korean_article(text, threshold=0.25):
-    if not text:
-        return False
-    korean_chars = re.findall(r"[가-힣]", text)
-    total_chars = len(text.replace(" ", ""))
-    if total_chars == 0:
-        return False
-    return (len(korean_chars) / total_chars) >= threshold
+# 섹션 목록 페이지 주소 (벤치마크 시 로컬 대역 서버 주소로 바꿔 끼울 수 있습니다)
+NAVER_LIST_URL = "https://news.naver.com/main/list.naver?mode=LSD&mid=sec&sid1={sid}"
 
+# 직전 크롤링 사이클의 카운터 (run_article_crawler 호출마다 갱신)
+last_crawl_stats = {}
 
-def get_news_data(url):
+# 섹션 목록 페이지 깊이: 평소에는 얕게, 마지막 수집 후 CATCHUP_AFTER초가 지났으면(다운타임) 깊게 따라잡기
+LIST_STEADY_PAGES = int(os.getenv("CRAWL_LIST_STEADY_PAGES", "2"))
+LIST_CATCHUP_PAGES = int(os.getenv("CRAWL_LIST_CATCHUP_PAGES", "10"))
+LIST_CATCHUP_AFTER = int(os.getenv("CRAWL_LIST_CATCHUP_AFTER", "1800"))
+
+# 상세 페이지 파싱 프로세스 수와, 프로세스 풀을 쓰기 시작하는 페이지 수
+# (평소 몇십 건은 프로세스를 띄우는 비용이 더 크므로 받기 스레드에서 바로 파싱)
+PARSE_WORKERS = int(os.getenv("CRAWL_PARSE_WORKERS", str(os.cpu_count() or 1)))
+PARSE_POOL_MIN_PAGES = int(os.getenv("CRAWL_PARSE_POOL_MIN_PAGES", "200"))
+
+# 섹션별 ETag/Last-Modified/목록 해시/최근 기사 URL (재시작 후에도 유지)
+default_crawl_state = CrawlState(os.getenv("CRAWL_STATE_PATH", "./crawl_state.json"))
+
+# 상세 페이지 원본 보관소 (PAGE_ARCHIVE_DIR을 설정했을 때만)
+default_page_archive = open_default_archive()
+
+
+def get_news_data(url, engine=None, archive=None):
     """
     [상세 페이지 파싱 함수]
     역할: 제목, 시간, 언론사, 카테고리, 기자, 본문, 이미지를 추출합니다.
+    engine(CrawlEngine)을 넘기면 공유 세션과 호스트별 요청 제한을 사용합니다.
+    archive(PageArchive)를 넘기면 받은 원본 HTML을 보관합니다. (추출 로직 수정 후 재파싱용)
+    추출은 news_parser의 백엔드(NEWS_PARSER_BACKEND: auto | bs4 | lxml | selectolax)가 담당합니다.
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
-    }
-
     try:
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # 1. 기사 제목 및 언론사 추출
-        title = (
-            soup.select_one("h2#title_area span").get_text(strip=True)
-            if soup.select_one("h2#title_area span")
-            else "제목 없음"
-        )
-        company_name = (
-            soup.select_one(".media_end_head_top_logo img")["title"]
-            if soup.select_one(".media_end_head_top_logo img")
-            else "언론사 미상"
-        )
-
-        # 네이버 뉴스 상단에 노출되는 섹션 정보(정치, 경제 등)를 가져옵니다.
-        category_el = soup.select_one(".media_end_head_top_channel_layer_text strong")
-        category = category_el.get_text(strip=True) if category_el else "미분류"
-
-        # 2. 기사 시간 추출
-        time_el = soup.select_one(".media_end_head_info_datestamp_time._ARTICLE_DATE_TIME")
-        time_val = time_el["data-date-time"] if time_el and time_el.has_attr("data-date-time") else "시간 정보 없음"
-
-        # 3. 본문 영역 확보 (기자명 추출을 위해 정제 전 원본 텍스트 보관 필요)
-        content_area = soup.select_one("#newsct_article")
-        if not content_area:
-            return None
-        raw_content_text = content_area.get_text(separator=" ", strip=True) if content_area else ""
-
-        # 3-2 한글 필터링 적용
-        if not is_korean_article(raw_content_text):
-            return None
-
-        # 4. [강화된 기자명 추출 로직]
-        author = "기자 미상"
-
-        # 4-1. 1순위: 네이버 표준 레이아웃(상단 기자명 영역) 탐색
-        author_el = soup.select_one(".media_end_head_journalist_name")
-        if author_el:
-            author = author_el.get_text(strip=True)
-
-        # 4-2. 2순위: 레이아웃에 없을 경우 본문 텍스트 내에서 패턴 매칭 (KBS, 연합뉴스 등 대응)
-        if (author == "기자 미상" or not author) and raw_content_text:
-            # 패턴 A: 이메일 앞의 이름 추출 (예: 홍길동 기자 abc@kbs.co.kr)
-            email_match = re.search(r"([가-힣]{2,4})\s?(?:기자)?\s?[\w\.-]+@[\w\.-]+", raw_content_text)
-            # 패턴 B: 본문 하단 'OOO 기자' 문구 추출
-            name_match = re.search(r"([가-힣]{2,4})\s?기자", raw_content_text)
-
-            if email_match:
-                author = email_match.group(1).strip()
-            elif name_match:
-                author = name_match.group(1).strip()
-
-        # 5. 이미지 URL 리스트 수집
-        img_urls = [
-            img.get("data-src") or img.get("src")
-            for img in soup.select("#newsct_article img")
-            if img.get("data-src") or img.get("src")
-        ]
-
-        # 6. 본문 텍스트 정제 (태그 제거)
-        if content_area:
-            # 원본 보존을 위해 copy를 사용하거나, 필요한 데이터를 뽑은 후 제거 진행
-            for extra in content_area.select(".img_desc, .article_caption, em, script, style"):
-                extra.decompose()
-            contents = content_area.get_text(separator=" ", strip=True)
+        if engine:
+            response = engine.get(url)
         else:
-            contents = "내용 없음"
-
-        return {
-            "title": title,
-            "time": time_val,  # 날짜
-            "company_name": company_name,  # 언론사
-            "author": author,  # 기자
-            "contents": contents,  # 본문
-            "img_urls": img_urls,  # 이미지
-            "url": url,  # 링크
-            "category": "미분류" # 카테고리는 run_article_crawler에서 줄 예정.
-        }
+            response = requests.get(url, headers=DEFAULT_HEADERS, timeout=10)
+        if archive is not None:
+            archive.put_response(url, response)
+        return parse_article(response.text, url)
 
     except Exception as e:
         print(f"[오류] 상세 페이지 파싱 실패: {url} | 사유: {e}")
         return None
 
 
-def run_article_crawler(target_companies=None, debug_save=False, output_file="news_result.json"):
+def run_article_crawler(
+    target_companies=None,
+    debug_save=False,
+    output_file="news_result.json",
+    engine=None,
+    list_url=NAVER_LIST_URL,
+    db_check_session=None,
+    state=None,
+    parse_workers=None,
+    archive=None,
+    save=None,
+):
     """
     통합 크롤링 제어 함수.
     반환값: [get_news_data(url)가 반환한 값 리스트]
 
     섹션 100(정치) ~ 105(IT/과학)까지 순회하며 크롤링
     001:전체 100:정치, 101:경제, 102:사회, 103:생활/문화, 104:세계, 105:IT/과학
-    """
-    is_filter_mode = True if target_companies else False
-
-    sections = ["100", "101", "102", "103", "104", "105"]
-    section_names = {"100": "정치", "101": "경제", "102": "사회", "103": "생활/문화", "104": "세계", "105": "IT/과학"}
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
-    }
 
-    all_news_data = []
-    # 중복 수집 방지를 위한 세트
-    seen_urls = set()
+    섹션 목록과 상세 페이지는 CrawlEngine 스레드 풀에서 동시에 수집합니다.
+    engine을 넘기지 않으면 이번 호출 동안만 쓰는 엔진을 만들고 끝나면 닫습니다.
 
-    for sid in sections:
-        print(f"\n[섹션 수집] {section_names[sid]} 뉴스 수집 중...")
-        list_url = f"https://news.naver.com/main/list.naver?mode=LSD&mid=sec&sid1={sid}"
+    db_check_session을 넘기면 상세 페이지를 받기 전에 후보 URL 전체를
+    articles.url과 한 번에 대조해서, 이미 저장된 기사는 다운로드하지 않습니다.
+    사이클별 카운터는 last_crawl_stats에 남습니다.
 
-        try:
-            response = requests.get(list_url, headers=headers)
-            soup = BeautifulSoup(response.text, "html.parser")
+    섹션 목록은 state(CrawlState, 기본값 default_crawl_state)를 이용해 조건부 요청을 보내고,
+    304나 직전과 같은 목록이면 파싱하지 않으며, 이미 본 기사 URL이 나오면 다음 페이지(&page=N)를 받지 않습니다.
 
-            # 목록에서 기사 URL 추출
-            atags = soup.select(".list_body a, .sa_text_title")
+    상세 페이지가 PARSE_POOL_MIN_PAGES건 이상이면(다운타임 후 따라잡기 등) 받기는 엔진 스레드,
+    파싱은 parse_workers(기본 PARSE_WORKERS)개 프로세스로 나눠 처리합니다. (parse_pool.fetch_and_parse)
 
-            # 리스트 컴프리헨션으로 URL 정리 및 중복 제거
-            urls = [a.get("href") for a in atags if a.get("href") and "article" in a.get("href")]
+    archive(기본값 default_page_archive, PAGE_ARCHIVE_DIR 설정 시)가 있으면 상세 페이지 원본을 보관합니다.
 
-            for url in set(urls):  # 현재 섹션 내 중복 제거
-                if url in seen_urls:
-                    continue  # 이미 수집한 URL이면 패스
+    save(news_list)를 넘기면 수집한 기사를 반환 전에 저장합니다. (예: crud.create_articles_bulk)
+    목록 상태(이미 본 URL, 첫 페이지 ETag/해시)는 기사가 처리된 뒤에만 기록합니다.
+    상세 페이지 받기/파싱이 실패했거나 save가 예외를 내면 그 URL은 기억하지 않고, 그 섹션의 목록 해시도 갱신하지 않으므로
+    다음 사이클에 목록을 다시 파싱해서 같은 기사를 다시 받습니다.
+    """
+    sections = ["100", "101", "102", "103", "104", "105"]
+    section_names = {"100": "정치", "101": "경제", "102": "사회", "103": "생활/문화", "104": "세계", "105": "IT/과학"}
 
-                data = get_news_data(url)
-                if data:
-                    # 만약 상세페이지에서 카테고리를 못 찾았을 때만 섹션 이름으로 채워줌
-                    if data["category"] == "미분류":
-                        data["category"] = section_names[sid]
+    own_engine = engine is None
+    if own_engine:
+        engine = CrawlEngine()
+    if state is None:
+        state = default_crawl_state
+    if archive is None:
+        archive = default_page_archive
+
+    def list_depth(sid):
+        since = state.seconds_since_crawl(sid)
+        if since is None:
+            return 1  # 상태가 없으면 기존처럼 첫 페이지만
+        return LIST_CATCHUP_PAGES if since > LIST_CATCHUP_AFTER else LIST_STEADY_PAGES
+
+    def fetch_section_urls(sid):
+        """섹션의 새 기사 URL과 목록 요청 카운터를 반환합니다."""
+        print(f"\n[섹션 수집] {section_names[sid]} 뉴스 수집 중...")
+        counters = {"list_requests": 0, "list_not_modified": 0, "list_unchanged": 0, "list_parsed": 0,
+                    "list_bytes": 0, "list_bytes_saved": 0}
+        new_urls = []
+        first_page = None
+        base_url = list_url.format(sid=sid)
+        try:
+            for page in range(1, list_depth(sid) + 1):
+                if page == 1:
+                    previous = state.section(sid)
+                    response = engine.get(base_url, headers=state.conditional_headers(sid))
+                else:
+                    response = engine.get(f"{base_url}&page={page}")
+                counters["list_requests"] += 1
+                counters["list_bytes"] += len(response.content)
+
+                if page == 1:
+                    # 변경 없음(304) 또는 내용이 같은 목록이면 파싱/다음 페이지를 모두 건너뜁니다.
+                    if response.status_code == 304:
+                        counters["list_not_modified"] += 1
+                        counters["list_bytes_saved"] += previous.get("size", 0)
+                        state.record_page(sid, response)
+                        break
+                    if response.status_code == 200 and content_hash(response.content) == previous.get("content_hash"):
+                        counters["list_unchanged"] += 1
+                        state.record_page(sid, response, response.content)
+                        break
+                if response.status_code != 200:
+                    print(f"[{sid}] 섹션 목록 응답 코드 {response.status_code} (page={page})")
+                    break
+                if page == 1:
+                    # 검증 헤더/해시는 이 목록의 기사가 모두 처리된 뒤에 기록합니다. (_commit_state)
+                    first_page = response
+
+                soup = BeautifulSoup(response.text, "html.parser")
+                counters["list_parsed"] += 1
+
+                # 목록에서 기사 URL 추출
+                atags = soup.select(".list_body a, .sa_text_title")
+                urls = list(dict.fromkeys(a.get("href") for a in atags if a.get("href") and "article" in a.get("href")))
+                fresh = [url for url in urls if not state.is_known(sid, url)]
+                new_urls.extend(fresh)
+                # 이미 본 기사가 나오면 그 뒤(더 오래된 기사)는 지난 사이클에 받았으므로 멈춥니다.
+                if not urls or len(fresh) < len(urls):
+                    break
+        except Exception as e:
+            print(f"[{sid}] 섹션 목록 수집 중 오류: {e}")
 
-                    if not target_companies or any(tc in data["company_name"] for tc in target_companies):
-                        all_news_data.append(data)
-                        seen_urls.add(url)
-                        print(f"[수집] {data['company_name']} | {data['title'][:15]}...")
+        new_urls = list(dict.fromkeys(new_urls))  # 현재 섹션 내 중복 제거 (순서 유지)
+        return new_urls, counters, first_page
 
-                time.sleep(0.1)  # 섹션 내 기사 간 휴식
+    def commit_state(section_results, done_urls):
+        """처리가 끝난 URL만 기억하고, 실패한 URL이 없는 섹션만 첫 페이지 ETag/해시를 기록합니다."""
+        for sid, (urls, _, first_page) in zip(sections, section_results):
+            state.remember_urls(sid, [url for url in urls if url in done_urls])
+            if first_page is not None:
+                if all(url in done_urls for url in urls):
+                    state.record_page(sid, first_page, first_page.content)
+                else:
+                    state.record_page(sid)
 
-        except Exception as e:
-            print(f"[{sid}] 섹션 목록 수집 중 오류: {e}")
-            continue
+    try:
+        section_results = engine.map(fetch_section_urls, sections)
+
+        # 중복 수집 방지: 여러 섹션에 걸친 URL은 처음 나온 섹션 기준으로 한 번만 가져옵니다.
+        candidates = {}
+        for sid, (urls, _, _) in zip(sections, section_results):
+            for url in urls:
+                candidates.setdefault(url, sid)
+
+        stats = {"candidates": len(candidates), "skipped_known": 0, "fetched": 0, "parsed": 0, "collected": 0}
+        # 이번 사이클에서 처리가 끝난 URL (이미 저장된 것 + 파싱 후 저장한 것)
+        done_urls = set(candidates)
+        for _, counters, _ in section_results:
+            for key, value in counters.items():
+                stats[key] = stats.get(key, 0) + value
+        if db_check_session is not None and candidates:
+            new_urls = set(crud.filter_new_urls(db_check_session, list(candidates)))
+            stats["skipped_known"] = len(candidates) - len(new_urls)
+            candidates = {url: sid for url, sid in candidates.items() if url in new_urls}
+
+        items = list(candidates.items())
+        done_urls -= set(candidates)
+        stats["fetched"] = len(items)
+        if parse_workers is None:
+            parse_workers = PARSE_WORKERS if len(items) >= PARSE_POOL_MIN_PAGES else 0
+        stats["parse_workers"] = parse_workers
+        if parse_workers > 0:
+            results = fetch_and_parse([url for url, _ in items], engine, parse_workers=parse_workers, archive=archive)
+        else:
+            results = engine.map(lambda item: get_news_data(item[0], engine, archive), items)
+
+        all_news_data = []
+        for (url, sid), data in zip(items, results):
+            if not data:
+                continue
+            # 만약 상세페이지에서 카테고리를 못 찾았을 때만 섹션 이름으로 채워줌
+            if data["category"] == "미분류":
+                data["category"] = section_names[sid]
+
+            if not target_companies or any(tc in data["company_name"] for tc in target_companies):
+                all_news_data.append(data)
+                print(f"[수집] {data['company_name']} | {data['title'][:15]}...")
+
+        if archive is not None:
+            # 보관 페이지를 다시 파싱해 추가할 때(page_archive reparse --insert-missing) 쓸 카테고리
+            archive.set_categories({url: data["category"] for (url, _), data in zip(items, results) if data})
+        if save is not None:
+            save(all_news_data)
+        # 저장까지 끝났으면 파싱에 성공한 URL도 처리 완료 (다른 언론사라 고르지 않은 기사 포함)
+        done_urls.update(url for (url, _), data in zip(items, results) if data)
+        commit_state(section_results, done_urls)
+    finally:
+        if own_engine:
+            engine.close()
+        state.save()
+
+    stats["parsed"] = sum(1 for data in results if data)
+    stats["collected"] = len(all_news_data)
+    last_crawl_stats.clear()
+    last_crawl_stats.update(stats)
+    print(
+        f"[크롤링 통계] 후보 {stats['candidates']}건 | 기존 URL 건너뜀 {stats['skipped_known']}건 | "
+        f"상세 요청 {stats['fetched']}건 | 수집 {stats['collected']}건"
+    )
+    print(
+        f"[목록 통계] 요청 {stats['list_requests']}회 | 304 {stats['list_not_modified']}회 | "
+        f"변경 없음 {stats['list_unchanged']}회 | 파싱 {stats['list_parsed']}페이지 | "
+        f"{stats['list_bytes'] / 1024:.1f}KB 수신 (약 {stats['list_bytes_saved'] / 1024:.1f}KB 절약)"
+    )
 
     return all_news_data
@@ -1,11 +1,14 @@
-import requests
+import asyncio
 import os
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from urllib.parse import quote
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from typing import List, Dict, Any, Optional, Union
 from models import Issue, Article
+import search_service
+from llm_cache import llm_cache
+from wiki_client import wiki_client
 
 # IBM WatsonX AI Import
 from ibm_watsonx_ai.foundation_models import ModelInference
@@ -20,18 +23,24 @@ credentials = {
     "url": os.getenv("WATSONX_URL"),
 }
 
+LLM_MODEL_ID = "meta-llama/llama-3-3-70b-instruct"
+
 llm_model = ModelInference(
-    model_id="meta-llama/llama-3-3-70b-instruct",
+    model_id=LLM_MODEL_ID,
     credentials=credentials,
     project_id=os.getenv("WATSONX_PROJECT_ID"),
 )
 
 # ------------------------------------
 
+# LLM 호출이 실패했을 때 요약 대신 돌려주는 문구 (통합 검색은 이 문구가 담긴 섹션을 실패로 보고 캐시하지 않음)
+LLM_ERROR_MESSAGE = "시스템 오류로 인해 AI 요약을 생성할 수 없습니다."
+
 
 def get_llm_summary(prompt: str) -> str:
     """
     IBM WatsonX ModelInference를 사용하여 요약/분석을 생성합니다.
+    같은 모델/파라미터/프롬프트 조합은 llm_cache에 저장된 응답을 재사용합니다.
     """
     try:
         # Llama 3 프롬프트 형식에 맞춰주는 것이 좋음 (System/User)
@@ -46,78 +55,52 @@ You are a helpful assistant that summarizes and analyzes text in Korean accurate
         # 파라미터 설정
         params = {"decoding_method": "greedy", "max_new_tokens": 1000, "min_new_tokens": 10, "repetition_penalty": 1.1}
 
-        # 텍스트 생성
-        response_text = llm_model.generate_text(prompt=full_prompt, params=params)
+        # 텍스트 생성 (캐시 미스일 때만 LLM 호출, 오류는 캐시하지 않음)
+        response_text = llm_cache.get_or_generate(
+            LLM_MODEL_ID, params, full_prompt, lambda: llm_model.generate_text(prompt=full_prompt, params=params)
+        )
         return response_text.strip()
 
     except Exception as e:
         print(f"LLM Error: {e}")
-        return "시스템 오류로 인해 AI 요약을 생성할 수 없습니다."
+        return LLM_ERROR_MESSAGE
 
 
 # 1. 위키피디아 검색 (Section 1)
 def search_wikipedia(keyword: str) -> Optional[Dict[str, str]]:
     """
     위키피디아 API를 통해 정의와 요약을 가져온 후, LLM을 통해 내용을 정리합니다.
-    API 검색 실패 시 None을 반환합니다.
+    문서를 찾지 못하면 None을 반환하고, 위키피디아 API 오류는 예외로 올려 보냅니다. (통합 검색에서 실패 섹션으로 처리)
     위키피디아의 출처를 표시하지 않습니다.
     (개선: 키워드로 먼저 '검색'하여 가장 적절한 문서 제목을 찾은 뒤 요약을 가져옴)
+    제목 검색 / 요약 조회는 wiki_client가 캐시하므로 같은 키워드는 네트워크를 다시 타지 않습니다.
     """
 
-    # 1. 관련 문서 제목 검색 (Opensearch API 사용)
-    search_url = "https://ko.wikipedia.org/w/api.php"
-    search_params = {"action": "opensearch", "search": keyword, "limit": 1, "namespace": 0, "format": "json"}
-
-    # Headers - 위키피디아 정책 준수
-    headers = {"User-Agent": "VaccineDailyReportBot/1.0 (contact@example.com)"}
-
-    target_title = keyword  # 기본값은 입력받은 그대로
-
-    try:
-        search_res = requests.get(search_url, params=search_params, headers=headers, timeout=5)
-        if search_res.status_code == 200:
-            search_data = search_res.json()
-            if search_data and len(search_data) > 1 and search_data[1]:
-                target_title = search_data[1][0]
-    except Exception as e:
-        print(f"Wikipedia Search API Error: {e}")
-
-    # 2. 해당 제목(target_title)으로 요약 정보 가져오기
-    encoded_keyword = quote(target_title)
-    url = f"https://ko.wikipedia.org/api/rest_v1/page/summary/{encoded_keyword}"
+    # 1. 관련 문서 제목 검색 + 2. 해당 제목으로 요약 정보 가져오기
+    page = wiki_client.lookup(keyword, raise_errors=True)
+    if not page:
+        return None
+
+    target_title = page["resolved_title"]
+    raw_summary = page["extract"]
+
+    # LLM을 이용해 내용을 정리 (1차 정보 전달)
+    llm_prompt = (
+        f"다음은 위키피디아의 '{target_title}'에 대한 요약 내용입니다. "
+        "위키피디아의 정보를 정확하게 전달해야 합니다."
+        "위키피디아의 출처는 표시하지 않습니다."
+        "한문과 한자가 포함되어있다면 번역하여 출력합니다."
+        f"이 내용을 읽기 쉽게 핵심만 정리해서 한국어로 설명해 주세요:\n\n{raw_summary}"
+    )
 
-    try:
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-
-            # 'type' 체크를 완화하고, title과 extract가 있는지 확인
-            # 'disambiguation' (동음이의어 문서) 타입은 제외할 수 있으나,
-            # 사용자 요구에 따라 일단 정보가 있으면 보여줌.
-            if data.get("title") and data.get("extract"):
-                raw_summary = data.get("extract")
-
-                # LLM을 이용해 내용을 정리 (1차 정보 전달)
-                llm_prompt = (
-                    f"다음은 위키피디아의 '{target_title}'에 대한 요약 내용입니다. "
-                    "위키피디아의 정보를 정확하게 전달해야 합니다."
-                    "위키피디아의 출처는 표시하지 않습니다."
-                    "한문과 한자가 포함되어있다면 번역하여 출력합니다."
-                    f"이 내용을 읽기 쉽게 핵심만 정리해서 한국어로 설명해 주세요:\n\n{raw_summary}"
-                )
-
-                llm_summary = get_llm_summary(llm_prompt)
-
-                return {
-                    "title": data.get("title"),
-                    "summary": llm_summary,
-                    "original_summary": raw_summary,
-                    "url": data.get("content_urls", {}).get("desktop", {}).get("page"),
-                }
-    except Exception as e:
-        print(f"Wikipedia Summary API Error: {e}")
+    llm_summary = get_llm_summary(llm_prompt)
 
-    return None
+    return {
+        "title": page["title"],
+        "summary": llm_summary,
+        "original_summary": raw_summary,
+        "url": page["url"],
+    }
 
 
 # 2. AI 요약(Issues) 검색 (Section 2)
@@ -126,16 +109,8 @@ def search_issues_by_keyword(db: Session, keyword: str) -> Dict[str, Any]:
     DB Issue 테이블에서만 키워드가 포함된 이슈를 검색하고, LLM을 통해 분석합니다.
     (Article 테이블은 참조하지 않음)
     """
-    search_pattern = f"%{keyword}%"
-
-    # Issue 테이블 검색
-    results = (
-        db.query(Issue)
-        .filter(or_(Issue.title.ilike(search_pattern), Issue.contents.ilike(search_pattern)))
-        .order_by(Issue.created_at.desc())
-        .limit(5)
-        .all()
-    )
+    # Issue 테이블 검색 (전문 검색 색인 사용, 최신순)
+    results = search_service.search_issues(db, keyword, limit=5)
 
     issues_list = [
         {"id": issue.id, "title": issue.title, "contents": issue.contents, "created_at": issue.created_at}
@@ -164,20 +139,18 @@ def search_issues_by_keyword(db: Session, keyword: str) -> Dict[str, Any]:
     return {"analysis": analysis_result, "issues": issues_list}
 
 
+# 목록용 조회 컬럼 (기사 본문 contents는 읽지 않음)
+HOT_TOPIC_COLUMNS = (Article.id, Article.title, Article.img_urls, Article.url, Article.company_name)
+RELATED_ARTICLE_COLUMNS = (Article.id, Article.title, Article.url, Article.company_name)
+
+
 # 3. 핫토픽(Articles) 검색 (Section 3)
 def search_hot_topics_by_keyword(db: Session, keyword: str) -> List[Dict[str, Any]]:
     """
     DB Article 테이블에서 키워드가 포함되고 이미지가 있는 기사를 검색합니다.
     """
-    search_pattern = f"%{keyword}%"
-
-    articles = (
-        db.query(Article)
-        .filter(or_(Article.title.ilike(search_pattern), Article.contents.ilike(search_pattern)))
-        .order_by(Article.time.desc())
-        .limit(50)
-        .all()
-    )
+    # 본문 없이 필요한 컬럼만 읽습니다.
+    articles = search_service.search_articles(db, keyword, limit=50, columns=HOT_TOPIC_COLUMNS)
 
     hot_topics = []
     for art in articles:
@@ -202,14 +175,7 @@ def search_articles_by_keyword(db: Session, keyword: str) -> List[Dict[str, Any]
     """
     DB Article 테이블에서 키워드가 포함된 기사를 검색합니다.
     """
-    search_pattern = f"%{keyword}%"
-
-    articles = (
-        db.query(Article)
-        .filter(or_(Article.title.ilike(search_pattern), Article.contents.ilike(search_pattern)))
-        .order_by(Article.time.desc())
-        .limit(20)
-    )  # 최대 20개
+    articles = search_service.search_articles(db, keyword, limit=20, columns=RELATED_ARTICLE_COLUMNS)  # 최대 20개
 
     # 쿼리 결과 사용
 
@@ -217,3 +183,119 @@ def search_articles_by_keyword(db: Session, keyword: str) -> List[Dict[str, Any]
         {"id": art.id, "title": art.title, "url": art.url, "company_name": art.company_name, "view_count": 0}
         for art in articles
     ]
+
+
+# 5. 통합 검색 (Section 1~3 병렬 실행 + 결과 캐시)
+# ------------------------------------
+
+# 섹션별 제한 시간(초). 넘기면 해당 섹션은 비워서 부분 결과로 응답합니다.
+COMPREHENSIVE_SECTION_TIMEOUT = float(os.getenv("COMPREHENSIVE_SECTION_TIMEOUT", "8"))
+
+# 섹션 실행 전용 스레드 풀. 시간 초과로 버려진 느린 호출이 스레드를 잡고 있어도
+# 빠른 DB 섹션이 기본 실행기 자리를 기다리지 않도록 넉넉하게 따로 둡니다.
+_section_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("COMPREHENSIVE_SEARCH_WORKERS", "32")), thread_name_prefix="search"
+)
+
+# 키워드별 통합 검색 결과 캐시 (모든 섹션이 성공한 응답만 저장)
+_comprehensive_cache = TTLCache(
+    maxsize=int(os.getenv("COMPREHENSIVE_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("COMPREHENSIVE_CACHE_TTL", "600")),
+)
+# 같은 키워드로 동시에 들어온 요청은 하나의 검색 작업을 함께 기다립니다.
+_comprehensive_inflight: Dict[str, asyncio.Future] = {}
+
+# 섹션 실패/시간 초과 시 채워 넣을 기본값
+_SECTION_DEFAULTS = {
+    "definition": None,
+    "ai_summaries": {"analysis": None, "issues": []},
+    "hot_topics": [],
+    "articles": [],
+}
+
+
+async def _run_section(name: str, func, keyword: str, session_factory, timeout: float):
+    """섹션 하나를 스레드에서 실행합니다. DB가 필요한 섹션은 자기 전용 세션을 엽니다."""
+
+    def call():
+        if session_factory is None:
+            return func(keyword)
+        db = session_factory()
+        try:
+            return func(db, keyword)
+        finally:
+            db.close()
+
+    try:
+        loop = asyncio.get_running_loop()
+        return name, await asyncio.wait_for(loop.run_in_executor(_section_executor, call), timeout), None
+    except asyncio.TimeoutError:
+        print(f"[Search] '{name}' 섹션 시간 초과 ({timeout}s): {keyword}")
+        return name, _SECTION_DEFAULTS[name], "timeout"
+    except Exception as e:
+        print(f"[Search] '{name}' 섹션 오류: {e}")
+        return name, _SECTION_DEFAULTS[name], "error"
+
+
+def _llm_failed(name: str, value) -> bool:
+    """LLM 오류 문구로 채워진 섹션인지 (오류 없이 돌아왔어도 캐시하면 안 됨)"""
+    if name == "definition":
+        return bool(value) and value.get("summary") == LLM_ERROR_MESSAGE
+    if name == "ai_summaries":
+        return value.get("analysis") == LLM_ERROR_MESSAGE
+    return False
+
+
+async def _comprehensive_search_uncached(keyword: str, session_factory, timeout: float) -> Dict[str, Any]:
+    sections = [
+        ("definition", search_wikipedia, None),
+        ("ai_summaries", search_issues_by_keyword, session_factory),
+        ("hot_topics", search_hot_topics_by_keyword, session_factory),
+        ("articles", search_articles_by_keyword, session_factory),
+    ]
+    results = await asyncio.gather(
+        *(_run_section(name, func, keyword, factory, timeout) for name, func, factory in sections)
+    )
+
+    response = {"keyword": keyword}
+    failed_sections = []
+    for name, value, failure in results:
+        response[name] = value
+        if failure or _llm_failed(name, value):
+            failed_sections.append(name)
+    response["failed_sections"] = failed_sections
+    return response
+
+
+async def run_comprehensive_search(
+    keyword: str, session_factory, timeout: float = COMPREHENSIVE_SECTION_TIMEOUT
+) -> Dict[str, Any]:
+    """
+    위키피디아 정의 / AI 이슈 요약 / 핫토픽 / 관련 기사를 동시에 검색해서 합칩니다.
+    - 섹션별 제한 시간을 넘기거나 오류가 난 섹션은 기본값으로 채우고 failed_sections에 이름을 남깁니다.
+      LLM 요약에 실패한 섹션(LLM_ERROR_MESSAGE)은 내용은 그대로 두고 failed_sections에만 남깁니다.
+    - 모든 섹션이 성공한 응답만 키워드별 TTL 캐시에 저장해, 인기 검색어는 LLM을 다시 부르지 않습니다.
+    """
+    cache_key = keyword.strip()
+    cached = _comprehensive_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    inflight = _comprehensive_inflight.get(cache_key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    _comprehensive_inflight[cache_key] = future
+    try:
+        response = await _comprehensive_search_uncached(keyword, session_factory, timeout)
+        if not response["failed_sections"]:
+            _comprehensive_cache[cache_key] = response
+        future.set_result(response)
+        return response
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # 기다리는 요청이 없어도 '처리되지 않은 예외' 경고가 나지 않도록 표시
+        raise
+    finally:
+        _comprehensive_inflight.pop(cache_key, None)
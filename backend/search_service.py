@@ -0,0 +1,177 @@
+# search_service.py
+"""
+기사/이슈 키워드 검색 서비스.
+
+SQLite에서는 FTS5 가상 테이블(trigram 토크나이저, 한글 부분 문자열 검색 지원)로 검색하고,
+FTS5를 쓸 수 없는 경우(3글자 미만 검색어, 다른 DB, trigram 미지원 SQLite)에는
+기존과 같은 ilike('%keyword%') 검색으로 자동 전환합니다.
+
+FTS 테이블은 원본 테이블 내용을 참조(external content)하며, 트리거로 INSERT/UPDATE/DELETE 시 동기화됩니다.
+"""
+from typing import List, Optional, Sequence
+
+from sqlalchemy import column, or_, text
+from sqlalchemy.orm import Query, Session
+
+from models import Article, Issue
+
+# trigram 토크나이저는 3글자 이상이어야 색인을 탈 수 있습니다.
+MIN_FTS_KEYWORD_LENGTH = 3
+
+# 정렬 방식: "time" (최신순, 기존 동작) / "rank" (bm25 관련도순, 제목 가중치 ↑)
+ORDER_TIME = "time"
+ORDER_RANK = "rank"
+
+# (FTS 테이블 이름, 원본 테이블 이름)
+_FTS_TABLES = {
+    "articles_fts": "articles",
+    "issues_fts": "issues",
+}
+
+# bm25 컬럼 가중치 (title, contents)
+_BM25_WEIGHTS = "10.0, 1.0"
+
+# FTS 테이블이 준비된 것이 확인된 (엔진 URL, 테이블) 목록
+_ready_tables = set()
+
+
+def _fts_ddl(fts_table: str, source_table: str) -> List[str]:
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+            title, contents, content='{source_table}', content_rowid='id', tokenize='trigram'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source_table} BEGIN
+            INSERT INTO {fts_table}(rowid, title, contents) VALUES (new.id, new.title, new.contents);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source_table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, title, contents) VALUES ('delete', old.id, old.title, old.contents);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF title, contents ON {source_table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, title, contents) VALUES ('delete', old.id, old.title, old.contents);
+            INSERT INTO {fts_table}(rowid, title, contents) VALUES (new.id, new.title, new.contents);
+        END
+        """,
+    ]
+
+
+def ensure_search_index(engine) -> bool:
+    """
+    FTS5 테이블과 동기화 트리거를 만듭니다. (SQLite 전용, 여러 번 호출해도 안전)
+    테이블을 새로 만든 경우에는 기존 데이터로 색인을 한 번 채웁니다(rebuild).
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+
+    try:
+        with engine.begin() as conn:
+            for fts_table, source_table in _FTS_TABLES.items():
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts_table}
+                ).first()
+                for ddl in _fts_ddl(fts_table, source_table):
+                    conn.execute(text(ddl))
+                if not exists:
+                    print(f"🔎 [Search] {fts_table} 색인 생성 중...")
+                    conn.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+                _ready_tables.add((str(engine.url), fts_table))
+    except Exception as e:
+        # trigram 토크나이저는 SQLite 3.34 이상에서만 지원됩니다.
+        print(f"⚠️ [Search] FTS5 색인을 만들 수 없어 LIKE 검색을 사용합니다: {e}")
+        return False
+    return True
+
+
+def _use_fts(db: Session, fts_table: str, keyword: str) -> bool:
+    if len(keyword.strip()) < MIN_FTS_KEYWORD_LENGTH:
+        return False
+    bind = db.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+    key = (str(bind.url), fts_table)
+    if key in _ready_tables:
+        return True
+    exists = db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts_table}
+    ).first()
+    if exists:
+        _ready_tables.add(key)
+    return exists is not None
+
+
+def _match_expression(keyword: str) -> str:
+    # 검색어 전체를 하나의 구문(phrase)으로 감싸서, FTS 문법 문자(AND, *, " 등)를 그대로 검색합니다.
+    return '"' + keyword.strip().replace('"', '""') + '"'
+
+
+def _keyword_query(db: Session, model, fts_table: str, keyword: str, order: str) -> Query:
+    query = db.query(model)
+
+    if not _use_fts(db, fts_table, keyword):
+        search_pattern = f"%{keyword}%"
+        return query.filter(or_(model.title.ilike(search_pattern), model.contents.ilike(search_pattern)))
+
+    match = _match_expression(keyword)
+    if order == ORDER_RANK:
+        ranked = (
+            text(f"SELECT rowid, bm25({fts_table}, {_BM25_WEIGHTS}) AS score FROM {fts_table} WHERE {fts_table} MATCH :match")
+            .bindparams(match=match)
+            .columns(column("rowid"), column("score"))
+            .subquery()
+        )
+        # 관련도순일 때도 점수가 같으면 아래에서 붙는 최신순 정렬이 2차 기준이 됩니다.
+        return query.join(ranked, model.id == ranked.c.rowid).order_by(ranked.c.score)
+
+    matched_ids = (
+        text(f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :match")
+        .bindparams(match=match)
+        .columns(column("rowid"))
+    )
+    return query.filter(model.id.in_(matched_ids))
+
+
+def article_search_query(
+    db: Session, keyword: str, category: Optional[str] = None, order: str = ORDER_TIME
+) -> Query:
+    """제목 또는 본문에 keyword가 들어간 기사 쿼리 (카테고리 필터 / 정렬 적용)."""
+    query = _keyword_query(db, Article, "articles_fts", keyword, order)
+    if category:
+        query = query.filter(Article.category == category)
+    return query.order_by(Article.time.desc())
+
+
+def search_articles(
+    db: Session,
+    keyword: str,
+    category: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    order: str = ORDER_TIME,
+    columns: Optional[Sequence] = None,
+) -> List[Article]:
+    """columns를 주면 ORM 객체 대신 그 컬럼만 SELECT한 행을 반환합니다. (목록용, 본문 미포함)"""
+    query = article_search_query(db, keyword, category, order)
+    if columns:
+        query = query.with_entities(*columns)
+    return query.offset(skip).limit(limit).all()
+
+
+def issue_search_query(db: Session, keyword: str, order: str = ORDER_TIME) -> Query:
+    """제목 또는 내용에 keyword가 들어간 이슈 쿼리."""
+    return _keyword_query(db, Issue, "issues_fts", keyword, order).order_by(Issue.created_at.desc())
+
+
+def search_issues(
+    db: Session, keyword: str, skip: int = 0, limit: int = 20, order: str = ORDER_TIME,
+    columns: Optional[Sequence] = None,
+) -> List[Issue]:
+    query = issue_search_query(db, keyword, order)
+    if columns:
+        query = query.with_entities(*columns)
+    return query.offset(skip).limit(limit).all()
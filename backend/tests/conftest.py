@@ -0,0 +1,79 @@
+# tests/conftest.py
+"""
+DB 백엔드별 테스트 설정.
+
+db_engine / db fixture를 쓰는 테스트는 백엔드마다 한 번씩 실행됩니다.
+- sqlite    : 항상 (임시 파일, database.create_db_engine 설정 그대로)
+- postgresql: TEST_POSTGRES_URL 또는 DATABASE_URL이 PostgreSQL일 때
+- mysql     : TEST_MYSQL_URL 또는 DATABASE_URL이 MySQL일 때
+서버 URL이 없는 백엔드는 건너뜁니다. 테스트마다 테이블을 지우고 다시 만드므로 테스트 전용 DB를 쓰세요.
+
+실행 (backend 폴더에서):
+    python -m pytest tests
+    TEST_POSTGRES_URL=postgresql+psycopg2://user:pw@localhost:5432/test_db \\
+    TEST_MYSQL_URL=mysql+pymysql://user:pw@localhost:3306/test_db python -m pytest tests
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import create_db_engine  # noqa: E402
+from migrations import schema_migrations  # noqa: E402
+from models import Base  # noqa: E402
+
+BACKENDS = ["sqlite", "postgresql", "mysql"]
+URL_ENV = {"postgresql": "TEST_POSTGRES_URL", "mysql": "TEST_MYSQL_URL"}
+
+
+def backend_url(backend, tmp_path):
+    if backend == "sqlite":
+        return f"sqlite:///{tmp_path / 'test.db'}"
+    url = os.getenv(URL_ENV[backend])
+    if not url:
+        database_url = os.getenv("DATABASE_URL")
+        if database_url and make_url(database_url).get_backend_name() in ((backend, "mariadb") if backend == "mysql" else (backend,)):
+            url = database_url
+    if not url:
+        pytest.skip(f"{backend}: {URL_ENV[backend]}이 없어 건너뜁니다.")
+    return url
+
+
+def reset_schema(engine):
+    Base.metadata.drop_all(engine)
+    schema_migrations.drop(engine, checkfirst=True)
+
+
+@pytest.fixture(params=BACKENDS)
+def db_engine(request, tmp_path):
+    """빈 DB 엔진 (테이블 없음). 테스트가 create_all / run_migrations를 직접 부릅니다."""
+    engine = create_db_engine(backend_url(request.param, tmp_path))
+    with contextlib.redirect_stdout(io.StringIO()):
+        reset_schema(engine)
+    yield engine
+    reset_schema(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    """앱과 같은 스키마(create_all + 마이그레이션)를 만든 DB의 세션 생성기"""
+    from migrations import run_migrations
+
+    Base.metadata.create_all(db_engine)
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_migrations(db_engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
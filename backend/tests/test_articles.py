@@ -0,0 +1,126 @@
+# tests/test_articles.py
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+import crud
+from models import Article
+from pagination import decode_cursor, paginate
+
+
+def news(n, title=None, company="테스트일보", published=None):
+    published = published or datetime.now()
+    return {
+        "title": title or f"기사 {n}", "contents": "본문", "category": "경제", "url": f"https://n.news.naver.com/article/{n}",
+        "company_name": company, "img_urls": [], "time": published.strftime("%Y-%m-%d %H:%M:%S"), "author": "홍길동",
+    }
+
+
+def test_create_articles_bulk_skips_duplicates(db):
+    assert crud.create_articles_bulk(db, [news(1), news(2)]) == {"inserted": 2, "skipped_url": 0, "skipped_title": 0}
+
+    result = crud.create_articles_bulk(db, [
+        news(1),  # DB에 있는 URL
+        news(3), news(3),  # 배치 안 URL 중복
+        news(4, title="기사 2"),  # 최근 24시간 같은 제목+언론사
+        news(5, title="기사 2", company="다른일보"),  # 언론사가 다르면 저장
+        news(6, title="기사 6"), news(7, title="기사 6"),  # 배치 안 제목 중복
+    ])
+
+    assert result == {"inserted": 3, "skipped_url": 2, "skipped_title": 2}
+    urls = {url for (url,) in db.query(Article.url)}
+    assert urls == {f"https://n.news.naver.com/article/{n}" for n in (1, 2, 3, 5, 6)}
+
+
+def test_create_articles_bulk_allows_old_title(db):
+    old = datetime.now() - timedelta(days=3)
+    crud.create_articles_bulk(db, [news(1, title="같은 제목", published=old)])
+
+    result = crud.create_articles_bulk(db, [news(2, title="같은 제목")])
+
+    assert result["inserted"] == 1
+
+
+@pytest.fixture
+def listed(db):
+    """시각이 겹치는 기사 53건 (같은 시각끼리는 id로 정렬되어야 함)"""
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    db.add_all(
+        Article(title=f"기사 {i}", url=f"https://example.com/{i}", category="경제" if i % 2 else "정치", time=base + timedelta(minutes=i // 4))
+        for i in range(53)
+    )
+    db.commit()
+    return db.query(Article.id, Article.time).order_by(Article.time.desc(), Article.id.desc()).all()
+
+
+def test_keyset_pagination_visits_every_row_once(db, listed):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = paginate(db.query(Article), Article.time, Article.id, cursor=cursor, limit=10)
+        seen.extend(row.id for row in rows)
+        if cursor is None:
+            break
+
+    assert seen == [row.id for row in listed]
+
+
+def test_keyset_pages_match_offset_pages(db, listed):
+    first, cursor = paginate(db.query(Article), Article.time, Article.id, limit=10)
+    second_keyset, _ = paginate(db.query(Article), Article.time, Article.id, cursor=cursor, limit=10)
+    second_offset, _ = paginate(db.query(Article), Article.time, Article.id, skip=10, limit=10)
+
+    assert [a.id for a in second_keyset] == [a.id for a in second_offset]
+    assert decode_cursor(cursor) == (first[-1].time, first[-1].id)
+
+
+def test_keyset_pagination_with_filter(db, listed):
+    query = db.query(Article).filter(Article.category == "경제")
+    seen, cursor = [], None
+    while True:
+        rows, cursor = paginate(query, Article.time, Article.id, cursor=cursor, limit=7)
+        seen.extend(row.id for row in rows)
+        if cursor is None:
+            break
+
+    expected = [a.id for a in db.query(Article).filter(Article.category == "경제").order_by(Article.time.desc(), Article.id.desc())]
+    assert seen == expected
+
+
+def test_invalid_cursor(db):
+    with pytest.raises(ValueError):
+        paginate(db.query(Article), Article.time, Article.id, cursor="not-a-cursor")
+
+
+def test_create_articles_bulk_without_insert_ignore(db, monkeypatch):
+    # ON CONFLICT / INSERT IGNORE가 없는 DB: 행마다 SAVEPOINT로 넣고 중복은 건너뜀
+    monkeypatch.setattr(crud, "_insert_ignore", lambda db, model, conflict_columns: None)
+    crud.create_articles_bulk(db, [news(1)])
+    # 검사 이후 다른 프로세스가 먼저 넣은 URL (DB 중복 검사를 건너뛰게 해서 재현)
+    monkeypatch.setattr(crud, "get_existing_urls", lambda db, urls: set())
+
+    result = crud.create_articles_bulk(db, [news(1, title="다른 제목"), news(2)])
+
+    assert result == {"inserted": 1, "skipped_url": 1, "skipped_title": 0}
+    assert db.query(Article).count() == 2
+
+
+def test_filter_new_urls_across_chunk_boundary(db):
+    size = crud.IN_CHUNK_SIZE
+    urls = [f"https://example.com/{i}" for i in range(2 * size + 201)]
+    stored = {0, size - 1, size, 2 * size - 1, 2 * size, len(urls) - 1}
+    db.add_all(Article(title=f"기사 {i}", url=urls[i]) for i in stored)
+    db.commit()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        # 중복/빈 URL이 섞여도 청크는 중복 제거 후 기준
+        new = crud.filter_new_urls(db, urls + [urls[size], ""])
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    assert new == [u for i, u in enumerate(urls) if i not in stored] + [""]
+    assert len(statements) == 3  # 서로 다른 URL 1201개 -> 500개씩 청크마다 SELECT 한 번
+    assert crud.get_existing_urls(db, urls) == {urls[i] for i in stored}
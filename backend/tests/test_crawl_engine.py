@@ -0,0 +1,101 @@
+# tests/test_crawl_engine.py
+import threading
+import time
+
+import pytest
+
+from benchmarks.naver_stub import NaverStubServer
+from crawl_engine import CrawlEngine, PolitenessDelay
+
+
+class CountingStub(NaverStubServer):
+    """동시에 처리 중인 요청 수의 최댓값(peak)을 기록하는 대역 서버 (서버 하나 = 호스트 하나)"""
+
+    def __init__(self, latency=0.05):
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        super().__init__(latency=0)
+        self.hold = latency
+
+    def handle(self, path):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.hold)
+        with self._lock:
+            self.active -= 1
+        return 200, path.encode("utf-8"), None
+
+
+@pytest.fixture
+def stubs():
+    with CountingStub() as first, CountingStub() as second:
+        yield first, second
+
+
+def test_map_keeps_input_order():
+    with CrawlEngine(max_workers=8) as engine:
+        # 뒤 항목이 먼저 끝나도 결과는 입력 순서
+        assert engine.map(lambda n: time.sleep(0.01 * (10 - n)) or n * n, range(10)) == [n * n for n in range(10)]
+
+
+def test_map_returns_responses_in_order(stubs):
+    stub, _ = stubs
+    urls = [f"{stub.base_url}/page/{i}" for i in range(20)]
+    with CrawlEngine(max_workers=8, min_delay=0) as engine:
+        bodies = engine.map(lambda url: engine.get(url).text, urls)
+
+    assert bodies == [f"/page/{i}" for i in range(20)]
+
+
+def test_per_host_limit_caps_concurrent_requests(stubs):
+    first, second = stubs
+    # 127.0.0.1:포트가 다르면 다른 호스트(netloc)로 취급
+    urls = [f"{stub.base_url}/page/{i}" for i in range(12) for stub in (first, second)]
+    with CrawlEngine(max_workers=16, per_host_limit=2, min_delay=0) as engine:
+        engine.map(engine.get, urls)
+
+    assert first.peak == 2 and second.peak == 2
+
+
+def test_politeness_spaces_requests_to_same_host():
+    delay = PolitenessDelay(min_delay=0.05)
+    started = []
+
+    def request(host):
+        delay.wait(host)
+        started.append((host, time.monotonic()))
+
+    workers = [threading.Thread(target=request, args=(host,)) for host in ["a"] * 4 + ["b"]]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    times = sorted(t for host, t in started if host == "a")
+    assert all(later - earlier >= 0.045 for earlier, later in zip(times, times[1:]))
+    # 다른 호스트는 기다리지 않음
+    assert next(t for host, t in started if host == "b") - times[0] < 0.045
+
+
+def test_politeness_backs_off_on_errors():
+    delay = PolitenessDelay(min_delay=0.1, max_delay=1.0, latency_factor=0.5)
+    delay.record("a", 0.01, 200)
+    assert delay.delay_for("a") == pytest.approx(0.1)
+
+    delay.record("a", 0.01, 503)
+    delay.record("a", 0.01, 429)
+    assert delay.delay_for("a") == pytest.approx(0.4)
+
+    for _ in range(50):
+        delay.record("a", 0.01, None)
+    assert delay.delay_for("a") == pytest.approx(1.0)  # max_delay에서 멈춤
+
+    for _ in range(100):
+        delay.record("a", 0.01, 200)
+    assert delay.delay_for("a") == pytest.approx(0.1)
+
+    # 느린 서버는 응답 시간에 비례해 간격을 늘림
+    delay.record("slow", 1.0, 200)
+    assert delay.delay_for("slow") == pytest.approx(0.5)
@@ -0,0 +1,89 @@
+# tests/test_crawl_state.py
+import contextlib
+import io
+
+import pytest
+
+import scraper
+from benchmarks.naver_stub import SECTIONS, NaverStubServer
+from crawl_engine import CrawlEngine
+from crawl_state import CrawlState
+
+
+class BrokenArticleStub(NaverStubServer):
+    """broken에 든 기사 번호의 상세 페이지에 500을 돌려주는 대역 서버"""
+
+    def __init__(self, **kwargs):
+        self.broken = set()
+        super().__init__(latency=0, links_per_section=5, **kwargs)
+
+    def handle(self, path):
+        if path.startswith("/article/") and int(path.rsplit("/", 1)[-1]) in self.broken:
+            return 500, b"server error", None
+        return super().handle(path)
+
+
+def crawl(stub, state):
+    with CrawlEngine(min_delay=0) as engine, contextlib.redirect_stdout(io.StringIO()):
+        news = scraper.run_article_crawler(engine=engine, list_url=stub.list_url, state=state, parse_workers=0)
+    return news, dict(scraper.last_crawl_stats)
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, "default_page_archive", None)
+    return CrawlState(str(tmp_path / "crawl_state.json"))
+
+
+def test_not_modified_list_is_skipped(state):
+    with BrokenArticleStub(etag=True) as stub:
+        stub.publish(5)
+        news, stats = crawl(stub, state)
+        assert len(news) == 5 * len(SECTIONS)
+        assert all(state.section(sid)["etag"] for sid in SECTIONS)
+
+        news, stats = crawl(stub, state)
+
+    assert news == []
+    assert stats["list_not_modified"] == len(SECTIONS)
+    assert stats["list_parsed"] == 0 and stats["fetched"] == 0
+
+
+def test_same_list_without_etag_is_skipped(state):
+    with BrokenArticleStub() as stub:
+        stub.publish(5)
+        crawl(stub, state)
+        news, stats = crawl(stub, state)
+
+        assert news == []
+        assert stats["list_unchanged"] == len(SECTIONS)
+        assert stats["list_parsed"] == 0
+
+        # 새 기사가 올라오면 목록을 다시 파싱하고 새 기사만 받음
+        stub.publish(2)
+        news, stats = crawl(stub, state)
+
+    assert len(news) == 2 * len(SECTIONS)
+    assert stats["list_unchanged"] == 0
+
+
+def test_partial_failure_does_not_record_etag(state):
+    with BrokenArticleStub(etag=True) as stub:
+        stub.publish(5)
+        stub.broken = {3}  # 모든 섹션의 3번 기사만 실패
+        news, stats = crawl(stub, state)
+
+        assert len(news) == 4 * len(SECTIONS)
+        for sid in SECTIONS:
+            section = state.section(sid)
+            assert section.get("etag") is None and section.get("content_hash") is None
+            assert not state.is_known(sid, f"{stub.base_url}/article/{sid}/3")
+            assert state.is_known(sid, f"{stub.base_url}/article/{sid}/4")
+
+        # 다음 사이클: 조건부 요청 없이 목록을 다시 받아 실패한 기사만 다시 받음
+        stub.broken = set()
+        news, stats = crawl(stub, state)
+
+    assert stats["list_not_modified"] == 0
+    assert sorted(n["url"].rsplit("/", 1)[-1] for n in news) == ["3"] * len(SECTIONS)
+    assert all(state.section(sid)["etag"] for sid in SECTIONS)
@@ -0,0 +1,99 @@
+# tests/test_feed_service.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from feed_service import FeedIndex, FeedService
+from models import Article, Issue, User
+
+
+@pytest.fixture
+def service():
+    return FeedService(FeedIndex(window_hours=1, refresh_seconds=0), top_k=10)
+
+
+def add_article(db, n, category, title=None, minutes_ago=5, issue_id=None):
+    article = Article(
+        title=title or f"기사 {n}", url=f"https://example.com/{n}", category=category,
+        time=datetime.now() - timedelta(minutes=minutes_ago), issue_id=issue_id,
+    )
+    db.add(article)
+    db.commit()
+    return article.id
+
+
+@pytest.fixture
+def kim(db):
+    user = User(login_id="kim", password_hash="x", subscribed_categories=["경제"], subscribed_keywords=["반도체"])
+    db.add(user)
+    db.commit()
+    return user
+
+
+def ranked_ids(service, db, user):
+    return [article_id for article_id, _ in service.ranking(db, user)["articles"]]
+
+
+def test_unrelated_article_keeps_cache(service, db, kim):
+    economy = add_article(db, 1, "경제")
+    ranked_ids(service, db, kim)
+
+    add_article(db, 2, "정치", title="국회 본회의")
+    assert ranked_ids(service, db, kim) == [economy]
+    assert service.stats["hits"] == 1 and service.stats["misses"] == 1
+
+
+def test_related_article_recomputes(service, db, kim):
+    add_article(db, 1, "경제")
+    ranked_ids(service, db, kim)
+
+    by_keyword = add_article(db, 2, "정치", title="반도체법 국회 통과")
+    assert by_keyword in ranked_ids(service, db, kim)
+    assert service.stats["misses"] == 2
+
+    by_category = add_article(db, 3, "경제")
+    assert by_category in ranked_ids(service, db, kim)
+    assert service.stats["misses"] == 3
+
+
+def test_evicted_articles_are_filtered_from_cache(service, db, kim):
+    issue = Issue(title="이슈", created_at=datetime.now())
+    db.add(issue)
+    db.commit()
+    old = add_article(db, 1, "경제", minutes_ago=50, issue_id=issue.id)
+    new = add_article(db, 2, "경제", minutes_ago=5)
+    first = service.ranking(db, kim)
+    assert {a for a, _ in first["articles"]} == {old, new}
+    assert [i for i, _ in first["issues"]] == [issue.id]
+
+    # 20분 뒤: old만 window(1시간)를 벗어남
+    service.index.evict(now=datetime.now() + timedelta(minutes=20))
+    ranking = service.ranking(db, kim)
+
+    assert [a for a, _ in ranking["articles"]] == [new]
+    assert ranking["issues"] == []
+    assert service.stats == {"hits": 1, "misses": 1, "invalidations": 0}
+
+
+def test_invalidate_recomputes(service, db, kim):
+    add_article(db, 1, "경제")
+    ranked_ids(service, db, kim)
+
+    service.invalidate("kim")
+    ranked_ids(service, db, kim)
+
+    assert service.stats == {"hits": 0, "misses": 2, "invalidations": 1}
+
+
+def test_user_without_interests_sees_every_new_article(service, db):
+    user = User(login_id="lee", password_hash="x")
+    db.add(user)
+    db.commit()
+    add_article(db, 1, "정치")
+    ranked_ids(service, db, user)
+    ranked_ids(service, db, user)
+
+    latest = add_article(db, 2, "사회", minutes_ago=1)
+
+    assert ranked_ids(service, db, user)[0] == latest
+    assert service.stats["hits"] == 1 and service.stats["misses"] == 2
@@ -0,0 +1,90 @@
+# tests/test_interest_buffer.py
+import contextlib
+import io
+import time
+
+import crud
+from interest_buffer import InterestBuffer
+from models import User
+
+
+def add_user(session_factory, login_id="kim"):
+    db = session_factory()
+    db.add(User(login_id=login_id, password_hash="x"))
+    db.commit()
+    db.close()
+
+
+def interests(session_factory, login_id="kim"):
+    db = session_factory()
+    try:
+        return crud.get_user_interests(db, login_id)
+    finally:
+        db.close()
+
+
+def test_too_long_term_is_not_buffered(session_factory):
+    add_user(session_factory)
+    buffer = InterestBuffer(session_factory)
+
+    buffer.add("kim", "경제", ["반도체", "가" * (crud.MAX_INTEREST_TERM_LENGTH + 1), ""])
+    buffer.flush()
+
+    assert interests(session_factory) == {crud.INTEREST_CATEGORY: {"경제": 1}, crud.INTEREST_KEYWORD: {"반도체": 1}}
+
+
+def test_bad_row_does_not_block_the_rest(session_factory):
+    add_user(session_factory)
+    buffer = InterestBuffer(session_factory)
+    buffer.add("kim", "경제", ["반도체"])
+    # interest_counts 검사를 거치지 않은 값 (서버 DB에서는 VARCHAR(255)를 넘어 DataError)
+    buffer._pending[("kim", crud.INTEREST_KEYWORD, "가" * 300)] += 1
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        buffer.flush()
+
+    assert buffer.metrics()["depth_keys"] == 0
+    saved = interests(session_factory)
+    assert saved[crud.INTEREST_CATEGORY] == {"경제": 1}
+    assert saved[crud.INTEREST_KEYWORD]["반도체"] == 1
+    if session_factory.kw["bind"].dialect.name != "sqlite":  # SQLite는 길이를 검사하지 않음
+        assert buffer.metrics()["dropped_rows"] == 1
+
+
+def test_failed_flush_keeps_events(session_factory):
+    add_user(session_factory)
+    broken = [True]
+
+    def factory():
+        if broken[0]:
+            raise RuntimeError("DB 연결 실패")
+        return session_factory()
+
+    buffer = InterestBuffer(factory)
+    buffer.add("kim", "경제", ["반도체"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert buffer.flush() == 0
+    broken[0] = False
+
+    assert buffer.flush() == 1
+    assert interests(session_factory)[crud.INTEREST_CATEGORY] == {"경제": 1}
+
+
+def test_background_thread_survives_on_flush_error(session_factory):
+    add_user(session_factory)
+
+    def on_flush(login_ids):
+        raise RuntimeError("캐시 무효화 실패")
+
+    buffer = InterestBuffer(session_factory, flush_ms=10, on_flush=on_flush)
+    with contextlib.redirect_stdout(io.StringIO()):
+        buffer.start()
+        buffer.add("kim", "경제")
+        time.sleep(0.2)
+        buffer.add("kim", "경제")
+        time.sleep(0.2)
+        assert buffer._thread.is_alive()
+        buffer.on_flush = None
+        buffer.shutdown()
+
+    assert interests(session_factory)[crud.INTEREST_CATEGORY] == {"경제": 2}
@@ -0,0 +1,106 @@
+# tests/test_keyword_matcher.py
+import contextlib
+import io
+from datetime import datetime, timedelta
+
+import pytest
+
+from keyword_matcher import KeywordMatcher, LogNotifier, notify_matches, prune_sent_notifications, sent_login_ids
+from models import Article, SentNotification, User
+
+
+def add_user(db, login_id, keywords, token="token", updated_at=None):
+    db.add(User(login_id=login_id, password_hash="x", subscribed_keywords=keywords, fcm_token=token,
+                keywords_updated_at=updated_at or datetime.now()))
+    db.commit()
+
+
+def test_incremental_sync_reads_only_changed_users(db):
+    old = datetime.now() - timedelta(hours=1)
+    for n in range(20):
+        add_user(db, f"user{n}", ["반도체"], updated_at=old)
+    matcher = KeywordMatcher()
+
+    assert matcher.sync(db) == 20
+    assert matcher.metrics()["full_syncs"] == 1
+
+    user = db.get(User, "user3")
+    user.subscribed_keywords = ["금리"]
+    user.keywords_updated_at = datetime.now()
+    db.commit()
+    add_user(db, "new_user", ["환율"])
+
+    rows_before = matcher.metrics()["synced_rows"]
+    assert matcher.sync(db) == 2
+    assert matcher.metrics()["synced_rows"] - rows_before == 2
+    assert set(matcher.match_article("금리와 환율")) == {"user3", "new_user"}
+
+    # 바뀐 것이 없으면 다시 적용하지 않음 (겹쳐 읽는 구간의 행은 그대로)
+    assert matcher.sync(db) == 0
+
+
+def test_full_sync_drops_deleted_users(db):
+    add_user(db, "kim", ["반도체"])
+    add_user(db, "lee", ["반도체"])
+    matcher = KeywordMatcher(full_sync_interval=0)
+    matcher.sync(db)
+
+    db.query(User).filter(User.login_id == "lee").delete()
+    db.commit()
+
+    assert matcher.sync(db) == 1
+    assert set(matcher.match_article("반도체 수출")) == {"kim"}
+
+
+@pytest.fixture
+def matched(db):
+    for n in range(5):
+        add_user(db, f"user{n}", ["반도체"])
+    add_user(db, "no_token", ["반도체"], token=None)
+    db.add(Article(id=1, title="반도체 수출 증가", url="https://example.com/1", time=datetime.now()))
+    db.commit()
+    matcher = KeywordMatcher()
+    matcher.sync(db)
+    return matcher.match_range(db, 1, 1)
+
+
+def send(db, matched, notifier, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return notify_matches(db, *matched, notifier, **kwargs)
+
+
+def test_retried_notify_does_not_resend(db, matched):
+    notifier = LogNotifier()
+
+    assert send(db, matched, notifier, id_range=(1, 1)) == 5
+    assert send(db, matched, notifier, id_range=(1, 1)) == 0
+    assert notifier.stats["sent"] == 5
+    assert sent_login_ids(db, 1, 1) == {f"user{n}" for n in range(5)}
+
+
+def test_failed_notify_resumes_with_remaining_users(db, matched):
+    class FlakyNotifier(LogNotifier):
+        def send(self, login_id, fcm_token, items):
+            if self.stats["sent"] == 2:
+                raise ConnectionError("푸시 서버 오류")
+            super().send(login_id, fcm_token, items)
+
+    flaky = FlakyNotifier()
+    with pytest.raises(ConnectionError):
+        send(db, matched, flaky, id_range=(1, 1))
+    assert len(sent_login_ids(db, 1, 1)) == 2
+
+    notifier = LogNotifier()
+    assert send(db, matched, notifier, id_range=(1, 1)) == 3
+    assert flaky.stats["sent"] + notifier.stats["sent"] == 5
+
+
+def test_prune_sent_notifications(db):
+    db.add_all([
+        SentNotification(min_id=1, max_id=1, login_id="old", sent_at=datetime.now() - timedelta(days=30)),
+        SentNotification(min_id=2, max_id=2, login_id="new", sent_at=datetime.now()),
+    ])
+    db.commit()
+
+    assert prune_sent_notifications(db, days=7) == 1
+    assert [row.login_id for row in db.query(SentNotification)] == ["new"]
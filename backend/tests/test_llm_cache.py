@@ -0,0 +1,50 @@
+# tests/test_llm_cache.py
+import threading
+import time
+
+import pytest
+
+import llm_cache as llm_cache_module
+from llm_cache import LLMCache
+
+diskcache = pytest.importorskip("diskcache")
+
+
+def test_get_or_generate_stores_only_accepted_answers(tmp_path):
+    cache = LLMCache(directory=str(tmp_path))
+
+    assert cache.get_or_generate("m", {}, "질문", lambda: "⚠️ 오류", should_store=lambda a: not a.startswith("⚠️")) == "⚠️ 오류"
+    assert cache.get_or_generate("m", {}, "질문", lambda: "답변") == "답변"
+    assert cache.get_or_generate("m", {}, "질문", lambda: "다른 답변") == "답변"
+
+    # 새 프로세스처럼 메모리 캐시가 비어 있어도 디스크에서 읽음
+    reopened = LLMCache(directory=str(tmp_path))
+    assert reopened.get(LLMCache.make_key("m", {}, "질문")) == "답변"
+    assert reopened.metrics()["disk_hits"] == 1
+
+
+def test_disk_cache_is_opened_once(tmp_path, monkeypatch):
+    opened = []
+
+    class SlowCache(diskcache.Cache):
+        def __init__(self, *args, **kwargs):
+            opened.append(1)
+            time.sleep(0.05)  # 여는 동안 다른 스레드가 끼어들 수 있도록
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(llm_cache_module.diskcache, "Cache", SlowCache)
+    cache = LLMCache(directory=str(tmp_path))
+    barrier = threading.Barrier(8)
+
+    def run():
+        barrier.wait()
+        cache.get("없는 키")
+
+    workers = [threading.Thread(target=run) for _ in range(8)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    assert len(opened) == 1
+    assert cache.metrics()["misses"] == 8
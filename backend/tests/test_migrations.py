@@ -0,0 +1,72 @@
+# tests/test_migrations.py
+import contextlib
+import io
+
+from sqlalchemy import inspect, select, text
+
+from migrations import MIGRATIONS, run_migrations
+from models import Base, User, UserInterest
+
+
+def migrate(engine):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_migrations(engine)
+
+
+def test_run_migrations_applies_each_step_once(db_engine):
+    Base.metadata.create_all(db_engine)
+
+    assert migrate(db_engine) == [version for version, _, _ in MIGRATIONS]
+    assert migrate(db_engine) == []
+
+    indexes = {ix["name"] for table in ("articles", "issues") for ix in inspect(db_engine).get_indexes(table)}
+    assert {"ix_articles_time_id", "ix_articles_category_time_id", "ix_articles_issue_id", "ix_issues_created_at_id"} <= indexes
+
+
+def test_backfill_moves_legacy_interest_json(db_engine):
+    Base.metadata.create_all(db_engine)
+    with db_engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"login_id": "dict_user", "password_hash": "x",
+             "read_categories": {"경제": 3, "정치": 1}, "read_keywords": {"반도체": 2, "": 5}},
+            {"login_id": "list_user", "password_hash": "x", "read_categories": ["세계"], "read_keywords": ["AI", "AI"]},
+            {"login_id": "moved_user", "password_hash": "x", "read_categories": {"경제": 9}, "read_keywords": {}},
+        ])
+        # 이미 user_interests로 옮겨진 사용자는 예전 JSON을 다시 더하지 않음
+        conn.execute(UserInterest.__table__.insert(), [
+            {"login_id": "moved_user", "kind": "category", "term": "경제", "count": 10},
+        ])
+
+    migrate(db_engine)
+
+    with db_engine.connect() as conn:
+        rows = {
+            (login_id, kind, term): count
+            for login_id, kind, term, count in conn.execute(select(
+                UserInterest.login_id, UserInterest.kind, UserInterest.term, UserInterest.count
+            ))
+        }
+    assert rows == {
+        ("dict_user", "category", "경제"): 3,
+        ("dict_user", "category", "정치"): 1,
+        ("dict_user", "keyword", "반도체"): 2,
+        ("list_user", "category", "세계"): 1,
+        ("list_user", "keyword", "AI"): 1,
+        ("moved_user", "category", "경제"): 10,
+    }
+
+
+def test_keywords_updated_at_is_added_to_existing_users_table(db_engine):
+    # 컬럼이 생기기 전의 users 테이블 (create_all은 이미 있는 테이블을 고치지 않음)
+    with db_engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE users (login_id VARCHAR(50) PRIMARY KEY, password_hash VARCHAR(255) NOT NULL,"
+            " read_categories TEXT, read_keywords TEXT)"
+        ))
+    Base.metadata.create_all(db_engine)
+
+    migrate(db_engine)
+
+    inspector = inspect(db_engine)
+    assert "keywords_updated_at" in {column["name"] for column in inspector.get_columns("users")}
+    assert "ix_users_keywords_updated_at" in {ix["name"] for ix in inspector.get_indexes("users")}
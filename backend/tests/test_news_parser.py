@@ -0,0 +1,52 @@
+# tests/test_news_parser.py
+import pytest
+
+import news_parser
+from benchmarks.bench_parser import _MUTATIONS, _outcome, check_equivalence, make_corpus
+from benchmarks.naver_stub import make_article_html
+
+URL = "https://n.news.naver.com/article/test/1"
+
+
+@pytest.fixture(params=["lxml", "selectolax"])
+def backend(request):
+    if request.param not in news_parser.available_backends():
+        pytest.skip(f"{request.param} 패키지가 없습니다.")
+    return request.param
+
+
+def mutate(name, seed=1):
+    return _MUTATIONS[name](make_article_html(seed), None)
+
+
+def test_backends_match_bs4_on_synthetic_pages(backend):
+    # 합성 페이지 30개 (절반은 변형 섞음) + 변형마다 단독 페이지 하나씩
+    assert check_equivalence(make_corpus(30), [backend]) == []
+
+
+def test_comments_are_left_out(backend):
+    html = mutate("comment")
+    expected = news_parser.parse_bs4(html, URL)
+
+    assert "ad slot" not in expected["contents"]
+    assert _outcome(backend, html, URL) == expected
+
+
+def test_ruby_text_is_left_out(backend):
+    html = mutate("ruby")
+    expected = news_parser.parse_bs4(html, URL)
+
+    assert "漢" in expected["contents"] and "(한)" not in expected["contents"]
+    assert _outcome(backend, html, URL) == expected
+
+
+def test_missing_body_container(backend):
+    html = mutate("no_body")
+
+    assert news_parser.parse_bs4(html, URL) is None
+    assert _outcome(backend, html, URL) is None
+
+
+def test_parse_article_uses_requested_backend(backend):
+    html = make_article_html(7)
+    assert news_parser.parse_article(html, URL, backend=backend) == news_parser.parse_article(html, URL, backend="bs4")
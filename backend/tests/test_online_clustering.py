@@ -0,0 +1,94 @@
+# tests/test_online_clustering.py
+import contextlib
+import io
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from benchmarks.bench_online_clustering import FakeEmbeddings, make_clusterer  # noqa: E402
+from models import Article, Issue  # noqa: E402
+
+# 사건별로 거의 같은 방향의 벡터 (기사 id 1부터 순서대로)
+EVENTS = [0, 0, 0, 1, 1, 1, 0]
+
+
+@pytest.fixture
+def embeddings():
+    rng = np.random.default_rng(0)
+    directions = np.eye(8, dtype=np.float32)
+    matrix = np.stack([directions[event] + rng.normal(0, 0.01, 8).astype(np.float32) for event in EVENTS])
+    return FakeEmbeddings(matrix)
+
+
+def add_articles(db, ids):
+    db.add_all(Article(id=i, title=f"기사 {i}", url=f"https://example.com/{i}", time=datetime.now()) for i in ids)
+    db.commit()
+
+
+def ingest(clusterer, db):
+    with contextlib.redirect_stdout(io.StringIO()):
+        clusterer.ingest(db)
+
+
+def assigned(db):
+    return {article_id: issue_id for article_id, issue_id in db.query(Article.id, Article.issue_id)}
+
+
+def break_commit(clusterer, monkeypatch):
+    def broken(db):
+        raise RuntimeError("커밋 실패")
+
+    monkeypatch.setattr(clusterer, "_commit", broken)
+
+
+def test_failed_commit_keeps_watermark(db, embeddings, tmp_path, monkeypatch):
+    add_articles(db, [1, 2, 3])
+    clusterer = make_clusterer(embeddings, str(tmp_path))
+    break_commit(clusterer, monkeypatch)
+
+    with pytest.raises(RuntimeError):
+        ingest(clusterer, db)
+
+    assert clusterer.last_article_id == 0
+    assert clusterer.members == {} and len(clusterer.issue_index) == 0
+    assert set(assigned(db).values()) == {None}
+    assert db.query(Issue).count() == 0
+
+    # 다음 사이클에 같은 기사를 다시 처리
+    monkeypatch.undo()
+    ingest(clusterer, db)
+
+    assert clusterer.last_article_id == 3
+    assert db.query(Issue).count() == 1
+    assert None not in assigned(db).values()
+
+
+def test_failed_commit_is_retried_after_restart(db, embeddings, tmp_path, monkeypatch):
+    add_articles(db, [1, 2, 3])
+    clusterer = make_clusterer(embeddings, str(tmp_path))
+    ingest(clusterer, db)
+    first_issue = assigned(db)[1]
+
+    # 새 사건 3건 + 기존 이슈에 붙을 기사 1건이 커밋 직전에 실패
+    add_articles(db, [4, 5, 6, 7])
+    break_commit(clusterer, monkeypatch)
+    with pytest.raises(RuntimeError):
+        ingest(clusterer, db)
+
+    assert clusterer.last_article_id == 3
+    assert first_issue not in clusterer.issue_index  # 커밋 못 한 기사가 더해진 centroid는 인덱스에서 뺌
+    assert [assigned(db)[i] for i in (4, 5, 6, 7)] == [None] * 4
+
+    # 재시작해도 저장된 처리 위치(3)부터 다시 처리
+    restarted = make_clusterer(embeddings, str(tmp_path))
+    assert restarted.last_article_id == 3
+    ingest(restarted, db)
+
+    rows = assigned(db)
+    assert restarted.last_article_id == 7
+    assert rows[7] == first_issue
+    assert rows[4] == rows[5] == rows[6] not in (None, first_issue)
+    assert db.query(Issue).count() == 2
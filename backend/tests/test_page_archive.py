@@ -0,0 +1,43 @@
+# tests/test_page_archive.py
+import contextlib
+import io
+import sqlite3
+
+from benchmarks.naver_stub import make_article_html
+from models import Article
+from page_archive import PageArchive, reparse
+
+
+def url(n):
+    return f"https://n.news.naver.com/mnews/article/001/{n:010d}"
+
+
+def test_insert_missing_uses_recorded_category(db, tmp_path):
+    archive = PageArchive(str(tmp_path / "archive"))
+    for n in range(3):
+        archive.put(url(n), make_article_html(n).encode("utf-8"), "utf-8")
+    # 크롤러가 수집한 섹션으로 기록 (2번은 카테고리 기록 전에 보관된 페이지)
+    archive.set_categories({url(0): "경제", url(1): "IT/과학"})
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = reparse(archive, db, workers=1, insert_missing=True)
+    archive.close()
+
+    assert result["inserted"] == 2
+    assert result["skipped_no_category"] == 1
+    assert dict(db.query(Article.url, Article.category)) == {url(0): "경제", url(1): "IT/과학"}
+
+
+def test_old_index_gets_category_column(tmp_path):
+    root = tmp_path / "archive"
+    (root / "segments").mkdir(parents=True)
+    conn = sqlite3.connect(root / "index.db")
+    conn.execute("CREATE TABLE pages (url TEXT PRIMARY KEY, hash TEXT NOT NULL, encoding TEXT, fetched_at REAL NOT NULL)")
+    conn.close()
+
+    archive = PageArchive(str(root))
+    archive.put(url(0), b"<html></html>")
+    archive.set_categories({url(0): "정치"})
+
+    assert archive.categories([url(0), url(1)]) == {url(0): "정치"}
+    archive.close()
@@ -0,0 +1,92 @@
+# tests/test_pipeline_queue.py
+import threading
+import time
+
+import pytest
+
+from pipeline_queue import JobQueue, LeaderLock
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "queue.db"))
+
+
+def test_expired_lease_is_claimed_by_another_worker(queue):
+    job_id = queue.enqueue("embed", {"ids": [1, 2]})
+    assert queue.claim("embed", "worker-a", lease_seconds=0.05) == (job_id, {"ids": [1, 2]}, 1)
+    assert queue.claim("embed", "worker-b") is None
+
+    time.sleep(0.1)
+    assert queue.requeue_expired() == 1
+
+    assert queue.claim("embed", "worker-b") == (job_id, {"ids": [1, 2]}, 2)
+    assert queue.stats()["embed"]["running"] == 1
+
+
+def test_stale_owner_cannot_finish_reclaimed_job(queue):
+    job_id = queue.enqueue("embed")
+    queue.claim("embed", "worker-a", lease_seconds=0.05)
+    time.sleep(0.1)
+    queue.requeue_expired()
+    queue.claim("embed", "worker-b")
+
+    # 임대를 잃은 worker-a의 기록은 무시됨
+    assert queue.renew(job_id, "worker-a") is False
+    assert queue.complete(job_id, "worker-a", items=5) is False
+    assert queue.fail(job_id, "worker-a", "timeout", attempts=1) is False
+    assert queue.fail(job_id, "worker-a", "timeout", attempts=3, max_attempts=3) is False
+    assert queue.stats()["embed"]["running"] == 1
+
+    assert queue.complete(job_id, "worker-b", items=2) is True
+    assert queue.complete(job_id, "worker-b", items=2) is False
+    stats = queue.stats()["embed"]
+    assert (stats["running"], stats["done"], stats["items"]) == (0, 1, 2)
+
+
+def test_fail_retries_then_gives_up(queue):
+    job_id = queue.enqueue("embed")
+    _, _, attempts = queue.claim("embed", "worker-a")
+
+    assert queue.fail(job_id, "worker-a", "boom", attempts, max_attempts=2, retry_delay=0) is True
+    _, _, attempts = queue.claim("embed", "worker-a")
+    assert attempts == 2
+    assert queue.fail(job_id, "worker-a", "boom", attempts, max_attempts=2, retry_delay=0) is True
+
+    assert queue.claim("embed", "worker-a") is None
+    assert queue.stats()["embed"]["failed"] == 1
+
+
+def test_only_one_leader_at_a_time(tmp_path):
+    path = str(tmp_path / "queue.db")
+    locks = [LeaderLock(path, ttl=0.2, owner=f"worker-{i}") for i in range(8)]
+    barrier = threading.Barrier(len(locks))
+    results = {}
+
+    def acquire(lock):
+        barrier.wait()
+        results[lock.owner] = lock.try_acquire()
+
+    workers = [threading.Thread(target=acquire, args=(lock,)) for lock in locks]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    leaders = [owner for owner, ok in results.items() if ok]
+    assert len(leaders) == 1
+    leader = next(lock for lock in locks if lock.owner == leaders[0])
+    others = [lock for lock in locks if lock is not leader]
+    assert leader.holder() == leader.owner
+    assert leader.try_acquire() is True  # 리더는 연장
+    assert not any(lock.try_acquire() for lock in others)
+
+    # 연장하지 않으면 만료 후 다른 워커가 이어받음
+    time.sleep(0.25)
+    assert others[0].try_acquire() is True
+    assert leader.try_acquire() is False
+
+    # release하면 바로 다른 워커가 잡을 수 있음
+    others[0].release()
+    assert others[1].try_acquire() is True
+    assert others[1].holder() == others[1].owner
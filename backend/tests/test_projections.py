@@ -0,0 +1,93 @@
+# tests/test_projections.py
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("ibm_watsonx_ai")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from models import Article, Issue  # noqa: E402
+
+BODY = "가나다라마바사아자차" * 20
+
+
+@pytest.fixture
+def client(session_factory):
+    """읽기/쓰기 세션을 테스트 DB로 바꾼 앱 (lifespan의 파이프라인은 띄우지 않음)"""
+    def override():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    main.app.dependency_overrides[main.get_db] = override
+    main.app.dependency_overrides[main.get_read_db] = override
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def issue_id(db):
+    """클러스터링이 만든 직후처럼 contents가 NULL인 이슈 + 관련 기사 3건"""
+    issue = Issue(title="반도체 수출", contents=None, created_at=datetime(2026, 1, 1, 12, 0, 0))
+    db.add(issue)
+    db.flush()
+    db.add_all(
+        Article(
+            title=f"기사 {i}", contents=BODY, category="경제", url=f"https://example.com/{i}", company_name="테스트일보",
+            img_urls=["https://example.com/a.jpg"], time=datetime(2026, 1, 1) + timedelta(minutes=i), author="홍길동",
+            issue_id=issue.id,
+        )
+        for i in range(3)
+    )
+    db.commit()
+    return issue.id
+
+
+def test_issue_detail_summary_with_null_contents(client, issue_id):
+    response = client.get(f"/issues/{issue_id}", params={"view": "summary", "snippet": 5})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["contents"] is None
+    assert [a["title"] for a in body["articles"]] == ["기사 2", "기사 1", "기사 0"]
+    for article in body["articles"]:
+        assert "contents" not in article and "img_urls" not in article
+        assert article["snippet"] == BODY[:5]
+
+
+def test_issue_lists_with_null_contents(client, issue_id):
+    assert client.get("/issues").json()[0]["contents"] is None
+    assert client.get("/issues", params={"view": "summary", "snippet": 5}).json() == [
+        {"id": issue_id, "title": "반도체 수출", "created_at": "2026-01-01T12:00:00", "snippet": None},
+    ]
+
+
+def test_article_summary_leaves_out_body(client, issue_id):
+    full = client.get("/articles").json()
+    assert full[0]["contents"] == BODY and full[0]["img_urls"] == ["https://example.com/a.jpg"]
+
+    for snippet, expected in ((0, None), (7, BODY[:7])):
+        articles = client.get("/articles", params={"view": "summary", "snippet": snippet}).json()
+        assert len(articles) == 3
+        for article in articles:
+            assert "contents" not in article and "img_urls" not in article
+            assert article["snippet"] == expected
+
+
+def test_issue_summary_snippet_is_truncated(client, db):
+    db.add(Issue(title="이슈", contents=BODY, created_at=datetime(2026, 1, 2)))
+    db.commit()
+
+    issues = client.get("/issues", params={"view": "summary", "snippet": 4}).json()
+
+    assert issues[0]["snippet"] == BODY[:4]
+    assert "contents" not in issues[0] and "analysis_result" not in issues[0]
+
+
+def test_snippet_is_capped(client):
+    response = client.get("/articles", params={"view": "summary", "snippet": main.MAX_SNIPPET_CHARS + 1})
+    assert response.status_code == 422
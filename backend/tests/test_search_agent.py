@@ -0,0 +1,79 @@
+# tests/test_search_agent.py
+import asyncio
+import contextlib
+import io
+
+import pytest
+
+pytest.importorskip("ibm_watsonx_ai")
+
+import search_agent  # noqa: E402
+
+PAGE = {"title": "삼성전자", "extract": "삼성전자는 전자 제품 제조 기업이다.", "url": "https://ko.wikipedia.org/wiki/삼성전자", "resolved_title": "삼성전자"}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """DB 섹션은 고정값, 위키피디아/LLM은 테스트마다 바꿔 끼웁니다."""
+    monkeypatch.setattr(search_agent, "search_issues_by_keyword", lambda db, keyword: {"analysis": None, "issues": []})
+    monkeypatch.setattr(search_agent, "search_hot_topics_by_keyword", lambda db, keyword: [])
+    monkeypatch.setattr(search_agent, "search_articles_by_keyword", lambda db, keyword: [])
+    monkeypatch.setattr(search_agent.wiki_client, "lookup", lambda keyword, raise_errors=False: PAGE)
+    monkeypatch.setattr(search_agent.llm_cache, "get_or_generate", lambda model_id, params, prompt, generate: "요약")
+    search_agent._comprehensive_cache.clear()
+    yield search_agent
+    search_agent._comprehensive_cache.clear()
+
+
+class NoDb:
+    """DB 섹션을 바꿔 끼웠으므로 세션은 닫기만 합니다."""
+
+    def close(self):
+        pass
+
+
+def search(agent, keyword="삼성"):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(agent.run_comprehensive_search(keyword, NoDb, timeout=5))
+
+
+def test_successful_response_is_cached(agent):
+    response = search(agent)
+
+    assert response["failed_sections"] == []
+    assert response["definition"]["summary"] == "요약"
+    assert agent._comprehensive_cache.get("삼성") is response
+
+
+def test_llm_error_marks_section_failed(agent, monkeypatch):
+    def broken(model_id, params, prompt, generate):
+        raise RuntimeError("LLM 서버 오류")
+
+    monkeypatch.setattr(agent.llm_cache, "get_or_generate", broken)
+    response = search(agent)
+
+    assert response["failed_sections"] == ["definition"]
+    assert response["definition"]["summary"] == agent.LLM_ERROR_MESSAGE
+    assert agent._comprehensive_cache.get("삼성") is None
+
+
+def test_wikipedia_error_is_not_cached(agent, monkeypatch):
+    def lookup(keyword, raise_errors=False):
+        if raise_errors:
+            raise ConnectionError("위키피디아 연결 실패")
+        return None
+
+    monkeypatch.setattr(agent.wiki_client, "lookup", lookup)
+    response = search(agent)
+
+    assert response["failed_sections"] == ["definition"]
+    assert response["definition"] is None
+    assert agent._comprehensive_cache.get("삼성") is None
+
+
+def test_missing_wikipedia_page_is_cached(agent, monkeypatch):
+    monkeypatch.setattr(agent.wiki_client, "lookup", lambda keyword, raise_errors=False: None)
+    response = search(agent)
+
+    assert response["failed_sections"] == []
+    assert agent._comprehensive_cache.get("삼성") is response
@@ -0,0 +1,108 @@
+# tests/test_search_service.py
+import contextlib
+import io
+from datetime import datetime, timedelta
+
+import pytest
+
+import search_service
+from models import Article, Issue
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+ARTICLES = [
+    ("삼성전자 반도체 수출 증가", "메모리 가격이 올랐다."),
+    ("국회 본회의 개최", "여야가 반도체 특별법을 논의했다."),
+    ("환율 급등", "원달러 환율이 1400원을 넘었다."),
+    ("AI 반도체 투자 확대", "삼성전자와 SK하이닉스가 투자를 늘린다."),
+    ("날씨", "전국에 비 소식."),
+]
+
+
+def index(db):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return search_service.ensure_search_index(db.get_bind())
+
+
+@pytest.fixture
+def articles(db):
+    db.add_all(
+        Article(title=title, contents=contents, category="경제", url=f"https://example.com/{i}", time=BASE + timedelta(hours=i))
+        for i, (title, contents) in enumerate(ARTICLES)
+    )
+    db.commit()
+    index(db)
+    return db
+
+
+def titles(rows):
+    return [row.title for row in rows]
+
+
+def like_only(monkeypatch):
+    monkeypatch.setattr(search_service, "_use_fts", lambda db, fts_table, keyword: False)
+
+
+@pytest.mark.parametrize("keyword", ["반도체", "삼성전자", "1400원", "본회의 개최", "없는검색어"])
+def test_fts_and_like_return_same_hits(articles, monkeypatch, keyword):
+    fts = titles(search_service.search_articles(articles, keyword))
+    like_only(monkeypatch)
+    like = titles(search_service.search_articles(articles, keyword))
+
+    assert fts == like
+
+
+def test_sqlite_uses_fts_for_long_keywords(articles):
+    if articles.get_bind().dialect.name != "sqlite":
+        pytest.skip("FTS5는 SQLite 전용")
+    assert search_service._use_fts(articles, "articles_fts", "반도체")
+    assert not search_service._use_fts(articles, "articles_fts", "환율")
+
+
+def test_short_keyword_falls_back_to_like(articles):
+    assert titles(search_service.search_articles(articles, "AI")) == ["AI 반도체 투자 확대"]
+    assert titles(search_service.search_articles(articles, "환율")) == ["환율 급등"]
+
+
+def test_search_index_follows_insert_update_delete(articles):
+    articles.add(Article(title="새 반도체 공장", contents="착공", category="경제", url="https://example.com/new", time=BASE + timedelta(days=1)))
+    articles.commit()
+    assert titles(search_service.search_articles(articles, "반도체"))[0] == "새 반도체 공장"
+
+    renamed = articles.query(Article).filter(Article.title == "AI 반도체 투자 확대").one()
+    renamed.title = "AI 데이터센터 투자 확대"
+    renamed.contents = "투자를 늘린다."
+    articles.commit()
+    assert "AI 데이터센터 투자 확대" not in titles(search_service.search_articles(articles, "반도체"))
+    assert titles(search_service.search_articles(articles, "데이터센터")) == ["AI 데이터센터 투자 확대"]
+
+    articles.delete(articles.query(Article).filter(Article.title == "새 반도체 공장").one())
+    articles.commit()
+    assert titles(search_service.search_articles(articles, "반도체")) == ["국회 본회의 개최", "삼성전자 반도체 수출 증가"]
+    assert search_service.search_articles(articles, "반도체 공장") == []
+
+
+def test_existing_rows_are_indexed_when_index_is_created(db):
+    db.add(Issue(title="반도체 수출 호조", contents="내용", created_at=BASE))
+    db.commit()
+    index(db)
+
+    assert titles(search_service.search_issues(db, "반도체")) == ["반도체 수출 호조"]
+
+
+def test_rank_order_puts_title_matches_first(articles):
+    # 최신순이면 본문에만 나오는 "국회 본회의 개최"(1시간 뒤)가 먼저지만, 관련도순이면 제목에 나온 기사가 먼저
+    articles.add(Article(title="증시 마감", contents="반도체주 약세", category="경제", url="https://example.com/late", time=BASE + timedelta(days=1)))
+    articles.commit()
+
+    by_time = titles(search_service.search_articles(articles, "반도체", order=search_service.ORDER_TIME))
+    by_rank = titles(search_service.search_articles(articles, "반도체", order=search_service.ORDER_RANK))
+
+    assert by_time[0] == "증시 마감"
+    assert sorted(by_rank) == sorted(by_time)
+    if articles.get_bind().dialect.name == "sqlite":
+        assert set(by_rank[:2]) == {"삼성전자 반도체 수출 증가", "AI 반도체 투자 확대"}
+
+
+def test_summary_columns_leave_out_body(articles):
+    rows = search_service.search_articles(articles, "반도체", columns=(Article.id, Article.title))
+    assert all(set(row._mapping) == {"id", "title"} for row in rows)
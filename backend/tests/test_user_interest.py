@@ -0,0 +1,78 @@
+# tests/test_user_interest.py
+import threading
+from collections import Counter
+
+import pytest
+
+import crud
+from models import User
+
+
+def add_users(db, *login_ids):
+    db.add_all(User(login_id=login_id, password_hash="x") for login_id in login_ids)
+    db.commit()
+
+
+@pytest.fixture(params=["upsert", "portable"])
+def upsert_path(request, monkeypatch):
+    """DB 전용 UPSERT 문장 / 문장이 없는 DB용 UPDATE 후 INSERT 경로 둘 다 확인"""
+    if request.param == "portable":
+        monkeypatch.setattr(crud, "_upsert_increment", lambda db: None)
+    return request.param
+
+
+def test_increase_user_interest_counts_up(db, upsert_path):
+    add_users(db, "kim")
+
+    assert crud.increase_user_interest(db, "kim", "경제", ["반도체", "AI"]) == "kim"
+    assert crud.increase_user_interest(db, "kim", "경제", ["반도체", "반도체"]) == "kim"
+
+    assert crud.get_user_interests(db, "kim") == {
+        crud.INTEREST_CATEGORY: {"경제": 2},
+        crud.INTEREST_KEYWORD: {"반도체": 3, "AI": 1},
+    }
+    user = crud.get_user(db, "kim")
+    assert user.read_keywords == {"반도체": 3, "AI": 1}
+
+
+def test_unknown_user_is_ignored(db):
+    add_users(db, "kim")
+
+    assert crud.increase_user_interest(db, "ghost", "경제", ["AI"]) is None
+    result = crud.add_user_interest_counts(db, Counter({
+        ("kim", crud.INTEREST_CATEGORY, "정치"): 4,
+        ("ghost", crud.INTEREST_CATEGORY, "정치"): 1,
+    }))
+
+    assert result == {"rows": 1, "unknown_users": ["ghost"]}
+    assert crud.get_user_interests(db, "ghost") == {crud.INTEREST_CATEGORY: {}, crud.INTEREST_KEYWORD: {}}
+    assert crud.get_user_interests(db, "kim")[crud.INTEREST_CATEGORY] == {"정치": 4}
+
+
+def test_concurrent_increments_are_not_lost(session_factory, upsert_path):
+    setup = session_factory()
+    add_users(setup, "kim")
+    setup.close()
+
+    threads, clicks = 4, 25
+    barrier = threading.Barrier(threads)
+
+    def click():
+        db = session_factory()
+        barrier.wait()
+        for _ in range(clicks):
+            crud.increase_user_interest(db, "kim", "경제", ["반도체"])
+        db.close()
+
+    workers = [threading.Thread(target=click) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    db = session_factory()
+    assert crud.get_user_interests(db, "kim") == {
+        crud.INTEREST_CATEGORY: {"경제": threads * clicks},
+        crud.INTEREST_KEYWORD: {"반도체": threads * clicks},
+    }
+    db.close()
@@ -0,0 +1,141 @@
+# tests/test_wiki_client.py
+import contextlib
+import io
+import threading
+import time
+
+import pytest
+
+from benchmarks.bench_wiki_client import WikiStub
+from wiki_client import WikipediaClient
+
+
+class FlakyWikiStub(WikiStub):
+    """fail=True인 동안 모든 요청에 500을 돌려주는 위키피디아 대역 서버"""
+
+    def __init__(self):
+        self.fail = False
+        super().__init__(latency=0)
+
+    def handle(self, path):
+        if self.fail:
+            return 500, {"error": "server error"}
+        return super().handle(path)
+
+
+@pytest.fixture
+def stub():
+    stub = FlakyWikiStub()
+    yield stub
+    stub.httpd.shutdown()
+
+
+def make_client(stub, **kwargs):
+    return WikipediaClient(base_url=stub.base_url, **kwargs)
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_lookup_caches_found_page(stub):
+    client = make_client(stub)
+
+    page = client.lookup("삼성")
+    assert page["title"] == "삼성전자" and page["resolved_title"] == "삼성전자"
+    assert stub.requests == 2  # opensearch + summary
+
+    assert client.lookup("삼성") == page
+    assert stub.requests == 2
+    assert client.metrics()["fresh_hits"] == 2
+    client.close()
+
+
+def test_missing_page_is_negatively_cached(stub):
+    client = make_client(stub, negative_ttl=0.2, stale_grace=0)
+
+    assert client.lookup("없는문서") is None
+    requests = stub.requests
+    assert client.lookup("없는문서") is None
+    assert stub.requests == requests
+
+    # negative_ttl이 지나면 다시 조회
+    time.sleep(0.25)
+    assert client.lookup("없는문서") is None
+    assert stub.requests > requests
+    client.close()
+
+
+def test_stale_entry_is_served_then_revalidated(stub):
+    client = make_client(stub, ttl=0.2, stale_grace=60)
+    client.lookup("삼성")
+    time.sleep(0.25)
+
+    requests = stub.requests
+    page = client.lookup("삼성")  # 오래된 값을 기다리지 않고 돌려줌
+    assert page["title"] == "삼성전자"
+
+    assert wait_until(lambda: client.metrics()["refreshes"] == 2)
+    assert stub.requests == requests + 2
+    assert client.lookup("삼성") == page
+    assert client.metrics()["fresh_hits"] == 2
+    client.close()
+
+
+def test_server_error_is_not_cached(stub):
+    client = make_client(stub)
+    stub.fail = True
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert client.lookup("삼성") is None
+    assert client.metrics()["errors"] >= 1
+
+    stub.fail = False
+    assert client.lookup("삼성")["title"] == "삼성전자"
+    client.close()
+
+
+def test_failed_revalidation_keeps_stale_value(stub):
+    client = make_client(stub, ttl=0.2, stale_grace=60)
+    page = client.lookup("삼성")
+    time.sleep(0.25)
+
+    stub.fail = True
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert client.lookup("삼성") == page
+        assert wait_until(lambda: client.metrics()["errors"] >= 1)
+        assert client.lookup("삼성") == page
+    client.close()
+
+
+def test_stats_are_exact_under_concurrency(stub):
+    client = make_client(stub)
+    client.lookup("삼성")
+    threads, calls = 8, 200
+
+    def run():
+        for _ in range(calls):
+            client.lookup("삼성")
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    # lookup 한 번에 제목/요약 캐시를 각각 조회
+    assert client.metrics()["fresh_hits"] == threads * calls * 2
+    client.close()
+
+
+def test_raise_errors_separates_outage_from_missing_page(stub):
+    client = make_client(stub)
+    assert client.lookup("없는문서", raise_errors=True) is None
+
+    stub.fail = True
+    with contextlib.redirect_stdout(io.StringIO()):
+        with pytest.raises(Exception):
+            client.lookup("삼성", raise_errors=True)
+    client.close()
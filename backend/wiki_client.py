@@ -0,0 +1,210 @@
+# wiki_client.py
+"""
+위키피디아 조회 클라이언트.
+
+- 커넥션 풀을 쓰는 requests.Session (keep-alive 재사용)
+- 키워드 -> 문서 제목, 문서 제목 -> 요약 두 단계를 각각 캐시 (찾지 못한 결과도 짧게 캐시)
+- 크기 제한 + 만료가 있는 저장소, stale-while-revalidate:
+  유효기간이 지난 항목은 일단 그대로 돌려주고 백그라운드에서 새로 받아옵니다.
+  그래서 자주 찾는 키워드는 네트워크를 기다리지 않습니다.
+base_url을 바꾸면 로컬 대역(stub) 서버로도 동작합니다.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+WIKI_HEADERS = {"User-Agent": "VaccineDailyReportBot/1.0 (contact@example.com)"}
+
+# 캐시 조회 상태
+FRESH = "fresh"
+STALE = "stale"
+MISSING = "missing"
+
+
+class ExpiringStore:
+    """
+    크기 제한(LRU)과 항목별 만료 시각을 가진 저장소.
+    만료 후 stale_grace 초 동안은 '오래된 값'으로 돌려줄 수 있습니다.
+    """
+
+    def __init__(self, max_entries=5000, stale_grace=60 * 60 * 24):
+        self.max_entries = max_entries
+        self.stale_grace = stale_grace
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None, MISSING
+            value, expires_at = entry
+            if now < expires_at:
+                self._data.move_to_end(key)
+                return value, FRESH
+            if now < expires_at + self.stale_grace:
+                self._data.move_to_end(key)
+                return value, STALE
+            del self._data[key]
+            return None, MISSING
+
+    def put(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class WikipediaClient:
+    def __init__(
+        self,
+        base_url="https://ko.wikipedia.org",
+        timeout=5,
+        ttl=60 * 60 * 6,
+        negative_ttl=60 * 30,
+        stale_grace=60 * 60 * 24,
+        max_entries=5000,
+        session=None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        self.session = session or requests.Session()
+        self.session.headers.update(WIKI_HEADERS)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._titles = ExpiringStore(max_entries, stale_grace)  # 키워드 -> 문서 제목 (못 찾으면 None)
+        self._summaries = ExpiringStore(max_entries, stale_grace)  # 문서 제목 -> 요약 dict (없으면 None)
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="wiki-refresh")
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "requests": 0, "errors": 0, "refreshes": 0}
+        self._stats_lock = threading.Lock()  # 요청 스레드와 갱신 스레드가 함께 셈
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    # --- 네트워크 호출 (실패 시 예외) ---
+    def _fetch_title(self, keyword):
+        params = {"action": "opensearch", "search": keyword, "limit": 1, "namespace": 0, "format": "json"}
+        self._count("requests")
+        res = self.session.get(f"{self.base_url}/w/api.php", params=params, timeout=self.timeout)
+        res.raise_for_status()
+        data = res.json()
+        if data and len(data) > 1 and data[1]:
+            return data[1][0]
+        return None
+
+    def _fetch_summary(self, title):
+        self._count("requests")
+        res = self.session.get(f"{self.base_url}/api/rest_v1/page/summary/{quote(title)}", timeout=self.timeout)
+        if res.status_code == 404:
+            return None
+        res.raise_for_status()
+        data = res.json()
+        # 'type' 체크를 완화하고, title과 extract가 있는지 확인
+        if data.get("title") and data.get("extract"):
+            return {
+                "title": data.get("title"),
+                "extract": data.get("extract"),
+                "url": data.get("content_urls", {}).get("desktop", {}).get("page"),
+            }
+        return None
+
+    # --- 캐시 ---
+    def _store(self, store, key, value):
+        store.put(key, value, self.ttl if value is not None else self.negative_ttl)
+
+    def _refresh(self, store, key, loader):
+        try:
+            self._store(store, key, loader(key))
+            self._count("refreshes")
+        except Exception as e:
+            self._count("errors")
+            print(f"Wikipedia refresh error ({key}): {e}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard((id(store), key))
+
+    def _schedule_refresh(self, store, key, loader):
+        token = (id(store), key)
+        with self._refresh_lock:
+            if token in self._refreshing:
+                return
+            self._refreshing.add(token)
+        self._refresher.submit(self._refresh, store, key, loader)
+
+    def _cached(self, store, key, loader, default, raise_errors=False):
+        value, state = store.lookup(key)
+        if state == FRESH:
+            self._count("fresh_hits")
+            return value
+        if state == STALE:
+            self._count("stale_hits")
+            self._schedule_refresh(store, key, loader)
+            return value
+
+        self._count("misses")
+        try:
+            value = loader(key)
+        except Exception as e:
+            # 네트워크 오류는 캐시하지 않습니다.
+            self._count("errors")
+            print(f"Wikipedia API Error ({key}): {e}")
+            if raise_errors:
+                raise
+            return default
+        self._store(store, key, value)
+        return value
+
+    def resolve_title(self, keyword, raise_errors=False):
+        """키워드로 가장 적절한 문서 제목을 찾습니다. (못 찾으면 키워드 그대로)"""
+        return self._cached(self._titles, keyword, self._fetch_title, None, raise_errors) or keyword
+
+    def get_summary(self, title, raise_errors=False):
+        """문서 제목의 요약 {title, extract, url}을 가져옵니다. (문서가 없으면 None)"""
+        return self._cached(self._summaries, title, self._fetch_summary, None, raise_errors)
+
+    def lookup(self, keyword, raise_errors=False):
+        """
+        키워드 -> 문서 제목 -> 요약. 반환값에 실제로 찾은 제목(resolved_title)을 함께 담습니다.
+        raise_errors=True이면 네트워크 오류를 '문서 없음(None)'과 구별할 수 있도록 예외로 올려 보냅니다.
+        """
+        title = self.resolve_title(keyword, raise_errors)
+        summary = self.get_summary(title, raise_errors)
+        if summary is None:
+            return None
+        return dict(summary, resolved_title=title)
+
+    def metrics(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return dict(stats, title_entries=len(self._titles), summary_entries=len(self._summaries))
+
+    def close(self):
+        self._refresher.shutdown(wait=False)
+        self.session.close()
+
+
+# 프로세스 공용 클라이언트
+wiki_client = WikipediaClient(
+    base_url=os.getenv("WIKIPEDIA_BASE_URL", "https://ko.wikipedia.org"),
+    ttl=float(os.getenv("WIKIPEDIA_CACHE_TTL", str(60 * 60 * 6))),
+    negative_ttl=float(os.getenv("WIKIPEDIA_NEGATIVE_TTL", str(60 * 30))),
+)